@@ -3,6 +3,7 @@ DotMac Performance Benchmarking Suite
 
 Modular benchmarking toolkit providing:
 - Core benchmarking framework with BenchmarkRunner
+- Open- and closed-loop load generation with histogram latency capture
 - Optional HTTP endpoint benchmarking (requires httpx)
 - Optional database query profiling (requires sqlalchemy)  
 - Optional system metrics collection (requires psutil)
@@ -21,12 +22,17 @@ Quick Start:
 """
 
 from .core import BenchmarkRunner
+from .load import LatencyHistogram, LoadResult, run_closed_loop, run_open_loop
 from .report import summarize, to_json
 
 __version__ = "1.0.0"
 
 __all__ = [
     "BenchmarkRunner",
+    "LatencyHistogram",
+    "LoadResult",
+    "run_closed_loop",
+    "run_open_loop",
     "summarize",
     "to_json",
 ]
@@ -11,6 +11,8 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Callable
 
+from .load import LoadResult, run_closed_loop, run_open_loop
+
 
 @dataclass
 class BenchmarkResult:
@@ -68,7 +70,7 @@ class BenchmarkRunner:
 
     def __init__(self) -> None:
         """Initialize the benchmark runner."""
-        self._results: list[BenchmarkResult] = []
+        self._results: list[BenchmarkResult | LoadResult] = []
 
     async def run(
         self,
@@ -131,6 +133,66 @@ class BenchmarkRunner:
 
         return result
 
+    async def run_load(
+        self,
+        label: str,
+        fn: Callable[[], Awaitable[Any]],
+        *,
+        users: int | None = None,
+        rate: float | None = None,
+        duration: float | None = None,
+        requests: int | None = None,
+        warmup: int = 0,
+        metadata: dict[str, Any] | None = None,
+        **options: Any
+    ) -> LoadResult:
+        """
+        Run a concurrent load test.
+
+        Pass ``users`` for a closed loop of virtual users or ``rate`` for an
+        open loop with a constant arrival rate; remaining keyword options are
+        forwarded to :func:`~dotmac_benchmarking.load.run_closed_loop` or
+        :func:`~dotmac_benchmarking.load.run_open_loop`.
+
+        Args:
+            label: Name/description for this run
+            fn: Async function performing one request
+            users: Number of virtual users (closed loop)
+            rate: Arrivals per second (open loop)
+            duration: Run time in seconds
+            requests: Maximum number of requests (closed loop only)
+            warmup: Number of warmup iterations (default: 0)
+            metadata: Optional metadata to include in results
+
+        Returns:
+            LoadResult with latency percentiles and throughput series
+
+        Example:
+            runner = BenchmarkRunner()
+            result = await runner.run_load("health", call_health, rate=500, duration=30)
+            print(f"p99: {result.p99_duration * 1000:.1f}ms")
+        """
+        if (users is None) == (rate is None):
+            raise ValueError("Specify exactly one of users (closed loop) or rate (open loop)")
+
+        for _ in range(warmup):
+            await fn()
+
+        if users is not None:
+            result = await run_closed_loop(
+                label, fn, users=users, duration=duration, requests=requests,
+                metadata=metadata, **options
+            )
+        else:
+            if duration is None:
+                raise ValueError("Open-loop runs require a duration")
+            result = await run_open_loop(
+                label, fn, rate=rate, duration=duration, metadata=metadata, **options
+            )
+
+        self._results.append(result)
+        return result
+
     def compare(self, results: list[BenchmarkResult] | None = None) -> dict[str, Any]:
         """
         Compare benchmark results.
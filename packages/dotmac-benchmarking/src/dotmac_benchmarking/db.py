@@ -5,7 +5,8 @@ Requires the 'db' extra: pip install dotmac-benchmarking[db]
 """
 
 import time
-from typing import Any
+from collections.abc import Awaitable
+from typing import Any, Callable
 
 try:
     from sqlalchemy import text
@@ -211,3 +212,41 @@ async def benchmark_transaction(
             "success": False,
             "timestamp": time.time()
         }
+
+
+def query_load_operation(
+    engine: "AsyncEngine",
+    query: str,
+    params: dict[str, Any] | None = None
+) -> Callable[[], Awaitable[dict[str, Any]]]:
+    """
+    Build a zero-argument query callable for the load drivers.
+
+    Each call checks out its own connection from the engine's pool, so
+    concurrent virtual users do not share a connection.
+
+    Args:
+        engine: SQLAlchemy async engine
+        query: SQL query string (use parameterized queries for safety)
+        params: Query parameters (optional)
+
+    Returns:
+        Async callable running the query; failed queries count as errors
+
+    Example:
+        from dotmac_benchmarking import BenchmarkRunner
+
+        operation = query_load_operation(engine, "SELECT * FROM users WHERE id = :id", {"id": 1})
+        result = await BenchmarkRunner().run_load("user lookup", operation, users=20, duration=30)
+    """
+    if not DB_AVAILABLE:
+        raise ImportError(
+            "Database benchmarking requires sqlalchemy. "
+            "Install with: pip install dotmac-benchmarking[db]"
+        )
+
+    async def operation() -> dict[str, Any]:
+        async with engine.connect() as conn:
+            return await benchmark_query(conn, query, params)
+
+    return operation
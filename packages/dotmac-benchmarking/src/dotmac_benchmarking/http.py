@@ -5,7 +5,8 @@ Requires the 'http' extra: pip install dotmac-benchmarking[http]
 """
 
 import time
-from typing import Any
+from collections.abc import Awaitable
+from typing import Any, Callable
 
 try:
     import httpx
@@ -154,3 +155,39 @@ async def benchmark_http_batch(
             )
             results.append(result)
         return results
+
+
+def http_load_operation(
+    client: "httpx.AsyncClient",
+    method: str,
+    url: str,
+    **kwargs: Any
+) -> Callable[[], Awaitable[dict[str, Any]]]:
+    """
+    Build a zero-argument request callable for the load drivers.
+
+    Args:
+        client: httpx AsyncClient instance
+        method: HTTP method (GET, POST, etc.)
+        url: Request URL
+        **kwargs: Additional arguments passed to benchmark_http_request
+
+    Returns:
+        Async callable issuing the request; non-2xx responses count as errors
+
+    Example:
+        from dotmac_benchmarking import BenchmarkRunner
+
+        async with httpx.AsyncClient(limits=httpx.Limits(max_connections=100)) as client:
+            operation = http_load_operation(client, "GET", "https://api.example.com/health")
+            result = await BenchmarkRunner().run_load("health", operation, rate=200, duration=30)
+    """
+    if not HTTP_AVAILABLE:
+        raise ImportError(
+            "HTTP benchmarking requires httpx. Install with: pip install dotmac-benchmarking[http]"
+        )
+
+    async def operation() -> dict[str, Any]:
+        return await benchmark_http_request(client, method, url, **kwargs)
+
+    return operation
@@ -0,0 +1,477 @@
+"""
+Concurrent load generation.
+
+Provides open-loop (constant arrival rate) and closed-loop (N virtual users)
+drivers built on asyncio. Latencies are captured in a fixed-memory,
+log-bucketed histogram instead of a list of raw samples, and each run
+reports throughput over time alongside the latency distribution.
+
+Open-loop runs measure latency from each request's *intended* start time,
+so a stalled server cannot hide queueing delay by slowing the load
+generator down (coordinated omission). Closed-loop runs can apply the
+equivalent correction by passing ``expected_interval``.
+"""
+
+import asyncio
+import math
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram with bounded relative error.
+
+    Values between ``lowest`` and ``highest`` (seconds) are counted in
+    buckets whose width grows geometrically by ``precision``, so memory is
+    fixed by the configured range and any percentile is reported within
+    ``precision`` of the true value. Values outside the range are clamped
+    into the first/last bucket; exact min, max and sum are kept separately.
+    """
+
+    def __init__(
+        self,
+        *,
+        lowest: float = 1e-6,
+        highest: float = 3600.0,
+        precision: float = 0.01
+    ) -> None:
+        """
+        Initialize an empty histogram.
+
+        Args:
+            lowest: Smallest distinguishable value in seconds
+            highest: Largest trackable value in seconds
+            precision: Relative bucket width (0.01 = 1% error)
+        """
+        if lowest <= 0 or highest <= lowest:
+            raise ValueError("Histogram range must satisfy 0 < lowest < highest")
+        if not 0 < precision < 1:
+            raise ValueError("Precision must be between 0 and 1")
+
+        self.lowest = lowest
+        self.highest = highest
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self._counts = [0] * (self._bucket_index(highest) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _bucket_index(self, value: float) -> int:
+        if value <= self.lowest:
+            return 0
+        return math.ceil(math.log(value / self.lowest) / self._log_base)
+
+    def _bucket_value(self, index: int) -> float:
+        return self.lowest * (1 + self.precision) ** index
+
+    def record(self, value: float, count: int = 1) -> None:
+        """Record a latency ``count`` times."""
+        index = min(self._bucket_index(value), len(self._counts) - 1)
+        self._counts[index] += count
+        self.count += count
+        self.total += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def record_corrected(self, value: float, expected_interval: float) -> None:
+        """
+        Record a latency, back-filling samples a stalled run failed to issue.
+
+        When a closed-loop user is blocked for longer than the interval at
+        which it would normally issue requests, the requests it *would* have
+        sent are recorded with linearly decreasing latencies.
+
+        Args:
+            value: Observed latency in seconds
+            expected_interval: Expected time between requests in seconds
+        """
+        self.record(value)
+        if expected_interval <= 0:
+            return
+
+        missing = value - expected_interval
+        while missing >= expected_interval:
+            self.record(missing)
+            missing -= expected_interval
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the counts of a histogram with the same configuration."""
+        if (other.lowest, other.highest, other.precision) != (
+            self.lowest, self.highest, self.precision
+        ):
+            raise ValueError("Cannot merge histograms with different configurations")
+
+        for index, count in enumerate(other._counts):
+            if count:
+                self._counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        """Mean of recorded values."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Value at a percentile (0-100).
+
+        Returns the upper bound of the bucket holding the requested rank,
+        clamped to the exact min/max seen.
+        """
+        if not self.count:
+            return 0.0
+        if not 0 <= percent <= 100:
+            raise ValueError("Percentile must be between 0 and 100")
+
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summary statistics of the recorded values."""
+        return {
+            "count": self.count,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+        }
+
+
+class ThroughputSeries:
+    """Completed requests and errors per fixed time interval."""
+
+    def __init__(self, interval: float = 1.0) -> None:
+        """
+        Initialize an empty series.
+
+        Args:
+            interval: Bucket width in seconds
+        """
+        if interval <= 0:
+            raise ValueError("Interval must be positive")
+        self.interval = interval
+        self._requests: list[int] = []
+        self._errors: list[int] = []
+
+    def record(self, elapsed: float, success: bool = True) -> None:
+        """Record a request completing ``elapsed`` seconds into the run."""
+        index = max(0, int(elapsed / self.interval))
+        while len(self._requests) <= index:
+            self._requests.append(0)
+            self._errors.append(0)
+        self._requests[index] += 1
+        if not success:
+            self._errors[index] += 1
+
+    def to_list(self) -> list[dict[str, Any]]:
+        """Series as a list of per-interval points."""
+        return [
+            {
+                "start": index * self.interval,
+                "requests": requests,
+                "errors": errors,
+                "throughput": requests / self.interval,
+            }
+            for index, (requests, errors) in enumerate(zip(self._requests, self._errors))
+        ]
+
+
+@dataclass
+class LoadResult:
+    """Result from a load-generation run."""
+
+    label: str
+    mode: str
+    samples: int
+    errors: int
+    concurrency: int
+    elapsed: float
+    throughput: float
+    avg_duration: float
+    min_duration: float
+    max_duration: float
+    p50_duration: float
+    p95_duration: float
+    p99_duration: float
+    p999_duration: float
+    timestamp: str
+    metadata: dict[str, Any]
+    latency: LatencyHistogram = field(repr=False)
+    service_time: LatencyHistogram = field(repr=False)
+    series: list[dict[str, Any]] = field(repr=False)
+
+    @classmethod
+    def from_run(
+        cls,
+        label: str,
+        mode: str,
+        *,
+        concurrency: int,
+        elapsed: float,
+        errors: int,
+        latency: LatencyHistogram,
+        service_time: LatencyHistogram,
+        series: ThroughputSeries,
+        metadata: dict[str, Any] | None = None
+    ) -> "LoadResult":
+        """Create LoadResult from the collectors of a finished run."""
+        return cls(
+            label=label,
+            mode=mode,
+            samples=service_time.count,
+            errors=errors,
+            concurrency=concurrency,
+            elapsed=elapsed,
+            throughput=service_time.count / elapsed if elapsed > 0 else 0.0,
+            avg_duration=latency.mean,
+            min_duration=latency.min if latency.count else 0.0,
+            max_duration=latency.max,
+            p50_duration=latency.percentile(50),
+            p95_duration=latency.percentile(95),
+            p99_duration=latency.percentile(99),
+            p999_duration=latency.percentile(99.9),
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            metadata=metadata or {},
+            latency=latency,
+            service_time=service_time,
+            series=series.to_list(),
+        )
+
+    @property
+    def error_rate(self) -> float:
+        """Fraction of requests that failed."""
+        return self.errors / self.samples if self.samples else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain dictionary suitable for ``report.summarize``."""
+        return {
+            "label": self.label,
+            "mode": self.mode,
+            "samples": self.samples,
+            "errors": self.errors,
+            "error_rate": self.error_rate,
+            "concurrency": self.concurrency,
+            "elapsed": self.elapsed,
+            "throughput": self.throughput,
+            "avg_duration": self.avg_duration,
+            "min_duration": self.min_duration,
+            "max_duration": self.max_duration,
+            "p50_duration": self.p50_duration,
+            "p95_duration": self.p95_duration,
+            "p99_duration": self.p99_duration,
+            "p999_duration": self.p999_duration,
+            "latency": self.latency.to_dict(),
+            "service_time": self.service_time.to_dict(),
+            "series": self.series,
+            "timestamp": self.timestamp,
+            "metadata": self.metadata,
+        }
+
+
+def _succeeded(outcome: Any) -> bool:
+    # The http/db helpers report failures in their result dict rather than raising
+    if isinstance(outcome, dict):
+        return outcome.get("success", True) is not False
+    return True
+
+
+class _Collector:
+    """Shared recording state for a single run."""
+
+    def __init__(self, start: float, series_interval: float) -> None:
+        self.start = start
+        self.latency = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+        self.series = ThroughputSeries(series_interval)
+        self.errors = 0
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> tuple[float, float]:
+        """Await ``fn`` once; returns (actual start, end) and records the outcome."""
+        started = time.perf_counter()
+        try:
+            success = _succeeded(await fn())
+        except Exception:
+            success = False
+        ended = time.perf_counter()
+
+        if not success:
+            self.errors += 1
+        self.service_time.record(ended - started)
+        self.series.record(ended - self.start, success)
+        return started, ended
+
+
+async def run_open_loop(
+    label: str,
+    fn: Callable[[], Awaitable[Any]],
+    *,
+    rate: float,
+    duration: float,
+    max_in_flight: int | None = None,
+    series_interval: float = 1.0,
+    metadata: dict[str, Any] | None = None
+) -> LoadResult:
+    """
+    Issue requests at a constant arrival rate, independent of responses.
+
+    Request *i* is scheduled at ``i / rate`` seconds into the run and its
+    latency is measured from that scheduled time, so time spent waiting
+    behind a slow request (or for a free ``max_in_flight`` slot) is
+    included. ``service_time`` on the result holds the uncorrected
+    per-call durations for comparison.
+
+    Args:
+        label: Name/description for this run
+        fn: Async function performing one request
+        rate: Arrivals per second
+        duration: Length of the arrival schedule in seconds
+        max_in_flight: Optional cap on concurrent requests
+        series_interval: Throughput series bucket width in seconds
+        metadata: Optional metadata to include in results
+
+    Returns:
+        LoadResult with coordinated-omission-corrected latencies
+
+    Example:
+        result = await run_open_loop("health", call_health, rate=200, duration=30)
+        print(f"p99 at 200 rps: {result.p99_duration * 1000:.1f}ms")
+    """
+    if rate <= 0 or duration <= 0:
+        raise ValueError("Rate and duration must be positive")
+    if max_in_flight is not None and max_in_flight <= 0:
+        raise ValueError("max_in_flight must be positive")
+
+    start = time.perf_counter()
+    collector = _Collector(start, series_interval)
+    semaphore = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+    in_flight: set[asyncio.Task[None]] = set()
+    peak = 0
+
+    async def request(intended: float) -> None:
+        if semaphore is None:
+            _, ended = await collector.call(fn)
+        else:
+            async with semaphore:
+                _, ended = await collector.call(fn)
+        collector.latency.record(ended - intended)
+
+    total = max(1, int(rate * duration))
+    for index in range(total):
+        intended = start + index / rate
+        delay = intended - time.perf_counter()
+        # Yield even when behind schedule so in-flight requests make progress
+        await asyncio.sleep(max(0.0, delay))
+        task = asyncio.ensure_future(request(intended))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+        peak = max(peak, len(in_flight))
+
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+    return LoadResult.from_run(
+        label,
+        "open",
+        concurrency=min(peak, max_in_flight) if max_in_flight else peak,
+        elapsed=time.perf_counter() - start,
+        errors=collector.errors,
+        latency=collector.latency,
+        service_time=collector.service_time,
+        series=collector.series,
+        metadata={**(metadata or {}), "rate": rate, "duration": duration},
+    )
+
+
+async def run_closed_loop(
+    label: str,
+    fn: Callable[[], Awaitable[Any]],
+    *,
+    users: int,
+    duration: float | None = None,
+    requests: int | None = None,
+    think_time: float = 0.0,
+    expected_interval: float | None = None,
+    series_interval: float = 1.0,
+    metadata: dict[str, Any] | None = None
+) -> LoadResult:
+    """
+    Run ``users`` virtual users that each issue a request, wait for it,
+    optionally pause for ``think_time``, and repeat.
+
+    The run stops after ``duration`` seconds or once ``requests`` requests
+    have been issued, whichever comes first. A closed loop slows down with
+    the system under test, so pass ``expected_interval`` (the per-user time
+    between requests under normal conditions) to correct for coordinated
+    omission.
+
+    Args:
+        label: Name/description for this run
+        fn: Async function performing one request
+        users: Number of concurrent virtual users
+        duration: Maximum run time in seconds
+        requests: Maximum total number of requests
+        think_time: Pause between a user's requests in seconds
+        expected_interval: Expected per-user request interval for correction
+        series_interval: Throughput series bucket width in seconds
+        metadata: Optional metadata to include in results
+
+    Returns:
+        LoadResult with the latency distribution and throughput series
+
+    Example:
+        result = await run_closed_loop("orders", list_orders, users=50, duration=60)
+        print(f"{result.throughput:.0f} req/s at 50 users")
+    """
+    if users <= 0:
+        raise ValueError("Users must be positive")
+    if duration is None and requests is None:
+        raise ValueError("Either duration or requests must be given")
+
+    start = time.perf_counter()
+    deadline = start + duration if duration is not None else math.inf
+    collector = _Collector(start, series_interval)
+    issued = 0
+
+    async def user() -> None:
+        nonlocal issued
+        while time.perf_counter() < deadline and (requests is None or issued < requests):
+            issued += 1
+            started, ended = await collector.call(fn)
+            if expected_interval:
+                collector.latency.record_corrected(ended - started, expected_interval)
+            else:
+                collector.latency.record(ended - started)
+            if think_time > 0:
+                await asyncio.sleep(think_time)
+
+    await asyncio.gather(*(user() for _ in range(users)))
+
+    return LoadResult.from_run(
+        label,
+        "closed",
+        concurrency=users,
+        elapsed=time.perf_counter() - start,
+        errors=collector.errors,
+        latency=collector.latency,
+        service_time=collector.service_time,
+        series=collector.series,
+        metadata={**(metadata or {}), "users": users, "think_time": think_time},
+    )
@@ -6,6 +6,20 @@ import json
 import statistics
 from typing import Any
 
+from .load import LoadResult
+
+LOAD_SUMMARY_KEYS = (
+    "mode",
+    "concurrency",
+    "throughput",
+    "errors",
+    "error_rate",
+    "p50_duration",
+    "p99_duration",
+    "p999_duration",
+    "series",
+)
+
 
 def summarize(results: list[dict[str, Any]]) -> dict[str, Any]:
     """
@@ -42,6 +56,9 @@ def summarize(results: list[dict[str, Any]]) -> dict[str, Any]:
 
     # Process each result
     for result in results:
+        if isinstance(result, LoadResult):
+            result = result.to_dict()
+
         if isinstance(result, dict):
             # Handle dict format (from BenchmarkResult.dict() or raw dict)
             if "avg_duration" in result:
@@ -55,6 +72,10 @@ def summarize(results: list[dict[str, Any]]) -> dict[str, Any]:
                     "p95_duration": result.get("p95_duration", 0),
                     "timestamp": result.get("timestamp", "")
                 }
+                # Load-test results (LoadResult.to_dict())
+                for key in LOAD_SUMMARY_KEYS:
+                    if key in result:
+                        benchmark_summary[key] = result[key]
                 all_durations.append(result["avg_duration"])
             else:
                 # Generic result format
@@ -165,6 +186,26 @@ def generate_markdown_report(report: dict[str, Any]) -> str:
 
     md.append("")
 
+    # Load tests
+    load_benchmarks = [b for b in report.get("benchmarks", []) if "throughput" in b]
+    if load_benchmarks:
+        md.append("## Load Tests\n")
+        md.append("| Label | Mode | Concurrency | Throughput | Error Rate | P50 | P99 | P99.9 |")
+        md.append("|-------|------|-------------|------------|------------|-----|-----|-------|")
+
+        for benchmark in load_benchmarks:
+            md.append(
+                f"| {benchmark['label']} | {benchmark.get('mode', '')} "
+                f"| {benchmark.get('concurrency', 'N/A')} "
+                f"| {benchmark['throughput']:.1f}/s "
+                f"| {benchmark.get('error_rate', 0) * 100:.2f}% "
+                f"| {benchmark.get('p50_duration', 0):.4f}s "
+                f"| {benchmark.get('p99_duration', 0):.4f}s "
+                f"| {benchmark.get('p999_duration', 0):.4f}s |"
+            )
+
+        md.append("")
+
     # Relative performance
     if "comparisons" in report:
         comps = report["comparisons"]
@@ -0,0 +1,251 @@
+"""
+Tests for load-generation functionality.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from dotmac_benchmarking.core import BenchmarkRunner
+from dotmac_benchmarking.http import http_load_operation
+from dotmac_benchmarking.load import (
+    LatencyHistogram,
+    ThroughputSeries,
+    run_closed_loop,
+    run_open_loop,
+)
+from dotmac_benchmarking.report import generate_markdown_report, summarize
+
+
+class TestLatencyHistogram:
+    """Test LatencyHistogram class."""
+
+    def test_percentiles_within_precision(self):
+        """Test percentiles stay within the configured relative error."""
+        histogram = LatencyHistogram(precision=0.01)
+        for ms in range(1, 10001):
+            histogram.record(ms / 1000)
+
+        assert histogram.count == 10000
+        assert histogram.min == 0.001
+        assert histogram.max == 10.0
+        assert histogram.mean == pytest.approx(5.0005)
+        for percent, expected in [(50, 5.0), (90, 9.0), (99, 9.9), (100, 10.0)]:
+            assert histogram.percentile(percent) == pytest.approx(expected, rel=0.01)
+
+    def test_fixed_memory(self):
+        """Test bucket storage does not grow with the number of samples."""
+        histogram = LatencyHistogram()
+        buckets = len(histogram._counts)
+        for i in range(50000):
+            histogram.record((i % 997) / 1000)
+        histogram.record(10_000.0)
+
+        assert len(histogram._counts) == buckets
+        assert histogram.max == 10_000.0
+
+    def test_record_corrected_backfills_missed_requests(self):
+        """Test coordinated-omission correction adds the requests a stall hid."""
+        histogram = LatencyHistogram()
+        for _ in range(99):
+            histogram.record_corrected(0.01, expected_interval=0.01)
+        histogram.record_corrected(1.0, expected_interval=0.01)
+
+        # The 1s stall stands in for ~99 requests that would have been sent
+        assert histogram.count == 198
+        assert histogram.percentile(50) > 0.01
+        assert histogram.percentile(75) == pytest.approx(0.5, rel=0.05)
+
+    def test_merge(self):
+        """Test merging histograms with the same configuration."""
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(0.01)
+        second.record(0.2, count=3)
+        first.merge(second)
+
+        assert first.count == 4
+        assert first.max == 0.2
+        assert first.percentile(50) == pytest.approx(0.2, rel=0.01)
+
+        with pytest.raises(ValueError, match="different configurations"):
+            first.merge(LatencyHistogram(precision=0.1))
+
+    def test_empty_and_invalid(self):
+        """Test empty histogram statistics and argument validation."""
+        histogram = LatencyHistogram()
+        assert histogram.percentile(99) == 0.0
+        assert histogram.to_dict()["min"] == 0.0
+
+        with pytest.raises(ValueError):
+            LatencyHistogram(lowest=1.0, highest=0.5)
+        histogram.record(0.1)
+        with pytest.raises(ValueError):
+            histogram.percentile(101)
+
+
+class TestThroughputSeries:
+    """Test ThroughputSeries class."""
+
+    def test_buckets_by_interval(self):
+        """Test completions are counted per interval."""
+        series = ThroughputSeries(interval=0.5)
+        for elapsed in (0.1, 0.2, 0.6, 1.7):
+            series.record(elapsed)
+        series.record(1.8, success=False)
+
+        points = series.to_list()
+        assert [point["requests"] for point in points] == [2, 1, 0, 2]
+        assert [point["errors"] for point in points] == [0, 0, 0, 1]
+        assert points[0]["throughput"] == 4.0
+        assert points[3]["start"] == 1.5
+
+
+class TestLoadDrivers:
+    """Test open- and closed-loop drivers."""
+
+    async def test_closed_loop_request_limit(self):
+        """Test virtual users run concurrently until the request budget is spent."""
+        active = 0
+        peak = 0
+
+        async def operation():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.005)
+            active -= 1
+
+        result = await run_closed_loop("closed", operation, users=5, requests=40)
+
+        assert result.mode == "closed"
+        assert result.samples == 40
+        assert result.errors == 0
+        assert result.concurrency == 5
+        assert peak == 5
+        assert result.p50_duration >= 0.005
+        assert result.throughput > 0
+        assert sum(point["requests"] for point in result.series) == 40
+
+    async def test_closed_loop_counts_errors(self):
+        """Test exceptions and unsuccessful result dicts count as errors."""
+        calls = 0
+
+        async def operation():
+            nonlocal calls
+            calls += 1
+            if calls % 4 == 0:
+                raise RuntimeError("boom")
+            return {"success": calls % 4 != 1}
+
+        result = await run_closed_loop("errors", operation, users=2, requests=8)
+
+        assert result.samples == 8
+        assert result.errors == 4
+        assert result.error_rate == 0.5
+
+    async def test_open_loop_corrects_for_coordinated_omission(self):
+        """Test queueing behind a stall is charged to the requests that waited."""
+        calls = 0
+
+        async def operation():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.2 if calls == 1 else 0.001)
+
+        result = await run_open_loop(
+            "open", operation, rate=100, duration=0.3, max_in_flight=1
+        )
+
+        assert result.mode == "open"
+        assert result.samples == 30
+        assert result.concurrency == 1
+        # Service times only show the single slow call...
+        assert result.service_time.percentile(50) < 0.05
+        # ...but requests scheduled during the stall saw its delay
+        assert result.p50_duration > 0.05
+        assert result.metadata["rate"] == 100
+
+    async def test_open_loop_keeps_arrival_rate(self):
+        """Test arrivals are not throttled by slow responses without a cap."""
+        async def operation():
+            await asyncio.sleep(0.05)
+
+        result = await run_open_loop("open", operation, rate=200, duration=0.2)
+
+        assert result.samples == 40
+        assert result.concurrency > 1
+        assert result.elapsed < 0.5
+
+    async def test_validation(self):
+        """Test invalid driver arguments are rejected."""
+        async def operation():
+            return None
+
+        with pytest.raises(ValueError):
+            await run_open_loop("bad", operation, rate=0, duration=1)
+        with pytest.raises(ValueError):
+            await run_closed_loop("bad", operation, users=1)
+        with pytest.raises(ValueError, match="exactly one"):
+            await BenchmarkRunner().run_load("bad", operation, users=1, rate=1, duration=1)
+
+
+class TestLoadIntegration:
+    """Test load results with the runner, http helpers and reports."""
+
+    async def test_runner_stores_load_results(self):
+        """Test run_load results are stored and comparable."""
+        async def operation():
+            await asyncio.sleep(0.001)
+
+        runner = BenchmarkRunner()
+        fast = await runner.run_load("fast", operation, users=2, requests=10)
+        slow = await runner.run_load(
+            "slow", operation, rate=50, duration=0.1, metadata={"env": "test"}
+        )
+
+        assert runner.get_results() == [fast, slow]
+        assert slow.metadata == {"env": "test", "rate": 50, "duration": 0.1}
+        assert runner.compare()["baseline"]["label"] in {"fast", "slow"}
+
+    @patch('dotmac_benchmarking.http.HTTP_AVAILABLE', True)
+    @patch('dotmac_benchmarking.http.httpx')
+    async def test_http_operation_drives_load(self, mock_httpx):
+        """Test http_load_operation feeds the drivers, counting 5xx as errors."""
+        statuses = iter([200, 503, 200, 200])
+
+        async def request(*args, **kwargs):
+            response = MagicMock()
+            response.status_code = next(statuses)
+            response.content = b"ok"
+            return response
+
+        client = AsyncMock()
+        client.request.side_effect = request
+        operation = http_load_operation(client, "GET", "https://api.example.com/health")
+
+        result = await run_closed_loop("http", operation, users=2, requests=4)
+
+        assert result.samples == 4
+        assert result.errors == 1
+        client.request.assert_called_with(
+            "GET", "https://api.example.com/health", timeout=30.0
+        )
+
+    async def test_summarize_load_results(self):
+        """Test load results flow into summaries and markdown reports."""
+        async def operation():
+            return None
+
+        result = await run_closed_loop("load", operation, users=1, requests=5)
+        report = summarize([result, result.to_dict()])
+
+        benchmark = report["benchmarks"][0]
+        assert benchmark["mode"] == "closed"
+        assert benchmark["throughput"] == result.throughput
+        assert benchmark["samples"] == 5
+        assert report["benchmarks"][1]["p99_duration"] == result.p99_duration
+
+        markdown = generate_markdown_report(report)
+        assert "## Load Tests" in markdown
+        assert "| load | closed | 1 |" in markdown
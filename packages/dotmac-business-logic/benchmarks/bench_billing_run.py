@@ -0,0 +1,233 @@
+"""
+Benchmark: BillingRunEngine on a synthetic 100k-subscription month-end run.
+
+Seeds an in-memory dataset (subscriptions spread over tenants and plans, a
+share of them with usage) behind repositories that charge a fixed round-trip
+latency per query, then compares per-subscription billing (chunk_size=1, one
+worker; the round-trip shape of the generate_invoice loop) against chunked,
+concurrent runs:
+
+    python benchmarks/bench_billing_run.py
+    python benchmarks/bench_billing_run.py --subscriptions 100000 --latency-ms 0.5 \\
+        --chunk-size 1000 --workers 8
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from dotmac_business_logic.billing.core.models import (  # noqa: E402
+    BillingCycle,
+    SubscriptionStatus,
+)
+from dotmac_business_logic.billing.services import BillingRunEngine  # noqa: E402
+
+BILLING_DATE = date(2024, 2, 1)
+
+
+class Dataset:
+    def __init__(self, subscriptions: int, tenants: int, usage_share: float, seed: int = 7):
+        rng = random.Random(seed)
+        self.plans = {}
+        self.customers = {}
+        self.subscriptions = {}
+        self.usage_totals = {}
+        self.invoice_rows = 0
+        self.line_item_rows = 0
+
+        tenant_ids = [uuid4() for _ in range(tenants)]
+        plans_by_tenant = {}
+        for tenant_id in tenant_ids:
+            plans_by_tenant[tenant_id] = []
+            for price in ("29.00", "49.00", "99.00"):
+                plan = SimpleNamespace(
+                    id=uuid4(),
+                    tenant_id=tenant_id,
+                    name=f"Plan {price}",
+                    base_price=Decimal(price),
+                    overage_price=Decimal("0.50"),
+                    included_usage=Decimal("500"),
+                    usage_unit="GB",
+                    currency="USD",
+                    billing_cycle=BillingCycle.MONTHLY,
+                )
+                self.plans[plan.id] = plan
+                plans_by_tenant[tenant_id].append(plan)
+
+        for _ in range(subscriptions):
+            tenant_id = rng.choice(tenant_ids)
+            customer = SimpleNamespace(id=uuid4(), tenant_id=tenant_id)
+            self.customers[customer.id] = customer
+            subscription = SimpleNamespace(
+                id=uuid4(),
+                tenant_id=tenant_id,
+                customer_id=customer.id,
+                billing_plan_id=rng.choice(plans_by_tenant[tenant_id]).id,
+                status=SubscriptionStatus.ACTIVE,
+                start_date=BILLING_DATE - timedelta(days=365),
+                next_billing_date=BILLING_DATE - timedelta(days=31),
+                custom_price=None,
+                quantity=1,
+            )
+            self.subscriptions[subscription.id] = subscription
+            if rng.random() < usage_share:
+                self.usage_totals[subscription.id] = Decimal(rng.randint(100, 900))
+
+    def reset(self):
+        for subscription in self.subscriptions.values():
+            subscription.next_billing_date = BILLING_DATE - timedelta(days=31)
+        self.invoice_rows = 0
+        self.line_item_rows = 0
+
+
+class LatencySession:
+    """One session; every repository call and commit costs one round trip."""
+
+    def __init__(self, dataset: Dataset, latency: float):
+        self.dataset = dataset
+        self.latency = latency
+        self.pending_dates = {}
+        self.pending_rows = (0, 0)
+        self.db = self
+        self.plan_repo = SimpleNamespace(get_many=self._getter(dataset.plans))
+        self.customer_repo = SimpleNamespace(get_many=self._getter(dataset.customers))
+        self.subscription_repo = SimpleNamespace(
+            get_many=self._getter(dataset.subscriptions),
+            get_due_for_billing_keys=self.get_due_for_billing_keys,
+            bulk_update_next_billing_date=self.bulk_update_next_billing_date,
+        )
+        self.invoice_repo = SimpleNamespace(
+            bulk_create_with_line_items=self.bulk_create_with_line_items
+        )
+        self.usage_repo = SimpleNamespace(get_usage_totals=self.get_usage_totals)
+
+    async def _round_trip(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def _getter(self, rows):
+        async def get_many(ids, tenant_id=None):
+            await self._round_trip()
+            return [rows[i] for i in ids]
+
+        return get_many
+
+    async def get_due_for_billing_keys(self, billing_date, tenant_id=None):
+        await self._round_trip()
+        return sorted(
+            (s.tenant_id, s.id)
+            for s in self.dataset.subscriptions.values()
+            if s.next_billing_date <= billing_date
+        )
+
+    async def get_usage_totals(self, subscription_ids, start_date, end_date):
+        await self._round_trip()
+        totals = self.dataset.usage_totals
+        return {i: totals[i] for i in subscription_ids if i in totals}
+
+    async def bulk_create_with_line_items(self, invoices, line_items):
+        await self._round_trip()
+        self.pending_rows = (len(invoices), len(line_items))
+        return len(invoices)
+
+    async def bulk_update_next_billing_date(self, next_billing_dates):
+        await self._round_trip()
+        self.pending_dates = next_billing_dates
+        return len(next_billing_dates)
+
+    async def commit(self):
+        await self._round_trip()
+        for subscription_id, next_date in self.pending_dates.items():
+            self.dataset.subscriptions[subscription_id].next_billing_date = next_date
+        self.dataset.invoice_rows += self.pending_rows[0]
+        self.dataset.line_item_rows += self.pending_rows[1]
+        await self.rollback()
+
+    async def rollback(self):
+        self.pending_dates = {}
+        self.pending_rows = (0, 0)
+
+
+async def timed_run(dataset: Dataset, latency: float, chunk_size: int, workers: int):
+    @asynccontextmanager
+    async def session_factory():
+        yield LatencySession(dataset, latency)
+
+    dataset.reset()
+    engine = BillingRunEngine(session_factory, chunk_size=chunk_size, max_workers=workers)
+    started = time.perf_counter()
+    results = await engine.run(BILLING_DATE)
+    return time.perf_counter() - started, results
+
+
+async def main(
+    subscriptions: int,
+    tenants: int,
+    usage_share: float,
+    latency_ms: float,
+    chunk_size: int,
+    workers: int,
+    baseline_count: int,
+):
+    latency = latency_ms / 1000
+    print(f"seeding {subscriptions} subscriptions over {tenants} tenants ...")
+    dataset = Dataset(subscriptions, tenants, usage_share)
+    baseline_dataset = Dataset(min(baseline_count, subscriptions), tenants, usage_share)
+
+    runs = [
+        ("per-subscription (1 x 1)", baseline_dataset, 1, 1),
+        (f"chunked ({chunk_size} x 1)", dataset, chunk_size, 1),
+        (f"chunked ({chunk_size} x {workers})", dataset, chunk_size, workers),
+    ]
+    rates = []
+    for label, data, size, pool in runs:
+        elapsed, results = await timed_run(data, latency, size, pool)
+        rate = results["processed_count"] / elapsed
+        rates.append(rate)
+        print(
+            f"{label:<28} {results['processed_count']:>8} subs  "
+            f"{results['chunk_count']:>7} chunks  {elapsed:8.2f} s  {rate:10.0f} subs/s  "
+            f"est. {subscriptions / rate:8.1f} s for {subscriptions}"
+        )
+        assert results["failed_count"] == 0, results["errors"][:1]
+        assert data.invoice_rows == results["processed_count"]
+    print(f"speedup vs per-subscription: {rates[-1] / rates[0]:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--subscriptions", type=int, default=100_000)
+    parser.add_argument("--tenants", type=int, default=20)
+    parser.add_argument("--usage-share", type=float, default=0.3)
+    parser.add_argument("--latency-ms", type=float, default=0.5)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--baseline-count",
+        type=int,
+        default=2000,
+        help="subscriptions billed in the per-subscription run (extrapolated)",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(
+            args.subscriptions,
+            args.tenants,
+            args.usage_share,
+            args.latency_ms,
+            args.chunk_size,
+            args.workers,
+            args.baseline_count,
+        )
+    )
@@ -0,0 +1,135 @@
+"""
+Benchmark: UsageRatingEngine.rate_cohort vs per-subscription Decimal rating.
+
+Generates aggregated usage for a cohort of subscribers on a few tiered and
+flat tariffs, rates it with rate_usage_for_subscription one subscriber at a
+time and with a single rate_cohort pass, and checks both produce identical
+line items:
+
+    python benchmarks/bench_usage_rating.py --subscriptions 50000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from dotmac_business_logic.billing.core.models import (  # noqa: E402
+    BillingCycle,
+    BillingPeriodValue,
+)
+from dotmac_business_logic.billing.usage.rating import (  # noqa: E402
+    UsageRatingEngine,
+    UsageTotal,
+)
+
+PERIOD = BillingPeriodValue(
+    start_date=date(2024, 1, 1), end_date=date(2024, 1, 31), cycle=BillingCycle.MONTHLY
+)
+
+
+def tiered(*bounds_and_prices, discounts=()):
+    tiers = []
+    lower = 0
+    for upper, price in bounds_and_prices:
+        tier = {"min_quantity": lower, "unit_price": price}
+        if upper is not None:
+            tier["max_quantity"] = upper
+        tiers.append(tier)
+        lower = upper
+    return {
+        "pricing_model": "tiered",
+        "tiers": tiers,
+        "volume_discounts": [
+            {"min_quantity": threshold, "discount_percent": percent}
+            for threshold, percent in discounts
+        ],
+    }
+
+
+def build_cohort(subscriptions: int, seed: int = 11):
+    rng = random.Random(seed)
+    plans = [
+        SimpleNamespace(
+            id=uuid4(),
+            usage_allowances={"data": Decimal(allowance), "voice": Decimal("0")},
+            usage_pricing={
+                "data_overage": tiered(
+                    (100, "0.10"), (1000, "0.075"), (10000, "0.05"), (None, "0.02"),
+                    discounts=((5000, 5), (20000, "7.5")),
+                ),
+                "voice_overage": {"unit_price": "0.0125"},
+            },
+        )
+        for allowance in ("50", "200", "1000")
+    ]
+    billing_plans = {}
+    usage_totals = []
+    for _ in range(subscriptions):
+        subscription_id = uuid4()
+        billing_plans[subscription_id] = rng.choice(plans)
+        usage_totals.append(
+            UsageTotal(subscription_id, "data", Decimal(rng.randint(0, 30_000_000_000)).scaleb(-6), "GB")
+        )
+        usage_totals.append(
+            UsageTotal(subscription_id, "voice", Decimal(rng.randint(0, 3_000)), "min")
+        )
+    return billing_plans, usage_totals
+
+
+async def rate_one_by_one(engine, billing_plans, usage_totals):
+    by_subscription = {}
+    for total in usage_totals:
+        by_subscription.setdefault(total.subscription_id, []).append(
+            SimpleNamespace(
+                meter_type=total.metric_name,
+                service_identifier=None,
+                quantity=total.quantity,
+                unit=total.unit,
+            )
+        )
+    rated = {}
+    for subscription_id, records in by_subscription.items():
+        subscription = SimpleNamespace(id=subscription_id, billing_plan=billing_plans[subscription_id])
+        items = await engine.rate_usage_for_subscription(subscription, PERIOD, records)
+        if items:
+            rated[subscription_id] = items
+    return rated
+
+
+async def main(subscriptions: int):
+    billing_plans, usage_totals = build_cohort(subscriptions)
+    engine = UsageRatingEngine()
+
+    started = time.perf_counter()
+    reference = await rate_one_by_one(engine, billing_plans, usage_totals)
+    reference_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    cohort = engine.rate_cohort(usage_totals, billing_plans, PERIOD)
+    cohort_seconds = time.perf_counter() - started
+
+    assert cohort == reference, "cohort rating diverged from the Decimal reference"
+    records = len(usage_totals)
+    for label, seconds in (
+        ("rate_usage_for_subscription", reference_seconds),
+        ("rate_cohort", cohort_seconds),
+    ):
+        print(f"{label:<30} {seconds * 1000:10.1f} ms  {records / seconds:12.0f} totals/s")
+    print(f"speedup: {reference_seconds / cohort_seconds:.1f}x (line items identical)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--subscriptions", type=int, default=50_000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.subscriptions))
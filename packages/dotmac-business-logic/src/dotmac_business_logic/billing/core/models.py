@@ -14,6 +14,7 @@ from typing import Optional
 
 class BillingCycle(str, Enum):
     """Billing cycle enumeration."""
+    WEEKLY = "weekly"
     MONTHLY = "monthly"
     QUARTERLY = "quarterly"
     SEMI_ANNUALLY = "semi_annually"
@@ -27,6 +27,7 @@ except ImportError:
 
 from .csv_exporter import export_invoices_csv, export_payments_csv
 from .pdf_generator import generate_invoice_pdf, generate_receipt_pdf
+from .pdf_rendering import PDFRenderingService, PDFRenderResult, PDFRenderStats
 
 # Optional file handler (requires aiofiles)
 try:
@@ -43,6 +44,9 @@ __all__ = [
     "initialize_websocket_manager",
     "generate_invoice_pdf",
     "generate_receipt_pdf",
+    "PDFRenderingService",
+    "PDFRenderResult",
+    "PDFRenderStats",
     "export_invoices_csv",
     "export_payments_csv",
     "file_upload_service",
@@ -2,7 +2,8 @@
 
 import io
 import logging
-from typing import Any, Optional
+import warnings
+from typing import Any, BinaryIO, Optional, Union
 
 # Try ISP billing models, fallback to local models
 try:
@@ -24,7 +25,14 @@ from reportlab.lib.enums import TA_LEFT, TA_RIGHT
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import inch
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from reportlab.platypus import (
+    PageBreak,
+    Paragraph,
+    SimpleDocTemplate,
+    Spacer,
+    Table,
+    TableStyle,
+)
 from reportlab.platypus.flowables import HRFlowable
 
 logger = logging.getLogger(__name__)
@@ -116,14 +124,40 @@ class InvoicePDFGenerator:
     ) -> bytes:
         """Generate PDF for an invoice."""
         buffer = io.BytesIO()
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=letter,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=18,
-        )
+        self.render_invoice(invoice, customer_data, buffer)
+        return buffer.getvalue()
+
+    def render_invoice(
+        self,
+        invoice: Invoice,
+        customer_data: dict[str, Any],
+        output: Union[str, BinaryIO],
+    ) -> None:
+        """Render an invoice to a file path or writable binary file."""
+        self._build_document(output, self.build_invoice_story(invoice, customer_data))
+
+    def render_invoices(
+        self,
+        documents: list[tuple[Invoice, dict[str, Any]]],
+        output: Union[str, BinaryIO],
+    ) -> int:
+        """Render several invoices into one document, each starting on a new page."""
+        if not documents:
+            raise ValueError("At least one invoice is required")
+
+        story = []
+        for invoice, customer_data in documents:
+            if story:
+                story.append(PageBreak())
+            story.extend(self.build_invoice_story(invoice, customer_data))
+
+        self._build_document(output, story)
+        return len(documents)
+
+    def build_invoice_story(
+        self, invoice: Invoice, customer_data: dict[str, Any]
+    ) -> list[Any]:
+        """Build the flowables for one invoice."""
         story = []
 
         # Header section
@@ -150,9 +184,19 @@ class InvoicePDFGenerator:
         # Footer
         story.extend(self._build_footer())
 
+        return story
+
+    def _build_document(self, output: Union[str, BinaryIO], story: list[Any]) -> None:
+        """Lay out a story on letter pages with the invoice margins."""
+        doc = SimpleDocTemplate(
+            output,
+            pagesize=letter,
+            rightMargin=72,
+            leftMargin=72,
+            topMargin=72,
+            bottomMargin=18,
+        )
         doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
 
     def _build_header(self, invoice: Invoice) -> list[Any]:
         """Build PDF header with company info and invoice title."""
@@ -431,8 +475,23 @@ class ReceiptPDFGenerator:
     ) -> bytes:
         """Generate PDF receipt for a payment."""
         buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
+        self.render_receipt(receipt, customer_data, buffer)
+        return buffer.getvalue()
 
+    def render_receipt(
+        self,
+        receipt: Receipt,
+        customer_data: dict[str, Any],
+        output: Union[str, BinaryIO],
+    ) -> None:
+        """Render a receipt to a file path or writable binary file."""
+        doc = SimpleDocTemplate(output, pagesize=letter)
+        doc.build(self.build_receipt_story(receipt, customer_data))
+
+    def build_receipt_story(
+        self, receipt: Receipt, customer_data: dict[str, Any]
+    ) -> list[Any]:
+        """Build the flowables for one receipt."""
         story = []
 
         # Header
@@ -467,16 +526,27 @@ class ReceiptPDFGenerator:
         # Thank you message
         story.append(Paragraph("Thank you for your payment!", self.styles["Heading2"]))
 
-        doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
+        return story
 
 
 class PDFBatchProcessor:
-    """Process multiple PDFs in batch operations."""
+    """
+    Process multiple PDFs in batch operations.
+
+    Deprecated: renders serially on the event loop and keeps every PDF in
+    memory. Use ``pdf_rendering.PDFRenderingService``, which renders on a
+    process pool and streams each PDF into a storage backend.
+    """
 
     def __init__(self):
         """Init   operation."""
+        warnings.warn(
+            "PDFBatchProcessor is deprecated. "
+            "Please use PDFRenderingService from "
+            "'dotmac_business_logic.billing.isp.pdf_rendering' instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
         self.invoice_generator = InvoicePDFGenerator()
         self.receipt_generator = ReceiptPDFGenerator()
 
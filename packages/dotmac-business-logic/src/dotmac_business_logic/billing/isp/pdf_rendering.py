@@ -0,0 +1,433 @@
+"""
+Process-pool rendering of billing PDFs into a storage backend.
+
+ReportLab layout is CPU-bound, so rendering a month-end batch inside the
+event loop stalls every request the API worker is serving. The
+PDFRenderingService hands documents to a pool of processes that build their
+generators, styles and font metrics once at start-up. Each worker writes its
+PDF to a spool file, and the service streams the finished file into the
+configured StorageBackend, so no batch is ever held in memory.
+"""
+
+import asyncio
+import io
+import logging
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Optional
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase import pdfmetrics
+from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+from .pdf_generator import Invoice, InvoicePDFGenerator, Receipt, ReceiptPDFGenerator
+
+if TYPE_CHECKING:
+    from dotmac_business_logic.files.storage.backends import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+INVOICE = "invoice"
+RECEIPT = "receipt"
+MERGED_INVOICES = "merged_invoices"
+
+# Fonts referenced by the invoice and receipt styles
+_WARM_FONTS = ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Times-Roman")
+
+# Generators owned by a pool worker, built once by _init_worker
+_invoice_generator: Optional[InvoicePDFGenerator] = None
+_receipt_generator: Optional[ReceiptPDFGenerator] = None
+
+
+def _init_worker(company_info: Optional[dict[str, Any]]) -> None:
+    """Build the generators and load font metrics once per worker process."""
+    global _invoice_generator, _receipt_generator
+
+    _invoice_generator = InvoicePDFGenerator(company_info)
+    _receipt_generator = ReceiptPDFGenerator(company_info)
+
+    for font_name in _WARM_FONTS:
+        pdfmetrics.getFont(font_name)
+    # Lay out one throwaway page so the first real document does not pay
+    # for ReportLab's lazy imports and caches.
+    SimpleDocTemplate(io.BytesIO(), pagesize=letter).build(
+        [Paragraph("<b>warm-up</b>", _invoice_generator.styles["Normal"])]
+    )
+
+
+def _worker_ready() -> int:
+    """No-op job used to make the pool start every worker up front."""
+    return os.getpid()
+
+
+def _render_job(
+    kind: str, documents: list[tuple[Any, dict[str, Any]]], spool_dir: str
+) -> tuple[str, int, float]:
+    """Render one job to a spool file; returns (path, size, seconds)."""
+    started = time.perf_counter()
+    fd, path = tempfile.mkstemp(suffix=".pdf", dir=spool_dir)
+    try:
+        with os.fdopen(fd, "wb") as output:
+            if kind == INVOICE:
+                _invoice_generator.render_invoice(*documents[0], output)
+            elif kind == RECEIPT:
+                _receipt_generator.render_receipt(*documents[0], output)
+            elif kind == MERGED_INVOICES:
+                _invoice_generator.render_invoices(documents, output)
+            else:
+                raise ValueError(f"Unknown document kind: {kind}")
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, os.path.getsize(path), time.perf_counter() - started
+
+
+def _snapshot_invoice(invoice: Invoice) -> SimpleNamespace:
+    """Copy the fields the invoice layout reads into a picklable object."""
+    return SimpleNamespace(
+        invoice_number=invoice.invoice_number,
+        invoice_date=invoice.invoice_date,
+        due_date=invoice.due_date,
+        subtotal=invoice.subtotal,
+        discount_amount=invoice.discount_amount,
+        tax_amount=invoice.tax_amount,
+        total_amount=invoice.total_amount,
+        paid_amount=invoice.paid_amount,
+        balance_due=invoice.balance_due,
+        line_items=[
+            SimpleNamespace(
+                description=item.description,
+                quantity=item.quantity,
+                unit_price=item.unit_price,
+                tax_amount=item.tax_amount,
+                line_total=item.line_total,
+            )
+            for item in invoice.line_items
+        ],
+        payments=[
+            SimpleNamespace(
+                payment_date=payment.payment_date,
+                payment_method=payment.payment_method,
+                amount=payment.amount,
+                status=payment.status,
+                reference_number=payment.reference_number,
+                transaction_id=payment.transaction_id,
+            )
+            for payment in invoice.payments or []
+        ],
+    )
+
+
+def _snapshot_receipt(receipt: Receipt) -> SimpleNamespace:
+    """Copy the fields the receipt layout reads into a picklable object."""
+    return SimpleNamespace(
+        receipt_number=receipt.receipt_number,
+        issued_at=receipt.issued_at,
+        invoice_number=receipt.invoice_number,
+        payment_method=receipt.payment_method,
+        amount=receipt.amount,
+    )
+
+
+@dataclass
+class PDFRenderResult:
+    """Outcome of rendering and storing one document."""
+
+    key: str
+    kind: str
+    storage_path: Optional[str] = None
+    size: int = 0
+    render_seconds: float = 0.0
+    store_seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the document reached storage."""
+        return self.error is None
+
+
+@dataclass
+class PDFRenderStats:
+    """Running totals across every batch a service has rendered."""
+
+    documents: int = 0
+    failures: int = 0
+    bytes_written: int = 0
+    render_seconds: float = 0.0
+    store_seconds: float = 0.0
+    max_render_seconds: float = 0.0
+
+    def record(self, result: PDFRenderResult) -> None:
+        """Add one document's outcome to the totals."""
+        self.documents += 1
+        if not result.succeeded:
+            self.failures += 1
+            return
+        self.bytes_written += result.size
+        self.render_seconds += result.render_seconds
+        self.store_seconds += result.store_seconds
+        self.max_render_seconds = max(self.max_render_seconds, result.render_seconds)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        rendered = self.documents - self.failures
+        return {
+            "documents": self.documents,
+            "failures": self.failures,
+            "bytes_written": self.bytes_written,
+            "render_seconds": self.render_seconds,
+            "store_seconds": self.store_seconds,
+            "avg_render_seconds": self.render_seconds / rendered if rendered else 0.0,
+            "max_render_seconds": self.max_render_seconds,
+        }
+
+
+class PDFRenderingService:
+    """Render billing PDFs on a process pool and stream them to storage."""
+
+    def __init__(
+        self,
+        storage: "StorageBackend",
+        *,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        company_info: Optional[dict[str, Any]] = None,
+        invoice_path: str = "invoices/{key}.pdf",
+        receipt_path: str = "receipts/{key}.pdf",
+        merged_path: str = "invoices/merged/{key}.pdf",
+        mp_context: Any = None,
+    ):
+        """Configure the pool; workers are started by start() or the first batch."""
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        # Bounds spool files on disk and futures queued on the pool
+        if max_pending is None:
+            max_pending = max_workers * 2
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.storage = storage
+        self.company_info = company_info
+        self.invoice_path = invoice_path
+        self.receipt_path = receipt_path
+        self.merged_path = merged_path
+        self.mp_context = mp_context
+        self.stats = PDFRenderStats()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._spool_dir: Optional[str] = None
+
+    async def start(self) -> None:
+        """Start every worker and wait until each has built its generators."""
+        if self._executor is not None:
+            return
+
+        if self._spool_dir is None:
+            self._spool_dir = tempfile.mkdtemp(prefix="dotmac_pdf_")
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=self.mp_context,
+            initializer=_init_worker,
+            initargs=(self.company_info,),
+        )
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, _worker_ready)
+                for _ in range(self.max_workers)
+            )
+        )
+        logger.info(f"PDF rendering pool ready with {len(set(pids))} workers")
+
+    async def _discard_pool(self) -> None:
+        """Shut the pool down; the next batch starts a fresh one."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, cancel_futures=True)
+
+    async def close(self) -> None:
+        """Shut the pool down and remove the spool directory."""
+        await self._discard_pool()
+        if self._spool_dir is not None:
+            shutil.rmtree(self._spool_dir, ignore_errors=True)
+            self._spool_dir = None
+
+    async def __aenter__(self) -> "PDFRenderingService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def render_invoices(
+        self,
+        invoices: list[Invoice],
+        customer_data_map: dict[str, dict[str, Any]],
+        tenant_id: str,
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> list[PDFRenderResult]:
+        """Render one PDF per invoice into storage."""
+        jobs = [
+            (
+                invoice.invoice_number,
+                INVOICE,
+                [(invoice, customer_data_map.get(str(invoice.customer_id), {}))],
+                self.invoice_path.format(key=invoice.invoice_number),
+            )
+            for invoice in invoices
+        ]
+        return await self._run(jobs, tenant_id, metadata)
+
+    async def render_receipts(
+        self,
+        receipts: list[Receipt],
+        customer_data_map: dict[str, dict[str, Any]],
+        tenant_id: str,
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> list[PDFRenderResult]:
+        """Render one PDF per receipt into storage."""
+        jobs = [
+            (
+                receipt.receipt_number,
+                RECEIPT,
+                [(receipt, customer_data_map.get(receipt.customer_name, {}))],
+                self.receipt_path.format(key=receipt.receipt_number),
+            )
+            for receipt in receipts
+        ]
+        return await self._run(jobs, tenant_id, metadata)
+
+    async def render_merged_invoices(
+        self,
+        invoices_by_reseller: dict[str, list[Invoice]],
+        customer_data_map: dict[str, dict[str, Any]],
+        tenant_id: str,
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> list[PDFRenderResult]:
+        """Render one combined PDF per reseller, one invoice after another."""
+        jobs = [
+            (
+                str(reseller_id),
+                MERGED_INVOICES,
+                [
+                    (invoice, customer_data_map.get(str(invoice.customer_id), {}))
+                    for invoice in invoices
+                ],
+                self.merged_path.format(key=reseller_id),
+            )
+            for reseller_id, invoices in invoices_by_reseller.items()
+            if invoices
+        ]
+        return await self._run(jobs, tenant_id, metadata)
+
+    async def _run(
+        self,
+        jobs: list[tuple[str, str, list[tuple[Any, dict[str, Any]]], str]],
+        tenant_id: str,
+        metadata: Optional[dict[str, Any]],
+    ) -> list[PDFRenderResult]:
+        """
+        Render and store jobs with at most max_pending in flight.
+
+        A worker that dies (segfault, OOM kill) breaks the whole pool and
+        fails every job queued on it. The pool is then replaced and those
+        jobs are retried once before being reported as failed.
+        """
+        semaphore = asyncio.Semaphore(self.max_pending)
+
+        async def run_job(job) -> Optional[PDFRenderResult]:
+            async with semaphore:
+                try:
+                    result = await self._render_and_store(*job, tenant_id, metadata)
+                except BrokenProcessPool:
+                    return None
+            self.stats.record(result)
+            return result
+
+        await self.start()
+        results = await asyncio.gather(*(run_job(job) for job in jobs))
+
+        broken = [i for i, result in enumerate(results) if result is None]
+        if broken:
+            logger.warning(
+                f"PDF rendering pool broke, retrying {len(broken)} jobs on a new pool"
+            )
+            await self._discard_pool()
+            await self.start()
+            retried = await asyncio.gather(*(run_job(jobs[i]) for i in broken))
+            for i, result in zip(broken, retried):
+                results[i] = result
+
+        broken = [i for i, result in enumerate(results) if result is None]
+        if broken:
+            logger.error(f"PDF rendering pool broke again, failing {len(broken)} jobs")
+            await self._discard_pool()
+            for i in broken:
+                key, kind = jobs[i][:2]
+                results[i] = PDFRenderResult(
+                    key=key, kind=kind, error="PDF rendering pool broke"
+                )
+                self.stats.record(results[i])
+        return results
+
+    async def _render_and_store(
+        self,
+        key: str,
+        kind: str,
+        documents: list[tuple[Any, dict[str, Any]]],
+        storage_path: str,
+        tenant_id: str,
+        metadata: Optional[dict[str, Any]],
+    ) -> PDFRenderResult:
+        """Render one job on the pool, then stream its spool file to storage."""
+        result = PDFRenderResult(key=key, kind=kind)
+        spool_path = None
+        try:
+            snapshot = _snapshot_receipt if kind == RECEIPT else _snapshot_invoice
+            documents = [(snapshot(source), data) for source, data in documents]
+            (
+                spool_path,
+                result.size,
+                result.render_seconds,
+            ) = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _render_job, kind, documents, self._spool_dir
+            )
+
+            started = time.perf_counter()
+            document_metadata = {
+                **(metadata or {}),
+                "document_type": kind,
+                "document_key": key,
+                "document_count": len(documents),
+            }
+            with open(spool_path, "rb") as content:
+                result.storage_path = await self.storage.save_file(
+                    storage_path, content, tenant_id, document_metadata
+                )
+            result.store_seconds = time.perf_counter() - started
+            logger.info(
+                f"Rendered {kind} PDF {key} ({result.size} bytes) "
+                f"in {result.render_seconds:.3f}s"
+            )
+        except BrokenProcessPool:
+            raise
+        except Exception as e:
+            result.error = str(e) or type(e).__name__
+            logger.error(f"Failed to render {kind} PDF {key}: {e}")
+        finally:
+            if spool_path is not None:
+                try:
+                    os.unlink(spool_path)
+                except FileNotFoundError:
+                    pass
+        return result
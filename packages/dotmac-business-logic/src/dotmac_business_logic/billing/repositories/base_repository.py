@@ -104,6 +104,41 @@ class BaseBillingRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaTyp
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_many(
+        self,
+        ids: list[UUID],
+        tenant_id: Optional[UUID] = None,
+        load_relationships: Optional[list[str]] = None,
+    ) -> list[ModelType]:
+        """
+        Get records by ID in a single IN (...) query.
+
+        Args:
+            ids: Record IDs
+            tenant_id: Tenant ID for filtering
+            load_relationships: List of relationships to eager load
+
+        Returns:
+            Model instances found, in no particular order
+        """
+        if not ids:
+            return []
+
+        query = select(self.model).where(self.model.id.in_(ids))
+
+        if tenant_id is not None:
+            query = query.where(self.model.tenant_id == tenant_id)
+
+        if load_relationships:
+            for relationship in load_relationships:
+                if hasattr(self.model, relationship):
+                    query = query.options(
+                        selectinload(getattr(self.model, relationship))
+                    )
+
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
     async def get_multi(
         self,
         *,
@@ -5,11 +5,13 @@ These repositories implement the protocol interfaces and provide
 specialized query methods for each billing entity type.
 """
 
+from collections import defaultdict
 from datetime import date, datetime, timezone
-from typing import Optional
+from decimal import Decimal
+from typing import Any, Optional
 from uuid import UUID
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, func, insert, inspect, select, update
 from sqlalchemy.orm import selectinload
 
 from ..core.models import (
@@ -213,6 +215,84 @@ class SubscriptionRepository(
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_due_for_billing_keys(
+        self, billing_date: date, tenant_id: Optional[UUID] = None
+    ) -> list[tuple[Optional[UUID], UUID]]:
+        """Get (tenant_id, id) of subscriptions due for billing, ordered by both."""
+        query = (
+            select(self.model.tenant_id, self.model.id)
+            .where(
+                and_(
+                    self.model.status == SubscriptionStatus.ACTIVE,
+                    self.model.next_billing_date <= billing_date,
+                )
+            )
+            .order_by(self.model.tenant_id, self.model.id)
+        )
+
+        if tenant_id is not None:
+            query = query.where(self.model.tenant_id == tenant_id)
+
+        result = await self.db.execute(query)
+        return [(row.tenant_id, row.id) for row in result]
+
+    async def lock_due_for_billing(
+        self,
+        ids: list[UUID],
+        billing_date: date,
+        tenant_id: Optional[UUID] = None,
+    ) -> list[Subscription]:
+        """
+        Lock the given subscriptions that are still due for billing.
+
+        Rows another transaction holds are skipped (FOR UPDATE SKIP LOCKED),
+        so concurrent billing runs never bill the same subscription twice.
+        """
+        if not ids:
+            return []
+
+        query = (
+            select(self.model)
+            .where(
+                and_(
+                    self.model.id.in_(ids),
+                    self.model.status == SubscriptionStatus.ACTIVE,
+                    self.model.next_billing_date <= billing_date,
+                )
+            )
+            .with_for_update(skip_locked=True)
+        )
+
+        if tenant_id is not None:
+            query = query.where(self.model.tenant_id == tenant_id)
+
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
+    async def bulk_update_next_billing_date(
+        self, next_billing_dates: dict[UUID, date]
+    ) -> int:
+        """
+        Set next_billing_date for many subscriptions.
+
+        Issues one UPDATE ... WHERE id IN (...) per distinct date and leaves
+        committing to the caller.
+        """
+        ids_by_date: dict[date, list[UUID]] = defaultdict(list)
+        for subscription_id, next_date in next_billing_dates.items():
+            ids_by_date[next_date].append(subscription_id)
+
+        updated = 0
+        for next_date, subscription_ids in ids_by_date.items():
+            result = await self.db.execute(
+                update(self.model)
+                .where(self.model.id.in_(subscription_ids))
+                .values(next_billing_date=next_date)
+                .execution_options(synchronize_session=False)
+            )
+            updated += result.rowcount
+        return updated
+
     async def get_expiring_subscriptions(
         self, days_ahead: int = 30, tenant_id: Optional[UUID] = None
     ) -> list[Subscription]:
@@ -312,6 +392,25 @@ class InvoiceRepository(BaseBillingRepository[Invoice, InvoiceCreate, None]):
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def bulk_create_with_line_items(
+        self, invoices: list[dict[str, Any]], line_items: list[dict[str, Any]]
+    ) -> int:
+        """
+        Insert invoice and line item rows with one executemany INSERT each.
+
+        Rows must carry their own primary keys so line items can reference
+        invoices without a RETURNING round trip. Committing is left to the
+        caller.
+        """
+        if not invoices:
+            return 0
+
+        await self.db.execute(insert(self.model), invoices)
+        if line_items:
+            line_item_model = inspect(self.model).relationships["line_items"].mapper.class_
+            await self.db.execute(insert(line_item_model), line_items)
+        return len(invoices)
+
     async def get_revenue_by_period(
         self, start_date: date, end_date: date, tenant_id: Optional[UUID] = None
     ) -> list[dict]:
@@ -460,6 +559,78 @@ class UsageRepository(BaseBillingRepository[UsageRecord, UsageRecordCreate, None
             "total_amount": row.total_amount or 0,
         }
 
+    async def get_usage_totals(
+        self, subscription_ids: list[UUID], start_date: date, end_date: date
+    ) -> dict[UUID, Decimal]:
+        """Get summed usage quantity per subscription in one GROUP BY query."""
+        if not subscription_ids:
+            return {}
+
+        query = (
+            select(
+                self.model.subscription_id,
+                func.sum(self.model.quantity).label("total_usage"),
+            )
+            .where(
+                and_(
+                    self.model.subscription_id.in_(subscription_ids),
+                    self.model.usage_date >= start_date,
+                    self.model.usage_date <= end_date,
+                )
+            )
+            .group_by(self.model.subscription_id)
+        )
+
+        result = await self.db.execute(query)
+        return {row.subscription_id: row.total_usage or Decimal("0") for row in result}
+
+    async def get_usage_metric_totals(
+        self, subscription_ids: list[UUID], start_date: date, end_date: date
+    ) -> list[dict]:
+        """
+        Aggregate usage per subscription and metric in one GROUP BY query.
+
+        Rows carry the UsageTotal fields, so ``UsageTotal(**row)`` feeds them
+        to UsageRatingEngine.rate_cohort.
+        """
+        if not subscription_ids:
+            return []
+
+        metric_name = func.coalesce(self.model.meter_type, self.model.service_identifier)
+        query = (
+            select(
+                self.model.subscription_id,
+                metric_name.label("metric_name"),
+                func.min(self.model.unit).label("unit"),
+                func.sum(self.model.quantity).label("quantity"),
+                func.max(func.coalesce(self.model.peak_usage, self.model.quantity)).label(
+                    "peak_usage"
+                ),
+                func.count(self.model.id).label("records_count"),
+            )
+            .where(
+                and_(
+                    self.model.subscription_id.in_(subscription_ids),
+                    self.model.usage_date >= start_date,
+                    self.model.usage_date <= end_date,
+                )
+            )
+            .group_by(self.model.subscription_id, metric_name)
+        )
+
+        result = await self.db.execute(query)
+        return [
+            {
+                "subscription_id": row.subscription_id,
+                "metric_name": row.metric_name,
+                "unit": row.unit or "units",
+                "quantity": row.quantity or Decimal("0"),
+                "peak_usage": row.peak_usage,
+                "records_count": row.records_count,
+            }
+            for row in result
+        ]
+
     async def bulk_mark_processed(self, usage_ids: list[UUID]) -> int:
         """Mark multiple usage records as processed."""
         if not usage_ids:
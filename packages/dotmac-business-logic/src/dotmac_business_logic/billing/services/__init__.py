@@ -1,8 +1,15 @@
 """Billing services for the DotMac Billing Package."""
 
+from .billing_run import (
+    BillingRunChunk,
+    BillingRunEngine,
+    InMemoryBillingRunCheckpointStore,
+)
 from .billing_service import BillingService
 from .protocols import (
     BillingAnalyticsProtocol,
+    BillingRunCheckpointStoreProtocol,
+    BillingRunSessionProtocol,
     BillingServiceProtocol,
     InvoiceServiceProtocol,
     NotificationServiceProtocol,
@@ -16,12 +23,17 @@ from .protocols import (
 __all__ = [
     # Concrete services
     "BillingService",
+    "BillingRunEngine",
+    "BillingRunChunk",
+    "InMemoryBillingRunCheckpointStore",
     # Service protocols
     "BillingServiceProtocol",
     "InvoiceServiceProtocol",
     "PaymentServiceProtocol",
     "SubscriptionServiceProtocol",
     "BillingAnalyticsProtocol",
+    "BillingRunSessionProtocol",
+    "BillingRunCheckpointStoreProtocol",
     # External service protocols
     "PaymentGatewayProtocol",
     "NotificationServiceProtocol",
@@ -0,0 +1,445 @@
+"""
+Partitioned billing-run engine.
+
+Bills every subscription due on a billing date in chunks instead of one
+``generate_invoice`` call per subscription. Due subscriptions are partitioned
+by tenant and ID range; for each chunk the engine prefetches subscriptions,
+plans, customers and usage totals with a handful of set-based queries,
+computes invoices in memory and writes invoices plus line items with one
+executemany INSERT each. Every chunk commits on its own session, chunks run on
+a bounded worker pool, and completed chunks are checkpointed so an interrupted
+run can be resumed with the same ``run_id``.
+"""
+
+import asyncio
+import copy
+from collections import defaultdict
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Optional
+from uuid import UUID, uuid4
+
+from .billing_service import BillingService
+from .protocols import (
+    BillingRunCheckpointStoreProtocol,
+    BillingRunSessionProtocol,
+    TaxCalculationServiceProtocol,
+)
+
+BillingRunSessionFactory = Callable[[], AbstractAsyncContextManager[BillingRunSessionProtocol]]
+
+
+@dataclass(frozen=True)
+class BillingRunChunk:
+    """A tenant-scoped, ID-ordered slice of due subscriptions."""
+
+    tenant_id: Optional[UUID]
+    subscription_ids: tuple[UUID, ...]
+
+    @property
+    def first_id(self) -> UUID:
+        return self.subscription_ids[0]
+
+    @property
+    def last_id(self) -> UUID:
+        return self.subscription_ids[-1]
+
+
+class InMemoryBillingRunCheckpointStore:
+    """Process-local checkpoint store, suitable for tests and single-node runs."""
+
+    def __init__(self):
+        self._checkpoints: dict[str, dict[str, Any]] = {}
+
+    async def load(self, run_id: str) -> Optional[dict[str, Any]]:
+        checkpoint = self._checkpoints.get(run_id)
+        return copy.deepcopy(checkpoint)
+
+    async def save(self, run_id: str, checkpoint: dict[str, Any]) -> None:
+        self._checkpoints[run_id] = copy.deepcopy(checkpoint)
+
+
+class BillingRunEngine:
+    """Chunked, concurrent implementation of a billing cycle."""
+
+    def __init__(
+        self,
+        session_factory: BillingRunSessionFactory,
+        *,
+        chunk_size: int = 1000,
+        max_workers: int = 4,
+        checkpoint_store: Optional[BillingRunCheckpointStoreProtocol] = None,
+        tax_service: Optional[TaxCalculationServiceProtocol] = None,
+        default_tenant_id: Optional[UUID] = None,
+        invoice_due_days: int = 30,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            session_factory: Returns an async context manager yielding a fresh
+                session and repositories; each chunk gets its own
+            chunk_size: Maximum subscriptions billed per chunk (and per commit)
+            max_workers: Maximum chunks processed concurrently
+            checkpoint_store: Where completed chunks are recorded for resumption
+            tax_service: Optional tax calculation service
+            default_tenant_id: Tenant written on rows whose subscription has none
+            invoice_due_days: Days between invoice date and due date
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.checkpoint_store = checkpoint_store or InMemoryBillingRunCheckpointStore()
+        self.tax_service = tax_service
+        self.default_tenant_id = default_tenant_id
+        self.invoice_due_days = invoice_due_days
+
+    @classmethod
+    def for_service(cls, service: BillingService, **kwargs) -> "BillingRunEngine":
+        """
+        Build an engine that reuses a BillingService's session and repositories.
+
+        A single session cannot be shared between concurrent chunks, so the
+        engine runs with one worker; chunks still commit individually.
+        """
+
+        @asynccontextmanager
+        async def shared_session():
+            yield service
+
+        kwargs["max_workers"] = 1
+        kwargs.setdefault("tax_service", service.tax_service)
+        kwargs.setdefault("default_tenant_id", service.default_tenant_id)
+        return cls(shared_session, **kwargs)
+
+    async def run(
+        self,
+        billing_date: Optional[date] = None,
+        tenant_id: Optional[UUID] = None,
+        run_id: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """
+        Bill all subscriptions due on ``billing_date``.
+
+        Passing the ``run_id`` of an interrupted run skips the chunks it
+        already committed; counts and totals then cover both attempts.
+        """
+        if billing_date is None:
+            billing_date = date.today()
+        if run_id is None:
+            run_id = f"billing-run-{billing_date.isoformat()}-{uuid4().hex[:8]}"
+
+        checkpoint = await self.checkpoint_store.load(run_id)
+        if checkpoint is None or checkpoint.get("billing_date") != billing_date.isoformat():
+            checkpoint = {
+                "billing_date": billing_date.isoformat(),
+                "completed_ranges": [],
+                "processed_count": 0,
+                "total_amount": "0",
+            }
+
+        chunks = await self.plan_chunks(billing_date, tenant_id, checkpoint)
+
+        results = {
+            "run_id": run_id,
+            "processed_count": checkpoint["processed_count"],
+            "failed_count": 0,
+            "total_amount": Decimal(checkpoint["total_amount"]),
+            "chunk_count": len(chunks),
+            "failed_chunks": 0,
+            "errors": [],
+        }
+        lock = asyncio.Lock()
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def worker(chunk: BillingRunChunk) -> None:
+            async with semaphore:
+                try:
+                    processed, amount, failures = await self._bill_chunk(
+                        chunk, billing_date
+                    )
+                except Exception as e:
+                    async with lock:
+                        results["failed_count"] += len(chunk.subscription_ids)
+                        results["failed_chunks"] += 1
+                        results["errors"].append(
+                            {
+                                "tenant_id": chunk.tenant_id,
+                                "first_id": chunk.first_id,
+                                "last_id": chunk.last_id,
+                                "error": str(e),
+                            }
+                        )
+                    return
+
+            async with lock:
+                results["processed_count"] += processed
+                results["total_amount"] += amount
+                results["failed_count"] += len(failures)
+                results["errors"].extend(failures)
+                checkpoint["completed_ranges"].append(
+                    [
+                        str(chunk.tenant_id) if chunk.tenant_id else None,
+                        str(chunk.first_id),
+                        str(chunk.last_id),
+                    ]
+                )
+                checkpoint["processed_count"] = results["processed_count"]
+                checkpoint["total_amount"] = str(results["total_amount"])
+                await self.checkpoint_store.save(run_id, checkpoint)
+
+        await asyncio.gather(*(worker(chunk) for chunk in chunks))
+        return results
+
+    async def plan_chunks(
+        self,
+        billing_date: date,
+        tenant_id: Optional[UUID] = None,
+        checkpoint: Optional[dict[str, Any]] = None,
+    ) -> list[BillingRunChunk]:
+        """Partition due subscriptions by tenant and ID range."""
+        async with self.session_factory() as session:
+            keys = await session.subscription_repo.get_due_for_billing_keys(
+                billing_date, tenant_id
+            )
+
+        completed: dict[Optional[str], list[tuple[UUID, UUID]]] = defaultdict(list)
+        for range_tenant, first_id, last_id in (checkpoint or {}).get("completed_ranges", []):
+            completed[range_tenant].append((UUID(first_id), UUID(last_id)))
+
+        ids_by_tenant: dict[Optional[UUID], list[UUID]] = defaultdict(list)
+        for key_tenant, subscription_id in keys:
+            done = completed.get(str(key_tenant) if key_tenant else None, ())
+            if any(first <= subscription_id <= last for first, last in done):
+                continue
+            ids_by_tenant[key_tenant].append(subscription_id)
+
+        chunks = []
+        for key_tenant, subscription_ids in ids_by_tenant.items():
+            subscription_ids.sort()
+            for start in range(0, len(subscription_ids), self.chunk_size):
+                chunks.append(
+                    BillingRunChunk(
+                        key_tenant,
+                        tuple(subscription_ids[start : start + self.chunk_size]),
+                    )
+                )
+        return chunks
+
+    async def _bill_chunk(
+        self, chunk: BillingRunChunk, billing_date: date
+    ) -> tuple[int, Decimal, list[dict[str, Any]]]:
+        """Bill one chunk inside its own transaction."""
+        async with self.session_factory() as session:
+            try:
+                result = await self._write_chunk(session, chunk, billing_date)
+                await session.db.commit()
+            except Exception:
+                await session.db.rollback()
+                raise
+        return result
+
+    async def _write_chunk(
+        self,
+        session: BillingRunSessionProtocol,
+        chunk: BillingRunChunk,
+        billing_date: date,
+    ) -> tuple[int, Decimal, list[dict[str, Any]]]:
+        """
+        Bill a chunk's subscriptions; return (processed, total, failures).
+
+        A subscription that cannot be invoiced is reported in the failures
+        and skipped without affecting the rest of the chunk.
+        """
+        # Re-check and lock under this transaction: another run may have
+        # billed these subscriptions or be billing them right now.
+        subscriptions = await session.subscription_repo.lock_due_for_billing(
+            list(chunk.subscription_ids), billing_date, chunk.tenant_id
+        )
+        if not subscriptions:
+            return 0, Decimal("0"), []
+
+        # Plans may be shared by every tenant, so they are not fetched by
+        # tenant; a plan owned by another tenant is rejected below.
+        plans = {
+            plan.id: plan
+            for plan in await session.plan_repo.get_many(
+                list({s.billing_plan_id for s in subscriptions})
+            )
+            if getattr(plan, "tenant_id", None) in (None, chunk.tenant_id)
+        }
+        customers = {
+            customer.id: customer
+            for customer in await session.customer_repo.get_many(
+                list({s.customer_id for s in subscriptions}), chunk.tenant_id
+            )
+        }
+
+        # Subscriptions on the same cycle share a period start, so this is
+        # usually one GROUP BY query per chunk.
+        by_period_start: dict[date, list[UUID]] = defaultdict(list)
+        for subscription in subscriptions:
+            by_period_start[self._period_start(subscription, billing_date)].append(
+                subscription.id
+            )
+        usage_totals: dict[UUID, Decimal] = {}
+        for period_start, subscription_ids in by_period_start.items():
+            usage_totals.update(
+                await session.usage_repo.get_usage_totals(
+                    subscription_ids, period_start, billing_date
+                )
+            )
+
+        invoices: list[dict[str, Any]] = []
+        line_items: list[dict[str, Any]] = []
+        next_billing_dates: dict[UUID, date] = {}
+        failures: list[dict[str, Any]] = []
+        # Every subscription is billed on billing_date, so the next date only
+        # depends on the plan's cycle.
+        next_date_by_cycle: dict[Any, date] = {}
+        total_amount = Decimal("0")
+
+        for subscription in subscriptions:
+            plan = plans.get(subscription.billing_plan_id)
+            customer = customers.get(subscription.customer_id)
+            try:
+                if plan is None:
+                    raise ValueError(
+                        f"Billing plan {subscription.billing_plan_id} not found"
+                    )
+                if customer is None:
+                    raise ValueError(f"Customer {subscription.customer_id} not found")
+                invoice, invoice_lines = await self._build_invoice(
+                    subscription,
+                    plan,
+                    customer,
+                    billing_date,
+                    usage_totals.get(subscription.id, Decimal("0")),
+                    chunk.tenant_id or self.default_tenant_id,
+                )
+            except Exception as e:
+                failures.append(
+                    {
+                        "tenant_id": chunk.tenant_id,
+                        "subscription_id": subscription.id,
+                        "error": str(e),
+                    }
+                )
+                continue
+
+            invoices.append(invoice)
+            line_items.extend(invoice_lines)
+            if plan.billing_cycle not in next_date_by_cycle:
+                next_date_by_cycle[plan.billing_cycle] = (
+                    BillingService._calculate_next_billing_date(billing_date, plan.billing_cycle)
+                )
+            next_billing_dates[subscription.id] = next_date_by_cycle[plan.billing_cycle]
+            total_amount += invoice["total_amount"]
+
+        if invoices:
+            await session.invoice_repo.bulk_create_with_line_items(invoices, line_items)
+            await session.subscription_repo.bulk_update_next_billing_date(
+                next_billing_dates
+            )
+        return len(invoices), total_amount, failures
+
+    @staticmethod
+    def _period_start(subscription: Any, billing_date: date) -> date:
+        period_start = subscription.next_billing_date
+        # If this is the first billing, use start date
+        if period_start > billing_date:
+            period_start = subscription.start_date
+        return period_start
+
+    async def _build_invoice(
+        self,
+        subscription: Any,
+        plan: Any,
+        customer: Any,
+        billing_date: date,
+        total_usage: Decimal,
+        tenant_id: Optional[UUID],
+    ) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        """Compute one invoice and its line items as insertable rows."""
+        period_start = self._period_start(subscription, billing_date)
+        period_end = billing_date
+
+        included_usage = plan.included_usage or Decimal("0")
+        overage_usage = max(Decimal("0"), total_usage - included_usage)
+        base_amount = subscription.custom_price or plan.base_price
+        usage_amount = overage_usage * (plan.overage_price or Decimal("0"))
+
+        invoice_id = uuid4()
+        invoice = {
+            "id": invoice_id,
+            "invoice_number": f"INV-{uuid4().hex[:8].upper()}",
+            "customer_id": subscription.customer_id,
+            "subscription_id": subscription.id,
+            "invoice_date": period_end,
+            "due_date": period_end + timedelta(days=self.invoice_due_days),
+            "service_period_start": period_start,
+            "service_period_end": period_end,
+            "currency": plan.currency,
+            "subtotal": base_amount + usage_amount,
+            "tenant_id": tenant_id,
+        }
+
+        line_items = []
+        if base_amount > 0:
+            line_items.append(
+                {
+                    "description": f"{plan.name} - {period_start} to {period_end}",
+                    "quantity": subscription.quantity,
+                    "unit_price": plan.base_price,
+                    "line_total": base_amount,
+                }
+            )
+        if usage_amount > 0:
+            line_items.append(
+                {
+                    "description": f"Usage charges - {overage_usage} {plan.usage_unit}",
+                    "quantity": overage_usage,
+                    "unit_price": plan.overage_price or Decimal("0"),
+                    "line_total": usage_amount,
+                }
+            )
+
+        total_tax_amount = Decimal("0")
+        taxable = getattr(plan, "taxable", True)
+        for line_item in line_items:
+            line_item.update(
+                id=uuid4(),
+                invoice_id=invoice_id,
+                taxable=taxable,
+                tax_amount=Decimal("0"),
+                service_period_start=period_start,
+                service_period_end=period_end,
+                tenant_id=tenant_id,
+            )
+            if self.tax_service and taxable:
+                tax_result = await self.tax_service.calculate_tax(
+                    line_item["line_total"], customer
+                )
+                line_item["tax_amount"] = Decimal(str(tax_result.get("amount", 0))).quantize(
+                    Decimal("0.01")
+                )
+                total_tax_amount += line_item["tax_amount"]
+
+                # Set tax type and rate on invoice from first taxable line
+                if "tax_type" not in invoice:
+                    invoice["tax_type"] = tax_result.get("tax_type", "none")
+                    invoice["tax_rate"] = Decimal(str(tax_result.get("rate", 0)))
+
+        invoice["tax_amount"] = total_tax_amount.quantize(Decimal("0.01"))
+        invoice["total_amount"] = (invoice["subtotal"] + invoice["tax_amount"]).quantize(
+            Decimal("0.01")
+        )
+        invoice["amount_due"] = invoice["total_amount"]
+        return invoice, line_items
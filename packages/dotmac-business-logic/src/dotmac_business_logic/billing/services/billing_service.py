@@ -42,6 +42,8 @@ if TYPE_CHECKING:
 
     class UsageRecord:
         pass
+
+    from .billing_run import BillingRunEngine
 else:
     # Runtime type aliases - use Any for runtime
     Invoice = Any
@@ -87,6 +89,7 @@ class BillingService:
         tax_service: Optional[TaxCalculationServiceProtocol] = None,
         pdf_generator: Optional[PdfGeneratorProtocol] = None,
         default_tenant_id: Optional[UUID] = None,
+        billing_run_engine: Optional["BillingRunEngine"] = None,
     ):
         """Initialize billing service with dependencies."""
         self.db = db
@@ -101,6 +104,7 @@ class BillingService:
         self.tax_service = tax_service
         self.pdf_generator = pdf_generator
         self.default_tenant_id = default_tenant_id
+        self.billing_run_engine = billing_run_engine
 
     async def create_subscription(
         self,
@@ -429,11 +433,20 @@ class BillingService:
     async def run_billing_cycle(
         self, billing_date: Optional[date] = None, tenant_id: Optional[UUID] = None
     ) -> dict[str, Any]:
-        """Run billing cycle for due subscriptions."""
+        """
+        Run billing cycle for due subscriptions.
+
+        When a billing_run_engine is configured the cycle is delegated to it
+        (chunked, set-based and resumable); otherwise each subscription is
+        invoiced through generate_invoice in a single transaction.
+        """
 
         if billing_date is None:
             billing_date = date.today()
 
+        if self.billing_run_engine is not None:
+            return await self.billing_run_engine.run(billing_date, tenant_id=tenant_id)
+
         # Get subscriptions due for billing
         due_subscriptions = await self.subscription_repo.get_due_for_billing(
             billing_date
@@ -470,8 +483,9 @@ class BillingService:
         await self.db.commit()
         return results
 
+    @staticmethod
     def _calculate_next_billing_date(
-        self, current_date: date, billing_cycle: BillingCycle
+        current_date: date, billing_cycle: BillingCycle
     ) -> date:
         """Calculate the next billing date based on cycle."""
 
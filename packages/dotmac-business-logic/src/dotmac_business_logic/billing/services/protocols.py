@@ -88,8 +88,8 @@ class DatabaseSessionProtocol(Protocol):
         """Add multiple instances to the session."""
         ...
 
-    async def execute(self, statement: Any) -> Any:
-        """Execute a statement and return results."""
+    async def execute(self, statement: Any, parameters: Any = None) -> Any:
+        """Execute a statement (executemany when parameters is a list)."""
         ...
 
     async def delete(self, instance: Any) -> None:
@@ -112,6 +112,10 @@ class BaseRepositoryProtocol(Protocol, Generic[T, CreateSchemaType, UpdateSchema
         """Get multiple records with pagination and filters."""
         ...
 
+    async def get_many(self, ids: list[UUID], tenant_id: Optional[UUID] = None) -> list[T]:
+        """Get records by ID in one query."""
+        ...
+
     async def update(self, db_obj: T, obj_in: UpdateSchemaType) -> T:
         """Update a record."""
         ...
@@ -201,6 +205,27 @@ class SubscriptionRepositoryProtocol(
         """Get subscription by subscription number."""
         ...
 
+    async def get_due_for_billing_keys(
+        self, billing_date: date, tenant_id: Optional[UUID] = None
+    ) -> list[tuple[Optional[UUID], UUID]]:
+        """Get (tenant_id, id) of subscriptions due on a date, ordered by both."""
+        ...
+
+    async def lock_due_for_billing(
+        self,
+        ids: list[UUID],
+        billing_date: date,
+        tenant_id: Optional[UUID] = None,
+    ) -> list[Subscription]:
+        """Lock the given subscriptions still due on a date, skipping locked rows."""
+        ...
+
+    async def bulk_update_next_billing_date(
+        self, next_billing_dates: dict[UUID, date]
+    ) -> int:
+        """Set next_billing_date for many subscriptions without committing."""
+        ...
+
 
 class InvoiceRepositoryProtocol(
     BaseRepositoryProtocol[Invoice, InvoiceCreate, Any], Protocol
@@ -233,6 +258,12 @@ class InvoiceRepositoryProtocol(
         """Get invoice by invoice number."""
         ...
 
+    async def bulk_create_with_line_items(
+        self, invoices: list[dict[str, Any]], line_items: list[dict[str, Any]]
+    ) -> int:
+        """Insert invoice and line item rows set-based without committing."""
+        ...
+
 
 class PaymentRepositoryProtocol(
     BaseRepositoryProtocol[Payment, PaymentCreate, Any], Protocol
@@ -274,6 +305,41 @@ class UsageRepositoryProtocol(
         """Get unprocessed usage records."""
         ...
 
+    async def get_usage_totals(
+        self, subscription_ids: list[UUID], start_date: date, end_date: date
+    ) -> dict[UUID, Decimal]:
+        """Get summed usage quantity per subscription within a date range."""
+        ...
+
+    async def get_usage_metric_totals(
+        self, subscription_ids: list[UUID], start_date: date, end_date: date
+    ) -> list[dict[str, Any]]:
+        """Get usage aggregated per subscription and metric within a date range."""
+        ...
+
+
+class BillingRunSessionProtocol(Protocol):
+    """Database session and repositories used for one billing-run chunk."""
+
+    db: DatabaseSessionProtocol
+    customer_repo: CustomerRepositoryProtocol
+    plan_repo: BillingPlanRepositoryProtocol
+    subscription_repo: SubscriptionRepositoryProtocol
+    invoice_repo: InvoiceRepositoryProtocol
+    usage_repo: UsageRepositoryProtocol
+
+
+class BillingRunCheckpointStoreProtocol(Protocol):
+    """Protocol for persisting billing-run progress between attempts."""
+
+    async def load(self, run_id: str) -> Optional[dict[str, Any]]:
+        """Load the checkpoint for a run, if any."""
+        ...
+
+    async def save(self, run_id: str, checkpoint: dict[str, Any]) -> None:
+        """Persist the checkpoint for a run."""
+        ...
+
 
 class PaymentGatewayProtocol(Protocol):
     """Protocol for payment gateway integrations."""
@@ -5,11 +5,13 @@ This module handles usage aggregation, proration, and billing period calculation
 """
 
 from .periods import BillingPeriodCalculator, TrialHandler
-from .rating import UsageAggregator, UsageRatingEngine
+from .rating import CompiledTariff, UsageAggregator, UsageRatingEngine, UsageTotal
 
 __all__ = [
     "BillingPeriodCalculator",
     "TrialHandler",
     "UsageAggregator",
     "UsageRatingEngine",
+    "UsageTotal",
+    "CompiledTariff",
 ]
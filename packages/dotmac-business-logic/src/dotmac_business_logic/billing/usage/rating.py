@@ -5,12 +5,156 @@ This module handles usage metering, aggregation, and conversion
 to billable line items with tiered pricing support.
 """
 
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
 from decimal import Decimal
 from typing import Any, Optional
 from uuid import UUID
 
 from ..core.models import BillingPeriodValue, UsageMetric
 
+# Fixed-point scale for usage quantities; matches the Numeric(15, 6) usage
+# columns, so summed quantities always fit exactly.
+QUANTITY_SCALE = 6
+
+
+def _decimal_places(value: Decimal) -> int:
+    return max(0, -value.as_tuple().exponent)
+
+
+def _to_fixed(value: Decimal, scale: int) -> int:
+    """Convert a Decimal to an integer count of 10**-scale units, exactly."""
+    scaled = value.scaleb(scale)
+    fixed = int(scaled)
+    if fixed != scaled:
+        raise ValueError(f"{value} has more than {scale} decimal places")
+    return fixed
+
+
+@dataclass(frozen=True)
+class UsageTotal:
+    """Aggregated usage of one metric for one subscription."""
+
+    subscription_id: UUID
+    metric_name: str
+    quantity: Decimal
+    unit: str = 'units'
+    peak_usage: Optional[Decimal] = None
+    records_count: int = 0
+
+
+class CompiledTariff:
+    """
+    A usage pricing config compiled to fixed-point tier boundary arrays.
+
+    Quantities are integers at ``quantity_scale`` and rates integers at
+    ``rate_scale``, so a charge is an exact integer at the sum of both. For
+    tier j, ``gates[j]`` is the quantity that must be exceeded to reach it,
+    ``starts[j]``/``widths[j]`` the slice of quantity it prices and
+    ``prefix[j]`` the charge of all fully consumed tiers below it. Pricing a
+    quantity is one bisect plus one multiply, and reproduces
+    TieredPricingEngine.calculate_tiered_pricing exactly.
+    """
+
+    __slots__ = (
+        'config', 'tiered', 'quantity_scale', 'rate_scale', 'unit_price',
+        'gates', 'starts', 'widths', 'rates', 'prefix',
+        'discount_thresholds', 'discounts',
+    )
+
+    def __init__(self, pricing_config: dict[str, Any], quantity_scale: int = QUANTITY_SCALE):
+        self.config = pricing_config
+        self.tiered = pricing_config.get('pricing_model') == 'tiered'
+        self.quantity_scale = quantity_scale
+
+        if self.tiered:
+            tiers = sorted(pricing_config.get('tiers', []), key=lambda t: t.get('min_quantity', 0))
+            rates = [Decimal(str(tier.get('unit_price', 0))) for tier in tiers]
+        else:
+            tiers = []
+            rates = [Decimal(str(pricing_config.get('unit_price', 0)))]
+        self.unit_price = rates[0] if not self.tiered else None
+        self.rate_scale = max((_decimal_places(rate) for rate in rates), default=0)
+
+        self.gates: list[int] = []
+        self.starts: list[int] = []
+        self.widths: list[Optional[int]] = []
+        self.rates: list[int] = []
+        self.prefix: list[int] = []
+
+        if not self.tiered:
+            # Flat rate: a single unbounded tier every positive quantity reaches.
+            self.gates.append(-1)
+            self.starts.append(0)
+            self.widths.append(None)
+            self.rates.append(_to_fixed(rates[0], self.rate_scale))
+            self.prefix.append(0)
+        else:
+            start = 0
+            charged = 0
+            for i, (tier, rate) in enumerate(zip(tiers, rates)):
+                tier_min = _to_fixed(Decimal(str(tier.get('min_quantity', 0))), quantity_scale)
+                raw_max = tier.get('max_quantity', float('inf'))
+                if raw_max == float('inf'):
+                    width = None
+                else:
+                    tier_max = _to_fixed(Decimal(str(raw_max)), quantity_scale)
+                    # The first tier is priced from zero up to its maximum.
+                    width = tier_max if i == 0 else tier_max - tier_min
+                    if width < 0:
+                        raise ValueError(f"Tier {i + 1} has max_quantity below min_quantity")
+
+                rate_fixed = _to_fixed(rate, self.rate_scale)
+                self.gates.append(max(tier_min, start))
+                self.starts.append(start)
+                self.widths.append(width)
+                self.rates.append(rate_fixed)
+                self.prefix.append(charged)
+                if width is None:
+                    break  # Tiers above an unbounded tier are never reached.
+                start += width
+                charged += width * rate_fixed
+
+        # Among discounts with the same threshold the first listed wins, as in
+        # calculate_volume_discount.
+        by_threshold: dict[int, dict[str, Any]] = {}
+        for discount in sorted(
+            pricing_config.get('volume_discounts', []),
+            key=lambda d: d.get('min_quantity', 0),
+            reverse=True,
+        ):
+            threshold = _to_fixed(Decimal(str(discount.get('min_quantity', 0))), quantity_scale)
+            by_threshold.setdefault(threshold, discount)
+        self.discount_thresholds = sorted(by_threshold)
+        self.discounts = []
+        for threshold in self.discount_thresholds:
+            discount = by_threshold[threshold]
+            percent = Decimal(str(discount.get('discount_percent', 0)))
+            places = _decimal_places(percent)
+            self.discounts.append((discount, _to_fixed(percent, places), places + 2))
+
+    @property
+    def charge_scale(self) -> int:
+        """Decimal places of the integers returned by charge()."""
+        return self.quantity_scale + self.rate_scale
+
+    def charge(self, quantity: int) -> int:
+        """Charge for a fixed-point quantity, before volume discounts."""
+        j = bisect_left(self.gates, quantity) - 1
+        if j < 0:
+            return 0
+        used = quantity - self.starts[j]
+        width = self.widths[j]
+        if width is not None and used > width:
+            used = width
+        return self.prefix[j] + used * self.rates[j]
+
+    def discount_for(self, quantity: int) -> Optional[tuple[dict[str, Any], int, int]]:
+        """Volume discount applying to a fixed-point quantity, if any."""
+        index = bisect_right(self.discount_thresholds, quantity) - 1
+        return self.discounts[index] if index >= 0 else None
+
 
 class UsageAggregator:
     """Aggregates raw usage data into billing metrics."""
@@ -102,6 +246,42 @@ class UsageAggregator:
 
         return billable_usage
 
+    def aggregate_cohort(self, usage_records: list[Any]) -> list[UsageTotal]:
+        """
+        Aggregate usage records of many subscriptions in one pass.
+
+        In-memory counterpart of UsageRepository.get_usage_metric_totals for
+        records that did not come from SQL; totals follow the same rules as
+        aggregate_usage_for_period.
+        """
+        totals: dict[tuple[UUID, str], list[Any]] = {}
+
+        for record in usage_records:
+            key = (record.subscription_id, record.meter_type or record.service_identifier)
+            quantity = getattr(record, 'quantity', Decimal('0'))
+            peak = getattr(record, 'peak_usage', quantity)
+
+            entry = totals.get(key)
+            if entry is None:
+                totals[key] = [quantity, getattr(record, 'unit', 'units'), peak, 1]
+            else:
+                entry[0] += quantity
+                entry[3] += 1
+                if peak > entry[2]:
+                    entry[2] = peak
+
+        return [
+            UsageTotal(
+                subscription_id=subscription_id,
+                metric_name=metric_name,
+                quantity=quantity,
+                unit=unit,
+                peak_usage=peak,
+                records_count=count,
+            )
+            for (subscription_id, metric_name), (quantity, unit, peak, count) in totals.items()
+        ]
+
     def calculate_average_usage(
         self,
         usage_records: list[Any],
@@ -354,6 +534,135 @@ class UsageRatingEngine:
             }
         }
 
+    def compile_plan_tariffs(self, billing_plan: Any) -> dict[str, CompiledTariff]:
+        """Compile every usage pricing config of a plan, keyed by metric name."""
+        usage_pricing = getattr(billing_plan, 'usage_pricing', {})
+        return {name: CompiledTariff(config) for name, config in usage_pricing.items()}
+
+    def rate_cohort(
+        self,
+        usage_totals: list[UsageTotal],
+        billing_plans: dict[UUID, Any],
+        billing_period: BillingPeriodValue,
+        tariff_cache: Optional[dict[Any, dict[str, CompiledTariff]]] = None,
+    ) -> dict[UUID, list[dict[str, Any]]]:
+        """
+        Rate aggregated usage for a whole cohort of subscriptions.
+
+        Produces the same line items as rate_usage_for_subscription, but each
+        plan's tariffs are compiled once and every quantity priced against
+        the same tariff is rated in one fixed-point integer pass.
+
+        Args:
+            usage_totals: Aggregated usage, e.g. from get_usage_metric_totals
+            billing_plans: Billing plan per subscription ID
+            billing_period: Billing period
+            tariff_cache: Compiled tariffs keyed by plan ID; pass the same dict
+                across cohorts to compile each plan only once per run
+
+        Returns:
+            Billable line items per subscription ID (subscriptions with
+            nothing billable are omitted)
+        """
+        if tariff_cache is None:
+            tariff_cache = {}
+        # Per plan object: (compiled tariffs, allowances), resolved once per call.
+        plan_rating: dict[int, tuple[dict[str, CompiledTariff], dict[str, Any]]] = {}
+
+        # Column pass: bucket overage quantities by the tariff that prices them.
+        columns: dict[int, tuple[CompiledTariff, list[int], list[tuple[UUID, Decimal, str, str]]]] = {}
+        for usage in usage_totals:
+            plan = billing_plans[usage.subscription_id]
+            rating = plan_rating.get(id(plan))
+            if rating is None:
+                plan_key = getattr(plan, 'id', None) or id(plan)
+                tariffs = tariff_cache.get(plan_key)
+                if tariffs is None:
+                    tariffs = tariff_cache[plan_key] = self.compile_plan_tariffs(plan)
+                rating = plan_rating[id(plan)] = (
+                    tariffs, getattr(plan, 'usage_allowances', {})
+                )
+            tariffs, allowances = rating
+
+            overage = usage.quantity - allowances.get(usage.metric_name, Decimal('0'))
+            if overage <= Decimal('0'):
+                continue
+
+            # Allowances rename the metric, and pricing is looked up by that name.
+            name = f"{usage.metric_name}_overage"
+            tariff = tariffs.get(name)
+            if tariff is None:
+                continue
+
+            column = columns.get(id(tariff))
+            if column is None:
+                column = columns[id(tariff)] = (tariff, [], [])
+            column[1].append(_to_fixed(overage, tariff.quantity_scale))
+            column[2].append((usage.subscription_id, overage, name, usage.unit))
+
+        line_items: dict[UUID, list[dict[str, Any]]] = defaultdict(list)
+        for tariff, quantities, rows in columns.values():
+            charges = [tariff.charge(quantity) for quantity in quantities]
+            # A tariff prices a single metric, so its description is shared.
+            _, overage, name, unit = rows[0]
+            description = self._format_usage_description(
+                UsageMetric(name=name, quantity=overage, unit=unit, period=billing_period),
+                tariff.config,
+            )
+            for quantity, charge, (subscription_id, overage, _, unit) in zip(quantities, charges, rows):
+                if not charge:
+                    continue
+                line_item = self._build_cohort_line_item(
+                    tariff, quantity, charge, overage, unit, description, billing_period
+                )
+                if line_item['amount'] > Decimal('0'):
+                    line_items[subscription_id].append(line_item)
+
+        return dict(line_items)
+
+    def _build_cohort_line_item(
+        self,
+        tariff: CompiledTariff,
+        quantity: int,
+        charge: int,
+        overage: Decimal,
+        unit: str,
+        description: str,
+        billing_period: BillingPeriodValue,
+    ) -> dict[str, Any]:
+        base_charge = Decimal(charge).scaleb(-tariff.charge_scale)
+        effective_rate = base_charge / overage if tariff.tiered else tariff.unit_price
+
+        final_charge = base_charge
+        volume_discount = None
+        applicable = tariff.discount_for(quantity)
+        if applicable is not None:
+            discount, percent, percent_scale = applicable
+            discount_amount = Decimal(charge * percent).scaleb(-(tariff.charge_scale + percent_scale))
+            final_charge = base_charge - discount_amount
+            volume_discount = {
+                'discount_name': discount.get('name', 'Volume Discount'),
+                'discount_percent': discount['discount_percent'],
+                'discount_amount': discount_amount,
+                'min_quantity': discount['min_quantity'],
+            }
+
+        return {
+            'description': description,
+            'quantity': overage,
+            'unit': unit,
+            'unit_price': effective_rate,
+            'amount': final_charge,
+            'taxable': tariff.config.get('taxable', True),
+            'usage_period_start': billing_period.start_date,
+            'usage_period_end': billing_period.end_date,
+            'pricing_details': {
+                'base_charge': base_charge,
+                'volume_discount': volume_discount,
+                'final_charge': final_charge,
+            }
+        }
+
     def _get_usage_pricing_config(self, billing_plan: Any, metric_name: str) -> Optional[dict]:
         """Get pricing configuration for a usage metric."""
         usage_pricing = getattr(billing_plan, 'usage_pricing', {})
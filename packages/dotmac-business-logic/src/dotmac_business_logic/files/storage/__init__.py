@@ -2,12 +2,32 @@
 Storage abstraction layer for file management.
 """
 
-from .backends import LocalFileStorage, S3FileStorage, StorageBackend
+from .backends import (
+    ByteRange,
+    LocalFileStorage,
+    MultipartUploadError,
+    RangeNotSatisfiableError,
+    S3FileStorage,
+    StorageBackend,
+    parse_range_header,
+)
 from .tenant_storage import TenantStorageManager
 
+try:
+    from .router import StorageFileResponse, create_file_router
+except ImportError:
+    StorageFileResponse = None
+    create_file_router = None
+
 __all__ = [
     "StorageBackend",
     "LocalFileStorage",
     "S3FileStorage",
     "TenantStorageManager",
+    "ByteRange",
+    "parse_range_header",
+    "RangeNotSatisfiableError",
+    "MultipartUploadError",
+    "StorageFileResponse",
+    "create_file_router",
 ]
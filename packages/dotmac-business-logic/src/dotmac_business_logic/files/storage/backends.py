@@ -6,14 +6,18 @@ AWS S3, and other cloud storage providers with multi-tenant isolation.
 """
 
 import asyncio
+import functools
+import io
 import logging
+import os
 import shutil
 import tempfile
 import uuid
+from collections.abc import AsyncIterable, AsyncIterator
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, BinaryIO, Optional, Protocol
+from typing import Any, BinaryIO, Optional, Protocol, Union
 
 try:
     import boto3
@@ -34,6 +38,116 @@ import aiofiles.os
 
 logger = logging.getLogger(__name__)
 
+# Read/write buffer for streamed transfers; memory use per transfer stays
+# at this size regardless of the file size
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# S3 rejects multipart parts smaller than 5 MiB (except the last one)
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class RangeNotSatisfiableError(Exception):
+    """Requested byte range starts beyond the end of the file."""
+
+    def __init__(self, size: int):
+        super().__init__(f"Range not satisfiable for file of {size} bytes")
+        self.size = size
+
+
+class MultipartUploadError(Exception):
+    """A multipart upload failed; it can be resumed with its upload ID."""
+
+    def __init__(self, s3_key: str, upload_id: str):
+        super().__init__(f"Multipart upload {upload_id} of {s3_key} failed")
+        self.s3_key = s3_key
+        self.upload_id = upload_id
+
+
+@dataclass(frozen=True)
+class ByteRange:
+    """Inclusive byte range within a file, as in an HTTP Range header."""
+
+    start: int
+    end: int
+
+    @property
+    def length(self) -> int:
+        """Number of bytes in the range."""
+        return self.end - self.start + 1
+
+    def content_range(self, size: int) -> str:
+        """Content-Range header value for a file of the given size."""
+        return f"bytes {self.start}-{self.end}/{size}"
+
+
+def parse_range_header(header: Optional[str], size: int) -> Optional[ByteRange]:
+    """
+    Parse a single-range HTTP Range header against a file size.
+
+    Returns None when the header is absent, malformed or lists several
+    ranges, in which case the whole file should be served. Raises
+    RangeNotSatisfiableError when the range starts past the end of the file.
+    """
+    if not header:
+        return None
+
+    unit, _, spec = header.partition("=")
+    first, dash, last = spec.strip().partition("-")
+    if unit.strip().lower() != "bytes" or "," in spec or not dash:
+        return None
+
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+            if last and start > end:
+                return None
+        elif last:
+            # Suffix range: the final N bytes
+            suffix = int(last)
+            if suffix == 0:
+                raise RangeNotSatisfiableError(size)
+            start, end = max(size - suffix, 0), size - 1
+        else:
+            return None
+    except ValueError:
+        return None
+
+    if start < 0 or start >= size:
+        raise RangeNotSatisfiableError(size)
+    return ByteRange(start, min(end, size - 1))
+
+
+async def _iter_content(
+    content: Union[BinaryIO, bytes], chunk_size: int
+) -> AsyncIterator[bytes]:
+    """Read a file-like object (or bytes) in chunks off the event loop."""
+    if not hasattr(content, "read"):
+        for offset in range(0, len(content), chunk_size):
+            yield content[offset : offset + chunk_size]
+        return
+
+    if getattr(content, "seekable", lambda: False)():
+        content.seek(0)
+    loop = asyncio.get_event_loop()
+    while True:
+        chunk = await loop.run_in_executor(None, content.read, chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def _rechunk(chunks: AsyncIterable[bytes], size: int) -> AsyncIterator[bytes]:
+    """Regroup a byte stream into blocks of exactly size bytes (last may be short)."""
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= size:
+            yield bytes(buffer[:size])
+            del buffer[:size]
+    if buffer:
+        yield bytes(buffer)
+
 
 @dataclass
 class FileInfo:
@@ -71,6 +185,26 @@ class StorageBackend(Protocol):
         """Retrieve file with tenant verification."""
         ...
 
+    async def save_stream(
+        self,
+        file_path: str,
+        chunks: AsyncIterable[bytes],
+        tenant_id: str,
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> str:
+        """Save file from an async byte stream without buffering it."""
+        ...
+
+    def iter_file(
+        self,
+        file_path: str,
+        tenant_id: str,
+        byte_range: Optional[ByteRange] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream file content, optionally limited to a byte range."""
+        ...
+
     async def delete_file(self, file_path: str, tenant_id: str) -> bool:
         """Delete file with tenant verification."""
         ...
@@ -107,12 +241,15 @@ class StorageBackend(Protocol):
 class LocalFileStorage:
     """Local filesystem storage backend."""
 
-    def __init__(self, base_path: str | None = None):
+    def __init__(
+        self, base_path: str | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
         """Initialize local file storage."""
         if base_path is None:
             # Use secure temporary directory
             base_path = tempfile.mkdtemp(prefix="dotmac_files_")
         self.base_path = Path(base_path)
+        self.chunk_size = chunk_size
         self.base_path.mkdir(parents=True, exist_ok=True)
         logger.info(f"Local file storage initialized at: {self.base_path}")
 
@@ -145,23 +282,41 @@ class LocalFileStorage:
         metadata: Optional[dict[str, Any]] = None,
     ) -> str:
         """Save file to local filesystem."""
+        return await self.save_stream(
+            file_path, _iter_content(content, self.chunk_size), tenant_id, metadata
+        )
+
+    async def save_stream(
+        self,
+        file_path: str,
+        chunks: AsyncIterable[bytes],
+        tenant_id: str,
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> str:
+        """Save a byte stream to local filesystem one chunk at a time."""
         try:
             full_path = self._get_full_path(file_path, tenant_id)
 
             # Create directory if it doesn't exist
             full_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Save file content
-            async with aiofiles.open(full_path, "wb") as f:
-                if hasattr(content, "read"):
-                    content.seek(0)
-                    while True:
-                        chunk = content.read(8192)
-                        if not chunk:
-                            break
+            # Write to a uniquely named sibling file and swap it in, so readers
+            # never see a partially written file and concurrent saves to the
+            # same path cannot interleave
+            fd, partial_path = tempfile.mkstemp(
+                prefix=f".{full_path.name}.", suffix=".part", dir=full_path.parent
+            )
+            try:
+                async with aiofiles.open(fd, "wb") as f:
+                    async for chunk in chunks:
                         await f.write(chunk)
-                else:
-                    await f.write(content)
+                await aiofiles.os.replace(partial_path, full_path)
+            except BaseException:
+                try:
+                    os.unlink(partial_path)
+                except FileNotFoundError:
+                    pass
+                raise
 
             # Save metadata if provided
             if metadata:
@@ -179,19 +334,12 @@ class LocalFileStorage:
             raise
 
     async def get_file(self, file_path: str, tenant_id: str) -> BinaryIO:
-        """Retrieve file from local filesystem."""
+        """Retrieve file from local filesystem; use iter_file to stream it."""
         try:
-            full_path = self._get_full_path(file_path, tenant_id)
-
-            if not full_path.exists():
-                raise FileNotFoundError(f"File not found: {file_path}")
-
-            # Return file-like object
-            import io
+            full_path = self.get_local_path(file_path, tenant_id)
 
             async with aiofiles.open(full_path, "rb") as f:
-                content = await f.read()
-                return io.BytesIO(content)
+                return io.BytesIO(await f.read())
 
         except Exception as e:
             logger.error(
@@ -199,6 +347,36 @@ class LocalFileStorage:
             )
             raise
 
+    def get_local_path(self, file_path: str, tenant_id: str) -> Path:
+        """Resolve a stored file to its path on disk."""
+        full_path = self._get_full_path(file_path, tenant_id)
+        if not full_path.is_file():
+            raise FileNotFoundError(f"File not found: {file_path}")
+        return full_path
+
+    async def iter_file(
+        self,
+        file_path: str,
+        tenant_id: str,
+        byte_range: Optional[ByteRange] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream file from local filesystem, optionally one byte range."""
+        full_path = self.get_local_path(file_path, tenant_id)
+        remaining = byte_range.length if byte_range else None
+
+        async with aiofiles.open(full_path, "rb") as f:
+            if byte_range:
+                await f.seek(byte_range.start)
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = await f.read(size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
     async def delete_file(self, file_path: str, tenant_id: str) -> bool:
         """Delete file from local filesystem."""
         try:
@@ -235,7 +413,9 @@ class LocalFileStorage:
             count = 0
 
             for file_path in tenant_path.rglob(pattern):
-                if file_path.is_file() and not file_path.name.endswith(".meta"):
+                if file_path.is_file() and not file_path.name.endswith(
+                    (".meta", ".part")
+                ):
                     if limit and count >= limit:
                         break
 
@@ -409,12 +589,21 @@ class S3FileStorage:
         aws_secret_access_key: Optional[str] = None,
         region_name: str = "us-east-1",
         endpoint_url: Optional[str] = None,
+        part_size: int = 8 * 1024 * 1024,
+        max_concurrency: int = 4,
     ):
         """Initialize S3 storage backend."""
         if not HAS_BOTO3:
             raise ImportError("boto3 is required for S3 storage backend")
+        if part_size < S3_MIN_PART_SIZE:
+            raise ValueError(f"part_size must be at least {S3_MIN_PART_SIZE} bytes")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
 
         self.bucket_name = bucket_name
+        # Uploads hold at most max_concurrency parts of part_size in memory
+        self.part_size = part_size
+        self.max_concurrency = max_concurrency
 
         # Initialize S3 client
         self.s3_client = boto3.client(
@@ -446,12 +635,33 @@ class S3FileStorage:
         tenant_id: str,
         metadata: Optional[dict[str, Any]] = None,
     ) -> str:
-        """Save file to S3."""
+        """Save file to S3, in parallel multipart chunks when it is large."""
+        return await self.save_stream(
+            file_path, _iter_content(content, self.part_size), tenant_id, metadata
+        )
+
+    async def save_stream(
+        self,
+        file_path: str,
+        chunks: AsyncIterable[bytes],
+        tenant_id: str,
+        metadata: Optional[dict[str, Any]] = None,
+        upload_id: Optional[str] = None,
+    ) -> str:
+        """
+        Save a byte stream to S3.
+
+        Streams up to one part go up with a single put_object; anything
+        larger becomes a multipart upload with up to max_concurrency parts in
+        flight. If a multipart upload fails, MultipartUploadError carries its
+        upload ID: passing that ID back with the same stream skips the parts
+        S3 already holds. Call abort_upload to give up on it instead.
+        """
         try:
             s3_key = self._get_s3_key(file_path, tenant_id)
 
             # Prepare upload parameters
-            upload_kwargs = {"Bucket": self.bucket_name, "Key": s3_key, "Body": content}
+            upload_kwargs = {"Bucket": self.bucket_name, "Key": s3_key}
 
             # Add metadata
             if metadata:
@@ -459,10 +669,19 @@ class S3FileStorage:
                 s3_metadata = {k: str(v) for k, v in metadata.items()}
                 upload_kwargs["Metadata"] = s3_metadata
 
-            # Upload file
-            await asyncio.get_event_loop().run_in_executor(
-                None, lambda: self.s3_client.put_object(**upload_kwargs)
-            )
+            parts = _rechunk(chunks, self.part_size)
+            first = await self._next_part(parts)
+            second = await self._next_part(parts) if first else None
+
+            if second is None and upload_id is None:
+                # Upload file
+                await self._call(
+                    self.s3_client.put_object, Body=first or b"", **upload_kwargs
+                )
+            else:
+                await self._multipart_upload(
+                    upload_kwargs, self._chain_parts(first, second, parts), upload_id
+                )
 
             logger.info(f"Saved file to S3: {s3_key}")
             return s3_key
@@ -473,6 +692,158 @@ class S3FileStorage:
             )
             raise
 
+    async def abort_upload(
+        self, file_path: str, tenant_id: str, upload_id: str
+    ) -> None:
+        """Abort a failed multipart upload and free the parts S3 holds for it."""
+        await self._call(
+            self.s3_client.abort_multipart_upload,
+            Bucket=self.bucket_name,
+            Key=self._get_s3_key(file_path, tenant_id),
+            UploadId=upload_id,
+        )
+
+    async def iter_file(
+        self,
+        file_path: str,
+        tenant_id: str,
+        byte_range: Optional[ByteRange] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream file from S3, requesting only the byte range if one is given."""
+        s3_key = self._get_s3_key(file_path, tenant_id)
+        request = {"Bucket": self.bucket_name, "Key": s3_key}
+        if byte_range:
+            request["Range"] = f"bytes={byte_range.start}-{byte_range.end}"
+
+        try:
+            response = await self._call(self.s3_client.get_object, **request)
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "NoSuchKey":
+                raise FileNotFoundError(f"File not found: {file_path}") from e
+            raise
+
+        body = response["Body"]
+        try:
+            while True:
+                chunk = await self._call(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+    async def _call(self, func, *args, **kwargs):
+        """Run a blocking boto3 call in the default executor."""
+        return await asyncio.get_event_loop().run_in_executor(
+            None, functools.partial(func, *args, **kwargs)
+        )
+
+    @staticmethod
+    async def _next_part(parts: AsyncIterator[bytes]) -> Optional[bytes]:
+        """Next part from the stream, or None once it is exhausted."""
+        try:
+            return await parts.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    @staticmethod
+    async def _chain_parts(
+        first: Optional[bytes], second: Optional[bytes], rest: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        """Put the parts read ahead back in front of the remaining stream."""
+        for part in (first, second):
+            if part is not None:
+                yield part
+        async for part in rest:
+            yield part
+
+    async def _uploaded_parts(
+        self, upload_kwargs: dict[str, Any], upload_id: str
+    ) -> dict[int, tuple[str, int]]:
+        """Map part number to (ETag, size) for parts an upload already holds."""
+        uploaded = {}
+        request = {
+            "Bucket": upload_kwargs["Bucket"],
+            "Key": upload_kwargs["Key"],
+            "UploadId": upload_id,
+        }
+        while True:
+            response = await self._call(self.s3_client.list_parts, **request)
+            for part in response.get("Parts", []):
+                uploaded[part["PartNumber"]] = (part["ETag"], part["Size"])
+            if not response.get("IsTruncated"):
+                return uploaded
+            request["PartNumberMarker"] = response["NextPartNumberMarker"]
+
+    async def _multipart_upload(
+        self,
+        upload_kwargs: dict[str, Any],
+        parts: AsyncIterator[bytes],
+        upload_id: Optional[str] = None,
+    ) -> None:
+        """Upload parts concurrently, holding at most max_concurrency in memory."""
+        target = {"Bucket": upload_kwargs["Bucket"], "Key": upload_kwargs["Key"]}
+        if upload_id is None:
+            response = await self._call(
+                self.s3_client.create_multipart_upload, **upload_kwargs
+            )
+            upload_id = response["UploadId"]
+            uploaded = {}
+        else:
+            uploaded = await self._uploaded_parts(upload_kwargs, upload_id)
+
+        slots = asyncio.Semaphore(self.max_concurrency)
+        etags: dict[int, str] = {}
+        pending: set[asyncio.Task] = set()
+
+        async def upload_part(part_number: int, body: bytes) -> None:
+            try:
+                response = await self._call(
+                    self.s3_client.upload_part,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                    **target,
+                )
+                etags[part_number] = response["ETag"]
+            finally:
+                slots.release()
+
+        try:
+            part_number = 0
+            async for body in parts:
+                part_number += 1
+                previous = uploaded.get(part_number)
+                if previous and previous[1] == len(body):
+                    etags[part_number] = previous[0]
+                    continue
+
+                await slots.acquire()
+                # Stop reading the source as soon as any part has failed
+                for task in [t for t in pending if t.done()]:
+                    pending.discard(task)
+                    task.result()
+                task = asyncio.ensure_future(upload_part(part_number, body))
+                pending.add(task)
+
+            await asyncio.gather(*pending)
+            await self._call(
+                self.s3_client.complete_multipart_upload,
+                UploadId=upload_id,
+                MultipartUpload={
+                    "Parts": [
+                        {"ETag": etags[number], "PartNumber": number}
+                        for number in sorted(etags)
+                    ]
+                },
+                **target,
+            )
+        except Exception as e:
+            for task in pending:
+                task.cancel()
+            raise MultipartUploadError(target["Key"], upload_id) from e
+
     async def get_file(self, file_path: str, tenant_id: str) -> BinaryIO:
         """Retrieve file from S3."""
         try:
@@ -671,6 +1042,8 @@ def create_storage_backend(config: dict[str, Any]) -> StorageBackend:
             aws_secret_access_key=config.get("aws_secret_access_key"),
             region_name=config.get("region_name", "us-east-1"),
             endpoint_url=config.get("endpoint_url"),
+            part_size=config.get("part_size", 8 * 1024 * 1024),
+            max_concurrency=config.get("max_concurrency", 4),
         )
     else:
         raise ValueError(f"Unsupported storage backend type: {backend_type}")
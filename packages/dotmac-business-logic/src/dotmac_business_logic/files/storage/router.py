@@ -0,0 +1,153 @@
+"""
+HTTP routes for serving stored files.
+
+Files are streamed out of the storage backend chunk by chunk with single
+``Range`` request support, so memory use does not grow with file size. For
+local storage behind an ASGI server that offers the
+``http.response.zerocopysend`` extension, the file descriptor is handed to
+the server, which sends it with sendfile.
+"""
+
+import logging
+from typing import Any, Callable, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from .backends import (
+    DEFAULT_CHUNK_SIZE,
+    ByteRange,
+    FileInfo,
+    RangeNotSatisfiableError,
+    StorageBackend,
+    parse_range_header,
+)
+
+logger = logging.getLogger(__name__)
+
+ZERO_COPY_EXTENSION = "http.response.zerocopysend"
+
+
+class StorageFileResponse(Response):
+    """Stream a stored file, or one byte range of it, to the client."""
+
+    def __init__(
+        self,
+        storage: StorageBackend,
+        file_path: str,
+        tenant_id: str,
+        info: FileInfo,
+        byte_range: Optional[ByteRange] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        send_body: bool = True,
+    ):
+        """Prepare headers; the body is read from storage when sent."""
+        self.storage = storage
+        self.file_path = file_path
+        self.tenant_id = tenant_id
+        self.byte_range = byte_range
+        self.chunk_size = chunk_size
+        self.send_body = send_body
+
+        headers = {
+            "accept-ranges": "bytes",
+            "content-length": str(byte_range.length if byte_range else info.size),
+        }
+        if byte_range:
+            headers["content-range"] = byte_range.content_range(info.size)
+        super().__init__(
+            status_code=206 if byte_range else 200,
+            headers=headers,
+            media_type=info.content_type,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+
+        if not self.send_body:
+            await send({"type": "http.response.body", "body": b""})
+        elif ZERO_COPY_EXTENSION in scope.get("extensions", {}) and hasattr(
+            self.storage, "get_local_path"
+        ):
+            await self._send_zero_copy(send)
+        else:
+            async for chunk in self.storage.iter_file(
+                self.file_path, self.tenant_id, self.byte_range, self.chunk_size
+            ):
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+            await send({"type": "http.response.body", "body": b""})
+
+        if self.background is not None:
+            await self.background()
+
+    async def _send_zero_copy(self, send: Send) -> None:
+        """Hand the open file to the server to send with sendfile."""
+        local_path = self.storage.get_local_path(self.file_path, self.tenant_id)
+        message: dict[str, Any] = {"type": ZERO_COPY_EXTENSION}
+        if self.byte_range:
+            message["offset"] = self.byte_range.start
+            message["count"] = self.byte_range.length
+
+        with local_path.open("rb") as f:
+            message["file"] = f
+            await send(message)
+
+
+def create_file_router(
+    storage: StorageBackend,
+    get_tenant_id: Callable[..., Any],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> APIRouter:
+    """
+    Create GET and HEAD routes that serve files from a storage backend.
+
+    Args:
+        storage: Storage backend to serve from
+        get_tenant_id: FastAPI dependency resolving the caller's tenant ID
+        chunk_size: Read size for streamed responses
+
+    Returns:
+        Router serving ``/{file_path}``
+    """
+    router = APIRouter()
+
+    @router.api_route("/{file_path:path}", methods=["GET", "HEAD"])
+    async def serve_file(
+        file_path: str,
+        request: Request,
+        tenant_id: str = Depends(get_tenant_id),
+    ) -> Response:
+        """Serve a stored file, honouring a single-range Range header."""
+        info = await storage.get_file_info(file_path, tenant_id)
+        if info is None:
+            raise HTTPException(status_code=404, detail="File not found")
+
+        try:
+            byte_range = parse_range_header(request.headers.get("range"), info.size)
+        except RangeNotSatisfiableError as e:
+            raise HTTPException(
+                status_code=416,
+                detail=str(e),
+                headers={"content-range": f"bytes */{info.size}"},
+            ) from e
+
+        return StorageFileResponse(
+            storage,
+            file_path,
+            tenant_id,
+            info,
+            byte_range,
+            chunk_size,
+            send_body=request.method != "HEAD",
+        )
+
+    return router
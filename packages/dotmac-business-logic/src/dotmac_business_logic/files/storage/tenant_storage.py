@@ -6,11 +6,12 @@ access control, and quota management.
 """
 
 import logging
+from collections.abc import AsyncIterable, AsyncIterator
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, BinaryIO, Optional
 
-from .backends import FileInfo, StorageBackend
+from .backends import DEFAULT_CHUNK_SIZE, ByteRange, FileInfo, StorageBackend
 
 logger = logging.getLogger(__name__)
 
@@ -230,10 +231,115 @@ class TenantStorageManager:
         logger.info(f"Saved file for tenant {tenant_id}: {file_path}")
         return result
 
+    async def save_stream(
+        self,
+        file_path: str,
+        chunks: AsyncIterable[bytes],
+        tenant_id: str,
+        metadata: Optional[dict[str, Any]] = None,
+        check_quota: bool = True,
+        expected_size: int = 0,
+    ) -> str:
+        """
+        Save a byte stream with tenant isolation and quota checking.
+
+        Args:
+            file_path: File path within tenant space
+            chunks: Async iterable of file content chunks
+            tenant_id: Tenant ID
+            metadata: Optional file metadata
+            check_quota: Whether to check quota while saving
+            expected_size: Declared size (e.g. Content-Length) to reject before
+                reading the stream; the bytes actually received are counted
+                against the quota either way
+
+        Returns:
+            Storage path of saved file
+        """
+        received = 0
+        limit_reason: Optional[str] = None
+
+        if check_quota:
+            file_type = file_path.split(".")[-1] if "." in file_path else "unknown"
+            check_result = await self.check_upload_allowed(
+                tenant_id, expected_size, file_type
+            )
+            if not check_result["allowed"]:
+                raise ValueError(f"Upload not allowed: {check_result['reason']}")
+
+            quota = self.get_tenant_quota(tenant_id)
+            usage = await self.get_tenant_usage(tenant_id)
+            storage_left = quota.max_storage_bytes - usage.total_bytes
+            source = chunks
+
+            async def counted_chunks() -> AsyncIterator[bytes]:
+                nonlocal received, limit_reason
+                async for chunk in source:
+                    received += len(chunk)
+                    if received > quota.max_file_size:
+                        limit_reason = (
+                            f"File size exceeds maximum {quota.max_file_size}"
+                        )
+                    elif received > storage_left:
+                        limit_reason = "Storage quota exceeded"
+                    if limit_reason:
+                        raise ValueError(f"Upload not allowed: {limit_reason}")
+                    yield chunk
+
+            chunks = counted_chunks()
+
+        try:
+            result = await self.storage.save_stream(
+                file_path, chunks, tenant_id, metadata
+            )
+        except Exception as e:
+            if limit_reason is None:
+                raise
+            await self._discard_partial_upload(file_path, tenant_id, e)
+            raise ValueError(f"Upload not allowed: {limit_reason}") from e
+
+        # Invalidate usage cache for this tenant
+        if tenant_id in self._tenant_usage:
+            del self._tenant_usage[tenant_id]
+
+        logger.info(f"Saved streamed file for tenant {tenant_id}: {file_path}")
+        return result
+
+    async def _discard_partial_upload(
+        self, file_path: str, tenant_id: str, error: Exception
+    ) -> None:
+        """
+        Free the storage held by a stream aborted over quota.
+
+        Backends never commit a partial stream, so any file already at
+        file_path is left alone; only an unfinished multipart upload needs
+        to be aborted.
+        """
+        upload_id = getattr(error, "upload_id", None)
+        if not upload_id or not hasattr(self.storage, "abort_upload"):
+            return
+        try:
+            await self.storage.abort_upload(file_path, tenant_id, upload_id)
+        except Exception as e:
+            logger.error(
+                f"Error discarding over-quota upload {file_path} "
+                f"for tenant {tenant_id}: {e}"
+            )
+
     async def get_file(self, file_path: str, tenant_id: str) -> BinaryIO:
         """Get file with tenant isolation."""
         return await self.storage.get_file(file_path, tenant_id)
 
+    def iter_file(
+        self,
+        file_path: str,
+        tenant_id: str,
+        byte_range: Optional[ByteRange] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream file content with tenant isolation."""
+        return self.storage.iter_file(file_path, tenant_id, byte_range, chunk_size)
+
     async def delete_file(self, file_path: str, tenant_id: str) -> bool:
         """Delete file with tenant isolation."""
         result = await self.storage.delete_file(file_path, tenant_id)
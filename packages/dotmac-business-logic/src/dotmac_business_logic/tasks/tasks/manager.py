@@ -48,6 +48,8 @@ class BackgroundOperationsManager:
         saga_timeout: int = 7200,  # 2 hours
         cleanup_interval: int = 3600,  # 1 hour
         enable_background_cleanup: bool = True,
+        saga_step_concurrency: int = 4,
+        saga_retry_backoff: float = 1.0,
     ) -> None:
         """
         Initialize the BackgroundOperationsManager.
@@ -58,12 +60,16 @@ class BackgroundOperationsManager:
             saga_timeout: Default timeout for saga execution in seconds
             cleanup_interval: Interval between cleanup tasks in seconds
             enable_background_cleanup: Whether to run background cleanup
+            saga_step_concurrency: Maximum saga steps (or compensations) run at once
+            saga_retry_backoff: Base delay in seconds for saga step retry backoff
         """
         self.storage = storage or MemoryStorage()
         self.default_idempotency_ttl = default_idempotency_ttl
         self.saga_timeout = saga_timeout
         self.cleanup_interval = cleanup_interval
         self.enable_background_cleanup = enable_background_cleanup
+        self.saga_step_concurrency = saga_step_concurrency
+        self.saga_retry_backoff = saga_retry_backoff
 
         # Operation and compensation handlers
         self._operation_handlers: dict[str, Callable] = {}
@@ -279,12 +285,16 @@ class BackgroundOperationsManager:
         Args:
             tenant_id: Tenant identifier
             workflow_type: Type of workflow
-            steps: List of step definitions
+            steps: List of step definitions; a step's optional ``depends_on``
+                lists step IDs it waits for (default: the previous step)
             idempotency_key: Associated idempotency key (optional)
             timeout_seconds: Workflow timeout (uses default if None)
 
         Returns:
             Created SagaWorkflow object
+
+        Raises:
+            ValueError: If step dependencies are unknown or cyclic
         """
         saga_id = str(uuid4())
         timeout = timeout_seconds or self.saga_timeout
@@ -300,6 +310,7 @@ class BackgroundOperationsManager:
                 compensation_operation=step_data.get("compensation_operation"),
                 compensation_parameters=step_data.get("compensation_parameters", {}),
                 max_retries=step_data.get("max_retries", 3),
+                depends_on=step_data.get("depends_on"),
             )
             saga_steps.append(step)
 
@@ -313,6 +324,9 @@ class BackgroundOperationsManager:
             timeout_seconds=timeout,
         )
 
+        # Reject unknown or cyclic step dependencies up front
+        self._saga_step_levels(saga)
+
         # Store in backend
         await self.storage.set_saga(saga_id, saga.to_dict())
 
@@ -432,61 +446,118 @@ class BackgroundOperationsManager:
 
             return False
 
-    async def _execute_saga_steps_forward(self, saga: SagaWorkflow) -> bool:
-        """Execute saga steps in forward direction."""
-        while saga.current_step < len(saga.steps):
-            step = saga.steps[saga.current_step]
-
-            # Skip already completed steps
-            if step.status == SagaStepStatus.COMPLETED:
-                saga.advance_step()
-                continue
+    @staticmethod
+    def _saga_step_dependencies(saga: SagaWorkflow) -> dict[str, list[str]]:
+        """Map each step ID to the step IDs it waits for."""
+        dependencies: dict[str, list[str]] = {}
+        previous: Optional[str] = None
+        for step in saga.steps:
+            if step.depends_on is not None:
+                dependencies[step.step_id] = list(step.depends_on)
+            else:
+                dependencies[step.step_id] = [previous] if previous else []
+            previous = step.step_id
+        return dependencies
 
-            logger.debug(f"Executing step {step.step_id}: {step.name}")
+    @classmethod
+    def _saga_step_levels(cls, saga: SagaWorkflow) -> dict[str, int]:
+        """
+        Topological level of each step (0 for steps without dependencies).
 
-            # Execute step with retries
-            success = await self._execute_saga_step(saga, step)
+        Raises:
+            ValueError: If a step depends on an unknown step or steps form a cycle
+        """
+        dependencies = cls._saga_step_dependencies(saga)
+        for step_id, step_dependencies in dependencies.items():
+            unknown = [dep for dep in step_dependencies if dep not in dependencies]
+            if unknown:
+                raise ValueError(f"Step {step_id} depends on unknown steps: {unknown}")
+
+        levels: dict[str, int] = {}
+        while len(levels) < len(dependencies):
+            resolved = {
+                step_id: 1 + max((levels[dep] for dep in step_dependencies), default=-1)
+                for step_id, step_dependencies in dependencies.items()
+                if step_id not in levels and all(dep in levels for dep in step_dependencies)
+            }
+            if not resolved:
+                cyclic = sorted(set(dependencies) - set(levels))
+                raise ValueError(f"Saga steps have cyclic dependencies: {cyclic}")
+            levels.update(resolved)
+        return levels
 
-            if success:
-                step.status = SagaStepStatus.COMPLETED
-                step.completed_at = datetime.now(timezone.utc)
+    async def _execute_saga_steps_forward(self, saga: SagaWorkflow) -> bool:
+        """
+        Execute saga steps in forward direction.
 
-                await self._record_saga_history(
-                    saga.saga_id,
-                    step.step_id,
-                    step.name,
-                    SagaStepStatus.COMPLETED,
-                    None,
-                    step.retry_count,
-                )
+        Steps run in waves: every pending step whose dependencies have
+        completed runs concurrently (bounded by ``saga_step_concurrency``),
+        and the saga state and history of each wave are persisted in one
+        write. Returns False after the first wave containing a failed step.
+        """
+        dependencies = self._saga_step_dependencies(saga)
+        semaphore = asyncio.Semaphore(self.saga_step_concurrency)
+
+        while True:
+            completed = {step.step_id for step in saga.steps if step.is_completed()}
+            wave = [
+                step
+                for step in saga.steps
+                if not step.is_completed()
+                and all(dep in completed for dep in dependencies[step.step_id])
+            ]
+            if not wave:
+                if len(completed) < len(saga.steps):
+                    logger.error(f"Saga {saga.saga_id} has steps with unmet dependencies")
+                    return False
+                return True
 
-                # Save progress
-                await self.storage.set_saga(saga.saga_id, saga.to_dict())
+            logger.debug(
+                f"Executing saga {saga.saga_id} wave: {[step.step_id for step in wave]}"
+            )
+            results = await asyncio.gather(
+                *(self._execute_saga_step(saga, step, semaphore) for step in wave)
+            )
 
-                # Advance to next step
-                if not saga.advance_step():
-                    break  # No more steps
-            else:
-                # Step failed
-                step.status = SagaStepStatus.FAILED
+            history = []
+            for step, success in zip(wave, results):
+                step.status = SagaStepStatus.COMPLETED if success else SagaStepStatus.FAILED
                 step.completed_at = datetime.now(timezone.utc)
-
-                await self._record_saga_history(
-                    saga.saga_id,
-                    step.step_id,
-                    step.name,
-                    SagaStepStatus.FAILED,
-                    step.error,
-                    step.retry_count,
+                history.append(
+                    self._saga_history_entry(
+                        step.step_id,
+                        step.name,
+                        step.status,
+                        None if success else step.error,
+                        step.retry_count,
+                    )
                 )
 
-                await self.storage.set_saga(saga.saga_id, saga.to_dict())
+            # Point current_step at the first step still to run
+            saga.current_step = next(
+                (i for i, step in enumerate(saga.steps) if not step.is_completed()),
+                len(saga.steps) - 1,
+            )
+            saga.updated_at = datetime.now(timezone.utc)
+
+            # Save progress and history for the whole wave at once
+            await self.storage.save_saga_progress(saga.saga_id, saga.to_dict(), history)
+
+            if not all(results):
                 return False
 
-        return True
+    async def _execute_saga_step(
+        self,
+        saga: SagaWorkflow,
+        step: SagaStep,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> bool:
+        """
+        Execute a single saga step with retries.
 
-    async def _execute_saga_step(self, saga: SagaWorkflow, step: SagaStep) -> bool:
-        """Execute a single saga step with retries."""
+        The semaphore is held only while the handler runs, so a step waiting
+        out its retry backoff does not block other steps of the wave.
+        """
         step.started_at = datetime.now(timezone.utc)
         step.status = SagaStepStatus.EXECUTING
 
@@ -506,8 +577,13 @@ class BackgroundOperationsManager:
                 # Execute operation
                 logger.debug(f"Executing step {step.step_id} (attempt {attempt + 1})")
 
-                result = await handler(step.parameters)
+                if semaphore is None:
+                    result = await handler(step.parameters)
+                else:
+                    async with semaphore:
+                        result = await handler(step.parameters)
                 step.result = result
+                step.error = None
                 return True
 
             except Exception as e:
@@ -517,7 +593,7 @@ class BackgroundOperationsManager:
 
                 if attempt < step.max_retries:
                     # Wait before retry (exponential backoff)
-                    wait_time = min(2**attempt, 60)  # Max 60 seconds
+                    wait_time = min(self.saga_retry_backoff * 2**attempt, 60)  # Max 60 seconds
                     await asyncio.sleep(wait_time)
                 else:
                     # All retries exhausted
@@ -527,69 +603,105 @@ class BackgroundOperationsManager:
         return False
 
     async def _execute_saga_compensation(self, saga: SagaWorkflow) -> None:
-        """Execute compensation steps in reverse order."""
+        """
+        Execute compensation steps in reverse topological order.
+
+        Completed steps are compensated level by level, from the steps that
+        ran last back to those without dependencies. Steps on the same level
+        do not depend on each other and are compensated concurrently.
+        """
         logger.info(f"Starting compensation for saga {saga.saga_id}")
 
-        # Get completed steps in reverse order
-        completed_steps = [
-            step for step in saga.steps if step.status == SagaStepStatus.COMPLETED
-        ]
+        levels = self._saga_step_levels(saga)
+        semaphore = asyncio.Semaphore(self.saga_step_concurrency)
 
-        for step in reversed(completed_steps):
-            if not step.can_compensate():
-                logger.debug(f"Step {step.step_id} cannot be compensated")
-                continue
+        # Group completed steps by level, keeping definition order within a level
+        by_level: dict[int, list[SagaStep]] = {}
+        for step in saga.steps:
+            if step.status == SagaStepStatus.COMPLETED:
+                by_level.setdefault(levels[step.step_id], []).append(step)
 
-            logger.debug(f"Compensating step {step.step_id}: {step.name}")
+        for level in sorted(by_level, reverse=True):
+            history = await asyncio.gather(
+                *(
+                    self._compensate_saga_step(step, semaphore)
+                    for step in reversed(by_level[level])
+                )
+            )
+            history = [entry for entry in history if entry is not None]
+            if history:
+                saga.updated_at = datetime.now(timezone.utc)
+                await self.storage.save_saga_progress(saga.saga_id, saga.to_dict(), history)
+
+    async def _compensate_saga_step(
+        self, step: SagaStep, semaphore: asyncio.Semaphore
+    ) -> Optional[dict[str, Any]]:
+        """Compensate one completed step, returning its history entry if any."""
+        if not step.can_compensate():
+            logger.debug(f"Step {step.step_id} cannot be compensated")
+            return None
 
-            try:
-                step.status = SagaStepStatus.COMPENSATING
+        logger.debug(f"Compensating step {step.step_id}: {step.name}")
 
-                # Get compensation handler
-                handler = self._compensation_handlers.get(step.compensation_operation)
-                if not handler:
-                    logger.warning(
-                        f"No compensation handler for {step.compensation_operation}"
-                    )
-                    step.status = SagaStepStatus.FAILED
-                    continue
+        try:
+            step.status = SagaStepStatus.COMPENSATING
+
+            # Get compensation handler
+            handler = self._compensation_handlers.get(step.compensation_operation)
+            if not handler:
+                logger.warning(
+                    f"No compensation handler for {step.compensation_operation}"
+                )
+                step.status = SagaStepStatus.FAILED
+                return None
 
-                # Execute compensation
+            # Execute compensation
+            async with semaphore:
                 await handler(step.compensation_parameters)
-                step.status = SagaStepStatus.COMPENSATED
+            step.status = SagaStepStatus.COMPENSATED
 
-                await self._record_saga_history(
-                    saga.saga_id, step.step_id, step.name, SagaStepStatus.COMPENSATED
-                )
+            return self._saga_history_entry(
+                step.step_id, step.name, SagaStepStatus.COMPENSATED
+            )
 
-            except Exception as e:
-                logger.error(f"Compensation failed for step {step.step_id}: {e}")
-                step.status = SagaStepStatus.FAILED
+        except Exception as e:
+            logger.error(f"Compensation failed for step {step.step_id}: {e}")
+            step.status = SagaStepStatus.FAILED
 
-                await self._record_saga_history(
-                    saga.saga_id, step.step_id, step.name, SagaStepStatus.FAILED, str(e)
-                )
+            return self._saga_history_entry(
+                step.step_id, step.name, SagaStepStatus.FAILED, str(e)
+            )
 
-    async def _record_saga_history(
-        self,
-        saga_id: str,
+    @staticmethod
+    def _saga_history_entry(
         step_id: str,
         step_name: str,
         status: SagaStepStatus,
         error: Optional[str] = None,
         retry_count: int = 0,
-    ) -> None:
-        """Record an entry in saga execution history."""
-        entry = SagaHistoryEntry(
+    ) -> dict[str, Any]:
+        """Build a saga execution history entry for storage."""
+        return SagaHistoryEntry(
             timestamp=datetime.now(timezone.utc),
             step_id=step_id,
             step_name=step_name,
             status=status,
             error=error,
             retry_count=retry_count,
-        )
+        ).to_dict()
 
-        await self.storage.append_saga_history(saga_id, entry.to_dict())
+    async def _record_saga_history(
+        self,
+        saga_id: str,
+        step_id: str,
+        step_name: str,
+        status: SagaStepStatus,
+        error: Optional[str] = None,
+        retry_count: int = 0,
+    ) -> None:
+        """Record an entry in saga execution history."""
+        entry = self._saga_history_entry(step_id, step_name, status, error, retry_count)
+        await self.storage.append_saga_history(saga_id, entry)
 
     # Operation Registry Methods
 
@@ -119,6 +119,10 @@ class SagaStep:
 
     Each step has an operation to perform and optionally a compensation
     operation to undo the work if the saga needs to be rolled back.
+
+    ``depends_on`` lists the step IDs that must complete before this step
+    runs. ``None`` means the step depends on the step before it (sequential
+    execution); an empty list means it can start immediately.
     """
 
     step_id: str
@@ -134,6 +138,7 @@ class SagaStep:
     completed_at: Optional[datetime] = None
     retry_count: int = 0
     max_retries: int = 3
+    depends_on: Optional[list[str]] = None
 
     def __post_init__(self) -> None:
         """Initialize default values and validate timestamps."""
@@ -186,6 +191,7 @@ class SagaStep:
             else None,
             "retry_count": self.retry_count,
             "max_retries": self.max_retries,
+            "depends_on": self.depends_on,
         }
 
     @classmethod
@@ -213,6 +219,7 @@ class SagaStep:
             completed_at=completed_at,
             retry_count=data.get("retry_count", 0),
             max_retries=data.get("max_retries", 3),
+            depends_on=data.get("depends_on"),
         )
 
 
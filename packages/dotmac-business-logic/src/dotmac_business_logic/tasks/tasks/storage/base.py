@@ -130,6 +130,24 @@ class Storage(ABC):
         """
         pass
 
+    async def save_saga_progress(
+        self, saga_id: str, mapping: dict[str, Any], history: list[dict[str, Any]]
+    ) -> None:
+        """
+        Set saga workflow data and append history entries together.
+
+        Backends that can batch writes should override this to persist both
+        in a single round trip.
+
+        Args:
+            saga_id: The saga workflow ID
+            mapping: Dictionary with saga data
+            history: History entries to append, oldest first
+        """
+        await self.set_saga(saga_id, mapping)
+        for entry in history:
+            await self.append_saga_history(saga_id, entry)
+
     @abstractmethod
     async def get_saga_history(
         self, saga_id: str, limit: Optional[int] = None
@@ -304,3 +322,7 @@ class LockAcquisitionError(StorageError):
     """Raised when lock acquisition fails."""
 
     pass
+
+
+# Name exported by the package; kept as an alias of StorageError
+StorageException = StorageError
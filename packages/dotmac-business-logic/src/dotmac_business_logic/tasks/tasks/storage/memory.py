@@ -144,6 +144,16 @@ class MemoryStorage(Storage):
                 self._saga_history[saga_id] = []
             self._saga_history[saga_id].append(entry.copy())
 
+    async def save_saga_progress(
+        self, saga_id: str, mapping: dict[str, Any], history: list[dict[str, Any]]
+    ) -> None:
+        """Set saga workflow data and append history entries together."""
+        async with self._lock:
+            self._saga_data[saga_id] = mapping.copy()
+            self._saga_history.setdefault(saga_id, []).extend(
+                entry.copy() for entry in history
+            )
+
     async def get_saga_history(
         self, saga_id: str, limit: Optional[int] = None
     ) -> list[dict[str, Any]]:
@@ -7,6 +7,7 @@ durable persistence and distributed lock support.
 
 import json
 import time
+from datetime import datetime
 from typing import Any, Optional
 
 try:
@@ -35,9 +36,16 @@ class RedisStorage(Storage):
     - Saga: bgops:saga:{saga_id} (JSON blob)
     - History: bgops:saga:history:{saga_id} (LIST)
     - Operations: bgops:operation:{operation_id} (HASH)
+    - Tenant operations: bgops:tenant_ops:{tenant_id} (ZSET by created_at)
+    - Tenant sagas: bgops:tenant_sagas:{tenant_id} (ZSET by created_at)
+    - Indexed tenants: bgops:tenants (SET)
+    - Tenant index backfill marker: bgops:tenant_index_version (String)
     - Locks: bgops:lock:{lock_key} (String with TTL)
     """
 
+    # Bump to re-run the tenant index backfill on existing deployments
+    TENANT_INDEX_VERSION = "1"
+
     def __init__(
         self,
         redis_url: str = "redis://localhost:6379/0",
@@ -67,6 +75,7 @@ class RedisStorage(Storage):
 
         self.prefix = prefix
         self.retry_on_timeout = retry_on_timeout
+        self._tenant_indexes_ready = False
 
         # Create Redis client
         self.redis: Redis = redis.from_url(
@@ -82,6 +91,149 @@ class RedisStorage(Storage):
         """Generate prefixed key."""
         return f"{self.prefix}:{key_type}:{identifier}"
 
+    @staticmethod
+    def _created_at_score(mapping: dict[str, Any]) -> float:
+        """Index score for a record: its created_at as a Unix timestamp."""
+        created_at = mapping.get("created_at")
+        if isinstance(created_at, datetime):
+            return created_at.timestamp()
+        if created_at:
+            try:
+                return datetime.fromisoformat(str(created_at)).timestamp()
+            except ValueError:
+                pass
+        return time.time()
+
+    def _index_record(
+        self, pipe: Any, index_type: str, record_id: str, mapping: dict[str, Any]
+    ) -> None:
+        """Queue the tenant index update for a record on a transaction."""
+        tenant_id = mapping.get("tenant_id")
+        if tenant_id:
+            pipe.zadd(
+                self._key(index_type, tenant_id),
+                {record_id: self._created_at_score(mapping)},
+            )
+            pipe.sadd(f"{self.prefix}:tenants", tenant_id)
+
+    async def _list_page(
+        self,
+        index_type: str,
+        record_type: str,
+        tenant_id: str,
+        limit: int,
+        offset: int,
+        fetch: Any,
+    ) -> list[Any]:
+        """
+        Fetch one page of a tenant index, newest first.
+
+        Index entries whose record no longer exists are removed from the
+        index, and further entries are read until the page is full or the
+        index is exhausted.
+        """
+        if limit <= 0:
+            return []
+        await self._ensure_tenant_indexes()
+
+        index_key = self._key(index_type, tenant_id)
+        page: list[Any] = []
+        start = offset
+        while len(page) < limit:
+            record_ids = await self._execute_with_retry(
+                self.redis.zrevrange, index_key, start, start + limit - len(page) - 1
+            )
+            if not record_ids:
+                break
+
+            pipe = self.redis.pipeline(transaction=False)
+            for record_id in record_ids:
+                fetch(pipe, self._key(record_type, record_id))
+            records = await self._execute_with_retry(pipe.execute)
+
+            missing = [
+                record_id for record_id, record in zip(record_ids, records) if not record
+            ]
+            if missing:
+                await self._execute_with_retry(self.redis.zrem, index_key, *missing)
+
+            found = [record for record in records if record]
+            page.extend(found)
+            # Removing the missing entries shifted the rest of the index up
+            start += len(found)
+
+        return page
+
+    async def _ensure_tenant_indexes(self) -> None:
+        """Backfill the tenant indexes once per keyspace before the first listing."""
+        if self._tenant_indexes_ready:
+            return
+
+        marker_key = f"{self.prefix}:tenant_index_version"
+        version = await self._execute_with_retry(self.redis.get, marker_key)
+        if version != self.TENANT_INDEX_VERSION:
+            await self.backfill_tenant_indexes()
+            await self._execute_with_retry(
+                self.redis.set, marker_key, self.TENANT_INDEX_VERSION
+            )
+        self._tenant_indexes_ready = True
+
+    async def backfill_tenant_indexes(self, chunk_size: int = 1000) -> int:
+        """
+        Add stored operations and sagas to their tenant indexes.
+
+        Records written before the tenant indexes existed are not in them.
+        This scans the operation and saga keys once and indexes each record;
+        it is safe to run again or while records are being written.
+
+        Args:
+            chunk_size: SCAN batch size
+
+        Returns:
+            Number of records indexed
+        """
+        indexed = 0
+        history_prefix = self._key("saga:history", "")
+
+        for record_type, index_type in (("operation", "tenant_ops"), ("saga", "tenant_sagas")):
+            record_prefix = self._key(record_type, "")
+            cursor = 0
+            while True:
+                cursor, keys = await self._execute_with_retry(
+                    self.redis.scan, cursor, match=f"{record_prefix}*", count=chunk_size
+                )
+                keys = [key for key in keys if not key.startswith(history_prefix)]
+
+                if keys:
+                    pipe = self.redis.pipeline(transaction=False)
+                    for key in keys:
+                        if record_type == "operation":
+                            pipe.hmget(key, "tenant_id", "created_at")
+                        else:
+                            pipe.get(key)
+                    records = await self._execute_with_retry(pipe.execute)
+
+                    pipe = self.redis.pipeline(transaction=False)
+                    for key, record in zip(keys, records):
+                        if record_type == "operation":
+                            mapping = {"tenant_id": record[0], "created_at": record[1]}
+                        else:
+                            try:
+                                mapping = json.loads(record) if record else {}
+                            except json.JSONDecodeError:
+                                continue
+                        if mapping.get("tenant_id"):
+                            self._index_record(
+                                pipe, index_type, key[len(record_prefix) :], mapping
+                            )
+                            indexed += 1
+                    await self._execute_with_retry(pipe.execute)
+
+                if cursor == 0:
+                    break
+
+        return indexed
+
     async def _execute_with_retry(self, operation, *args, **kwargs):
         """Execute Redis operation with optional retry on timeout."""
         try:
@@ -183,17 +335,26 @@ class RedisStorage(Storage):
         redis_key = self._key("saga", saga_id)
 
         json_data = json.dumps(mapping, default=str)
-        await self._execute_with_retry(self.redis.set, redis_key, json_data)
+
+        # Write the saga and its tenant index atomically
+        pipe = self.redis.pipeline()
+        pipe.set(redis_key, json_data)
+        self._index_record(pipe, "tenant_sagas", saga_id, mapping)
+
+        await self._execute_with_retry(pipe.execute)
 
     async def delete_saga(self, saga_id: str) -> bool:
         """Delete saga workflow data by ID."""
         saga_key = self._key("saga", saga_id)
         history_key = self._key("saga:history", saga_id)
+        saga = await self.get_saga(saga_id)
 
         # Use pipeline for atomic operation
         pipe = self.redis.pipeline()
         pipe.delete(saga_key)
         pipe.delete(history_key)
+        if saga and saga.get("tenant_id"):
+            pipe.zrem(self._key("tenant_sagas", saga["tenant_id"]), saga_id)
 
         results = await self._execute_with_retry(pipe.execute)
         return results[0] > 0  # First result is from saga deletion
@@ -205,6 +366,21 @@ class RedisStorage(Storage):
         json_entry = json.dumps(entry, default=str)
         await self._execute_with_retry(self.redis.rpush, history_key, json_entry)
 
+    async def save_saga_progress(
+        self, saga_id: str, mapping: dict[str, Any], history: list[dict[str, Any]]
+    ) -> None:
+        """Set saga workflow data and append history entries in one transaction."""
+        pipe = self.redis.pipeline()
+        pipe.set(self._key("saga", saga_id), json.dumps(mapping, default=str))
+        self._index_record(pipe, "tenant_sagas", saga_id, mapping)
+        if history:
+            pipe.rpush(
+                self._key("saga:history", saga_id),
+                *(json.dumps(entry, default=str) for entry in history),
+            )
+
+        await self._execute_with_retry(pipe.execute)
+
     async def get_saga_history(
         self, saga_id: str, limit: Optional[int] = None
     ) -> list[dict[str, Any]]:
@@ -266,97 +442,73 @@ class RedisStorage(Storage):
         if redis_data.get("result") is not None:
             redis_data["result"] = json.dumps(redis_data["result"])
 
-        await self._execute_with_retry(self.redis.hset, redis_key, mapping=redis_data)
+        # Write the operation and its tenant index atomically
+        pipe = self.redis.pipeline()
+        pipe.hset(redis_key, mapping=redis_data)
+        self._index_record(pipe, "tenant_ops", operation_id, mapping)
+
+        await self._execute_with_retry(pipe.execute)
 
     async def delete_operation(self, operation_id: str) -> bool:
         """Delete background operation data by ID."""
         redis_key = self._key("operation", operation_id)
+        tenant_id = await self._execute_with_retry(self.redis.hget, redis_key, "tenant_id")
 
-        result = await self._execute_with_retry(self.redis.delete, redis_key)
-        return result > 0
+        pipe = self.redis.pipeline()
+        pipe.delete(redis_key)
+        if tenant_id:
+            pipe.zrem(self._key("tenant_ops", tenant_id), operation_id)
+
+        results = await self._execute_with_retry(pipe.execute)
+        return results[0] > 0
 
     async def list_operations_by_tenant(
         self, tenant_id: str, limit: int = 100, offset: int = 0
     ) -> list[dict[str, Any]]:
         """List background operations for a tenant."""
-        # This is a simplified implementation - in production you might want
-        # to use Redis secondary indexes or search modules for better performance
-        pattern = self._key("operation", "*")
-
-        operations = []
-        cursor = 0
-
-        while True:
-            cursor, keys = await self._execute_with_retry(
-                self.redis.scan, cursor, match=pattern, count=1000
-            )
-
-            if keys:
-                pipe = self.redis.pipeline()
-                for key in keys:
-                    pipe.hgetall(key)
-
-                results = await self._execute_with_retry(pipe.execute)
-
-                for data in results:
-                    if data and data.get("tenant_id") == tenant_id:
-                        # Parse JSON result if present
-                        if data.get("result"):
-                            try:
-                                data["result"] = json.loads(data["result"])
-                            except (json.JSONDecodeError, TypeError):
-                                pass
-                        operations.append(dict(data))
-
-            if cursor == 0:
-                break
+        operations = await self._list_page(
+            "tenant_ops",
+            "operation",
+            tenant_id,
+            limit,
+            offset,
+            lambda pipe, key: pipe.hgetall(key),
+        )
 
-        # Sort by created_at (newest first)
-        operations.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+        result = []
+        for data in operations:
+            data = dict(data)
+            # Parse JSON result if present
+            if data.get("result"):
+                try:
+                    data["result"] = json.loads(data["result"])
+                except (json.JSONDecodeError, TypeError):
+                    pass
+            result.append(data)
 
-        # Apply pagination
-        end_idx = offset + limit
-        return operations[offset:end_idx]
+        return result
 
     async def list_sagas_by_tenant(
         self, tenant_id: str, limit: int = 100, offset: int = 0
     ) -> list[dict[str, Any]]:
         """List saga workflows for a tenant."""
-        pattern = self._key("saga", "*")
-
-        sagas = []
-        cursor = 0
-
-        while True:
-            cursor, keys = await self._execute_with_retry(
-                self.redis.scan, cursor, match=pattern, count=1000
-            )
-
-            if keys:
-                pipe = self.redis.pipeline()
-                for key in keys:
-                    pipe.get(key)
-
-                results = await self._execute_with_retry(pipe.execute)
-
-                for data in results:
-                    if data:
-                        try:
-                            saga_data = json.loads(data)
-                            if saga_data.get("tenant_id") == tenant_id:
-                                sagas.append(saga_data)
-                        except json.JSONDecodeError:
-                            continue
-
-            if cursor == 0:
-                break
+        sagas = await self._list_page(
+            "tenant_sagas",
+            "saga",
+            tenant_id,
+            limit,
+            offset,
+            lambda pipe, key: pipe.get(key),
+        )
 
-        # Sort by created_at (newest first)
-        sagas.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+        result = []
+        for data in sagas:
+            try:
+                result.append(json.loads(data))
+            except json.JSONDecodeError:
+                continue
 
-        # Apply pagination
-        end_idx = offset + limit
-        return sagas[offset:end_idx]
+        return result
 
     async def acquire_lock(self, lock_key: str, timeout_seconds: int = 30) -> bool:
         """Acquire a distributed lock for saga execution."""
@@ -397,10 +549,56 @@ class RedisStorage(Storage):
 
             await self._execute_with_retry(pipe.execute)
 
+        # Prune tenant index entries whose operation or saga is gone
+        cleaned_count += await self._prune_tenant_indexes()
+
         # Expired locks are automatically cleaned up by Redis TTL
 
         return cleaned_count
 
+    async def _prune_tenant_indexes(self, chunk_size: int = 500) -> int:
+        """Remove dangling tenant index entries and empty tenant indexes."""
+        tenants_key = f"{self.prefix}:tenants"
+        tenant_ids = await self._execute_with_retry(self.redis.smembers, tenants_key)
+
+        pruned = 0
+        for tenant_id in tenant_ids:
+            indexes_left = 0
+            for index_type, record_type in (
+                ("tenant_ops", "operation"),
+                ("tenant_sagas", "saga"),
+            ):
+                index_key = self._key(index_type, tenant_id)
+                start = 0
+                while True:
+                    record_ids = await self._execute_with_retry(
+                        self.redis.zrange, index_key, start, start + chunk_size - 1
+                    )
+                    if not record_ids:
+                        break
+
+                    pipe = self.redis.pipeline(transaction=False)
+                    for record_id in record_ids:
+                        pipe.exists(self._key(record_type, record_id))
+                    exists = await self._execute_with_retry(pipe.execute)
+
+                    missing = [
+                        record_id
+                        for record_id, found in zip(record_ids, exists)
+                        if not found
+                    ]
+                    if missing:
+                        await self._execute_with_retry(self.redis.zrem, index_key, *missing)
+                        pruned += len(missing)
+                    start += len(record_ids) - len(missing)
+
+                indexes_left += await self._execute_with_retry(self.redis.zcard, index_key)
+
+            if not indexes_left:
+                await self._execute_with_retry(self.redis.srem, tenants_key, tenant_id)
+
+        return pruned
+
     async def health_check(self) -> dict[str, Any]:
         """Perform storage health check."""
         try:
@@ -34,6 +34,7 @@ class StepDefinition(TypedDict, total=False):
     compensation_operation: Optional[str]  # Optional
     compensation_parameters: dict[str, Any]  # Optional, defaults to {}
     max_retries: int  # Optional, defaults to 3
+    depends_on: list[str]  # Optional, defaults to the previous step; [] for none
 
 
 class SagaWorkflowDefinition(TypedDict, total=False):
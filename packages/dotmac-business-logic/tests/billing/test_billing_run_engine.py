@@ -0,0 +1,357 @@
+"""
+Tests for the partitioned billing-run engine.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from dotmac_business_logic.billing.core.models import BillingCycle, SubscriptionStatus
+from dotmac_business_logic.billing.services import (
+    BillingRunEngine,
+    BillingService,
+    InMemoryBillingRunCheckpointStore,
+)
+
+BILLING_DATE = date(2024, 2, 1)
+
+
+class FakeStore:
+    """Committed rows shared by every session."""
+
+    def __init__(self):
+        self.plans = {}
+        self.customers = {}
+        self.subscriptions = {}
+        self.usage = []
+        self.invoices = []
+        self.line_items = []
+        self.commits = 0
+        self.insert_calls = 0
+
+
+class FakeRepo:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def get_many(self, ids, tenant_id=None):
+        return [
+            self.rows[i]
+            for i in ids
+            if i in self.rows and (tenant_id is None or self.rows[i].tenant_id == tenant_id)
+        ]
+
+
+class FakeSubscriptionRepo(FakeRepo):
+    def __init__(self, session):
+        super().__init__(session.store.subscriptions)
+        self.session = session
+
+    async def get_due_for_billing_keys(self, billing_date, tenant_id=None):
+        return sorted(
+            (s.tenant_id, s.id)
+            for s in self.rows.values()
+            if s.status == SubscriptionStatus.ACTIVE
+            and s.next_billing_date <= billing_date
+            and (tenant_id is None or s.tenant_id == tenant_id)
+        )
+
+    async def lock_due_for_billing(self, ids, billing_date, tenant_id=None):
+        self.session.locked_ids.extend(ids)
+        return [
+            s
+            for s in await self.get_many(ids, tenant_id)
+            if s.status == SubscriptionStatus.ACTIVE and s.next_billing_date <= billing_date
+        ]
+
+    async def bulk_update_next_billing_date(self, next_billing_dates):
+        self.session.pending_dates.update(next_billing_dates)
+        return len(next_billing_dates)
+
+
+class FakeInvoiceRepo:
+    def __init__(self, session):
+        self.session = session
+
+    async def bulk_create_with_line_items(self, invoices, line_items):
+        if self.session.fail_on is not None and self.session.fail_on in {
+            invoice["subscription_id"] for invoice in invoices
+        }:
+            raise RuntimeError("insert failed")
+        self.session.store.insert_calls += 1
+        self.session.pending_invoices.extend(invoices)
+        self.session.pending_lines.extend(line_items)
+        return len(invoices)
+
+
+class FakeUsageRepo:
+    def __init__(self, store):
+        self.store = store
+
+    async def get_usage_totals(self, subscription_ids, start_date, end_date):
+        wanted = set(subscription_ids)
+        totals = {}
+        for subscription_id, usage_date, quantity in self.store.usage:
+            if subscription_id in wanted and start_date <= usage_date <= end_date:
+                totals[subscription_id] = totals.get(subscription_id, Decimal("0")) + quantity
+        return totals
+
+
+class FakeSession:
+    def __init__(self, store, fail_on=None):
+        self.store = store
+        self.fail_on = fail_on
+        self.pending_invoices = []
+        self.pending_lines = []
+        self.pending_dates = {}
+        self.locked_ids = []
+        self.db = SimpleNamespace(commit=self.commit, rollback=self.rollback)
+        self.plan_repo = FakeRepo(store.plans)
+        self.customer_repo = FakeRepo(store.customers)
+        self.subscription_repo = FakeSubscriptionRepo(self)
+        self.invoice_repo = FakeInvoiceRepo(self)
+        self.usage_repo = FakeUsageRepo(store)
+
+    async def commit(self):
+        self.store.invoices.extend(self.pending_invoices)
+        self.store.line_items.extend(self.pending_lines)
+        for subscription_id, next_date in self.pending_dates.items():
+            self.store.subscriptions[subscription_id].next_billing_date = next_date
+        self.store.commits += 1
+        await self.rollback()
+
+    async def rollback(self):
+        self.pending_invoices = []
+        self.pending_lines = []
+        self.pending_dates = {}
+
+
+def make_factory(store, fail_on=None):
+    @asynccontextmanager
+    async def factory():
+        yield FakeSession(store, fail_on)
+
+    return factory
+
+
+def seed(store, tenants=2, per_tenant=5, **plan_fields):
+    plan_values = {
+        "name": "Basic",
+        "base_price": Decimal("50.00"),
+        "overage_price": None,
+        "included_usage": None,
+        "usage_unit": "GB",
+        "currency": "USD",
+        "billing_cycle": BillingCycle.MONTHLY,
+    }
+    plan_values.update(plan_fields)
+    for _ in range(tenants):
+        tenant_id = uuid4()
+        plan = SimpleNamespace(id=uuid4(), tenant_id=tenant_id, **plan_values)
+        store.plans[plan.id] = plan
+        for _ in range(per_tenant):
+            customer = SimpleNamespace(id=uuid4(), tenant_id=tenant_id)
+            store.customers[customer.id] = customer
+            subscription = SimpleNamespace(
+                id=uuid4(),
+                tenant_id=tenant_id,
+                customer_id=customer.id,
+                billing_plan_id=plan.id,
+                status=SubscriptionStatus.ACTIVE,
+                start_date=date(2024, 1, 1),
+                next_billing_date=BILLING_DATE,
+                custom_price=None,
+                quantity=1,
+            )
+            store.subscriptions[subscription.id] = subscription
+    return store
+
+
+class TestBillingRunEngine:
+    """Test chunking, set-based writes and resumption."""
+
+    async def test_bills_every_due_subscription_in_tenant_chunks(self):
+        store = seed(FakeStore(), tenants=2, per_tenant=5)
+        engine = BillingRunEngine(make_factory(store), chunk_size=2, max_workers=3)
+
+        chunks = await engine.plan_chunks(BILLING_DATE)
+        assert len(chunks) == 6  # 3 chunks of <=2 per tenant
+        for chunk in chunks:
+            assert list(chunk.subscription_ids) == sorted(chunk.subscription_ids)
+            assert {store.subscriptions[i].tenant_id for i in chunk.subscription_ids} == {
+                chunk.tenant_id
+            }
+
+        results = await engine.run(BILLING_DATE)
+
+        assert results["processed_count"] == 10
+        assert results["failed_count"] == 0
+        assert results["total_amount"] == Decimal("500.00")
+        assert store.insert_calls == 6
+        assert store.commits == 6
+        assert len(store.invoices) == 10
+        assert len(store.line_items) == 10
+        assert {s.next_billing_date for s in store.subscriptions.values()} == {
+            date(2024, 3, 1)
+        }
+        for invoice in store.invoices:
+            subscription = store.subscriptions[invoice["subscription_id"]]
+            assert invoice["tenant_id"] == subscription.tenant_id
+            assert invoice["due_date"] == date(2024, 3, 2)
+
+    async def test_usage_overage_and_tax_lines(self):
+        store = seed(
+            FakeStore(),
+            tenants=1,
+            per_tenant=1,
+            overage_price=Decimal("2.00"),
+            included_usage=Decimal("10"),
+        )
+        subscription = next(iter(store.subscriptions.values()))
+        store.usage = [
+            (subscription.id, date(2024, 1, 15), Decimal("12")),
+            (subscription.id, date(2024, 2, 1), Decimal("3")),
+            (subscription.id, date(2024, 2, 2), Decimal("100")),  # after period
+        ]
+        tax_service = AsyncMock()
+        tax_service.calculate_tax.return_value = {
+            "amount": "5.00",
+            "tax_type": "sales_tax",
+            "rate": "0.1",
+        }
+        subscription.next_billing_date = date(2024, 1, 1)
+        engine = BillingRunEngine(make_factory(store), tax_service=tax_service)
+
+        results = await engine.run(BILLING_DATE)
+
+        assert results["processed_count"] == 1
+        [invoice] = store.invoices
+        assert invoice["subtotal"] == Decimal("60.00")
+        assert invoice["tax_amount"] == Decimal("10.00")
+        assert invoice["total_amount"] == Decimal("70.00")
+        assert invoice["tax_type"] == "sales_tax"
+        usage_line = [line for line in store.line_items if line["quantity"] == Decimal("5")]
+        assert usage_line and usage_line[0]["line_total"] == Decimal("10.00")
+        assert all(line["invoice_id"] == invoice["id"] for line in store.line_items)
+
+    async def test_failed_chunk_rolls_back_and_others_commit(self):
+        store = seed(FakeStore(), tenants=1, per_tenant=4)
+        first = min(store.subscriptions)
+        engine = BillingRunEngine(make_factory(store, fail_on=first), chunk_size=2)
+
+        results = await engine.run(BILLING_DATE)
+
+        assert results["processed_count"] == 2
+        assert results["failed_count"] == 2
+        assert results["failed_chunks"] == 1
+        assert results["errors"][0]["first_id"] == first
+        assert len(store.invoices) == 2
+        assert store.subscriptions[first].next_billing_date == BILLING_DATE
+
+    async def test_bad_subscription_fails_alone(self):
+        store = seed(FakeStore(), tenants=2, per_tenant=2)
+        tenant_a, tenant_b = sorted({s.tenant_id for s in store.subscriptions.values()})
+        a_subs = sorted(s.id for s in store.subscriptions.values() if s.tenant_id == tenant_a)
+        b_plan = next(p for p in store.plans.values() if p.tenant_id == tenant_b)
+        global_plan = SimpleNamespace(**{**vars(b_plan), "id": uuid4(), "tenant_id": None})
+        store.plans[global_plan.id] = global_plan
+        # One subscription on another tenant's plan, one on a global plan,
+        # one whose customer is gone
+        store.subscriptions[a_subs[0]].billing_plan_id = b_plan.id
+        store.subscriptions[a_subs[1]].billing_plan_id = global_plan.id
+        b_sub = next(s for s in store.subscriptions.values() if s.tenant_id == tenant_b)
+        del store.customers[b_sub.customer_id]
+        engine = BillingRunEngine(make_factory(store), chunk_size=2)
+
+        results = await engine.run(BILLING_DATE)
+
+        assert results["processed_count"] == 2
+        assert results["failed_count"] == 2
+        assert results["failed_chunks"] == 0
+        assert {e["subscription_id"] for e in results["errors"]} == {a_subs[0], b_sub.id}
+        assert "not found" in results["errors"][0]["error"]
+        other_b_sub = next(
+            s.id for s in store.subscriptions.values() if s.tenant_id == tenant_b and s is not b_sub
+        )
+        assert {i["subscription_id"] for i in store.invoices} == {a_subs[1], other_b_sub}
+        assert store.subscriptions[a_subs[0]].next_billing_date == BILLING_DATE
+
+    async def test_due_subscriptions_are_locked_before_billing(self):
+        store = seed(FakeStore(), tenants=1, per_tenant=2)
+        session = FakeSession(store)
+
+        @asynccontextmanager
+        async def factory():
+            yield session
+
+        engine = BillingRunEngine(factory)
+        chunk = (await engine.plan_chunks(BILLING_DATE))[0]
+        # Billed by a concurrent run after this one planned its chunks
+        store.subscriptions[chunk.first_id].next_billing_date = date(2024, 3, 1)
+
+        processed, _, failures = await engine._write_chunk(session, chunk, BILLING_DATE)
+
+        assert session.locked_ids == list(chunk.subscription_ids)
+        assert processed == 1
+        assert failures == []
+
+    async def test_resume_skips_checkpointed_chunks(self):
+        store = seed(FakeStore(), tenants=1, per_tenant=4)
+        first = min(store.subscriptions)
+        checkpoints = InMemoryBillingRunCheckpointStore()
+
+        failing = BillingRunEngine(
+            make_factory(store, fail_on=first), chunk_size=2, checkpoint_store=checkpoints
+        )
+        first_attempt = await failing.run(BILLING_DATE, run_id="run-1")
+        assert first_attempt["processed_count"] == 2
+
+        # Pretend the committed chunk was not advanced, so only the
+        # checkpoint stops it from being billed twice.
+        for subscription in store.subscriptions.values():
+            subscription.next_billing_date = BILLING_DATE
+
+        engine = BillingRunEngine(make_factory(store), chunk_size=2, checkpoint_store=checkpoints)
+        results = await engine.run(BILLING_DATE, run_id="run-1")
+
+        assert results["chunk_count"] == 1
+        assert results["processed_count"] == 4
+        assert results["total_amount"] == Decimal("200.00")
+        assert len(store.invoices) == 4
+
+    async def test_rejects_invalid_pool_settings(self):
+        with pytest.raises(ValueError):
+            BillingRunEngine(make_factory(FakeStore()), chunk_size=0)
+        with pytest.raises(ValueError):
+            BillingRunEngine(make_factory(FakeStore()), max_workers=0)
+
+
+class TestBillingServiceDelegation:
+    """Test that BillingService hands the cycle to the engine."""
+
+    async def test_run_billing_cycle_uses_engine(self):
+        store = seed(FakeStore(), tenants=1, per_tenant=3)
+        session = FakeSession(store)
+        service = BillingService(
+            db=session.db,
+            customer_repo=session.customer_repo,
+            plan_repo=session.plan_repo,
+            subscription_repo=session.subscription_repo,
+            invoice_repo=session.invoice_repo,
+            payment_repo=AsyncMock(),
+            usage_repo=session.usage_repo,
+        )
+        service.billing_run_engine = BillingRunEngine.for_service(
+            service, chunk_size=2, max_workers=8
+        )
+        assert service.billing_run_engine.max_workers == 1
+
+        results = await service.run_billing_cycle(BILLING_DATE)
+
+        assert results["processed_count"] == 3
+        assert store.commits == 2
@@ -0,0 +1,195 @@
+"""
+Tests for process-pool PDF rendering into a storage backend.
+"""
+
+import importlib
+import multiprocessing
+import os
+import sys
+import types
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+from dotmac_business_logic.files.storage.backends import LocalFileStorage  # noqa: E402
+
+ISP_PACKAGE = "dotmac_business_logic.billing.isp"
+TENANT = "tenant-1"
+ISSUED = datetime(2024, 3, 1)
+
+
+class Method(Enum):
+    CARD = "credit_card"
+
+
+class Status(Enum):
+    COMPLETED = "completed"
+
+
+@pytest.fixture(scope="module")
+def pdf():
+    """
+    Import pdf_rendering without the billing.isp package __init__.
+
+    The package __init__ pulls in routers and the ORM models, neither of
+    which import in this tree; the layout code only needs the model names.
+    """
+    import dotmac_business_logic.billing as billing
+
+    package = types.ModuleType(ISP_PACKAGE)
+    package.__path__ = [str(Path(billing.__file__).parent / "isp")]
+    models = types.ModuleType(f"{ISP_PACKAGE}.models")
+    for name in ("Invoice", "InvoiceLineItem", "Payment", "Receipt"):
+        setattr(models, name, type(name, (), {}))
+
+    # Stay in sys.modules while tests run so pool jobs pickle by module path
+    with mock.patch.dict(
+        sys.modules, {ISP_PACKAGE: package, f"{ISP_PACKAGE}.models": models}
+    ):
+        yield (
+            importlib.import_module(f"{ISP_PACKAGE}.pdf_rendering"),
+            importlib.import_module(f"{ISP_PACKAGE}.pdf_generator"),
+        )
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalFileStorage(str(tmp_path))
+
+
+def _issued_or_die(marker):
+    """Unpickled in a pool worker: kill it the first time, then behave."""
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return ISSUED
+
+
+class CrashOnce:
+    """Invoice date that takes down the first worker to unpickle it."""
+
+    def __init__(self, marker):
+        self.marker = str(marker)
+
+    def __reduce__(self):
+        return _issued_or_die, (self.marker,)
+
+
+def make_invoice(number, customer_id="c1", **fields):
+    fields.setdefault("invoice_date", ISSUED)
+    return SimpleNamespace(
+        invoice_number=number,
+        customer_id=customer_id,
+        due_date=ISSUED,
+        subtotal=Decimal("50.00"),
+        discount_amount=Decimal("0"),
+        tax_amount=Decimal("5.00"),
+        total_amount=Decimal("55.00"),
+        paid_amount=Decimal("55.00"),
+        balance_due=Decimal("0"),
+        line_items=[
+            SimpleNamespace(
+                description="Fiber 100",
+                quantity=Decimal("1"),
+                unit_price=Decimal("50.00"),
+                tax_amount=Decimal("5.00"),
+                line_total=Decimal("55.00"),
+            )
+        ],
+        payments=[
+            SimpleNamespace(
+                payment_date=ISSUED,
+                payment_method=Method.CARD,
+                amount=Decimal("55.00"),
+                status=Status.COMPLETED,
+                reference_number=None,
+                transaction_id="txn-1",
+            )
+        ],
+        **fields,
+    )
+
+
+class TestPDFRenderingService:
+    """Render on a process pool, stream to storage and keep stats."""
+
+    async def test_batch_records_failures_and_merges_per_reseller(self, pdf, storage):
+        pdf_rendering, _ = pdf
+        invoices = [make_invoice(f"INV-{i}") for i in range(4)]
+        # Layout calls invoice_date.strftime() inside the worker
+        invoices.append(make_invoice("INV-bad", invoice_date=None))
+        customers = {"c1": {"name": "Acme", "email": "billing@acme.test"}}
+
+        async with pdf_rendering.PDFRenderingService(
+            storage,
+            max_workers=2,
+            max_pending=2,
+            mp_context=multiprocessing.get_context("fork"),
+        ) as service:
+            results = await service.render_invoices(invoices, customers, TENANT)
+            merged = await service.render_merged_invoices(
+                {"reseller-1": invoices[:3], "reseller-2": []}, customers, TENANT
+            )
+            stats = service.stats.to_dict()
+
+        by_key = {result.key: result for result in results}
+        assert [result.key for result in results] == [inv.invoice_number for inv in invoices]
+        assert not by_key["INV-bad"].succeeded
+        assert by_key["INV-bad"].storage_path is None
+        for key in ("INV-0", "INV-1", "INV-2", "INV-3"):
+            stored = Path(by_key[key].storage_path)
+            assert stored == storage.base_path / TENANT / "invoices" / f"{key}.pdf"
+            assert stored.read_bytes().startswith(b"%PDF")
+            assert stored.stat().st_size == by_key[key].size
+
+        assert [result.key for result in merged] == ["reseller-1"]
+        merged_path = Path(merged[0].storage_path)
+        assert merged_path == storage.base_path / TENANT / "invoices/merged/reseller-1.pdf"
+        assert merged_path.read_bytes().count(b"/Type /Page\n") == 3
+        assert merged[0].size > by_key["INV-0"].size
+
+        assert stats["documents"] == 6
+        assert stats["failures"] == 1
+        assert stats["bytes_written"] == sum(
+            result.size for result in results + merged if result.succeeded
+        )
+        assert 0 < stats["avg_render_seconds"] <= stats["max_render_seconds"]
+        assert service._executor is None
+        assert service._spool_dir is None
+
+    async def test_broken_pool_is_replaced_and_batch_retried(
+        self, pdf, storage, tmp_path
+    ):
+        pdf_rendering, _ = pdf
+        invoices = [make_invoice(f"INV-{i}") for i in range(3)]
+        invoices.append(
+            make_invoice("INV-crash", invoice_date=CrashOnce(tmp_path / "crashed"))
+        )
+
+        async with pdf_rendering.PDFRenderingService(
+            storage, max_workers=2, mp_context=multiprocessing.get_context("fork")
+        ) as service:
+            first_pool = service._executor
+            results = await service.render_invoices(invoices, {}, TENANT)
+            assert service._executor is not None
+            assert service._executor is not first_pool
+
+        assert (tmp_path / "crashed").exists()
+        assert [result.error for result in results] == [None] * 4
+        for result in results:
+            assert Path(result.storage_path).read_bytes().startswith(b"%PDF")
+        assert service.stats.documents == 4
+        assert service.stats.failures == 0
+
+    def test_batch_processor_is_deprecated(self, pdf):
+        _, pdf_generator = pdf
+
+        with pytest.warns(DeprecationWarning, match="PDFRenderingService"):
+            pdf_generator.PDFBatchProcessor()
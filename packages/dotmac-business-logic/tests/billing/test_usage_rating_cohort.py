@@ -0,0 +1,186 @@
+"""
+Tests for cohort usage rating against the Decimal reference implementation.
+"""
+
+import random
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from dotmac_business_logic.billing.core.models import BillingCycle, BillingPeriodValue
+from dotmac_business_logic.billing.usage.rating import (
+    CompiledTariff,
+    TieredPricingEngine,
+    UsageAggregator,
+    UsageRatingEngine,
+    UsageTotal,
+)
+
+PERIOD = BillingPeriodValue(
+    start_date=date(2024, 1, 1), end_date=date(2024, 1, 31), cycle=BillingCycle.MONTHLY
+)
+
+TIERED = {
+    'pricing_model': 'tiered',
+    'description': 'Data transfer',
+    'tiers': [
+        {'name': 'Bulk', 'min_quantity': 1000, 'unit_price': '0.05'},
+        {'name': 'First', 'min_quantity': 0, 'max_quantity': 100, 'unit_price': '0.125'},
+        {'name': 'Second', 'min_quantity': 100, 'max_quantity': 1000, 'unit_price': '0.0875'},
+    ],
+    'volume_discounts': [
+        {'name': 'Silver', 'min_quantity': 500, 'discount_percent': 5},
+        {'name': 'Gold', 'min_quantity': 2000, 'discount_percent': '12.5'},
+        {'name': 'Gold duplicate', 'min_quantity': 2000, 'discount_percent': 50},
+    ],
+}
+GAPPED = {
+    'pricing_model': 'tiered',
+    'tiers': [
+        {'min_quantity': 10, 'max_quantity': 50, 'unit_price': '1.10'},
+        {'min_quantity': 80, 'max_quantity': 120, 'unit_price': '0.90'},
+        {'min_quantity': 120, 'unit_price': '0.30'},
+    ],
+}
+FLAT = {'unit_price': '0.015', 'taxable': False}
+
+
+def make_plan(**usage_pricing):
+    return SimpleNamespace(
+        id=uuid4(),
+        usage_allowances={'data': Decimal('25'), 'calls': Decimal('0')},
+        usage_pricing=usage_pricing,
+    )
+
+
+async def reference_items(plan, subscription_id, totals):
+    """Rate one subscription with rate_usage_for_subscription."""
+    records = [
+        SimpleNamespace(
+            subscription_id=subscription_id,
+            meter_type=total.metric_name,
+            service_identifier=None,
+            quantity=total.quantity,
+            unit=total.unit,
+        )
+        for total in totals
+    ]
+    subscription = SimpleNamespace(id=subscription_id, billing_plan=plan)
+    return await UsageRatingEngine().rate_usage_for_subscription(subscription, PERIOD, records)
+
+
+class TestCompiledTariff:
+    """Test compiled tariffs against TieredPricingEngine."""
+
+    @pytest.mark.parametrize('config', [TIERED, GAPPED])
+    def test_charge_matches_tiered_pricing(self, config):
+        tariff = CompiledTariff(config)
+        engine = TieredPricingEngine()
+        quantities = [Decimal(q) for q in ('0', '5', '10', '10.000001', '50', '79', '80', '99.5',
+                                           '100', '101', '120', '999.999999', '1000', '5000.25')]
+        for quantity in quantities:
+            expected = engine.calculate_tiered_pricing(quantity, config['tiers'])['total_charge']
+            fixed = tariff.charge(int(quantity.scaleb(tariff.quantity_scale)))
+            assert Decimal(fixed).scaleb(-tariff.charge_scale) == expected, quantity
+
+    def test_rejects_inverted_tier_and_excess_precision(self):
+        with pytest.raises(ValueError):
+            CompiledTariff({
+                'pricing_model': 'tiered',
+                'tiers': [
+                    {'min_quantity': 0, 'max_quantity': 10, 'unit_price': 1},
+                    {'min_quantity': 20, 'max_quantity': 15, 'unit_price': 1},
+                ],
+            })
+        with pytest.raises(ValueError):
+            CompiledTariff({'pricing_model': 'tiered', 'tiers': [
+                {'min_quantity': '0.0000001', 'unit_price': 1},
+            ]})
+
+
+class TestRateCohort:
+    """Test cohort rating equals per-subscription Decimal rating."""
+
+    async def test_matches_reference_for_random_cohort(self):
+        rng = random.Random(42)
+        plans = [
+            make_plan(data_overage=TIERED, calls_overage=FLAT),
+            make_plan(data_overage=GAPPED),
+            make_plan(calls_overage=FLAT),
+        ]
+        billing_plans = {}
+        usage_totals = []
+        for _ in range(300):
+            subscription_id = uuid4()
+            billing_plans[subscription_id] = rng.choice(plans)
+            for metric, unit in (('data', 'GB'), ('calls', 'calls'), ('sms', 'msgs')):
+                if rng.random() < 0.8:
+                    quantity = Decimal(rng.randint(0, 4_000_000_000)).scaleb(-6)
+                    usage_totals.append(UsageTotal(subscription_id, metric, quantity, unit))
+
+        tariff_cache = {}
+        rated = UsageRatingEngine().rate_cohort(usage_totals, billing_plans, PERIOD, tariff_cache)
+
+        assert len(tariff_cache) == len(plans)
+        by_subscription = {}
+        for total in usage_totals:
+            by_subscription.setdefault(total.subscription_id, []).append(total)
+        for subscription_id, totals in by_subscription.items():
+            expected = await reference_items(billing_plans[subscription_id], subscription_id, totals)
+            assert rated.get(subscription_id, []) == expected
+
+    async def test_volume_discount_and_allowance(self):
+        plan = make_plan(data_overage=TIERED)
+        subscription_id = uuid4()
+        totals = [UsageTotal(subscription_id, 'data', Decimal('2025'), 'GB')]
+
+        rated = UsageRatingEngine().rate_cohort(totals, {subscription_id: plan}, PERIOD)
+
+        [item] = rated[subscription_id]
+        assert item['quantity'] == Decimal('2000')  # 25 GB allowance
+        discount = item['pricing_details']['volume_discount']
+        assert discount['discount_name'] == 'Gold'
+        assert item['amount'] == item['pricing_details']['base_charge'] * Decimal('0.875')
+        assert item == (await reference_items(plan, subscription_id, totals))[0]
+
+    def test_usage_within_allowance_is_omitted(self):
+        plan = make_plan(data_overage=TIERED)
+        subscription_id = uuid4()
+        totals = [UsageTotal(subscription_id, 'data', Decimal('25'), 'GB')]
+
+        assert UsageRatingEngine().rate_cohort(totals, {subscription_id: plan}, PERIOD) == {}
+
+
+class TestAggregateCohort:
+    """Test in-memory cohort aggregation."""
+
+    async def test_matches_aggregate_usage_for_period(self):
+        subscription_id = uuid4()
+        records = [
+            SimpleNamespace(subscription_id=subscription_id, meter_type='data',
+                            service_identifier=None, quantity=Decimal('1.5'), unit='GB',
+                            peak_usage=Decimal('3')),
+            SimpleNamespace(subscription_id=subscription_id, meter_type=None,
+                            service_identifier='data', quantity=Decimal('2.25'), unit='GB',
+                            peak_usage=Decimal('7')),
+            SimpleNamespace(subscription_id=uuid4(), meter_type='data',
+                            service_identifier=None, quantity=Decimal('9'), unit='GB',
+                            peak_usage=Decimal('9')),
+        ]
+        aggregator = UsageAggregator()
+
+        totals = {
+            (t.subscription_id, t.metric_name): t for t in aggregator.aggregate_cohort(records)
+        }
+        expected = await aggregator.aggregate_usage_for_period(
+            subscription_id, PERIOD, records[:2]
+        )
+
+        total = totals[(subscription_id, 'data')]
+        assert total.quantity == expected['data'].quantity == Decimal('3.75')
+        assert total.peak_usage == Decimal('7')
+        assert total.records_count == 2
+        assert len(totals) == 2
@@ -0,0 +1,387 @@
+"""
+Tests for streamed, range-aware storage I/O and the file router.
+"""
+
+import asyncio
+import io
+import os
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+
+from dotmac_business_logic.files.storage import backends
+from dotmac_business_logic.files.storage.backends import (
+    S3_MIN_PART_SIZE,
+    ByteRange,
+    LocalFileStorage,
+    MultipartUploadError,
+    RangeNotSatisfiableError,
+    S3FileStorage,
+    parse_range_header,
+)
+from dotmac_business_logic.files.storage.router import create_file_router
+from dotmac_business_logic.files.storage.tenant_storage import (
+    TenantQuota,
+    TenantStorageManager,
+)
+
+TENANT = "tenant-1"
+
+
+async def stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+
+class TestParseRangeHeader:
+    """Test HTTP Range header parsing."""
+
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            (None, None),
+            ("bytes=0-99", ByteRange(0, 99)),
+            ("bytes=900-", ByteRange(900, 999)),
+            ("bytes=-100", ByteRange(900, 999)),
+            ("bytes=-5000", ByteRange(0, 999)),
+            ("bytes=10-5000", ByteRange(10, 999)),
+            ("bytes=0-1,5-6", None),
+            ("bytes=9-1", None),
+            ("items=0-1", None),
+            ("bytes=abc", None),
+        ],
+    )
+    def test_parses_single_ranges(self, header, expected):
+        assert parse_range_header(header, 1000) == expected
+
+    @pytest.mark.parametrize("header", ["bytes=1000-", "bytes=-0"])
+    def test_unsatisfiable(self, header):
+        with pytest.raises(RangeNotSatisfiableError):
+            parse_range_header(header, 1000)
+
+
+class TestLocalFileStreaming:
+    """Test chunked local reads and writes."""
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        return LocalFileStorage(str(tmp_path), chunk_size=7)
+
+    async def test_save_stream_and_iter_ranges(self, storage):
+        data = bytes(range(256)) * 4
+        await storage.save_stream("exports/cdr.bin", stream(data[:300], data[300:]), TENANT)
+
+        assert await collect(storage.iter_file("exports/cdr.bin", TENANT, chunk_size=64)) == data
+        chunks = [
+            chunk
+            async for chunk in storage.iter_file(
+                "exports/cdr.bin", TENANT, ByteRange(100, 299), chunk_size=64
+            )
+        ]
+        assert b"".join(chunks) == data[100:300]
+        assert max(len(chunk) for chunk in chunks) == 64
+
+    async def test_save_file_and_get_file(self, storage):
+        await storage.save_file("report.csv", io.BytesIO(b"a,b\n1,2\n"), TENANT)
+
+        handle = await storage.get_file("report.csv", TENANT)
+        assert isinstance(handle, io.BytesIO)
+        assert handle.read() == b"a,b\n1,2\n"
+
+    async def test_concurrent_saves_do_not_interleave(self, storage):
+        first_started = asyncio.Event()
+        release_first = asyncio.Event()
+
+        async def slow(data):
+            yield data[:5]
+            first_started.set()
+            await release_first.wait()
+            yield data[5:]
+
+        first = asyncio.create_task(
+            storage.save_stream("report.csv", slow(b"a" * 10), TENANT)
+        )
+        await first_started.wait()
+        await storage.save_stream("report.csv", stream(b"b" * 10), TENANT)
+        release_first.set()
+        await first
+
+        assert await collect(storage.iter_file("report.csv", TENANT)) == b"a" * 10
+        assert [p.name for p in (storage.base_path / TENANT).iterdir()] == ["report.csv"]
+
+    async def test_failed_stream_leaves_no_file(self, storage):
+        async def broken():
+            yield b"partial"
+            raise ConnectionError("client went away")
+
+        with pytest.raises(ConnectionError):
+            await storage.save_stream("backup.tar", broken(), TENANT)
+
+        assert not await storage.file_exists("backup.tar", TENANT)
+        assert list((storage.base_path / TENANT).iterdir()) == []
+
+
+class FakeS3Client:
+    """In-memory stand-in for the boto3 calls S3FileStorage makes."""
+
+    def __init__(self, fail_part=None):
+        self.fail_part = fail_part
+        self.objects = {}
+        self.uploads = {}
+        self.calls = []
+
+    def head_bucket(self, Bucket):
+        pass
+
+    def put_object(self, Bucket, Key, Body, Metadata=None):
+        self.calls.append("put_object")
+        self.objects[Key] = bytes(Body)
+
+    def create_multipart_upload(self, Bucket, Key, Metadata=None):
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.calls.append(("upload_part", PartNumber))
+        if PartNumber == self.fail_part:
+            raise ConnectionError("part upload failed")
+        self.uploads[UploadId][PartNumber] = bytes(Body)
+        return {"ETag": f'"etag-{PartNumber}"'}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.calls.append("abort_multipart_upload")
+        del self.uploads[UploadId]
+
+    def list_parts(self, Bucket, Key, UploadId, PartNumberMarker=0):
+        parts = [
+            {"PartNumber": number, "ETag": f'"etag-{number}"', "Size": len(body)}
+            for number, body in sorted(self.uploads[UploadId].items())
+            if number > PartNumberMarker
+        ]
+        return {
+            "Parts": parts[:1],
+            "IsTruncated": len(parts) > 1,
+            "NextPartNumberMarker": parts[0]["PartNumber"] if parts else 0,
+        }
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        assert numbers == sorted(self.uploads[UploadId])
+        parts = self.uploads.pop(UploadId)
+        self.objects[Key] = b"".join(parts[number] for number in numbers)
+
+    def get_object(self, Bucket, Key, Range=None):
+        data = self.objects[Key]
+        if Range:
+            start, end = (int(v) for v in Range.removeprefix("bytes=").split("-"))
+            data = data[start : end + 1]
+        return {"Body": io.BytesIO(data)}
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    client = FakeS3Client()
+    monkeypatch.setattr(backends, "HAS_BOTO3", True)
+    monkeypatch.setattr(
+        backends, "boto3", SimpleNamespace(client=lambda *a, **k: client), raising=False
+    )
+    return S3FileStorage("bucket", part_size=S3_MIN_PART_SIZE, max_concurrency=2)
+
+
+class TestS3Streaming:
+    """Test multipart uploads and ranged downloads against a fake client."""
+
+    async def test_small_file_uses_single_put(self, s3):
+        await s3.save_file("small.txt", io.BytesIO(b"hello"), TENANT)
+
+        assert s3.s3_client.calls == ["put_object"]
+        assert s3.s3_client.objects[f"{TENANT}/small.txt"] == b"hello"
+
+    async def test_large_stream_uploads_parts(self, s3):
+        data = os.urandom(2 * S3_MIN_PART_SIZE + 123)
+
+        await s3.save_stream(
+            "big.bin",
+            stream(*[data[i : i + 999_999] for i in range(0, len(data), 999_999)]),
+            TENANT,
+        )
+
+        assert s3.s3_client.objects[f"{TENANT}/big.bin"] == data
+        assert sorted(c[1] for c in s3.s3_client.calls) == [1, 2, 3]
+        ranged = await collect(s3.iter_file("big.bin", TENANT, ByteRange(10, 4000), 1024))
+        assert ranged == data[10:4001]
+
+    async def test_failed_upload_resumes_with_upload_id(self, s3):
+        data = os.urandom(3 * S3_MIN_PART_SIZE)
+        s3.s3_client.fail_part = 3
+
+        with pytest.raises(MultipartUploadError) as failure:
+            await s3.save_file("backup.tar", io.BytesIO(data), TENANT)
+
+        s3.s3_client.fail_part = None
+        s3.s3_client.calls.clear()
+        await s3.save_stream("backup.tar", stream(data), TENANT, upload_id=failure.value.upload_id)
+
+        assert s3.s3_client.calls == [("upload_part", 3)]
+        assert s3.s3_client.objects[f"{TENANT}/backup.tar"] == data
+
+    def test_rejects_parts_below_s3_minimum(self, s3):
+        with pytest.raises(ValueError):
+            S3FileStorage("bucket", part_size=1024)
+
+
+class TestTenantStreamQuota:
+    """Streamed uploads are counted against the quota as they arrive."""
+
+    @staticmethod
+    def manager(storage, max_file_size=1000, max_storage_bytes=10_000):
+        return TenantStorageManager(
+            storage,
+            TenantQuota(
+                max_storage_bytes=max_storage_bytes,
+                max_files=10,
+                allowed_file_types={"bin"},
+                max_file_size=max_file_size,
+            ),
+        )
+
+    async def test_undeclared_oversize_stream_is_aborted(self, tmp_path):
+        storage = LocalFileStorage(str(tmp_path))
+        manager = self.manager(storage)
+        await manager.save_stream("data.bin", stream(b"old"), TENANT)
+
+        with pytest.raises(ValueError, match="File size exceeds maximum 1000"):
+            await manager.save_stream("data.bin", stream(b"x" * 600, b"x" * 600), TENANT)
+
+        assert await collect(storage.iter_file("data.bin", TENANT)) == b"old"
+        assert [p.name for p in (storage.base_path / TENANT).iterdir()] == ["data.bin"]
+
+    async def test_stream_counted_against_remaining_storage(self, tmp_path):
+        storage = LocalFileStorage(str(tmp_path))
+        manager = self.manager(storage, max_storage_bytes=1500)
+        await manager.save_stream("a.bin", stream(b"x" * 1000), TENANT)
+
+        with pytest.raises(ValueError, match="Storage quota exceeded"):
+            await manager.save_stream("b.bin", stream(b"x" * 300, b"x" * 300), TENANT)
+        assert not await storage.file_exists("b.bin", TENANT)
+
+        await manager.save_stream("b.bin", stream(b"x" * 300, b"x" * 200), TENANT)
+        assert await storage.file_exists("b.bin", TENANT)
+
+    async def test_over_quota_multipart_upload_is_aborted(self, s3):
+        manager = self.manager(
+            s3, max_file_size=2 * S3_MIN_PART_SIZE + 1, max_storage_bytes=10 * S3_MIN_PART_SIZE
+        )
+        part = b"x" * S3_MIN_PART_SIZE
+
+        with pytest.raises(ValueError, match="File size exceeds maximum"):
+            await manager.save_stream("big.bin", stream(part, part, part), TENANT)
+
+        assert s3.s3_client.calls[-1] == "abort_multipart_upload"
+        assert s3.s3_client.uploads == {}
+        assert f"{TENANT}/big.bin" not in s3.s3_client.objects
+
+
+async def call_app(app, method, path, headers=(), extensions=None):
+    """Drive an ASGI app once and collect what it sends."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers],
+        "client": ("test", 1),
+        "server": ("test", 80),
+        "extensions": extensions or {},
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.zerocopysend":
+            handle = message["file"]
+            handle.seek(message.get("offset", 0))
+            message = dict(message, body=handle.read(message.get("count", -1)))
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start = messages[0]
+    return (
+        start["status"],
+        {k.decode(): v.decode() for k, v in start["headers"]},
+        b"".join(m.get("body", b"") for m in messages[1:]),
+        [m["type"] for m in messages[1:]],
+    )
+
+
+class TestFileRouter:
+    """Test range-aware serving through the file router."""
+
+    @pytest.fixture
+    async def app(self, tmp_path):
+        storage = LocalFileStorage(str(tmp_path))
+        await storage.save_file("reports/q1.csv", bytes(range(200)), TENANT)
+        app = FastAPI()
+        app.include_router(
+            create_file_router(storage, lambda: TENANT, chunk_size=64), prefix="/files"
+        )
+        return app
+
+    async def test_streams_whole_file(self, app):
+        status, headers, body, types = await call_app(app, "GET", "/files/reports/q1.csv")
+
+        assert status == 200
+        assert headers["content-length"] == "200"
+        assert headers["accept-ranges"] == "bytes"
+        assert body == bytes(range(200))
+        assert len(types) == 5  # four 64-byte reads and the closing message
+
+    async def test_partial_content(self, app):
+        status, headers, body, _ = await call_app(
+            app, "GET", "/files/reports/q1.csv", [("Range", "bytes=-50")]
+        )
+
+        assert status == 206
+        assert headers["content-range"] == "bytes 150-199/200"
+        assert body == bytes(range(150, 200))
+
+    async def test_zero_copy_extension(self, app):
+        status, _, body, types = await call_app(
+            app,
+            "GET",
+            "/files/reports/q1.csv",
+            [("Range", "bytes=10-19")],
+            {"http.response.zerocopysend": {}},
+        )
+
+        assert status == 206
+        assert types == ["http.response.zerocopysend"]
+        assert body == bytes(range(10, 20))
+
+    async def test_errors_and_head(self, app):
+        status, headers, _, _ = await call_app(
+            app, "GET", "/files/reports/q1.csv", [("Range", "bytes=500-")]
+        )
+        assert status == 416
+        assert headers["content-range"] == "bytes */200"
+
+        status, _, _, _ = await call_app(app, "GET", "/files/missing.csv")
+        assert status == 404
+
+        status, headers, body, _ = await call_app(app, "HEAD", "/files/reports/q1.csv")
+        assert status == 200
+        assert headers["content-length"] == "200"
+        assert body == b""
@@ -0,0 +1,133 @@
+"""
+Tests for tenant indexes in the Redis background-operations storage.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from dotmac_business_logic.tasks.tasks.storage.redis import RedisStorage  # noqa: E402
+
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def storage():
+    """RedisStorage backed by an in-process fake Redis server."""
+    storage = RedisStorage(prefix="test")
+    storage.redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    return storage
+
+
+def operation(operation_id, tenant_id, minutes):
+    return {
+        "operation_id": operation_id,
+        "tenant_id": tenant_id,
+        "operation_type": "provision",
+        "status": "pending",
+        "created_at": (BASE + timedelta(minutes=minutes)).isoformat(),
+        "result": {"ok": True},
+    }
+
+
+def saga(saga_id, tenant_id, minutes):
+    return {
+        "saga_id": saga_id,
+        "tenant_id": tenant_id,
+        "workflow_type": "onboarding",
+        "steps": [],
+        "created_at": (BASE + timedelta(minutes=minutes)).isoformat(),
+    }
+
+
+class TestRedisStorageTenantIndexes:
+    """Tenant listing reads a per-tenant index instead of scanning keys."""
+
+    async def test_operations_listed_newest_first_with_pagination(self, storage):
+        for minutes in (3, 1, 4, 2, 0):
+            await storage.set_operation(f"op-{minutes}", operation(f"op-{minutes}", "t1", minutes))
+        await storage.set_operation("other", operation("other", "t2", 10))
+
+        page = await storage.list_operations_by_tenant("t1", limit=2)
+        assert [op["operation_id"] for op in page] == ["op-4", "op-3"]
+        assert page[0]["result"] == {"ok": True}
+
+        page = await storage.list_operations_by_tenant("t1", limit=2, offset=2)
+        assert [op["operation_id"] for op in page] == ["op-2", "op-1"]
+
+        assert await storage.list_operations_by_tenant("t1", limit=0) == []
+        assert [op["operation_id"] for op in await storage.list_operations_by_tenant("t2")] == [
+            "other"
+        ]
+
+    async def test_sagas_listed_from_index(self, storage):
+        await storage.set_saga("s-old", saga("s-old", "t1", 0))
+        await storage.set_saga("s-new", saga("s-new", "t1", 5))
+        await storage.set_saga("s-t2", saga("s-t2", "t2", 1))
+
+        sagas = await storage.list_sagas_by_tenant("t1")
+        assert [s["saga_id"] for s in sagas] == ["s-new", "s-old"]
+        assert await storage.redis.zcard("test:tenant_sagas:t1") == 2
+
+    async def test_deletes_remove_index_entries(self, storage):
+        await storage.set_operation("op-1", operation("op-1", "t1", 0))
+        await storage.set_saga("s-1", saga("s-1", "t1", 0))
+
+        assert await storage.delete_operation("op-1")
+        assert await storage.delete_saga("s-1")
+
+        assert await storage.redis.zcard("test:tenant_ops:t1") == 0
+        assert await storage.redis.zcard("test:tenant_sagas:t1") == 0
+
+    async def test_dangling_entries_are_pruned(self, storage):
+        await storage.set_operation("op-1", operation("op-1", "t1", 0))
+        await storage.set_operation("op-2", operation("op-2", "t1", 1))
+        await storage.set_saga("s-1", saga("s-1", "t2", 0))
+
+        # Records removed behind the storage's back (e.g. expired or flushed)
+        await storage.redis.delete("test:operation:op-2", "test:saga:s-1")
+
+        assert [op["operation_id"] for op in await storage.list_operations_by_tenant("t1")] == [
+            "op-1"
+        ]
+        assert await storage.redis.zrange("test:tenant_ops:t1", 0, -1) == ["op-1"]
+
+        assert await storage.cleanup_expired_data() == 1
+        assert await storage.redis.exists("test:tenant_sagas:t2") == 0
+        assert await storage.redis.smembers("test:tenants") == {"t1"}
+
+    async def test_saga_progress_written_with_history(self, storage):
+        history = [{"step_id": "dns", "status": "completed"}, {"step_id": "storage"}]
+        await storage.save_saga_progress("s-1", saga("s-1", "t1", 0), history)
+
+        assert (await storage.get_saga("s-1"))["saga_id"] == "s-1"
+        assert [e["step_id"] for e in await storage.get_saga_history("s-1")] == ["storage", "dns"]
+        assert [s["saga_id"] for s in await storage.list_sagas_by_tenant("t1")] == ["s-1"]
+
+    async def test_page_filled_past_dangling_entries(self, storage):
+        for minutes in range(5):
+            await storage.set_operation(f"op-{minutes}", operation(f"op-{minutes}", "t1", minutes))
+        await storage.redis.delete("test:operation:op-4", "test:operation:op-2")
+
+        page = await storage.list_operations_by_tenant("t1", limit=2)
+        assert [op["operation_id"] for op in page] == ["op-3", "op-1"]
+
+        page = await storage.list_operations_by_tenant("t1", limit=2, offset=2)
+        assert [op["operation_id"] for op in page] == ["op-0"]
+
+    async def test_records_written_before_indexes_are_backfilled(self, storage):
+        await storage.set_operation("op-1", operation("op-1", "t1", 1))
+        await storage.set_operation("op-2", operation("op-2", "t1", 2))
+        await storage.save_saga_progress("s-1", saga("s-1", "t1", 0), [{"step_id": "dns"}])
+        # Keyspace as left by a release without tenant indexes
+        await storage.redis.delete("test:tenant_ops:t1", "test:tenant_sagas:t1", "test:tenants")
+
+        assert [op["operation_id"] for op in await storage.list_operations_by_tenant("t1")] == [
+            "op-2",
+            "op-1",
+        ]
+        assert [s["saga_id"] for s in await storage.list_sagas_by_tenant("t1")] == ["s-1"]
+        assert await storage.redis.get("test:tenant_index_version") == "1"
+        assert await storage.backfill_tenant_indexes() == 3
@@ -0,0 +1,140 @@
+"""
+Tests for dependency-aware saga execution in BackgroundOperationsManager.
+"""
+
+import asyncio
+
+import pytest
+
+from dotmac_business_logic.tasks.tasks.manager import BackgroundOperationsManager
+from dotmac_business_logic.tasks.tasks.models import OperationStatus, SagaStepStatus
+from dotmac_business_logic.tasks.tasks.storage.memory import MemoryStorage
+
+
+class RecordingStorage(MemoryStorage):
+    """MemoryStorage that counts batched saga progress writes."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.progress_writes: list[list[str]] = []
+
+    async def save_saga_progress(self, saga_id, mapping, history):
+        self.progress_writes.append([entry["step_id"] for entry in history])
+        await super().save_saga_progress(saga_id, mapping, history)
+
+
+def provisioning_steps():
+    return [
+        {"step_id": "dns", "name": "DNS", "operation": "work", "depends_on": [],
+         "parameters": {"name": "dns"}, "compensation_operation": "undo",
+         "compensation_parameters": {"name": "dns"}},
+        {"step_id": "storage", "name": "Storage", "operation": "work", "depends_on": [],
+         "parameters": {"name": "storage"}, "compensation_operation": "undo",
+         "compensation_parameters": {"name": "storage"}},
+        {"step_id": "radius", "name": "RADIUS client", "operation": "work", "depends_on": [],
+         "parameters": {"name": "radius"}, "compensation_operation": "undo",
+         "compensation_parameters": {"name": "radius"}},
+        {"step_id": "billing", "name": "Billing account", "operation": "work",
+         "depends_on": ["dns", "storage", "radius"], "parameters": {"name": "billing"},
+         "compensation_operation": "undo", "compensation_parameters": {"name": "billing"}},
+        {"step_id": "notify", "name": "Notify", "operation": "work",
+         "depends_on": ["billing"], "parameters": {"name": "notify"}},
+    ]
+
+
+@pytest.fixture
+def manager():
+    manager = BackgroundOperationsManager(
+        storage=RecordingStorage(),
+        enable_background_cleanup=False,
+        saga_step_concurrency=2,
+        saga_retry_backoff=0,
+    )
+    manager.events = []
+    manager.in_flight = 0
+    manager.max_in_flight = 0
+    manager.fail = set()
+
+    async def work(parameters):
+        manager.in_flight += 1
+        manager.max_in_flight = max(manager.max_in_flight, manager.in_flight)
+        await asyncio.sleep(0.01)
+        manager.in_flight -= 1
+        manager.events.append(("run", parameters["name"]))
+        if parameters["name"] in manager.fail:
+            raise RuntimeError(f"{parameters['name']} failed")
+        return {"ok": parameters["name"]}
+
+    async def undo(parameters):
+        manager.events.append(("undo", parameters["name"]))
+
+    manager.register_operation_handler("work", work)
+    manager.register_compensation_handler("undo", undo)
+    return manager
+
+
+class TestSagaDagExecution:
+    """Saga steps run in dependency waves under a concurrency limit."""
+
+    async def test_independent_steps_run_concurrently_in_waves(self, manager):
+        saga = await manager.create_saga_workflow("t1", "tenant_provisioning", provisioning_steps())
+
+        assert await manager.execute_saga_workflow(saga.saga_id)
+
+        assert manager.max_in_flight == 2
+        ran = [name for kind, name in manager.events if kind == "run"]
+        assert set(ran[:3]) == {"dns", "storage", "radius"}
+        assert ran[3:] == ["billing", "notify"]
+
+        # One batched write per wave, carrying that wave's history
+        assert manager.storage.progress_writes == [
+            ["dns", "storage", "radius"], ["billing"], ["notify"],
+        ]
+        history = await manager.storage.get_saga_history(saga.saga_id)
+        assert len(history) == 5
+        stored = await manager.storage.get_saga(saga.saga_id)
+        assert stored["status"] == OperationStatus.COMPLETED.value
+        assert stored["steps"][3]["depends_on"] == ["dns", "storage", "radius"]
+
+    async def test_failure_compensates_in_reverse_topological_order(self, manager):
+        manager.fail = {"notify"}
+        steps = provisioning_steps()
+        steps[4]["max_retries"] = 1
+        saga = await manager.create_saga_workflow("t1", "tenant_provisioning", steps)
+
+        assert not await manager.execute_saga_workflow(saga.saga_id)
+
+        assert [name for kind, name in manager.events if kind == "run"].count("notify") == 2
+        undone = [name for kind, name in manager.events if kind == "undo"]
+        assert undone[0] == "billing"
+        assert set(undone[1:]) == {"dns", "storage", "radius"}
+
+        stored = await manager.storage.get_saga(saga.saga_id)
+        assert stored["status"] == OperationStatus.COMPENSATED.value
+        statuses = {step["step_id"]: step["status"] for step in stored["steps"]}
+        assert statuses["billing"] == SagaStepStatus.COMPENSATED.value
+        assert statuses["notify"] == SagaStepStatus.FAILED.value
+
+    async def test_steps_without_dependencies_stay_sequential(self, manager):
+        steps = [
+            {"step_id": name, "name": name, "operation": "work", "parameters": {"name": name}}
+            for name in ("first", "second", "third")
+        ]
+        saga = await manager.create_saga_workflow("t1", "legacy", steps)
+
+        assert await manager.execute_saga_workflow(saga.saga_id)
+
+        assert manager.max_in_flight == 1
+        assert manager.events == [("run", "first"), ("run", "second"), ("run", "third")]
+
+    async def test_invalid_dependencies_are_rejected(self, manager):
+        cyclic = [
+            {"step_id": "a", "name": "a", "operation": "work", "depends_on": ["b"]},
+            {"step_id": "b", "name": "b", "operation": "work", "depends_on": ["a"]},
+        ]
+        with pytest.raises(ValueError, match="cyclic"):
+            await manager.create_saga_workflow("t1", "broken", cyclic)
+
+        unknown = [{"step_id": "a", "name": "a", "operation": "work", "depends_on": ["zzz"]}]
+        with pytest.raises(ValueError, match="unknown"):
+            await manager.create_saga_workflow("t1", "broken", unknown)
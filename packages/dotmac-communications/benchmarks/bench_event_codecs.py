@@ -0,0 +1,145 @@
+"""
+Benchmark: event codec encode/decode throughput and payload size.
+
+Encodes and decodes representative billing and provisioning events with the
+stdlib JSON codec, the orjson codec and the MessagePack codec (with and
+without the schema-keyed payload fast path):
+
+    python benchmarks/bench_event_codecs.py --events 5000
+    python benchmarks/bench_event_codecs.py --samples 10
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from dotmac_benchmarking import BenchmarkRunner
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from dotmac.communications.events.codecs import JsonCodec, MsgPackCodec, OrjsonCodec
+from dotmac.communications.events.message import Event
+
+INVOICE_TOPIC = "billing.invoice.created"
+INVOICE_FIELDS = (
+    "invoice_id",
+    "account_id",
+    "currency",
+    "subtotal",
+    "tax",
+    "total",
+    "period_start",
+    "period_end",
+    "line_items",
+)
+ACTIVATION_TOPIC = "provisioning.service.activated"
+ACTIVATION_FIELDS = (
+    "subscriber_id",
+    "service_id",
+    "plan",
+    "onu_serial",
+    "vlan",
+    "ipv4",
+    "download_mbps",
+    "upload_mbps",
+    "activated_at",
+)
+
+
+def billing_event(index: int) -> Event:
+    start = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    return Event(
+        topic=INVOICE_TOPIC,
+        key=f"account-{index % 500}",
+        tenant_id=f"tenant-{index % 20}",
+        payload={
+            "invoice_id": str(uuid.uuid4()),
+            "account_id": f"account-{index % 500}",
+            "currency": "USD",
+            "subtotal": 59.99,
+            "tax": 4.2,
+            "total": 64.19,
+            "period_start": start,
+            "period_end": start + timedelta(days=30),
+            "line_items": [
+                {"sku": "fiber-300", "quantity": 1, "amount": 49.99},
+                {"sku": "static-ip", "quantity": 1, "amount": 10.0},
+            ],
+        },
+    )
+
+
+def provisioning_event(index: int) -> Event:
+    return Event(
+        topic=ACTIVATION_TOPIC,
+        key=f"subscriber-{index}",
+        tenant_id=f"tenant-{index % 20}",
+        payload={
+            "subscriber_id": uuid.uuid4(),
+            "service_id": f"svc-{index}",
+            "plan": "fiber-300",
+            "onu_serial": f"ALCL{index:08X}",
+            "vlan": 100 + index % 3000,
+            "ipv4": f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}",
+            "download_mbps": 300,
+            "upload_mbps": 150,
+            "activated_at": datetime.now(timezone.utc),
+        },
+    )
+
+
+def codecs() -> dict:
+    return {
+        "json": JsonCodec.compact(),
+        "orjson": OrjsonCodec(),
+        "msgpack": MsgPackCodec(),
+        "msgpack+schema": MsgPackCodec(
+            payload_schemas={INVOICE_TOPIC: INVOICE_FIELDS, ACTIVATION_TOPIC: ACTIVATION_FIELDS}
+        ),
+    }
+
+
+async def main(events: int, samples: int):
+    workloads = {
+        "billing": [billing_event(index) for index in range(events)],
+        "provisioning": [provisioning_event(index) for index in range(events)],
+    }
+
+    runner = BenchmarkRunner()
+    print(f"{'codec':<16} {'workload':<13} {'bytes':>7} {'encode/s':>11} {'decode/s':>11}")
+    for workload, batch in workloads.items():
+        for name, codec in codecs().items():
+            encoded = [codec.encode(event) for event in batch]
+            size = sum(len(data) for data in encoded) / events
+
+            async def encode(codec=codec, batch=batch):
+                for event in batch:
+                    codec.encode(event)
+
+            async def decode(codec=codec, encoded=encoded):
+                for data in encoded:
+                    codec.decode(data)
+
+            metadata = {"codec": name, "workload": workload, "events": events}
+            encode_result = await runner.run(
+                f"{name} encode {workload}", encode, samples=samples, warmup=1, metadata=metadata
+            )
+            decode_result = await runner.run(
+                f"{name} decode {workload}", decode, samples=samples, warmup=1, metadata=metadata
+            )
+            print(
+                f"{name:<16} {workload:<13} {size:7.0f} "
+                f"{events / encode_result.p50_duration:11,.0f} "
+                f"{events / decode_result.p50_duration:11,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=2_000)
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.events, args.samples))
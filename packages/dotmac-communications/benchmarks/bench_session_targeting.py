@@ -0,0 +1,108 @@
+"""
+Benchmark: resolving role- and permission-targeted broadcast recipients.
+
+Builds a SessionManager with authenticated sessions spread over tenants and
+roles, then compares resolving a NOC-wide target by scanning every session
+against the set intersection over the session manager's indexes:
+
+    python benchmarks/bench_session_targeting.py --sessions 50000
+    python benchmarks/bench_session_targeting.py --tenants 200 --noc-share 0.01
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from dotmac_benchmarking import BenchmarkRunner
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from dotmac.communications.websockets.core.config import (
+    AuthConfig,
+    SessionConfig,
+    WebSocketConfig,
+)
+from dotmac.communications.websockets.core.session import SessionManager
+
+
+class NullSocket:
+    async def send(self, data):
+        pass
+
+    async def close(self, code, reason):
+        pass
+
+
+async def build_sessions(sessions: int, tenants: int, noc_share: float) -> SessionManager:
+    config = WebSocketConfig(
+        auth_config=AuthConfig(enabled=False),
+        session_config=SessionConfig(ping_interval_seconds=0),
+    )
+    manager = SessionManager(config)
+    noc_every = round(1 / noc_share) if noc_share else 0
+    for index in range(sessions):
+        session_id = f"session-{index}"
+        noc = noc_every and index % noc_every == 0
+        await manager.create_session(NullSocket(), session_id)
+        manager.update_session_user_info(
+            session_id,
+            f"user-{index}",
+            f"tenant-{index % tenants}",
+            roles=["noc"] if noc else ["subscriber"],
+            permissions=["alarms:read", "alarms:ack"] if noc else ["portal:read"],
+        )
+    return manager
+
+
+def scan(manager: SessionManager, tenant_id: str) -> list:
+    return [
+        session
+        for session in manager.get_all_sessions()
+        if session.is_authenticated
+        and session.tenant_id == tenant_id
+        and session.has_role("noc")
+        and session.has_permission("alarms:ack")
+    ]
+
+
+def indexed(manager: SessionManager, tenant_id: str) -> list:
+    session_ids = manager.select_session_ids(
+        tenant_id=tenant_id, any_roles=["noc"], all_permissions=["alarms:ack"], authenticated=True
+    )
+    return manager.get_sessions_by_ids(session_ids)
+
+
+async def main(sessions: int, tenants: int, noc_share: float, iterations: int, samples: int):
+    manager = await build_sessions(sessions, tenants, noc_share)
+    expected = len(scan(manager, "tenant-0"))
+    assert len(indexed(manager, "tenant-0")) == expected
+
+    print(f"{sessions} sessions, {tenants} tenants, {expected} NOC sessions in tenant-0")
+    runner = BenchmarkRunner()
+    for label, resolve in (("scan", scan), ("indexed", indexed)):
+
+        async def run(resolve=resolve):
+            for _ in range(iterations):
+                resolve(manager, "tenant-0")
+
+        result = await runner.run(
+            f"resolve {label}",
+            run,
+            samples=samples,
+            metadata={"sessions": sessions, "iterations": iterations},
+        )
+        print(f"{result.label:<18} {result.avg_duration / iterations * 1e6:10.1f} us/resolve")
+
+    await manager.close_all_sessions()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=20_000)
+    parser.add_argument("--tenants", type=int, default=50)
+    parser.add_argument("--noc-share", type=float, default=0.02)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions, args.tenants, args.noc_share, args.iterations, args.samples))
@@ -0,0 +1,164 @@
+"""
+Benchmark: WebSocket broadcast fan-out to local sessions.
+
+Broadcasts to every session of a SessionManager backed by in-memory sockets,
+a small share of which are slow clients. Compares the sequential path (await
+``send_message`` per session, encoding each time) with the encode-once
+BroadcastManager path over per-session outbound queues, and reports
+end-to-end latency from broadcast start to each socket write:
+
+    python benchmarks/bench_websocket_broadcast.py --sessions 10000
+    python benchmarks/bench_websocket_broadcast.py --slow-share 0.05 --slow-delay-ms 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from dotmac_benchmarking import BenchmarkRunner
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from dotmac.communications.websockets.channels.broadcast import (
+    BroadcastManager,
+    BroadcastMessage,
+    BroadcastScope,
+    BroadcastTarget,
+)
+from dotmac.communications.websockets.core.config import (
+    AuthConfig,
+    SessionConfig,
+    WebSocketConfig,
+)
+from dotmac.communications.websockets.core.session import SessionManager
+
+PAYLOAD = {
+    "alarm_id": "a0e6b0c2-53c4-4c47-9d43-2f3f0c9b7a11",
+    "severity": "major",
+    "device": "olt-01.pop-3",
+    "message": "LOS on PON 1/1/4, 37 ONTs affected",
+    "affected": list(range(37)),
+}
+
+
+class LatencyRecorder:
+    """Collects write latencies relative to the current broadcast start."""
+
+    def __init__(self):
+        self.started_at = 0.0
+        self.latencies_ms: list[float] = []
+
+    def start(self):
+        self.started_at = time.perf_counter()
+
+    def record(self):
+        self.latencies_ms.append((time.perf_counter() - self.started_at) * 1000)
+
+
+class BenchSocket:
+    def __init__(self, recorder: LatencyRecorder, delay: float = 0.0):
+        self.recorder = recorder
+        self.delay = delay
+
+    async def send(self, data):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.recorder.record()
+
+    async def close(self, code, reason):
+        pass
+
+
+async def build_sessions(
+    sessions: int, slow_share: float, slow_delay: float, recorder: LatencyRecorder
+) -> SessionManager:
+    config = WebSocketConfig(
+        auth_config=AuthConfig(enabled=False),
+        session_config=SessionConfig(ping_interval_seconds=0),
+    )
+    manager = SessionManager(config)
+    slow_every = round(1 / slow_share) if slow_share else 0
+    for index in range(sessions):
+        slow = slow_every and index % slow_every == 0
+        socket = BenchSocket(recorder, slow_delay if slow else 0.0)
+        await manager.create_session(socket, f"session-{index}")
+    return manager
+
+
+async def sequential_broadcast(manager: SessionManager, recorder: LatencyRecorder):
+    recorder.start()
+    for session in manager.get_all_sessions():
+        await session.send_message("alarm", PAYLOAD)
+
+
+async def queued_broadcast(broadcaster: BroadcastManager, recorder: LatencyRecorder):
+    recorder.start()
+    result = await broadcaster.broadcast(
+        BroadcastTarget(scope=BroadcastScope.GLOBAL, identifier="global"),
+        BroadcastMessage(type="alarm", data=PAYLOAD),
+    )
+    await result.delivery.wait()
+    return result
+
+
+def percentile(values: list[float], quantile: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+async def main(
+    sessions: int, broadcasts: int, samples: int, slow_share: float, slow_delay_ms: float
+):
+    recorder = LatencyRecorder()
+    manager = await build_sessions(sessions, slow_share, slow_delay_ms / 1000, recorder)
+    broadcaster = BroadcastManager(manager, channel_manager=None)
+    enqueue_ms: list[float] = []
+
+    async def run_sequential():
+        for _ in range(broadcasts):
+            await sequential_broadcast(manager, recorder)
+
+    async def run_queued():
+        for _ in range(broadcasts):
+            result = await queued_broadcast(broadcaster, recorder)
+            enqueue_ms.append(result.duration_ms)
+
+    print(
+        f"{sessions} sessions, {int(sessions * slow_share)} slow "
+        f"({slow_delay_ms:g} ms per write), {broadcasts} broadcasts per sample"
+    )
+    runner = BenchmarkRunner()
+    for label, fn in (("sequential", run_sequential), ("queued", run_queued)):
+        recorder.latencies_ms.clear()
+        result = await runner.run(
+            f"broadcast {label}",
+            fn,
+            samples=samples,
+            metadata={"sessions": sessions, "broadcasts": broadcasts},
+        )
+        latencies = recorder.latencies_ms
+        print(
+            f"{result.label:<22} {result.avg_duration / broadcasts * 1000:8.1f} ms/broadcast  "
+            f"latency p50 {percentile(latencies, 0.5):7.1f} ms  "
+            f"p99 {percentile(latencies, 0.99):7.1f} ms  "
+            f"max {max(latencies):7.1f} ms"
+        )
+
+    print(f"queued broadcast call (encode + enqueue): {statistics.mean(enqueue_ms):.1f} ms avg")
+    await manager.close_all_sessions()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--broadcasts", type=int, default=10)
+    parser.add_argument("--samples", type=int, default=3)
+    parser.add_argument("--slow-share", type=float, default=0.01)
+    parser.add_argument("--slow-delay-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(
+        main(args.sessions, args.broadcasts, args.samples, args.slow_share, args.slow_delay_ms)
+    )
@@ -6,7 +6,8 @@ from collections import defaultdict
 from typing import Any, Optional
 
 from ..bus import ConsumeError, EventHandler, PublishError
-from ..message import Event
+from ..codecs.registry import CodecRegistry
+from ..message import Event, MessageCodec
 from .base import AdapterConfig, AdapterMetadata, BaseAdapter
 
 __all__ = [
@@ -26,6 +27,7 @@ class MemoryConfig(AdapterConfig):
         *,
         max_queue_size: int = 1000,
         enable_persistence: bool = False,
+        codec: Optional[MessageCodec] = None,
         **kwargs: Any,
     ):
         """
@@ -34,11 +36,14 @@ class MemoryConfig(AdapterConfig):
         Args:
             max_queue_size: Maximum size of topic queues
             enable_persistence: If True, keep event history (for testing)
+            codec: If set, events are encoded with this codec on publish and
+                decoded by content type before delivery, as a broker would
             **kwargs: Base adapter config options
         """
         super().__init__(**kwargs)
         self.max_queue_size = max_queue_size
         self.enable_persistence = enable_persistence
+        self.codec = codec
 
 
 class TopicSubscription:
@@ -104,6 +109,9 @@ class MemoryEventBus(BaseAdapter):
 
         self._lock = asyncio.Lock()
 
+        # Decoders keyed by content type, used when a codec is configured
+        self._codecs = CodecRegistry([self.config.codec] if self.config.codec else None)
+
     @property
     def metadata(self) -> AdapterMetadata:
         """Get adapter metadata."""
@@ -142,6 +150,11 @@ class MemoryEventBus(BaseAdapter):
             if headers:
                 event = event.with_headers(**headers)
 
+            # Round-trip through the codec so handlers see what a broker delivers
+            codec = self.config.codec
+            if codec is not None:
+                event = self._codecs.decode(codec.encode(event), codec.content_type)
+
             # Get or create queue for topic
             async with self._lock:
                 if event.topic not in self._topic_queues:
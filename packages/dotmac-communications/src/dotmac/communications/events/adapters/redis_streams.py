@@ -2,11 +2,16 @@
 
 import asyncio
 import logging
+import time
+from collections.abc import Awaitable, Callable
 from typing import Any, Optional
 from urllib.parse import urlparse
 
 from ..bus import ConsumeError, EventHandler, NotSupportedError, PublishError
 from ..codecs.json_codec import JsonCodec
+from ..codecs.registry import CodecRegistry
+from ..consumer import ConsumerOptions, RetryableHandler
+from ..dlq import DLQ, SimpleDLQ
 from ..message import Event, MessageCodec
 from .base import AdapterConfig, AdapterMetadata, BaseAdapter
 
@@ -19,6 +24,9 @@ __all__ = [
 
 logger = logging.getLogger(__name__)
 
+# Dead-letters one failed event; raises if the DLQ publish fails
+DeadLetterSender = Callable[[Event, Exception], Awaitable[None]]
+
 # Optional Redis import
 try:
     import redis.asyncio as redis
@@ -45,7 +53,11 @@ class RedisConfig(AdapterConfig):
         consumer_timeout: float = 1.0,
         block_time: int = 1000,  # milliseconds
         prefetch_count: int = 10,
+        handler_concurrency: int = 1,
+        claim_idle_ms: Optional[int] = 60000,
+        claim_interval: float = 30.0,
         codec: Optional[MessageCodec] = None,
+        accept_codecs: Optional[list[MessageCodec]] = None,
         **kwargs: Any,
     ):
         """
@@ -62,7 +74,14 @@ class RedisConfig(AdapterConfig):
             consumer_timeout: Consumer read timeout
             block_time: XREAD block time in milliseconds
             prefetch_count: Number of messages to prefetch
+            handler_concurrency: Handlers run concurrently per consumer; events
+                with the same partition key are always handled in order
+            claim_idle_ms: Claim pending entries idle for this long from other
+                consumers with XAUTOCLAIM (None disables claiming)
+            claim_interval: Seconds between pending-entry claim sweeps
             codec: Message codec for serialization
+            accept_codecs: Additional codecs consumers accept, selected by each
+                entry's ``content_type`` field (JSON is always accepted)
             **kwargs: Base adapter config options
         """
         super().__init__(**kwargs)
@@ -87,28 +106,47 @@ class RedisConfig(AdapterConfig):
         self.consumer_timeout = consumer_timeout
         self.block_time = block_time
         self.prefetch_count = prefetch_count
+        self.handler_concurrency = handler_concurrency
+        self.claim_idle_ms = claim_idle_ms
+        self.claim_interval = claim_interval
 
         # Codec
         self.codec = codec or JsonCodec.compact()
+        self.accept_codecs = accept_codecs or []
 
 
 class ConsumerGroupInfo:
     """Information about a Redis consumer group."""
 
-    def __init__(self, topic: str, group: str, handler: EventHandler, task: asyncio.Task[None]):
+    def __init__(self, topic: str, group: str, handler: EventHandler, stop_timeout: float = 5.0):
         self.topic = topic
         self.group = group
         self.handler = handler
-        self.task = task
+        self.stop_timeout = stop_timeout
+        self.tasks: list[asyncio.Task[None]] = []
         self._stop_event = asyncio.Event()
 
+    @property
+    def stopping(self) -> bool:
+        """Whether the consumers have been asked to stop."""
+        return self._stop_event.is_set()
+
     async def stop(self) -> None:
-        """Stop the consumer group."""
+        """
+        Stop the consumer group.
+
+        Consumers finish their current read and batch; any still running
+        after ``stop_timeout`` are cancelled.
+        """
         self._stop_event.set()
-        if self.task and not self.task.done():
-            self.task.cancel()
+        running = [task for task in self.tasks if not task.done()]
+        if not running:
+            return
+        _, still_running = await asyncio.wait(running, timeout=self.stop_timeout)
+        for task in still_running:
+            task.cancel()
             try:
-                await self.task
+                await task
             except asyncio.CancelledError:
                 pass
 
@@ -120,6 +158,12 @@ class RedisEventBus(BaseAdapter):
     Uses Redis Streams for reliable message delivery with consumer groups.
     Each topic becomes a Redis Stream, and consumer groups provide
     at-least-once delivery semantics.
+
+    Consumers read entries in batches and handle them concurrently (up to
+    ``handler_concurrency``), keeping events with the same partition key in
+    stream order. A batch is acknowledged with a single XACK. Failed events
+    go to the DLQ; entries whose DLQ publish also fails stay pending and are
+    reclaimed with XAUTOCLAIM once idle.
     """
 
     def __init__(self, config: RedisConfig):
@@ -137,6 +181,9 @@ class RedisEventBus(BaseAdapter):
         super().__init__(config)
         self.config: RedisConfig = config
 
+        # Decoders keyed by the content type recorded on each stream entry
+        self._codecs = CodecRegistry([*config.accept_codecs, config.codec])
+
         # Redis connection
         self._redis: Optional[redis.Redis] = None
 
@@ -206,7 +253,8 @@ class RedisEventBus(BaseAdapter):
 
         Args:
             event: Event to publish
-            partition_key: Ignored in Redis Streams (events are ordered)
+            partition_key: Ordering key for concurrent consumers (defaults to
+                ``event.key``); events sharing a key are handled in order
             headers: Additional headers to add to event
         """
         self._ensure_not_closed()
@@ -224,6 +272,8 @@ class RedisEventBus(BaseAdapter):
                 "data": event_data,
                 "content_type": self.config.codec.content_type,
             }
+            if partition_key:
+                fields["partition_key"] = partition_key
 
             # Add metadata as separate fields for easier querying
             if event.metadata:
@@ -264,6 +314,8 @@ class RedisEventBus(BaseAdapter):
         group: str = "default",
         concurrency: int = 1,
         auto_offset_reset: str = "latest",
+        retry_options: Optional[ConsumerOptions] = None,
+        dlq: Optional[DLQ] = None,
         **kwargs: Any,
     ) -> None:
         """
@@ -275,6 +327,9 @@ class RedisEventBus(BaseAdapter):
             group: Consumer group name
             concurrency: Number of concurrent consumers
             auto_offset_reset: Where to start consuming ("earliest" or "latest")
+            retry_options: Retry failed events with backoff before sending
+                them to the DLQ (see ``RetryableHandler``)
+            dlq: Dead letter queue for failed events (defaults to ``SimpleDLQ``)
             **kwargs: Additional options (ignored)
         """
         self._ensure_not_closed()
@@ -294,16 +349,28 @@ class RedisEventBus(BaseAdapter):
                         f"Failed to create consumer group: {e}", topic=topic, cause=e
                     ) from e
 
-            # Start consumer tasks
-            tasks = []
+            # Failed events are retried (if configured), then dead-lettered
+            # here, so an entry whose DLQ publish fails stays pending
+            if retry_options is not None:
+                handler = RetryableHandler(handler, self, retry_options).handle_with_retries
+            dead_letter = self._dead_letter_sender(dlq or SimpleDLQ(self), topic, retry_options)
+
+            # Start consumer tasks; a blocked read returns within block_time
+            consumer_info = ConsumerGroupInfo(
+                topic,
+                group,
+                handler,
+                stop_timeout=self.config.block_time / 1000 + self.config.operation_timeout,
+            )
             for i in range(concurrency):
                 consumer_name = f"{group}-consumer-{i}"
-                task = asyncio.create_task(self._consume_loop(topic, group, consumer_name, handler))
-                tasks.append(task)
-
-            # Create consumer group info
-            # For simplicity, we use the first task as the main task
-            consumer_info = ConsumerGroupInfo(topic, group, handler, tasks[0])
+                consumer_info.tasks.append(
+                    asyncio.create_task(
+                        self._consume_loop(
+                            topic, group, consumer_name, handler, dead_letter, consumer_info
+                        )
+                    )
+                )
             self._consumer_groups.append(consumer_info)
 
             self._logger.info(
@@ -333,15 +400,36 @@ class RedisEventBus(BaseAdapter):
         group: str,
         consumer_name: str,
         handler: EventHandler,
+        dead_letter: DeadLetterSender,
+        consumer_info: Optional[ConsumerGroupInfo] = None,
     ) -> None:
         """Main consumer loop for Redis Streams."""
         redis_conn = await self._get_connection()
+        slots = asyncio.Semaphore(max(1, self.config.handler_concurrency))
+
+        async def process(entries: list[tuple[bytes, dict[bytes, bytes]]]) -> None:
+            await self._process_batch(
+                redis_conn, topic, group, entries, handler, dead_letter, slots
+            )
 
         self._logger.info(f"Started Redis consumer '{consumer_name}' for stream '{topic}'")
 
         try:
-            while not self.is_closed:
+            # Entries delivered to this consumer before a restart but never acknowledged
+            try:
+                await self._recover_own_pending(redis_conn, topic, group, consumer_name, process)
+            except Exception as e:
+                self._logger.error(f"Error recovering pending entries from '{topic}': {e}")
+            next_claim = time.monotonic()
+
+            while not self.is_closed and not (consumer_info and consumer_info.stopping):
                 try:
+                    if self.config.claim_idle_ms is not None and time.monotonic() >= next_claim:
+                        await self._claim_stale_pending(
+                            redis_conn, topic, group, consumer_name, process
+                        )
+                        next_claim = time.monotonic() + self.config.claim_interval
+
                     # Read from stream with consumer group
                     messages = await redis_conn.xreadgroup(
                         group,
@@ -351,32 +439,8 @@ class RedisEventBus(BaseAdapter):
                         block=self.config.block_time,
                     )
 
-                    # Process messages
-                    for stream_name, stream_messages in messages:
-                        for message_id, fields in stream_messages:
-                            try:
-                                # Decode message
-                                event = self._decode_redis_message(fields)
-
-                                # Handle event
-                                await handler(event)
-
-                                # Acknowledge message
-                                await redis_conn.xack(topic, group, message_id)
-
-                                self._logger.debug(
-                                    f"Processed and acknowledged message {message_id.decode()} "
-                                    f"from stream '{topic}'"
-                                )
-
-                            except Exception as e:
-                                self._logger.error(
-                                    f"Error processing message {message_id.decode()}: {e}",
-                                    exc_info=True,
-                                )
-                                # In a real implementation, this would go to retry/DLQ logic
-                                # For now, just acknowledge to prevent infinite retries
-                                await redis_conn.xack(topic, group, message_id)
+                    for _stream_name, stream_messages in messages:
+                        await process(stream_messages)
 
                 except asyncio.TimeoutError:
                     # Normal timeout, continue
@@ -392,6 +456,148 @@ class RedisEventBus(BaseAdapter):
 
         self._logger.info(f"Redis consumer '{consumer_name}' stopped")
 
+    async def _recover_own_pending(
+        self, redis_conn: Any, topic: str, group: str, consumer_name: str, process: Any
+    ) -> None:
+        """Re-process this consumer's pending entries, oldest first."""
+        last_id: Any = "0"
+        while not self.is_closed:
+            messages = await redis_conn.xreadgroup(
+                group, consumer_name, {topic: last_id}, count=self.config.prefetch_count
+            )
+            entries = [entry for _stream, stream_entries in messages for entry in stream_entries]
+            if not entries:
+                return
+            self._logger.info(f"Recovering {len(entries)} pending entries from stream '{topic}'")
+            # Entries left pending again are skipped here; the claim sweep
+            # (which also claims this consumer's own idle entries) retries
+            # them after claim_idle_ms, or the next restart if claiming is off
+            last_id = entries[-1][0]
+            await process(entries)
+
+    async def _claim_stale_pending(
+        self, redis_conn: Any, topic: str, group: str, consumer_name: str, process: Any
+    ) -> None:
+        """Claim and process entries left pending by other consumers for too long."""
+        start_id: Any = "0-0"
+        while not self.is_closed:
+            result = await redis_conn.xautoclaim(
+                topic,
+                group,
+                consumer_name,
+                min_idle_time=self.config.claim_idle_ms,
+                start_id=start_id,
+                count=self.config.prefetch_count,
+            )
+            start_id, claimed = result[0], result[1]
+            entries = [entry for entry in claimed if entry]
+            if entries:
+                self._logger.info(f"Claimed {len(entries)} stale entries from stream '{topic}'")
+                await process(entries)
+            if start_id in (b"0-0", "0-0"):
+                return
+
+    async def _process_batch(
+        self,
+        redis_conn: Any,
+        topic: str,
+        group: str,
+        entries: list[tuple[bytes, dict[bytes, bytes]]],
+        handler: EventHandler,
+        dead_letter: DeadLetterSender,
+        slots: asyncio.Semaphore,
+    ) -> None:
+        """
+        Handle a batch of stream entries and acknowledge them with one XACK.
+
+        Entries are split into lanes by partition key; lanes run concurrently
+        and each lane is handled in stream order.
+        """
+        lanes: dict[Any, list[tuple[bytes, Event]]] = {}
+        completed: list[bytes] = []
+
+        for message_id, fields in entries:
+            if not fields:
+                # Pending entry that was trimmed from the stream
+                completed.append(message_id)
+                continue
+            try:
+                event = self._decode_redis_message(fields)
+            except Exception as e:
+                self._logger.error(
+                    f"Discarding undecodable message {message_id.decode()} "
+                    f"from stream '{topic}': {e}"
+                )
+                completed.append(message_id)
+                continue
+
+            partition_key = fields.get(b"partition_key")
+            key = partition_key.decode("utf-8") if partition_key else event.key
+            # Events without a key have no ordering constraint
+            lanes.setdefault(key if key is not None else message_id, []).append((message_id, event))
+
+        async def run_lane(lane: list[tuple[bytes, Event]]) -> None:
+            for message_id, event in lane:
+                async with slots:
+                    if await self._handle_entry(topic, message_id, event, handler, dead_letter):
+                        completed.append(message_id)
+
+        if len(lanes) == 1:
+            await run_lane(next(iter(lanes.values())))
+        elif lanes:
+            await asyncio.gather(*(run_lane(lane) for lane in lanes.values()))
+
+        if completed:
+            await redis_conn.xack(topic, group, *completed)
+            self._logger.debug(f"Acknowledged {len(completed)} messages from stream '{topic}'")
+
+    async def _handle_entry(
+        self,
+        topic: str,
+        message_id: bytes,
+        event: Event,
+        handler: EventHandler,
+        dead_letter: DeadLetterSender,
+    ) -> bool:
+        """Handle one event. Returns whether its entry can be acknowledged."""
+        try:
+            await handler(event)
+            return True
+        except Exception as e:
+            error = e
+            self._logger.error(
+                f"Error processing message {message_id.decode()} from stream '{topic}': {e}",
+                exc_info=True,
+            )
+
+        try:
+            await dead_letter(event, error)
+            return True
+        except Exception as e:
+            self._logger.error(
+                f"Failed to dead-letter message {message_id.decode()}, "
+                f"leaving it pending for redelivery: {e}"
+            )
+            return False
+
+    def _dead_letter_sender(
+        self, dlq: DLQ, topic: str, retry_options: Optional[ConsumerOptions]
+    ) -> DeadLetterSender:
+        """Build the coroutine that dead-letters a failed event; it raises if the DLQ does."""
+        retry_count = retry_options.max_retries if retry_options is not None else 0
+        dlq_topic = retry_options.get_dlq_topic(topic) if retry_options is not None else None
+        on_dlq = retry_options.on_dlq if retry_options is not None else None
+
+        async def dead_letter(event: Event, error: Exception) -> None:
+            await dlq.send_to_dlq(event, error, retry_count=retry_count, dlq_topic=dlq_topic)
+            if on_dlq:
+                try:
+                    await on_dlq(event, error)
+                except Exception as callback_error:
+                    self._logger.warning(f"DLQ callback failed: {callback_error}")
+
+        return dead_letter
+
     def _decode_redis_message(self, fields: dict[bytes, bytes]) -> Event:
         """Decode a Redis Stream message to an Event."""
         # Extract event data
@@ -399,8 +605,12 @@ class RedisEventBus(BaseAdapter):
         if not event_data:
             raise ValueError("Redis message missing 'data' field")
 
-        # Decode event
-        event = self.config.codec.decode(event_data)
+        # Decode event with the codec matching the producer's content type
+        content_type = fields.get(b"content_type")
+        if content_type:
+            event = self._codecs.decode(event_data, content_type.decode("utf-8"))
+        else:
+            event = self.config.codec.decode(event_data)
 
         # Extract headers from Redis fields
         headers = {}
@@ -19,7 +19,7 @@ from .bus import (
 )
 
 # Codecs
-from .codecs import JsonCodec
+from .codecs import CodecRegistry, JsonCodec, MsgPackCodec, OrjsonCodec
 
 # Consumer and retry logic
 from .consumer import (
@@ -91,6 +91,9 @@ __all__ = (
         "NotSupportedError",
         # Codecs
         "JsonCodec",
+        "OrjsonCodec",
+        "MsgPackCodec",
+        "CodecRegistry",
         # Adapters
         "AdapterConfig",
         "AdapterMetadata",
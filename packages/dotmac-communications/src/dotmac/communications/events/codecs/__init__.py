@@ -1,5 +1,15 @@
 """Event codecs for serialization and deserialization."""
 
 from .json_codec import JsonCodec
+from .msgpack_codec import MSGPACK_AVAILABLE, MsgPackCodec
+from .orjson_codec import ORJSON_AVAILABLE, OrjsonCodec
+from .registry import CodecRegistry
 
-__all__ = ["JsonCodec"]
+__all__ = [
+    "CodecRegistry",
+    "JsonCodec",
+    "MSGPACK_AVAILABLE",
+    "MsgPackCodec",
+    "ORJSON_AVAILABLE",
+    "OrjsonCodec",
+]
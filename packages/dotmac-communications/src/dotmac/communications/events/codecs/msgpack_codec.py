@@ -0,0 +1,222 @@
+"""MessagePack codec for event serialization/deserialization."""
+
+import struct
+import uuid
+import zlib
+from collections.abc import Callable, Mapping, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from ..message import Event, EventMetadata
+
+__all__ = ["MsgPackCodec", "MSGPACK_AVAILABLE"]
+
+# Optional msgpack import
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    msgpack = None  # type: ignore
+
+# Extension type codes
+EXT_UUID = 1
+EXT_DATETIME = 2  # naive datetime, microseconds since the epoch
+EXT_DATETIME_UTC = 3  # aware datetime normalized to UTC, microseconds since the epoch
+
+# Envelope layout version (first element of every encoded event)
+ENVELOPE_VERSION = 1
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_INT64 = struct.Struct(">q")
+
+
+def _schema_fingerprint(fields: Sequence[str]) -> int:
+    """Stable fingerprint of an ordered payload field list."""
+    return zlib.crc32("\x1f".join(fields).encode("utf-8"))
+
+
+class MsgPackCodec:
+    """
+    Compact MessagePack codec for encoding/decoding events.
+
+    Events are packed as a positional envelope rather than a map, and
+    datetimes and UUIDs use native extension types, so neither field names
+    nor ISO strings are paid for on the wire.
+
+    Topics listed in ``payload_schemas`` take a schema-keyed fast path: when
+    a payload has exactly the declared fields its values are packed as an
+    array in schema order, tagged with a fingerprint of the field list so a
+    consumer with a different schema fails loudly instead of mislabelling
+    values. Payloads that do not match fall back to a regular map.
+    """
+
+    def __init__(
+        self,
+        *,
+        payload_schemas: Optional[Mapping[str, Sequence[str]]] = None,
+        schema_validator: Optional[Callable[[str, dict[str, Any]], None]] = None,
+    ):
+        """
+        Initialize MessagePack codec.
+
+        Args:
+            payload_schemas: Ordered payload field names keyed by topic
+            schema_validator: Optional function to validate event payload schema
+
+        Raises:
+            ImportError: If msgpack is not installed
+        """
+        if not MSGPACK_AVAILABLE:
+            raise ImportError(
+                "msgpack is required for MsgPackCodec. "
+                "Install with: pip install 'dotmac-communications[codecs]'"
+            )
+
+        self.schema_validator = schema_validator
+        self._schemas: dict[str, tuple[tuple[str, ...], frozenset[str], int]] = {
+            topic: (tuple(fields), frozenset(fields), _schema_fingerprint(tuple(fields)))
+            for topic, fields in (payload_schemas or {}).items()
+        }
+
+    @property
+    def content_type(self) -> str:
+        """Content type identifier for MessagePack codec."""
+        return "application/msgpack"
+
+    def encode(self, event: Event | dict[str, Any]) -> bytes:
+        """
+        Encode an event to MessagePack bytes.
+
+        Args:
+            event: Event object or dict to encode
+
+        Returns:
+            MessagePack-encoded event as bytes
+        """
+        if not isinstance(event, Event):
+            return msgpack.packb(event, default=self._encode_ext, use_bin_type=True)
+
+        if self.schema_validator:
+            self.schema_validator(event.topic, event.payload)
+
+        payload: Any = event.payload
+        fingerprint = None
+        schema = self._schemas.get(event.topic)
+        if schema is not None:
+            fields, field_set, schema_fingerprint = schema
+            if payload.keys() == field_set:
+                payload = list(map(payload.__getitem__, fields))
+                fingerprint = schema_fingerprint
+
+        metadata = event.metadata or EventMetadata()
+        envelope = [
+            ENVELOPE_VERSION,
+            event.topic,
+            payload,
+            fingerprint,
+            event.key,
+            event.headers or None,
+            event.tenant_id,
+            metadata.id,
+            metadata.timestamp,
+            metadata.content_type,
+            metadata.encoding,
+            metadata.producer,
+            metadata.correlation_id,
+            metadata.causation_id,
+        ]
+        return msgpack.packb(envelope, default=self._encode_ext, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Event | dict[str, Any]:
+        """
+        Decode MessagePack bytes to an event or dictionary.
+
+        Args:
+            data: MessagePack bytes to decode
+
+        Returns:
+            Decoded Event object if data represents an event, otherwise the raw dictionary
+
+        Raises:
+            ValueError: If data is not a valid MessagePack event or dictionary
+        """
+        try:
+            obj = msgpack.unpackb(data, ext_hook=self._decode_ext, raw=False, strict_map_key=False)
+        except (ValueError, TypeError, msgpack.UnpackException) as e:
+            raise ValueError(f"Invalid MessagePack data: {e}") from e
+
+        if isinstance(obj, dict):
+            return obj
+        if not isinstance(obj, list) or not obj or obj[0] != ENVELOPE_VERSION:
+            raise ValueError("Event data must be a MessagePack event envelope or map")
+
+        try:
+            (
+                _,
+                topic,
+                payload,
+                fingerprint,
+                key,
+                headers,
+                tenant_id,
+                event_id,
+                timestamp,
+                content_type,
+                encoding,
+                producer,
+                correlation_id,
+                causation_id,
+            ) = obj
+        except ValueError as e:
+            raise ValueError(f"Invalid event structure: {e}") from e
+
+        if fingerprint is not None:
+            schema = self._schemas.get(topic)
+            if schema is None or schema[2] != fingerprint:
+                raise ValueError(f"Unknown payload schema for topic '{topic}'")
+            payload = dict(zip(schema[0], payload))
+
+        return Event(
+            topic=topic,
+            payload=payload,
+            key=key,
+            headers=headers,
+            tenant_id=tenant_id,
+            metadata=EventMetadata(
+                id=event_id,
+                timestamp=timestamp,
+                content_type=content_type,
+                encoding=encoding,
+                producer=producer,
+                correlation_id=correlation_id,
+                causation_id=causation_id,
+            ),
+        )
+
+    @staticmethod
+    def _encode_ext(obj: Any) -> Any:
+        """Pack datetime and UUID objects as extension types."""
+        if isinstance(obj, datetime):
+            if obj.tzinfo is None:
+                micros = (obj - _EPOCH) // _MICROSECOND
+                return msgpack.ExtType(EXT_DATETIME, _INT64.pack(micros))
+            micros = (obj - _EPOCH_UTC) // _MICROSECOND
+            return msgpack.ExtType(EXT_DATETIME_UTC, _INT64.pack(micros))
+        if isinstance(obj, uuid.UUID):
+            return msgpack.ExtType(EXT_UUID, obj.bytes)
+        raise TypeError(f"Object of type {type(obj).__name__} is not MessagePack serializable")
+
+    @staticmethod
+    def _decode_ext(code: int, data: bytes) -> Any:
+        """Unpack extension types produced by :meth:`_encode_ext`."""
+        if code == EXT_UUID:
+            return uuid.UUID(bytes=data)
+        if code == EXT_DATETIME:
+            return _EPOCH + _INT64.unpack(data)[0] * _MICROSECOND
+        if code == EXT_DATETIME_UTC:
+            return _EPOCH_UTC + _INT64.unpack(data)[0] * _MICROSECOND
+        return msgpack.ExtType(code, data)
@@ -0,0 +1,105 @@
+"""orjson-backed JSON codec for event serialization/deserialization."""
+
+from collections.abc import Callable
+from typing import Any, Optional
+
+from ..message import Event
+
+__all__ = ["OrjsonCodec", "ORJSON_AVAILABLE"]
+
+# Optional orjson import
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None  # type: ignore
+
+
+class OrjsonCodec:
+    """
+    JSON codec backed by orjson.
+
+    Produces the same ``application/json`` wire format as :class:`JsonCodec`,
+    so producers and consumers can switch independently, but serializes
+    datetimes and UUIDs natively instead of through a Python ``default`` hook.
+    """
+
+    def __init__(
+        self,
+        *,
+        sort_keys: bool = False,
+        schema_validator: Optional[Callable[[str, dict[str, Any]], None]] = None,
+    ):
+        """
+        Initialize orjson codec.
+
+        Args:
+            sort_keys: If True, sort dictionary keys for stable output
+            schema_validator: Optional function to validate event payload schema
+
+        Raises:
+            ImportError: If orjson is not installed
+        """
+        if not ORJSON_AVAILABLE:
+            raise ImportError(
+                "orjson is required for OrjsonCodec. "
+                "Install with: pip install 'dotmac-communications[codecs]'"
+            )
+
+        self.sort_keys = sort_keys
+        self.schema_validator = schema_validator
+        self._options = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+
+    @property
+    def content_type(self) -> str:
+        """Content type identifier for orjson codec."""
+        return "application/json"
+
+    def encode(self, event: Event | dict[str, Any]) -> bytes:
+        """
+        Encode an event to JSON bytes.
+
+        Args:
+            event: Event object or dict to encode
+
+        Returns:
+            JSON-encoded event as bytes
+        """
+        if hasattr(event, "to_dict"):
+            if self.schema_validator:
+                self.schema_validator(event.topic, event.payload)
+            event_dict = event.to_dict()
+        else:
+            event_dict = event
+
+        return orjson.dumps(event_dict, option=self._options)
+
+    def decode(self, data: bytes) -> Event | dict[str, Any]:
+        """
+        Decode JSON bytes to an event or dictionary.
+
+        Args:
+            data: JSON bytes to decode
+
+        Returns:
+            Decoded Event object if data represents an event, otherwise the raw dictionary
+
+        Raises:
+            ValueError: If data is not valid JSON
+        """
+        try:
+            event_dict = orjson.loads(data)
+
+            if not isinstance(event_dict, dict):
+                raise ValueError("Event data must be a JSON object")
+
+            if "topic" in event_dict and "payload" in event_dict:
+                return Event.from_dict(event_dict)
+            return event_dict
+
+        except orjson.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON data: {e}") from e
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid event structure: {e}") from e
@@ -0,0 +1,59 @@
+"""Content-type registry for negotiating event codecs."""
+
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from ..message import Event, MessageCodec
+from .json_codec import JsonCodec
+
+__all__ = ["CodecRegistry"]
+
+
+class CodecRegistry:
+    """
+    Map content types to codecs.
+
+    Adapters record the producing codec's content type alongside each
+    message and use a registry to pick the matching decoder, so producers
+    can move to a binary codec while older consumers and in-flight JSON
+    messages keep working. JSON is always registered as the fallback.
+    """
+
+    def __init__(self, codecs: Optional[Iterable[MessageCodec]] = None):
+        """
+        Initialize codec registry.
+
+        Args:
+            codecs: Codecs to register; later codecs replace earlier ones
+                with the same content type
+        """
+        self._codecs: dict[str, MessageCodec] = {}
+        self.register(JsonCodec.compact())
+        for codec in codecs or ():
+            self.register(codec)
+
+    def register(self, codec: MessageCodec) -> None:
+        """Register a codec under its content type."""
+        self._codecs[codec.content_type] = codec
+
+    def get(self, content_type: str) -> MessageCodec:
+        """
+        Get the codec for a content type.
+
+        Raises:
+            ValueError: If no codec is registered for the content type
+        """
+        # Ignore parameters such as "; charset=utf-8"
+        codec = self._codecs.get(content_type.split(";", 1)[0].strip().lower())
+        if codec is None:
+            raise ValueError(f"No codec registered for content type '{content_type}'")
+        return codec
+
+    def decode(self, data: bytes, content_type: str) -> Event | dict[str, Any]:
+        """Decode data with the codec registered for its content type."""
+        return self.get(content_type).decode(data)
+
+    @property
+    def content_types(self) -> list[str]:
+        """Registered content types."""
+        return list(self._codecs)
@@ -141,7 +141,19 @@ class RetryableHandler:
         self.retry_policy = options.get_retry_policy()
 
     async def __call__(self, event: Event) -> None:
-        """Handle event with retry logic."""
+        """Handle event with retry logic, sending it to the DLQ once retries run out."""
+        try:
+            await self.handle_with_retries(event)
+        except Exception as e:
+            await self._send_to_dlq(event, e)
+
+    async def handle_with_retries(self, event: Event) -> None:
+        """
+        Handle event with retry logic, without dead-lettering.
+
+        Raises:
+            Exception: The last handler error once no retry is left
+        """
         retry_count = 0
 
         while True:
@@ -164,11 +176,8 @@ class RetryableHandler:
 
                 # Check if we should retry
                 if not self.retry_policy.should_retry(e, retry_count):
-                    logger.error(
-                        f"Event {event.id} failed after {retry_count} retries, sending to DLQ: {e}"
-                    )
-                    await self._send_to_dlq(event, e)
-                    return
+                    logger.error(f"Event {event.id} failed after {retry_count} retries: {e}")
+                    raise
 
                 # Retry callback
                 if self.options.on_retry:
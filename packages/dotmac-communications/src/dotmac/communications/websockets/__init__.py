@@ -17,8 +17,9 @@ from .backends.local import LocalBackend
 from .backends.redis import RedisScalingBackend
 from .channels.abstractions import Channel, ChannelManager
 from .channels.broadcast import BroadcastManager
-from .core.config import AuthConfig, RedisConfig, WebSocketConfig
+from .core.config import AuthConfig, RedisConfig, SlowConsumerPolicy, WebSocketConfig
 from .core.gateway import WebSocketGateway
+from .core.outbound import BroadcastDelivery
 from .core.session import SessionManager, WebSocketSession
 from .middleware.rate_limit import RateLimitMiddleware
 from .middleware.tenant import TenantMiddleware
@@ -57,10 +58,12 @@ __all__ = [
     "WebSocketConfig",
     "RedisConfig",
     "AuthConfig",
+    "SlowConsumerPolicy",
     # Channel system
     "Channel",
     "ChannelManager",
     "BroadcastManager",
+    "BroadcastDelivery",
     # Authentication
     "AuthManager",
     "AuthMiddleware",
@@ -29,6 +29,14 @@ class ScalingBackend(ABC):
         """Broadcast message to all instances for a specific tenant."""
         pass
 
+    async def broadcast_to_role(self, role: str, message_type: str, data: Any = None):
+        """Broadcast message to all instances for sessions with a role."""
+        return None
+
+    async def broadcast_to_permission(self, permission: str, message_type: str, data: Any = None):
+        """Broadcast message to all instances for sessions with a permission."""
+        return None
+
     @abstractmethod
     async def broadcast_to_channel(self, channel_name: str, message_type: str, data: Any = None):
         """Broadcast message to all instances for a specific channel."""
@@ -33,6 +33,14 @@ class LocalBackend(ScalingBackend):
         """No-op for local backend - broadcasting handled by session manager."""
         pass
 
+    async def broadcast_to_role(self, role: str, message_type: str, data: Any = None):
+        """No-op for local backend - broadcasting handled by session manager."""
+        pass
+
+    async def broadcast_to_permission(self, permission: str, message_type: str, data: Any = None):
+        """No-op for local backend - broadcasting handled by session manager."""
+        pass
+
     async def broadcast_to_channel(self, channel_name: str, message_type: str, data: Any = None):
         """No-op for local backend - broadcasting handled by channel manager."""
         pass
@@ -9,6 +9,7 @@ import time
 import uuid
 from typing import Any, Optional
 
+from ..core.session import SessionIndex
 from .base import ScalingBackend
 
 logger = logging.getLogger(__name__)
@@ -25,7 +26,23 @@ except ImportError:
 
 
 class RedisScalingBackend(ScalingBackend):
-    """Redis-based scaling backend for WebSocket gateway."""
+    """
+    Redis-based scaling backend for WebSocket gateway.
+
+    The session manager's tenant, role and permission indexes are mirrored
+    into Redis as route sets (``{prefix}:route:{index}:{value}`` -> instance
+    ids). Tenant, role and permission broadcasts are published only to the
+    inbox channel of each instance in the route set, instead of to every
+    instance. Each instance refreshes an expiring heartbeat key; route set
+    members whose heartbeat has expired (crashed instances) are pruned when
+    a routed publish reads the set. Every heartbeat, and every reconnect,
+    re-adds this instance to the route sets of all its local index values,
+    so an instance pruned while its heartbeat was late (a stalled event loop
+    or a Redis outage) receives routed broadcasts again.
+    """
+
+    # Session indexes mirrored into Redis route sets
+    ROUTED_INDEXES = (SessionIndex.TENANT, SessionIndex.ROLE, SessionIndex.PERMISSION)
 
     def __init__(self, redis_config, session_manager, channel_manager):
         if not REDIS_AVAILABLE:
@@ -46,12 +63,21 @@ class RedisScalingBackend(ScalingBackend):
         self._subscribed_channels: set[str] = set()
         self._listener_task: Optional[asyncio.Task] = None
 
+        # Route set changes waiting to be written: (index, value) -> present
+        self._pending_routes: dict[tuple[SessionIndex, str], bool] = {}
+        self._routes_changed: Optional[asyncio.Event] = None
+        self._route_sync_task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
         # Statistics
         self._stats = {
             "messages_published": 0,
             "messages_received": 0,
             "connection_errors": 0,
             "reconnects": 0,
+            "route_updates": 0,
+            "routed_publishes": 0,
+            "routes_pruned": 0,
         }
 
         self._started = False
@@ -84,6 +110,13 @@ class RedisScalingBackend(ScalingBackend):
             # Start message listener
             self._listener_task = asyncio.create_task(self._listen_for_messages())
 
+            # Advertise liveness before joining any route set
+            await self.register_instance()
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+
+            # Mirror the local session indexes into the route sets
+            self._start_route_sync()
+
             self._started = True
             self._start_time = time.time()
 
@@ -100,6 +133,10 @@ class RedisScalingBackend(ScalingBackend):
             return
 
         try:
+            # Stop mirroring and withdraw this instance from the route sets
+            await self._stop_route_sync()
+            await self._stop_heartbeat()
+
             # Stop listener task
             if self._listener_task and not self._listener_task.done():
                 self._listener_task.cancel()
@@ -182,6 +219,10 @@ class RedisScalingBackend(ScalingBackend):
         for channel in self._subscribed_channels:
             await self.pubsub.subscribe(channel)
 
+        # The heartbeat may have lapsed while disconnected
+        await self.register_instance()
+        self._queue_full_route_sync()
+
     async def _handle_redis_message(self, channel: str, data: bytes):
         """Handle incoming Redis message."""
         try:
@@ -202,6 +243,10 @@ class RedisScalingBackend(ScalingBackend):
                 await self.session_manager.broadcast_to_user(target_id, msg_type, msg_data)
             elif target_type == "tenant":
                 await self.session_manager.broadcast_to_tenant(target_id, msg_type, msg_data)
+            elif target_type == "role":
+                await self.session_manager.broadcast_to_role(target_id, msg_type, msg_data)
+            elif target_type == "permission":
+                await self.session_manager.broadcast_to_permission(target_id, msg_type, msg_data)
             elif target_type == "channel":
                 await self.channel_manager.broadcast_to_channel(target_id, msg_type, msg_data)
             elif target_type == "session":
@@ -237,15 +282,172 @@ class RedisScalingBackend(ScalingBackend):
             logger.error(f"Error publishing Redis message: {e}")
             self._stats["connection_errors"] += 1
 
+    def _instance_key(self, instance_id: str) -> str:
+        return f"{self.config.channel_prefix}:instances:{instance_id}"
+
+    async def _heartbeat_loop(self):
+        """Refresh this instance's heartbeat key until stopped."""
+        interval = max(1.0, self.config.instance_ttl_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            await self.heartbeat()
+
+    async def _stop_heartbeat(self):
+        if self._heartbeat_task and not self._heartbeat_task.done():
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+        if self.redis:
+            try:
+                await self.redis.delete(self._instance_key(self.instance_id))
+            except Exception as e:
+                logger.error(f"Error unregistering instance: {e}")
+
+    def _route_key(self, index: SessionIndex, value: str) -> str:
+        return f"{self.config.channel_prefix}:route:{index.value}:{value}"
+
+    def _instance_channel(self, instance_id: str) -> str:
+        return f"{self.config.channel_prefix}:session:{instance_id}"
+
+    def _start_route_sync(self):
+        """Register for index changes and queue a full sync of the local indexes."""
+        self._routes_changed = asyncio.Event()
+        self.session_manager.add_index_listener(self._on_index_change)
+        self._route_sync_task = asyncio.create_task(self._sync_routes())
+        self._queue_full_route_sync()
+
+    def _queue_full_route_sync(self):
+        """Queue this instance for the route set of every local index value."""
+        if self._routes_changed is None:
+            return
+        for index in self.ROUTED_INDEXES:
+            for value in self.session_manager.get_indexed_values(index):
+                self._pending_routes[(index, value)] = True
+        self._routes_changed.set()
+
+    async def _stop_route_sync(self):
+        self.session_manager.remove_index_listener(self._on_index_change)
+        if self._route_sync_task and not self._route_sync_task.done():
+            self._route_sync_task.cancel()
+            try:
+                await self._route_sync_task
+            except asyncio.CancelledError:
+                pass
+        self._pending_routes.clear()
+        self._routes_changed = None
+
+        if not self.redis:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for index in self.ROUTED_INDEXES:
+                for value in self.session_manager.get_indexed_values(index):
+                    pipe.srem(self._route_key(index, value), self.instance_id)
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Error removing instance routes: {e}")
+
+    def _on_index_change(self, index: SessionIndex, value: str, present: bool):
+        """Session index listener; coalesces changes until the sync task writes them."""
+        if index not in self.ROUTED_INDEXES:
+            return
+        self._pending_routes[(index, value)] = present
+        if self._routes_changed is not None:
+            self._routes_changed.set()
+
+    async def _sync_routes(self):
+        """Write pending route changes to Redis, batching bursts into one pipeline."""
+        while True:
+            await self._routes_changed.wait()
+            self._routes_changed.clear()
+            if not self._pending_routes or not self.redis:
+                continue
+
+            changes, self._pending_routes = self._pending_routes, {}
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for (index, value), present in changes.items():
+                    key = self._route_key(index, value)
+                    if present:
+                        pipe.sadd(key, self.instance_id)
+                    else:
+                        pipe.srem(key, self.instance_id)
+                await pipe.execute()
+                self._stats["route_updates"] += len(changes)
+            except Exception as e:
+                logger.error(f"Error syncing session routes: {e}")
+                self._stats["connection_errors"] += 1
+                # Keep the failed changes unless newer ones superseded them
+                for route, present in changes.items():
+                    self._pending_routes.setdefault(route, present)
+                await asyncio.sleep(1)
+                self._routes_changed.set()
+
+    async def _publish_routed(
+        self, index: SessionIndex, value: str, message_type: str, data: Any = None
+    ) -> int:
+        """Publish to the inbox of each other instance holding sessions for an index value."""
+        if not self.redis:
+            return 0
+
+        try:
+            members = await self.redis.smembers(self._route_key(index, value))
+        except Exception as e:
+            logger.error(f"Error reading session routes: {e}")
+            self._stats["connection_errors"] += 1
+            return 0
+
+        instance_ids = {m.decode("utf-8") if isinstance(m, bytes) else m for m in members}
+        instance_ids.discard(self.instance_id)
+        instance_ids = await self._prune_dead_instances(self._route_key(index, value), instance_ids)
+        for instance_id in instance_ids:
+            await self._publish_message(
+                self._instance_channel(instance_id), index.value, value, message_type, data
+            )
+        self._stats["routed_publishes"] += len(instance_ids)
+        return len(instance_ids)
+
+    async def _prune_dead_instances(self, route_key: str, instance_ids: set[str]) -> set[str]:
+        """Drop route set members whose heartbeat key has expired; returns the live ones."""
+        if not instance_ids:
+            return instance_ids
+
+        ordered = sorted(instance_ids)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for instance_id in ordered:
+                pipe.exists(self._instance_key(instance_id))
+            alive = await pipe.execute()
+
+            dead = [instance_id for instance_id, live in zip(ordered, alive) if not live]
+            if dead:
+                await self.redis.srem(route_key, *dead)
+                self._stats["routes_pruned"] += len(dead)
+                logger.info(f"Pruned {len(dead)} dead instances from {route_key}")
+        except Exception as e:
+            logger.error(f"Error checking instance liveness: {e}")
+            return instance_ids
+
+        return {instance_id for instance_id, live in zip(ordered, alive) if live}
+
     async def broadcast_to_user(self, user_id: str, message_type: str, data: Any = None):
         """Broadcast message to all instances for a specific user."""
         channel = f"{self.config.channel_prefix}:broadcast:user"
         await self._publish_message(channel, "user", user_id, message_type, data)
 
     async def broadcast_to_tenant(self, tenant_id: str, message_type: str, data: Any = None):
-        """Broadcast message to all instances for a specific tenant."""
-        channel = f"{self.config.channel_prefix}:broadcast:tenant"
-        await self._publish_message(channel, "tenant", tenant_id, message_type, data)
+        """Broadcast message to the instances holding sessions of a tenant."""
+        await self._publish_routed(SessionIndex.TENANT, tenant_id, message_type, data)
+
+    async def broadcast_to_role(self, role: str, message_type: str, data: Any = None):
+        """Broadcast message to the instances holding sessions with a role."""
+        await self._publish_routed(SessionIndex.ROLE, role, message_type, data)
+
+    async def broadcast_to_permission(self, permission: str, message_type: str, data: Any = None):
+        """Broadcast message to the instances holding sessions with a permission."""
+        await self._publish_routed(SessionIndex.PERMISSION, permission, message_type, data)
 
     async def broadcast_to_channel(self, channel_name: str, message_type: str, data: Any = None):
         """Broadcast message to all instances for a specific channel."""
@@ -272,24 +474,25 @@ class RedisScalingBackend(ScalingBackend):
             return
 
         try:
-            instance_key = f"{self.config.channel_prefix}:instances:{self.instance_id}"
+            instance_key = self._instance_key(self.instance_id)
             instance_data = {
                 "instance_id": self.instance_id,
-                "started_at": time.time(),
+                "started_at": self._start_time or time.time(),
                 "last_heartbeat": time.time(),
                 "stats": self._stats,
             }
 
             await self.redis.setex(
-                instance_key, self.config.message_ttl_seconds, json.dumps(instance_data)
+                instance_key, self.config.instance_ttl_seconds, json.dumps(instance_data)
             )
 
         except Exception as e:
             logger.error(f"Error registering instance: {e}")
 
     async def heartbeat(self):
-        """Send heartbeat to Redis."""
+        """Send heartbeat to Redis and re-assert this instance's routes."""
         await self.register_instance()
+        self._queue_full_route_sync()
 
     async def get_active_instances(self) -> dict[str, Any]:
         """Get all active instances from Redis."""
@@ -9,6 +9,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Optional
 
+from ..core.outbound import BroadcastDelivery, EnqueueStatus, encode_frame
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,8 +59,13 @@ class BroadcastMessage:
     timestamp: float = field(default_factory=time.time)
 
     # Delivery options
-    reliable: bool = False  # Ensure delivery or queue for retry
+    reliable: bool = False  # Wait until queued frames are written before returning
     ttl_seconds: Optional[int] = None  # Message expiration
+    delivery_timeout_seconds: Optional[float] = None  # Bound on the reliable wait
+
+    # Frames with the same key replace each other in a lagging session's queue
+    # under the coalesce slow-consumer policy
+    coalesce_key: Optional[str] = None
 
     # Custom headers
     headers: dict[str, str] = field(default_factory=dict)
@@ -73,10 +80,19 @@ class BroadcastResult:
 
     # Results
     success: bool
-    delivered_count: int = 0
+    delivered_count: int = 0  # Frames accepted for delivery (written, if reliable)
     failed_count: int = 0
     filtered_count: int = 0  # Sessions filtered out by conditions
 
+    # Per-session queue outcomes
+    queued_count: int = 0
+    coalesced_count: int = 0  # Replaced a pending frame with the same coalesce key
+    evicted_count: int = 0  # Queued after evicting the session's oldest frame
+    disconnected_count: int = 0  # Slow consumers disconnected by policy
+
+    # Tracks written/dropped frames after the broadcast returns
+    delivery: Optional[BroadcastDelivery] = None
+
     # Error information
     errors: list[str] = field(default_factory=list)
 
@@ -104,6 +120,9 @@ class BroadcastManager:
             "successful_broadcasts": 0,
             "failed_broadcasts": 0,
             "total_messages_sent": 0,
+            "total_frames_evicted": 0,
+            "total_frames_coalesced": 0,
+            "slow_consumer_disconnects": 0,
             "average_delivery_time_ms": 0.0,
         }
 
@@ -120,7 +139,13 @@ class BroadcastManager:
     async def broadcast(
         self, target: BroadcastTarget, message: BroadcastMessage
     ) -> BroadcastResult:
-        """Perform broadcast operation."""
+        """
+        Perform broadcast operation.
+
+        The message is encoded once and the frame is queued on every target
+        session; session writer tasks deliver it. ``result.delivery`` tracks
+        the outcome, and ``message.reliable`` waits for it before returning.
+        """
         start_time = time.time()
 
         result = BroadcastResult(target=target, message=message, success=False)
@@ -137,34 +162,47 @@ class BroadcastManager:
                     result.errors.append(f"Filter error: {e}")
                     return result
 
-            # Get target sessions
-            target_sessions = await self._resolve_target_sessions(target)
+            # Resolve target session ids and apply session-level filtering
+            target_ids = await self._resolve_target_session_ids(target)
+            filtered_ids = self._filter_session_ids(target_ids, target)
+            result.filtered_count = len(target_ids) - len(filtered_ids)
+            filtered_sessions = self.session_manager.get_sessions_by_ids(filtered_ids)
 
-            # Apply session-level filtering
-            filtered_sessions = await self._filter_sessions(target_sessions, target, message)
-            result.filtered_count = len(target_sessions) - len(filtered_sessions)
-
-            # Broadcast to filtered sessions
-            delivered_count = 0
-            failed_count = 0
+            # Encode once, then queue the frame for each session
+            frame = encode_frame(message.type, message.data, message.timestamp)
+            delivery = result.delivery = BroadcastDelivery()
+            counts = dict.fromkeys(EnqueueStatus, 0)
 
             for session in filtered_sessions:
                 try:
-                    success = await session.send_message(message.type, message.data)
-                    if success:
-                        delivered_count += 1
-                    else:
-                        failed_count += 1
+                    status = session.enqueue_frame(frame, delivery, message.coalesce_key)
                 except Exception as e:
-                    logger.error(f"Error sending to session {session.session_id}: {e}")
-                    failed_count += 1
+                    logger.error(f"Error queueing for session {session.session_id}: {e}")
                     result.errors.append(f"Session {session.session_id}: {e}")
+                    status = EnqueueStatus.CLOSED
+                counts[status] += 1
+
+            delivery.seal()
+
+            result.queued_count = (
+                counts[EnqueueStatus.QUEUED] + counts[EnqueueStatus.QUEUED_DROPPED_OLDEST]
+            )
+            result.evicted_count = counts[EnqueueStatus.QUEUED_DROPPED_OLDEST]
+            result.coalesced_count = counts[EnqueueStatus.COALESCED]
+            result.disconnected_count = counts[EnqueueStatus.DISCONNECTED]
+            result.delivered_count = result.queued_count + result.coalesced_count
+            result.failed_count = result.disconnected_count + counts[EnqueueStatus.CLOSED]
+
+            if message.reliable:
+                if not await delivery.wait(message.delivery_timeout_seconds):
+                    result.errors.append(f"Delivery timed out with {delivery.pending} pending")
+                result.delivered_count = delivery.sent
+                result.failed_count += delivery.expected - delivery.sent
 
-            result.delivered_count = delivered_count
-            result.failed_count = failed_count
-            result.success = delivered_count > 0
+            result.success = result.delivered_count > 0
 
             # Update statistics
+            result.duration_ms = (time.time() - start_time) * 1000
             self._update_stats(result, start_time)
 
         except Exception as e:
@@ -183,112 +221,56 @@ class BroadcastManager:
 
         return result
 
-    async def _resolve_target_sessions(self, target: BroadcastTarget) -> list:
-        """Resolve target sessions based on broadcast scope."""
-        sessions = []
+    async def _resolve_target_session_ids(self, target: BroadcastTarget) -> set[str]:
+        """Resolve the ids of the sessions in the broadcast scope."""
+        session_manager = self.session_manager
+        scope = target.scope
 
-        if target.scope == BroadcastScope.SESSION:
-            session = self.session_manager.get_session(target.identifier)
-            if session:
-                sessions = [session]
+        if scope == BroadcastScope.SESSION:
+            if session_manager.get_session(target.identifier):
+                return {target.identifier}
+            return set()
 
-        elif target.scope == BroadcastScope.USER:
-            sessions = self.session_manager.get_user_sessions(target.identifier)
+        if scope == BroadcastScope.USER:
+            return session_manager.select_session_ids(user_id=target.identifier)
 
-        elif target.scope == BroadcastScope.TENANT:
-            sessions = self.session_manager.get_tenant_sessions(target.identifier)
+        if scope == BroadcastScope.TENANT:
+            return session_manager.select_session_ids(tenant_id=target.identifier)
 
-        elif target.scope == BroadcastScope.CHANNEL:
+        if scope == BroadcastScope.CHANNEL:
             subscriber_ids = await self.channel_manager.get_channel_subscribers(target.identifier)
-            sessions = [
-                self.session_manager.get_session(sid)
-                for sid in subscriber_ids
-                if self.session_manager.get_session(sid)
-            ]
-
-        elif target.scope == BroadcastScope.ROLE:
-            sessions = [
-                session
-                for session in self.session_manager.get_all_sessions()
-                if (
-                    session.is_authenticated
-                    and hasattr(session, "user_info")
-                    and hasattr(session.user_info, "has_role")
-                    and session.user_info.has_role(target.identifier)
-                )
-            ]
-
-        elif target.scope == BroadcastScope.PERMISSION:
-            sessions = [
-                session
-                for session in self.session_manager.get_all_sessions()
-                if (
-                    session.is_authenticated
-                    and hasattr(session, "user_info")
-                    and hasattr(session.user_info, "has_permission")
-                    and session.user_info.has_permission(target.identifier)
-                )
-            ]
-
-        elif target.scope == BroadcastScope.GLOBAL:
-            sessions = self.session_manager.get_all_sessions()
-
-        return sessions
-
-    async def _filter_sessions(
-        self, sessions: list, target: BroadcastTarget, message: BroadcastMessage
-    ) -> list:
-        """Apply session-level filtering."""
-        filtered_sessions = []
-
-        for session in sessions:
-            # Exclude specific sessions
-            if session.session_id in target.exclude_sessions:
-                continue
-
-            # Include only specific sessions (if specified)
-            if (
-                target.include_only_sessions
-                and session.session_id not in target.include_only_sessions
-            ):
-                continue
-
-            # Authentication requirement
-            if target.require_authenticated and not session.is_authenticated:
-                continue
-
-            # Tenant filtering
-            if target.tenant_id and session.tenant_id != target.tenant_id:
-                continue
-
-            # Role requirements
-            if target.require_roles:
-                if (
-                    not session.is_authenticated
-                    or not hasattr(session, "user_info")
-                    or not hasattr(session.user_info, "has_any_role")
-                    or not session.user_info.has_any_role(target.require_roles)
-                ):
-                    continue
-
-            # Permission requirements
-            if target.require_permissions:
-                if (
-                    not session.is_authenticated
-                    or not hasattr(session, "user_info")
-                    or not hasattr(session.user_info, "has_permission")
-                ):
-                    continue
-
-                has_all_permissions = all(
-                    session.user_info.has_permission(perm) for perm in target.require_permissions
-                )
-                if not has_all_permissions:
-                    continue
-
-            filtered_sessions.append(session)
-
-        return filtered_sessions
+            return session_manager.select_session_ids(set(subscriber_ids))
+
+        if scope == BroadcastScope.ROLE:
+            return session_manager.select_session_ids(any_roles=[target.identifier])
+
+        if scope == BroadcastScope.PERMISSION:
+            return session_manager.select_session_ids(all_permissions=[target.identifier])
+
+        if scope == BroadcastScope.GLOBAL:
+            return session_manager.select_session_ids()
+
+        return set()
+
+    def _filter_session_ids(self, session_ids: set[str], target: BroadcastTarget) -> set[str]:
+        """Apply session-level filters as set operations over the session indexes."""
+        require_roles = target.require_roles or None
+        require_permissions = target.require_permissions or None
+
+        selected = self.session_manager.select_session_ids(
+            session_ids,
+            tenant_id=target.tenant_id or None,
+            any_roles=require_roles,
+            all_permissions=require_permissions,
+            authenticated=bool(
+                target.require_authenticated or require_roles or require_permissions
+            ),
+        )
+        if target.exclude_sessions:
+            selected.difference_update(target.exclude_sessions)
+        if target.include_only_sessions:
+            selected.intersection_update(target.include_only_sessions)
+        return selected
 
     def _update_stats(self, result: BroadcastResult, start_time: float):
         """Update broadcast statistics."""
@@ -300,6 +282,9 @@ class BroadcastManager:
             self._stats["failed_broadcasts"] += 1
 
         self._stats["total_messages_sent"] += result.delivered_count
+        self._stats["total_frames_evicted"] += result.evicted_count
+        self._stats["total_frames_coalesced"] += result.coalesced_count
+        self._stats["slow_consumer_disconnects"] += result.disconnected_count
 
         # Update average delivery time
         current_avg = self._stats["average_delivery_time_ms"]
@@ -6,6 +6,7 @@ import asyncio
 import logging
 from typing import Any, Optional
 
+from ..core.outbound import encode_frame
 from .abstractions import Channel, ChannelManager, ChannelMetadata
 
 logger = logging.getLogger(__name__)
@@ -27,7 +28,8 @@ class ConcreteChannel(Channel):
         # Add to message history
         await self.add_message(message_type, data)
 
-        # Send to all subscribers
+        # Encode once and queue for all subscribers
+        frame = encode_frame(message_type, data)
         for session_id in self._subscribers.copy():  # Copy to avoid modification during iteration
             if exclude_session and session_id == exclude_session:
                 continue
@@ -35,7 +37,7 @@ class ConcreteChannel(Channel):
             session = self.session_manager.get_session(session_id)
             if session:
                 try:
-                    if await session.send_message(message_type, data):
+                    if session.enqueue_frame(frame).accepted:
                         success_count += 1
                 except Exception as e:
                     logger.error(f"Error sending to session {session_id}: {e}")
@@ -256,21 +258,16 @@ class ConcreteChannelManager(ChannelManager):
             return False
 
         # Check required roles
-        if metadata.required_roles:
-            user_info = getattr(session, "user_info", None)
-            if not user_info or not hasattr(user_info, "has_any_role"):
-                return False
-            if not user_info.has_any_role(metadata.required_roles):
-                return False
+        if metadata.required_roles and not any(
+            session.has_role(role) for role in metadata.required_roles
+        ):
+            return False
 
         # Check required permissions
-        if metadata.required_permissions:
-            user_info = getattr(session, "user_info", None)
-            if not user_info or not hasattr(user_info, "has_permission"):
-                return False
-            for permission in metadata.required_permissions:
-                if not user_info.has_permission(permission):
-                    return False
+        if metadata.required_permissions and not all(
+            session.has_permission(permission) for permission in metadata.required_permissions
+        ):
+            return False
 
         return True
 
@@ -2,16 +2,23 @@
 Core WebSocket components.
 """
 
-from .config import AuthConfig, RedisConfig, WebSocketConfig
+from .config import AuthConfig, RedisConfig, SlowConsumerPolicy, WebSocketConfig
 from .gateway import WebSocketGateway
-from .session import SessionManager, SessionState, WebSocketSession
+from .outbound import BroadcastDelivery, EnqueueStatus, SessionOutbox, encode_frame
+from .session import SessionIndex, SessionManager, SessionState, WebSocketSession
 
 __all__ = [
     "WebSocketConfig",
     "RedisConfig",
     "AuthConfig",
+    "SlowConsumerPolicy",
     "SessionManager",
     "WebSocketSession",
     "SessionState",
+    "SessionIndex",
     "WebSocketGateway",
+    "SessionOutbox",
+    "BroadcastDelivery",
+    "EnqueueStatus",
+    "encode_frame",
 ]
@@ -24,6 +24,14 @@ class BackendType(str, Enum):
     REDIS = "redis"
 
 
+class SlowConsumerPolicy(str, Enum):
+    """What to do when a session's outbound queue is full."""
+
+    DROP_OLDEST = "drop_oldest"  # Evict the oldest queued frame
+    DISCONNECT = "disconnect"  # Close the session
+    COALESCE = "coalesce"  # Replace a queued frame with the same key, else drop oldest
+
+
 @dataclass
 class RedisConfig:
     """Redis connection configuration."""
@@ -45,6 +53,9 @@ class RedisConfig:
     channel_prefix: str = "ws"
     message_ttl_seconds: int = 300
 
+    # Instance liveness: heartbeat key TTL; refreshed every third of it
+    instance_ttl_seconds: int = 30
+
     def to_url(self) -> str:
         """Generate Redis URL."""
         if self.password:
@@ -114,6 +125,10 @@ class SessionConfig:
     # Session cleanup
     cleanup_interval_seconds: int = 60
 
+    # Outbound queue for broadcast frames, drained by a writer task per session
+    outbound_queue_size: int = 256
+    slow_consumer_policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST
+
     # Storage
     store_session_metadata: bool = True
     metadata_ttl_seconds: int = 3600
@@ -98,6 +98,8 @@ class WebSocketGateway:
                         session.session_id,
                         auth_result.user_info.user_id,
                         auth_result.user_info.tenant_id,
+                        roles=auth_result.user_info.roles,
+                        permissions=auth_result.user_info.permissions,
                         **auth_result.user_info.extra_data,
                     )
 
@@ -478,6 +480,30 @@ class WebSocketGateway:
 
         return local_count
 
+    async def broadcast_to_role(self, role: str, message_type: str, data: Any = None) -> int:
+        """Broadcast message to all sessions whose user has a role."""
+        local_count = await self.session_manager.broadcast_to_role(role, message_type, data)
+
+        # Also broadcast via scaling backend
+        if self.scaling_backend:
+            await self.scaling_backend.broadcast_to_role(role, message_type, data)
+
+        return local_count
+
+    async def broadcast_to_permission(
+        self, permission: str, message_type: str, data: Any = None
+    ) -> int:
+        """Broadcast message to all sessions whose user has a permission."""
+        local_count = await self.session_manager.broadcast_to_permission(
+            permission, message_type, data
+        )
+
+        # Also broadcast via scaling backend
+        if self.scaling_backend:
+            await self.scaling_backend.broadcast_to_permission(permission, message_type, data)
+
+        return local_count
+
     async def broadcast_to_channel(
         self,
         channel_name: str,
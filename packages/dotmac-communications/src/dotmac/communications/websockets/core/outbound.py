@@ -0,0 +1,350 @@
+"""
+Outbound frame queues for WebSocket sessions.
+
+Broadcasts serialize a message once and enqueue the encoded frame onto a
+bounded queue per session. A writer task per session drains its queue, so a
+slow client only backs up its own queue instead of stalling the broadcast.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from enum import Enum
+from typing import Any, Optional
+
+from .config import SlowConsumerPolicy
+
+logger = logging.getLogger(__name__)
+
+
+def encode_frame(message_type: str, data: Any = None, timestamp: Optional[float] = None) -> str:
+    """Serialize a structured message into a text frame."""
+    return json.dumps(
+        {
+            "type": message_type,
+            "data": data,
+            "timestamp": time.time() if timestamp is None else timestamp,
+        }
+    )
+
+
+class EnqueueStatus(str, Enum):
+    """Outcome of enqueueing a frame onto a session queue."""
+
+    QUEUED = "queued"
+    QUEUED_DROPPED_OLDEST = "queued_dropped_oldest"  # Oldest queued frame was evicted
+    COALESCED = "coalesced"  # Replaced a queued frame with the same coalesce key
+    DISCONNECTED = "disconnected"  # Queue full under the disconnect policy
+    CLOSED = "closed"  # Session or queue already closed
+
+    @property
+    def accepted(self) -> bool:
+        """Whether the frame was accepted for delivery."""
+        return self in (
+            EnqueueStatus.QUEUED,
+            EnqueueStatus.QUEUED_DROPPED_OLDEST,
+            EnqueueStatus.COALESCED,
+        )
+
+
+class BroadcastDelivery:
+    """
+    Delivery tracking for the frames of one broadcast.
+
+    Counts how each accepted frame ended up: written to the socket, failed,
+    dropped by the slow-consumer policy, or superseded by a newer frame with
+    the same coalesce key. ``wait()`` returns once every frame is resolved.
+    """
+
+    __slots__ = (
+        "_done",
+        "_sealed",
+        "completed_at",
+        "dropped",
+        "expected",
+        "failed",
+        "first_sent_at",
+        "last_sent_at",
+        "sent",
+        "started_at",
+        "superseded",
+    )
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.expected = 0
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.superseded = 0
+        self.first_sent_at: Optional[float] = None
+        self.last_sent_at: Optional[float] = None
+        self.completed_at: Optional[float] = None
+        self._sealed = False
+        self._done: Optional[asyncio.Event] = None
+
+    @property
+    def pending(self) -> int:
+        """Accepted frames not yet resolved."""
+        return self.expected - self.sent - self.failed - self.dropped - self.superseded
+
+    @property
+    def is_complete(self) -> bool:
+        return self.completed_at is not None
+
+    def record_accepted(self) -> None:
+        self.expected += 1
+
+    def record_sent(self) -> None:
+        now = time.perf_counter()
+        if self.first_sent_at is None:
+            self.first_sent_at = now
+        self.last_sent_at = now
+        self.sent += 1
+        self._check_complete()
+
+    def record_failed(self) -> None:
+        self.failed += 1
+        self._check_complete()
+
+    def record_dropped(self) -> None:
+        self.dropped += 1
+        self._check_complete()
+
+    def record_superseded(self) -> None:
+        self.superseded += 1
+        self._check_complete()
+
+    def seal(self) -> None:
+        """Mark enqueueing as finished; completion is only possible after this."""
+        self._sealed = True
+        self._check_complete()
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every accepted frame is resolved. Returns False on timeout."""
+        if self.is_complete:
+            return True
+        if self._done is None:
+            self._done = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def _check_complete(self) -> None:
+        if self._sealed and self.completed_at is None and self.pending == 0:
+            self.completed_at = time.perf_counter()
+            if self._done is not None:
+                self._done.set()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Delivery counters and latencies in milliseconds since the broadcast started."""
+
+        def since_start(moment: Optional[float]) -> Optional[float]:
+            return None if moment is None else (moment - self.started_at) * 1000
+
+        return {
+            "expected": self.expected,
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "superseded": self.superseded,
+            "pending": self.pending,
+            "first_delivery_ms": since_start(self.first_sent_at),
+            "last_delivery_ms": since_start(self.last_sent_at),
+            "completion_ms": since_start(self.completed_at),
+        }
+
+
+class _Frame:
+    """Encoded frame waiting in a session queue."""
+
+    __slots__ = ("coalesce_key", "data", "delivery")
+
+    def __init__(
+        self, data: str, delivery: Optional[BroadcastDelivery], coalesce_key: Optional[str]
+    ) -> None:
+        self.data = data
+        self.delivery = delivery
+        self.coalesce_key = coalesce_key
+
+
+class SessionOutbox:
+    """
+    Bounded outbound frame queue drained by a writer task.
+
+    Args:
+        send: Coroutine writing one encoded frame to the client
+        on_error: Coroutine called when a write fails; the outbox is closed
+        max_size: Frames held before the slow-consumer policy applies
+        policy: Slow-consumer policy
+        name: Label for log messages
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[None]],
+        on_error: Callable[[Exception], Awaitable[None]],
+        max_size: int = 256,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+        name: str = "",
+    ):
+        self.max_size = max(1, max_size)
+        self.policy = SlowConsumerPolicy(policy)
+        self.name = name
+        self._send = send
+        self._on_error = on_error
+
+        self._frames: deque[_Frame] = deque()
+        self._by_key: dict[str, _Frame] = {}
+        # Set while the writer is parked on an empty queue
+        self._waiter: Optional[asyncio.Future] = None
+        self._closed = False
+        self._writer: Optional[asyncio.Task] = None
+
+        # Statistics
+        self.frames_queued = 0
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.frames_coalesced = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        """Frames waiting to be written."""
+        return len(self._frames)
+
+    @property
+    def is_closed(self) -> bool:
+        return self._closed
+
+    def enqueue(
+        self,
+        data: str,
+        delivery: Optional[BroadcastDelivery] = None,
+        coalesce_key: Optional[str] = None,
+    ) -> EnqueueStatus:
+        """Queue an encoded frame without waiting for it to be written."""
+        if self._closed:
+            return EnqueueStatus.CLOSED
+
+        status = EnqueueStatus.QUEUED
+        frames = self._frames
+
+        if self.policy == SlowConsumerPolicy.COALESCE and coalesce_key is not None:
+            pending = self._by_key.get(coalesce_key)
+            if pending is not None:
+                # Latest value wins; the frame keeps its place in the queue
+                if pending.delivery is not None:
+                    pending.delivery.record_superseded()
+                pending.data = data
+                pending.delivery = delivery
+                if delivery is not None:
+                    delivery.record_accepted()
+                self.frames_coalesced += 1
+                return EnqueueStatus.COALESCED
+
+        if len(frames) >= self.max_size:
+            if self.policy == SlowConsumerPolicy.DISCONNECT:
+                logger.warning(
+                    f"Outbound queue full for {self.name} ({len(frames)} frames), disconnecting"
+                )
+                self.close()
+                return EnqueueStatus.DISCONNECTED
+            self._drop_oldest()
+            status = EnqueueStatus.QUEUED_DROPPED_OLDEST
+
+        frame = _Frame(data, delivery, coalesce_key)
+        frames.append(frame)
+        if coalesce_key is not None and self.policy == SlowConsumerPolicy.COALESCE:
+            self._by_key[coalesce_key] = frame
+        if delivery is not None:
+            delivery.record_accepted()
+
+        self.frames_queued += 1
+        if len(frames) > self.max_depth:
+            self.max_depth = len(frames)
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._drain())
+        else:
+            self._wake_writer()
+        return status
+
+    def close(self) -> None:
+        """Stop the writer and drop queued frames."""
+        if self._closed:
+            return
+        self._closed = True
+
+        while self._frames:
+            self._drop_oldest()
+        self._wake_writer()
+
+        writer = self._writer
+        if writer is not None and not writer.done() and writer is not asyncio.current_task():
+            writer.cancel()
+
+    def _wake_writer(self) -> None:
+        waiter = self._waiter
+        if waiter is not None:
+            self._waiter = None
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _drop_oldest(self) -> None:
+        frame = self._frames.popleft()
+        self._forget_key(frame)
+        if frame.delivery is not None:
+            frame.delivery.record_dropped()
+        self.frames_dropped += 1
+
+    def _forget_key(self, frame: _Frame) -> None:
+        if frame.coalesce_key is not None and self._by_key.get(frame.coalesce_key) is frame:
+            del self._by_key[frame.coalesce_key]
+
+    async def _drain(self) -> None:
+        """Writer loop: write queued frames in order until closed."""
+        frames = self._frames
+        while True:
+            while not frames:
+                if self._closed:
+                    return
+                self._waiter = asyncio.get_running_loop().create_future()
+                await self._waiter
+
+            frame = frames.popleft()
+            self._forget_key(frame)
+            try:
+                await self._send(frame.data)
+            except asyncio.CancelledError:
+                if frame.delivery is not None:
+                    frame.delivery.record_dropped()
+                raise
+            except Exception as e:
+                if frame.delivery is not None:
+                    frame.delivery.record_failed()
+                self.close()
+                await self._on_error(e)
+                return
+
+            self.frames_sent += 1
+            if frame.delivery is not None:
+                frame.delivery.record_sent()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Queue statistics."""
+        return {
+            "depth": len(self._frames),
+            "max_depth": self.max_depth,
+            "max_size": self.max_size,
+            "policy": self.policy.value,
+            "frames_queued": self.frames_queued,
+            "frames_sent": self.frames_sent,
+            "frames_dropped": self.frames_dropped,
+            "frames_coalesced": self.frames_coalesced,
+            "closed": self._closed,
+        }
@@ -7,11 +7,14 @@ import json
 import logging
 import time
 import uuid
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Collection, Iterable
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Optional
 
+from .config import SlowConsumerPolicy
+from .outbound import BroadcastDelivery, EnqueueStatus, SessionOutbox, encode_frame
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +29,18 @@ class SessionState(str, Enum):
     ERROR = "error"
 
 
+class SessionIndex(str, Enum):
+    """Session attributes the session manager keeps inverted indexes for."""
+
+    USER = "user"
+    TENANT = "tenant"
+    ROLE = "role"
+    PERMISSION = "permission"
+
+
+_NO_SESSIONS: frozenset[str] = frozenset()
+
+
 @dataclass
 class SessionMetadata:
     """Session metadata and tracking."""
@@ -44,6 +59,8 @@ class SessionMetadata:
     # Session data
     custom_data: dict[str, Any] = field(default_factory=dict)
     channels: set[str] = field(default_factory=set)
+    roles: set[str] = field(default_factory=set)
+    permissions: set[str] = field(default_factory=set)
 
     # Statistics
     messages_sent: int = 0
@@ -53,13 +70,29 @@ class SessionMetadata:
 
 
 class WebSocketSession:
-    """Individual WebSocket session wrapper."""
+    """
+    Individual WebSocket session wrapper.
+
+    ``send_message``/``send_raw`` write directly to the socket. Broadcast
+    frames go through ``enqueue_frame`` instead, onto a bounded outbound
+    queue drained by a writer task, so a slow client cannot stall the
+    broadcaster.
+    """
 
-    def __init__(self, websocket, session_id: str, metadata: Optional[SessionMetadata] = None):
+    def __init__(
+        self,
+        websocket,
+        session_id: str,
+        metadata: Optional[SessionMetadata] = None,
+        outbound_queue_size: int = 256,
+        slow_consumer_policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+    ):
         self.websocket = websocket
         self.session_id = session_id
         self.metadata = metadata or SessionMetadata(session_id=session_id)
         self.state = SessionState.CONNECTING
+        self.outbound_queue_size = outbound_queue_size
+        self.slow_consumer_policy = slow_consumer_policy
 
         # Event handlers
         self._message_handlers: list[Callable[[str, Any], Awaitable[None]]] = []
@@ -68,6 +101,8 @@ class WebSocketSession:
         # Internal state
         self._closed = False
         self._ping_task: Optional[asyncio.Task] = None
+        self._outbox: Optional[SessionOutbox] = None
+        self._close_task: Optional[asyncio.Task] = None
 
     @property
     def is_authenticated(self) -> bool:
@@ -92,11 +127,36 @@ class WebSocketSession:
             SessionState.AUTHENTICATED,
         )
 
-    def set_user_info(self, user_id: str, tenant_id: Optional[str] = None, **extra_data):
-        """Set user authentication information."""
+    def has_role(self, role: str) -> bool:
+        """Check if the authenticated user has a role."""
+        return role in self.metadata.roles
+
+    def has_permission(self, permission: str) -> bool:
+        """Check if the authenticated user has a permission."""
+        return permission in self.metadata.permissions
+
+    def set_user_info(
+        self,
+        user_id: str,
+        tenant_id: Optional[str] = None,
+        roles: Optional[Iterable[str]] = None,
+        permissions: Optional[Iterable[str]] = None,
+        **extra_data,
+    ):
+        """
+        Set user authentication information.
+
+        Roles and permissions replace the current ones when given. Use
+        ``SessionManager.update_session_user_info`` for managed sessions so
+        the manager's indexes stay in sync.
+        """
         self.metadata.user_id = user_id
         if tenant_id:
             self.metadata.tenant_id = tenant_id
+        if roles is not None:
+            self.metadata.roles = set(roles)
+        if permissions is not None:
+            self.metadata.permissions = set(permissions)
 
         self.metadata.custom_data.update(extra_data)
         self.state = SessionState.AUTHENTICATED
@@ -115,9 +175,7 @@ class WebSocketSession:
             return False
 
         try:
-            message = {"type": message_type, "data": data, "timestamp": time.time()}
-
-            message_json = json.dumps(message)
+            message_json = encode_frame(message_type, data)
             await self.websocket.send(message_json)
 
             # Update statistics
@@ -150,6 +208,51 @@ class WebSocketSession:
             await self._handle_disconnect()
             return False
 
+    def enqueue_frame(
+        self,
+        frame: str,
+        delivery: Optional[BroadcastDelivery] = None,
+        coalesce_key: Optional[str] = None,
+    ) -> EnqueueStatus:
+        """
+        Queue an encoded frame (see ``encode_frame``) for the writer task.
+
+        Returns immediately. When the queue is full the session's slow-consumer
+        policy applies; under ``DISCONNECT`` the session is closed.
+        """
+        if not self.is_connected:
+            return EnqueueStatus.CLOSED
+
+        if self._outbox is None:
+            self._outbox = SessionOutbox(
+                self._write_frame,
+                self._handle_write_error,
+                max_size=self.outbound_queue_size,
+                policy=self.slow_consumer_policy,
+                name=f"session {self.session_id}",
+            )
+
+        status = self._outbox.enqueue(frame, delivery, coalesce_key)
+        if status == EnqueueStatus.DISCONNECTED and self._close_task is None:
+            self._close_task = asyncio.create_task(self.close(1008, "Slow consumer"))
+        return status
+
+    @property
+    def outbound_depth(self) -> int:
+        """Frames waiting in the outbound queue."""
+        return self._outbox.depth if self._outbox else 0
+
+    async def _write_frame(self, frame: str):
+        """Write one queued frame; called by the outbox writer task."""
+        await self.websocket.send(frame)
+        self.metadata.messages_sent += 1
+        self.metadata.bytes_sent += len(frame)
+
+    async def _handle_write_error(self, error: Exception):
+        """Handle a failed queued write."""
+        logger.warning(f"Failed to send queued frame to session {self.session_id}: {error}")
+        await self._handle_disconnect()
+
     async def ping(self) -> bool:
         """Send ping to client."""
         try:
@@ -201,6 +304,10 @@ class WebSocketSession:
             if self._ping_task and not self._ping_task.done():
                 self._ping_task.cancel()
 
+            # Stop the writer and drop queued frames
+            if self._outbox:
+                self._outbox.close()
+
             # Close WebSocket
             await self.websocket.close(code, reason)
 
@@ -216,6 +323,8 @@ class WebSocketSession:
             return
 
         self.state = SessionState.DISCONNECTED
+        if self._outbox:
+            self._outbox.close()
 
         # Call disconnect handlers
         for handler in self._disconnect_handlers:
@@ -262,23 +371,43 @@ class WebSocketSession:
                 "last_activity": self.metadata.last_activity,
                 "last_ping": self.metadata.last_ping,
                 "channels": list(self.metadata.channels),
+                "roles": sorted(self.metadata.roles),
+                "permissions": sorted(self.metadata.permissions),
                 "messages_sent": self.metadata.messages_sent,
                 "messages_received": self.metadata.messages_received,
                 "bytes_sent": self.metadata.bytes_sent,
                 "bytes_received": self.metadata.bytes_received,
                 "custom_data": self.metadata.custom_data,
             },
+            "outbound": self._outbox.get_stats() if self._outbox else None,
         }
 
 
 class SessionManager:
-    """Manages WebSocket sessions."""
+    """
+    Manages WebSocket sessions.
+
+    Sessions are indexed by user, tenant, role and permission (value ->
+    session ids), so targeted broadcasts resolve their recipients with set
+    operations instead of scanning every session. Index listeners are told
+    when a value gains its first or loses its last local session.
+    """
 
     def __init__(self, config):
         self.config = config
         self._sessions: dict[str, WebSocketSession] = {}
         self._user_sessions: dict[str, set[str]] = {}  # user_id -> session_ids
         self._tenant_sessions: dict[str, set[str]] = {}  # tenant_id -> session_ids
+        self._role_sessions: dict[str, set[str]] = {}  # role -> session_ids
+        self._permission_sessions: dict[str, set[str]] = {}  # permission -> session_ids
+        self._authenticated_sessions: set[str] = set()
+        self._indexes: dict[SessionIndex, dict[str, set[str]]] = {
+            SessionIndex.USER: self._user_sessions,
+            SessionIndex.TENANT: self._tenant_sessions,
+            SessionIndex.ROLE: self._role_sessions,
+            SessionIndex.PERMISSION: self._permission_sessions,
+        }
+        self._index_listeners: list[Callable[[SessionIndex, str, bool], None]] = []
         self._cleanup_task: Optional[asyncio.Task] = None
 
     def start_cleanup_task(self):
@@ -322,7 +451,14 @@ class SessionManager:
             metadata = SessionMetadata(session_id=session_id)
 
         # Create session
-        session = WebSocketSession(websocket, session_id, metadata)
+        session_config = self.config.session_config
+        session = WebSocketSession(
+            websocket,
+            session_id,
+            metadata,
+            outbound_queue_size=session_config.outbound_queue_size,
+            slow_consumer_policy=session_config.slow_consumer_policy,
+        )
         session.state = SessionState.CONNECTED
 
         # Add disconnect handler to auto-cleanup
@@ -347,18 +483,10 @@ class SessionManager:
         if not session:
             return False
 
-        # Remove from user and tenant indexes
-        if session.user_id:
-            user_sessions = self._user_sessions.get(session.user_id, set())
-            user_sessions.discard(session_id)
-            if not user_sessions:
-                self._user_sessions.pop(session.user_id, None)
-
-        if session.tenant_id:
-            tenant_sessions = self._tenant_sessions.get(session.tenant_id, set())
-            tenant_sessions.discard(session_id)
-            if not tenant_sessions:
-                self._tenant_sessions.pop(session.tenant_id, None)
+        # Remove from indexes
+        for index, value in self._index_entries(session):
+            self._index_discard(index, value, session_id)
+        self._authenticated_sessions.discard(session_id)
 
         # Close session if not already closed
         if session.is_connected:
@@ -385,74 +513,201 @@ class SessionManager:
         """Get all active sessions."""
         return list(self._sessions.values())
 
+    def get_role_sessions(self, role: str) -> list[WebSocketSession]:
+        """Get all sessions whose user has a role."""
+        session_ids = self._role_sessions.get(role, _NO_SESSIONS)
+        return [self._sessions[sid] for sid in session_ids if sid in self._sessions]
+
+    def get_permission_sessions(self, permission: str) -> list[WebSocketSession]:
+        """Get all sessions whose user has a permission."""
+        session_ids = self._permission_sessions.get(permission, _NO_SESSIONS)
+        return [self._sessions[sid] for sid in session_ids if sid in self._sessions]
+
+    def get_sessions_by_ids(self, session_ids: Iterable[str]) -> list[WebSocketSession]:
+        """Get the sessions for a collection of session ids, skipping unknown ids."""
+        sessions = self._sessions
+        return [sessions[sid] for sid in session_ids if sid in sessions]
+
+    def get_indexed_values(self, index: SessionIndex) -> list[str]:
+        """Values of an index that have at least one local session."""
+        return list(self._indexes[SessionIndex(index)])
+
+    def select_session_ids(
+        self,
+        candidates: Optional[Collection[str]] = None,
+        *,
+        user_id: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+        any_roles: Optional[Iterable[str]] = None,
+        all_permissions: Optional[Iterable[str]] = None,
+        authenticated: bool = False,
+    ) -> set[str]:
+        """
+        Session ids matching every given criterion.
+
+        Args:
+            candidates: Restrict the result to these session ids
+            user_id: Sessions of this user
+            tenant_id: Sessions of this tenant
+            any_roles: Sessions whose user has at least one of these roles
+            all_permissions: Sessions whose user has all of these permissions
+            authenticated: Only authenticated sessions
+
+        Returns:
+            A new set; with no criteria, every session id
+        """
+        constraints: list[Collection[str]] = []
+        if candidates is not None:
+            constraints.append(candidates)
+        if user_id is not None:
+            constraints.append(self._user_sessions.get(user_id, _NO_SESSIONS))
+        if tenant_id is not None:
+            constraints.append(self._tenant_sessions.get(tenant_id, _NO_SESSIONS))
+        if any_roles is not None:
+            roles = [self._role_sessions.get(role, _NO_SESSIONS) for role in any_roles]
+            constraints.append(roles[0] if len(roles) == 1 else set().union(*roles))
+        if all_permissions is not None:
+            constraints.extend(
+                self._permission_sessions.get(permission, _NO_SESSIONS)
+                for permission in all_permissions
+            )
+        if authenticated:
+            constraints.append(self._authenticated_sessions)
+
+        if not constraints:
+            return set(self._sessions)
+
+        # Intersect starting from the smallest set
+        constraints.sort(key=len)
+        selected = set(constraints[0])
+        for other in constraints[1:]:
+            if not selected:
+                break
+            selected.intersection_update(other)
+        if candidates is not None:
+            selected.intersection_update(self._sessions)
+        return selected
+
+    def add_index_listener(self, listener: Callable[[SessionIndex, str, bool], None]):
+        """
+        Register a callback for index membership changes.
+
+        Called as ``listener(index, value, present)`` when a value gains its
+        first session (``present=True``) or loses its last one. Listeners run
+        synchronously and must not block.
+        """
+        self._index_listeners.append(listener)
+
+    def remove_index_listener(self, listener: Callable[[SessionIndex, str, bool], None]):
+        """Unregister an index listener."""
+        if listener in self._index_listeners:
+            self._index_listeners.remove(listener)
+
     def update_session_user_info(
-        self, session_id: str, user_id: str, tenant_id: Optional[str] = None, **extra_data
+        self,
+        session_id: str,
+        user_id: str,
+        tenant_id: Optional[str] = None,
+        roles: Optional[Iterable[str]] = None,
+        permissions: Optional[Iterable[str]] = None,
+        **extra_data,
     ):
         """Update session user information and indexes."""
         session = self._sessions.get(session_id)
         if not session:
             return False
 
-        # Remove from old indexes
-        old_user_id = session.user_id
-        old_tenant_id = session.tenant_id
-
-        if old_user_id and old_user_id != user_id:
-            user_sessions = self._user_sessions.get(old_user_id, set())
-            user_sessions.discard(session_id)
-            if not user_sessions:
-                self._user_sessions.pop(old_user_id, None)
+        old_entries = self._index_entries(session)
+        session.set_user_info(user_id, tenant_id, roles, permissions, **extra_data)
+        new_entries = self._index_entries(session)
 
-        if old_tenant_id and old_tenant_id != tenant_id:
-            tenant_sessions = self._tenant_sessions.get(old_tenant_id, set())
-            tenant_sessions.discard(session_id)
-            if not tenant_sessions:
-                self._tenant_sessions.pop(old_tenant_id, None)
+        for index, value in old_entries - new_entries:
+            self._index_discard(index, value, session_id)
+        for index, value in new_entries - old_entries:
+            self._index_add(index, value, session_id)
+        self._authenticated_sessions.add(session_id)
 
-        # Update session
-        session.set_user_info(user_id, tenant_id, **extra_data)
-
-        # Add to new indexes
-        if user_id:
-            self._user_sessions.setdefault(user_id, set()).add(session_id)
+        return True
 
-        if tenant_id:
-            self._tenant_sessions.setdefault(tenant_id, set()).add(session_id)
+    @staticmethod
+    def _index_entries(session: WebSocketSession) -> set[tuple[SessionIndex, str]]:
+        """(index, value) pairs a session is indexed under."""
+        metadata = session.metadata
+        entries = {(SessionIndex.ROLE, role) for role in metadata.roles}
+        entries.update((SessionIndex.PERMISSION, permission) for permission in metadata.permissions)
+        if metadata.user_id:
+            entries.add((SessionIndex.USER, metadata.user_id))
+        if metadata.tenant_id:
+            entries.add((SessionIndex.TENANT, metadata.tenant_id))
+        return entries
+
+    def _index_add(self, index: SessionIndex, value: str, session_id: str):
+        session_ids = self._indexes[index].get(value)
+        if session_ids is None:
+            self._indexes[index][value] = {session_id}
+            self._notify_index_change(index, value, True)
+        else:
+            session_ids.add(session_id)
+
+    def _index_discard(self, index: SessionIndex, value: str, session_id: str):
+        session_ids = self._indexes[index].get(value)
+        if session_ids is None:
+            return
+        session_ids.discard(session_id)
+        if not session_ids:
+            del self._indexes[index][value]
+            self._notify_index_change(index, value, False)
 
-        return True
+    def _notify_index_change(self, index: SessionIndex, value: str, present: bool):
+        for listener in self._index_listeners:
+            try:
+                listener(index, value, present)
+            except Exception as e:
+                logger.error(f"Session index listener error: {e}")
 
     async def broadcast_to_user(self, user_id: str, message_type: str, data: Any = None) -> int:
         """Broadcast message to all sessions of a user."""
-        sessions = self.get_user_sessions(user_id)
-        success_count = 0
-
-        for session in sessions:
-            if await session.send_message(message_type, data):
-                success_count += 1
-
-        return success_count
+        return self.fan_out(self.get_user_sessions(user_id), message_type, data)
 
     async def broadcast_to_tenant(self, tenant_id: str, message_type: str, data: Any = None) -> int:
         """Broadcast message to all sessions of a tenant."""
-        sessions = self.get_tenant_sessions(tenant_id)
-        success_count = 0
+        return self.fan_out(self.get_tenant_sessions(tenant_id), message_type, data)
 
-        for session in sessions:
-            if await session.send_message(message_type, data):
-                success_count += 1
+    async def broadcast_to_role(self, role: str, message_type: str, data: Any = None) -> int:
+        """Broadcast message to all sessions whose user has a role."""
+        return self.fan_out(self.get_role_sessions(role), message_type, data)
 
-        return success_count
+    async def broadcast_to_permission(
+        self, permission: str, message_type: str, data: Any = None
+    ) -> int:
+        """Broadcast message to all sessions whose user has a permission."""
+        return self.fan_out(self.get_permission_sessions(permission), message_type, data)
 
     async def broadcast_to_all(self, message_type: str, data: Any = None) -> int:
         """Broadcast message to all sessions."""
-        sessions = self.get_all_sessions()
-        success_count = 0
-
+        return self.fan_out(self._sessions.values(), message_type, data)
+
+    @staticmethod
+    def fan_out(
+        sessions: Iterable[WebSocketSession],
+        message_type: str,
+        data: Any = None,
+        delivery: Optional[BroadcastDelivery] = None,
+    ) -> int:
+        """
+        Encode a message once and queue it for each session.
+
+        Returns the number of sessions that accepted the frame; delivery to the
+        socket happens in each session's writer task.
+        """
+        frame = encode_frame(message_type, data)
+        accepted = 0
         for session in sessions:
-            if await session.send_message(message_type, data):
-                success_count += 1
-
-        return success_count
+            if session.enqueue_frame(frame, delivery).accepted:
+                accepted += 1
+        if delivery is not None:
+            delivery.seal()
+        return accepted
 
     async def _cleanup_expired_sessions(self):
         """Clean up expired sessions."""
@@ -482,7 +737,7 @@ class SessionManager:
     def get_stats(self) -> dict[str, Any]:
         """Get session manager statistics."""
         total_sessions = len(self._sessions)
-        authenticated_sessions = sum(1 for s in self._sessions.values() if s.is_authenticated)
+        authenticated_sessions = len(self._authenticated_sessions)
 
         return {
             "total_sessions": total_sessions,
@@ -490,6 +745,8 @@ class SessionManager:
             "anonymous_sessions": total_sessions - authenticated_sessions,
             "unique_users": len(self._user_sessions),
             "unique_tenants": len(self._tenant_sessions),
+            "unique_roles": len(self._role_sessions),
+            "unique_permissions": len(self._permission_sessions),
             "sessions_by_state": {
                 state.value: sum(1 for s in self._sessions.values() if s.state == state)
                 for state in SessionState
@@ -503,7 +760,10 @@ class SessionManager:
             await session.close()
 
         self._sessions.clear()
-        self._user_sessions.clear()
-        self._tenant_sessions.clear()
+        for index, values in self._indexes.items():
+            for value in list(values):
+                del values[value]
+                self._notify_index_change(index, value, False)
+        self._authenticated_sessions.clear()
 
         self.stop_cleanup_task()
@@ -1,5 +1,6 @@
 """Unit tests for Events component."""
 
+import asyncio
 
 import pytest
 
@@ -122,6 +123,94 @@ class TestEventCodecs:
         decoded = codec.decode(encoded)
         assert decoded == test_data
 
+    def test_orjson_codec_interoperates_with_json_codec(self):
+        """orjson and stdlib JSON codecs share one wire format."""
+        pytest.importorskip("orjson")
+        from dotmac.communications.events.codecs import JsonCodec, OrjsonCodec
+        from dotmac.communications.events.message import Event
+
+        event = Event(topic="billing.invoice.created", payload={"amount": 12.5}, key="inv-1")
+
+        decoded = JsonCodec().decode(OrjsonCodec().encode(event))
+        assert decoded.payload == event.payload
+        assert decoded.id == event.id
+        assert decoded.timestamp == event.timestamp
+        assert OrjsonCodec().decode(JsonCodec().encode(event)).key == "inv-1"
+
+    def test_msgpack_codec_round_trips_native_types(self):
+        """MessagePack codec keeps datetimes and UUIDs as native types."""
+        pytest.importorskip("msgpack")
+        from datetime import datetime, timezone
+        from uuid import uuid4
+
+        from dotmac.communications.events.codecs import MsgPackCodec
+        from dotmac.communications.events.message import Event
+
+        codec = MsgPackCodec()
+        payload = {
+            "subscriber_id": uuid4(),
+            "activated_at": datetime(2024, 5, 1, 12, 30, 15, 250, tzinfo=timezone.utc),
+            "scheduled_for": datetime(2024, 5, 2, 8, 0),
+            "services": ["internet", "voip"],
+        }
+        event = Event(
+            topic="provisioning.service.activated",
+            payload=payload,
+            key="sub-1",
+            tenant_id="tenant-a",
+        )
+
+        decoded = codec.decode(codec.encode(event))
+
+        assert decoded.payload == payload
+        assert decoded.id == event.id
+        assert decoded.timestamp == event.timestamp
+        assert decoded.tenant_id == "tenant-a"
+        assert decoded.headers == event.headers
+        assert codec.decode(codec.encode({"plain": 1})) == {"plain": 1}
+
+    def test_msgpack_codec_schema_fast_path(self):
+        """Payloads matching a topic schema are packed positionally."""
+        pytest.importorskip("msgpack")
+        from dotmac.communications.events.codecs import MsgPackCodec
+        from dotmac.communications.events.message import Event
+
+        topic = "billing.usage.recorded"
+        schema = {topic: ("account_id", "meter", "quantity")}
+        codec = MsgPackCodec(payload_schemas=schema)
+        plain = MsgPackCodec()
+        event = Event(topic=topic, payload={"account_id": "a1", "meter": "gb", "quantity": 3})
+
+        encoded = codec.encode(event)
+        assert len(encoded) < len(plain.encode(event))
+        assert codec.decode(encoded).payload == event.payload
+
+        # Payloads that do not match the schema fall back to a map
+        extra = Event(topic=topic, payload={"account_id": "a1", "note": "x"})
+        assert plain.decode(codec.encode(extra)).payload == extra.payload
+
+        # Consumers without the producer's schema refuse to guess field names
+        with pytest.raises(ValueError):
+            plain.decode(encoded)
+        other = MsgPackCodec(payload_schemas={topic: ("account_id", "quantity", "meter")})
+        with pytest.raises(ValueError):
+            other.decode(encoded)
+
+    def test_codec_registry_negotiates_content_type(self):
+        """Registry picks a decoder by content type and always accepts JSON."""
+        pytest.importorskip("msgpack")
+        from dotmac.communications.events.codecs import CodecRegistry, JsonCodec, MsgPackCodec
+        from dotmac.communications.events.message import Event
+
+        registry = CodecRegistry([MsgPackCodec()])
+        event = Event(topic="billing.invoice.paid", payload={"invoice_id": "i-1"})
+
+        binary = registry.decode(MsgPackCodec().encode(event), "application/msgpack")
+        text = registry.decode(JsonCodec().encode(event), "application/json; charset=utf-8")
+        assert binary.payload == text.payload == event.payload
+        with pytest.raises(ValueError):
+            registry.get("application/avro")
+
 
 class TestDeadLetterQueue:
     """Test dead letter queue functionality."""
@@ -223,5 +312,242 @@ class TestEventAPI:
         assert exp_options is not None
 
 
+async def start_redis_consumer(handler, *, topic="provisioning.events", **options):
+    fakeredis = pytest.importorskip("fakeredis")
+    from dotmac.communications.events.adapters.redis_streams import RedisConfig, RedisEventBus
+
+    config = RedisConfig(block_time=20, **options)
+    bus = RedisEventBus(config)
+    bus._redis = fakeredis.aioredis.FakeRedis()
+    await bus._redis.xgroup_create(topic, "workers", id="0", mkstream=True)
+    return bus, topic
+
+
+async def wait_until(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not await condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+async def pending_count(bus, topic):
+    return (await bus._redis.xpending(topic, "workers"))["pending"]
+
+
+@pytest.mark.asyncio
+class TestCodecNegotiation:
+    """Test content-type negotiation in the adapters."""
+
+    async def test_redis_consumer_decodes_by_content_type(self):
+        pytest.importorskip("msgpack")
+        from dotmac.communications.events.codecs import MsgPackCodec
+        from dotmac.communications.events.message import Event
+
+        handled = []
+
+        async def handler(event):
+            handled.append(event)
+
+        bus, topic = await start_redis_consumer(handler, accept_codecs=[MsgPackCodec()])
+        producer, _ = await start_redis_consumer(handler, codec=MsgPackCodec())
+        producer._redis = bus._redis
+        try:
+            await bus.subscribe(topic, handler, group="workers")
+            await producer.publish(Event(topic=topic, payload={"step": "binary"}))
+            await bus.publish(Event(topic=topic, payload={"step": "json"}))
+
+            async def both_handled():
+                return len(handled) == 2
+
+            await wait_until(both_handled)
+            assert sorted(event.payload["step"] for event in handled) == ["binary", "json"]
+        finally:
+            await bus.close()
+
+    async def test_memory_bus_round_trips_through_codec(self):
+        pytest.importorskip("msgpack")
+        from datetime import datetime
+
+        from dotmac.communications.events.adapters import MemoryConfig, MemoryEventBus
+        from dotmac.communications.events.codecs import MsgPackCodec
+        from dotmac.communications.events.message import Event
+
+        bus = MemoryEventBus(MemoryConfig(codec=MsgPackCodec(), enable_persistence=True))
+        try:
+            billed_at = datetime(2024, 6, 1)
+            await bus.publish(Event(topic="billing.cycle.closed", payload={"at": billed_at}))
+
+            (delivered,) = bus.get_event_history()
+            assert delivered.payload == {"at": billed_at}
+            assert bus.get_queue_size("billing.cycle.closed") == 1
+        finally:
+            await bus.close()
+
+
+@pytest.mark.asyncio
+class TestRedisStreamsConsumer:
+    """Test batched Redis Streams consumption."""
+
+    async def test_concurrent_batches_keep_per_key_order(self):
+        from dotmac.communications.events.message import Event
+
+        handled = []
+        in_flight = 0
+        max_in_flight = 0
+
+        async def handler(event):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.005 * (event.payload["seq"] % 3))
+            handled.append((event.key, event.payload["seq"]))
+            in_flight -= 1
+
+        bus, topic = await start_redis_consumer(handler, prefetch_count=30, handler_concurrency=3)
+        for seq in range(5):
+            for device in ("olt-1", "olt-2", "olt-3", "olt-4"):
+                await bus.publish(Event(topic=topic, payload={"seq": seq}, key=device))
+        await bus.subscribe(topic, handler, group="workers")
+
+        async def all_acked():
+            return len(handled) == 20 and await pending_count(bus, topic) == 0
+
+        await wait_until(all_acked)
+        await bus.close()
+
+        assert max_in_flight == 3
+        for device in ("olt-1", "olt-2", "olt-3", "olt-4"):
+            assert [seq for key, seq in handled if key == device] == list(range(5))
+
+    async def test_failed_events_are_dead_lettered(self):
+        from dotmac.communications.events.message import Event
+
+        async def handler(event):
+            if event.payload["seq"] == 1:
+                raise ValueError("device unreachable")
+
+        bus, topic = await start_redis_consumer(handler)
+        for seq in range(3):
+            await bus.publish(Event(topic=topic, payload={"seq": seq}))
+        await bus.subscribe(topic, handler, group="workers")
+
+        async def dead_lettered():
+            return await bus._redis.xlen(f"{topic}.DLQ") == 1
+
+        await wait_until(dead_lettered)
+        await wait_until(lambda: _zero_pending(bus, topic))
+        await bus.close()
+
+    async def test_undeliverable_failures_stay_pending(self):
+        from dotmac.communications.events.dlq import DLQError, SimpleDLQ
+        from dotmac.communications.events.message import Event
+
+        class BrokenDLQ(SimpleDLQ):
+            async def send_to_dlq(self, event, error, retry_count, dlq_topic=None):
+                raise DLQError("DLQ unavailable")
+
+        async def handler(event):
+            raise ValueError("device unreachable")
+
+        bus, topic = await start_redis_consumer(handler, claim_idle_ms=None)
+        await bus.publish(Event(topic=topic, payload={"seq": 0}))
+        await bus.subscribe(topic, handler, group="workers", dlq=BrokenDLQ(bus))
+
+        async def delivered():
+            info = await bus._redis.xinfo_groups(topic)
+            return info[0]["last-delivered-id"] != b"0-0"
+
+        await wait_until(delivered)
+        await asyncio.sleep(0.05)
+        assert await pending_count(bus, topic) == 1
+        await bus.close()
+
+    async def test_retried_failures_use_given_dlq_and_stay_pending_if_it_fails(self):
+        from dotmac.communications.events.consumer import ConsumerOptions
+        from dotmac.communications.events.dlq import DLQError, SimpleDLQ
+        from dotmac.communications.events.message import Event
+
+        attempts = []
+        dead_lettered = []
+
+        class BrokenDLQ(SimpleDLQ):
+            async def send_to_dlq(self, event, error, retry_count, dlq_topic=None):
+                dead_lettered.append((event.payload["seq"], retry_count, dlq_topic))
+                raise DLQError("DLQ unavailable")
+
+        async def handler(event):
+            attempts.append(event.payload["seq"])
+            raise ValueError("device unreachable")
+
+        bus, topic = await start_redis_consumer(handler, claim_idle_ms=None)
+        await bus.publish(Event(topic=topic, payload={"seq": 0}))
+        options = ConsumerOptions(max_retries=2, backoff_base_ms=1, backoff_jitter_ms=0)
+        await bus.subscribe(
+            topic, handler, group="workers", retry_options=options, dlq=BrokenDLQ(bus)
+        )
+
+        async def dead_letter_attempted():
+            return bool(dead_lettered)
+
+        await wait_until(dead_letter_attempted)
+        await asyncio.sleep(0.05)
+        assert attempts == [0, 0, 0]
+        assert dead_lettered == [(0, 2, f"{topic}.DLQ")]
+        assert await pending_count(bus, topic) == 1
+        await bus.close()
+
+    async def test_single_consumer_retries_own_pending_entries(self):
+        from dotmac.communications.events.dlq import DLQError, SimpleDLQ
+        from dotmac.communications.events.message import Event
+
+        class FlakyDLQ(SimpleDLQ):
+            attempts = 0
+
+            async def send_to_dlq(self, event, error, retry_count, dlq_topic=None):
+                FlakyDLQ.attempts += 1
+                if FlakyDLQ.attempts == 1:
+                    raise DLQError("DLQ unavailable")
+                await super().send_to_dlq(event, error, retry_count, dlq_topic)
+
+        async def handler(event):
+            raise ValueError("device unreachable")
+
+        bus, topic = await start_redis_consumer(handler, claim_idle_ms=0, claim_interval=0)
+        await bus.publish(Event(topic=topic, payload={"seq": 0}))
+        await bus.subscribe(topic, handler, group="workers", dlq=FlakyDLQ(bus))
+
+        async def dead_lettered():
+            return await bus._redis.xlen(f"{topic}.DLQ") == 1
+
+        await wait_until(dead_lettered)
+        await wait_until(lambda: _zero_pending(bus, topic))
+        await bus.close()
+
+        assert FlakyDLQ.attempts == 2
+
+    async def test_stale_pending_entries_are_claimed(self):
+        from dotmac.communications.events.message import Event
+
+        handled = []
+
+        async def handler(event):
+            handled.append(event.payload["seq"])
+
+        bus, topic = await start_redis_consumer(handler, claim_idle_ms=0)
+        await bus.publish(Event(topic=topic, payload={"seq": 7}))
+        # A consumer that read the entry and died before acknowledging it
+        await bus._redis.xreadgroup("workers", "crashed-consumer", {topic: ">"}, count=10)
+
+        await bus.subscribe(topic, handler, group="workers")
+        await wait_until(lambda: _zero_pending(bus, topic))
+        await bus.close()
+
+        assert handled == [7]
+
+
+async def _zero_pending(bus, topic):
+    return await pending_count(bus, topic) == 0
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -1,8 +1,29 @@
 """Unit tests for WebSockets component."""
 
+import asyncio
+import json
 
 import pytest
-from dotmac.communications.websockets.core.config import WebSocketConfig
+
+from dotmac.communications.websockets.backends.redis import (
+    REDIS_AVAILABLE,
+    RedisScalingBackend,
+)
+from dotmac.communications.websockets.channels.broadcast import (
+    BroadcastManager,
+    BroadcastMessage,
+    BroadcastScope,
+    BroadcastTarget,
+)
+from dotmac.communications.websockets.core import outbound
+from dotmac.communications.websockets.core.config import (
+    AuthConfig,
+    RedisConfig,
+    SessionConfig,
+    SlowConsumerPolicy,
+    WebSocketConfig,
+)
+from dotmac.communications.websockets.core.session import SessionIndex, SessionManager
 
 
 class TestWebSocketConfig:
@@ -169,5 +190,354 @@ class TestWebSocketAsync:
             pytest.skip("WebSocket async operations require additional setup")
 
 
+class FakeWebSocket:
+    """Records sent frames; ``block`` stalls sends until released."""
+
+    def __init__(self, fail: bool = False):
+        self.sent = []
+        self.fail = fail
+        self.block = asyncio.Event()
+        self.block.set()
+        self.closed_with = None
+
+    async def send(self, data):
+        await self.block.wait()
+        if self.fail:
+            raise ConnectionError("client went away")
+        self.sent.append(json.loads(data))
+
+    async def close(self, code, reason):
+        self.closed_with = (code, reason)
+
+
+def make_session_manager(queue_size=256, policy=SlowConsumerPolicy.DROP_OLDEST):
+    config = WebSocketConfig(
+        auth_config=AuthConfig(enabled=False),
+        session_config=SessionConfig(
+            ping_interval_seconds=0,
+            outbound_queue_size=queue_size,
+            slow_consumer_policy=policy,
+        ),
+    )
+    return SessionManager(config)
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+class TestBroadcastFanOut:
+    """Test encode-once broadcasts over per-session outbound queues."""
+
+    async def test_broadcast_encodes_once_and_delivers(self, monkeypatch):
+        manager = make_session_manager()
+        sockets = [FakeWebSocket() for _ in range(3)]
+        for index, socket in enumerate(sockets):
+            await manager.create_session(socket, f"s{index}")
+        broadcaster = BroadcastManager(manager, channel_manager=None)
+
+        encoded = []
+        original_dumps = json.dumps
+        monkeypatch.setattr(
+            outbound.json, "dumps", lambda obj: encoded.append(obj) or original_dumps(obj)
+        )
+
+        result = await broadcaster.broadcast(
+            BroadcastTarget(scope=BroadcastScope.GLOBAL, identifier="global"),
+            BroadcastMessage(type="alert", data={"level": "major"}, reliable=True),
+        )
+
+        assert len(encoded) == 1
+        assert result.delivered_count == 3
+        assert result.delivery.to_dict()["sent"] == 3
+        assert all(socket.sent[0]["data"] == {"level": "major"} for socket in sockets)
+
+    async def test_slow_consumer_does_not_stall_broadcast(self):
+        manager = make_session_manager(queue_size=2)
+        slow, fast = FakeWebSocket(), FakeWebSocket()
+        slow.block.clear()
+        await manager.create_session(slow, "slow")
+        await manager.create_session(fast, "fast")
+
+        for index in range(4):
+            assert await manager.broadcast_to_all("tick", index) == 2
+            await settle()
+
+        assert [m["data"] for m in fast.sent] == [0, 1, 2, 3]
+        slow_session = manager.get_session("slow")
+        # One frame is in flight, the queue holds the two newest
+        assert slow_session.outbound_depth == 2
+        stats = slow_session.to_dict()["outbound"]
+        assert stats["frames_dropped"] == 1
+
+        slow.block.set()
+        await settle()
+        assert [m["data"] for m in slow.sent] == [0, 2, 3]
+
+    async def test_disconnect_policy_closes_slow_consumer(self):
+        manager = make_session_manager(queue_size=1, policy=SlowConsumerPolicy.DISCONNECT)
+        slow = FakeWebSocket()
+        slow.block.clear()
+        await manager.create_session(slow, "slow")
+        broadcaster = BroadcastManager(manager, channel_manager=None)
+        target = BroadcastTarget(scope=BroadcastScope.SESSION, identifier="slow")
+
+        await broadcaster.broadcast(target, BroadcastMessage(type="tick", data=1))
+        await settle()
+        await broadcaster.broadcast(target, BroadcastMessage(type="tick", data=2))
+        result = await broadcaster.broadcast(target, BroadcastMessage(type="tick", data=3))
+        await settle()
+
+        assert result.disconnected_count == 1
+        assert slow.closed_with == (1008, "Slow consumer")
+        assert manager.get_session("slow") is None
+        assert broadcaster.get_stats()["slow_consumer_disconnects"] == 1
+
+    async def test_coalesce_policy_keeps_latest_frame(self):
+        manager = make_session_manager(policy=SlowConsumerPolicy.COALESCE)
+        socket = FakeWebSocket()
+        socket.block.clear()
+        await manager.create_session(socket, "s1")
+        broadcaster = BroadcastManager(manager, channel_manager=None)
+        target = BroadcastTarget(scope=BroadcastScope.SESSION, identifier="s1")
+
+        await broadcaster.broadcast(target, BroadcastMessage(type="other", data=0))
+        await settle()
+        results = [
+            await broadcaster.broadcast(
+                target, BroadcastMessage(type="status", data=value, coalesce_key="device-1")
+            )
+            for value in (1, 2, 3)
+        ]
+        socket.block.set()
+        await settle()
+
+        assert [m["data"] for m in socket.sent] == [0, 3]
+        assert [r.coalesced_count for r in results] == [0, 1, 1]
+        assert results[0].delivery.superseded == 1
+        assert results[2].delivery.sent == 1
+
+    async def test_failed_write_removes_session(self):
+        manager = make_session_manager()
+        await manager.create_session(FakeWebSocket(fail=True), "broken")
+        broadcaster = BroadcastManager(manager, channel_manager=None)
+
+        result = await broadcaster.broadcast(
+            BroadcastTarget(scope=BroadcastScope.SESSION, identifier="broken"),
+            BroadcastMessage(type="tick", reliable=True, delivery_timeout_seconds=1),
+        )
+
+        assert result.delivered_count == 0
+        assert result.delivery.failed == 1
+        assert manager.get_session("broken") is None
+
+
+async def make_indexed_sessions():
+    manager = make_session_manager()
+    users = {
+        "noc-1": ("isp-a", ["noc"], ["alarms:read", "alarms:ack"]),
+        "noc-2": ("isp-b", ["noc"], ["alarms:read"]),
+        "billing-1": ("isp-a", ["billing"], ["invoices:read"]),
+    }
+    sockets = {}
+    for session_id, (tenant_id, roles, permissions) in users.items():
+        sockets[session_id] = FakeWebSocket()
+        await manager.create_session(sockets[session_id], session_id)
+        manager.update_session_user_info(
+            session_id, f"user-{session_id}", tenant_id, roles=roles, permissions=permissions
+        )
+    sockets["anonymous"] = FakeWebSocket()
+    await manager.create_session(sockets["anonymous"], "anonymous")
+    return manager, sockets
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis set and publish commands used for routing."""
+
+    def __init__(self):
+        self.sets = {}
+        self.keys = {}
+        self.published = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def smembers(self, key):
+        return {member.encode() for member in self.sets.get(key, set())}
+
+    async def srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(members)
+
+    async def setex(self, key, ttl, value):
+        self.keys[key] = value
+
+    async def delete(self, key):
+        self.keys.pop(key, None)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def sadd(self, key, member):
+        self.commands.append(("sadd", key, member))
+
+    def srem(self, key, member):
+        self.commands.append(("srem", key, member))
+
+    def exists(self, key):
+        self.commands.append(("exists", key, None))
+
+    async def execute(self):
+        results = []
+        for command, key, member in self.commands:
+            if command == "exists":
+                results.append(int(key in self.redis.keys))
+                continue
+            members = self.redis.sets.setdefault(key, set())
+            if command == "sadd":
+                members.add(member)
+            else:
+                members.discard(member)
+                if not members:
+                    del self.redis.sets[key]
+            results.append(1)
+        return results
+
+
+@pytest.mark.asyncio
+class TestSessionIndexes:
+    """Test role, permission and tenant indexes for broadcast targeting."""
+
+    async def test_role_and_permission_scopes_use_indexes(self):
+        manager, sockets = await make_indexed_sessions()
+        broadcaster = BroadcastManager(manager, channel_manager=None)
+
+        by_role = await broadcaster.broadcast(
+            BroadcastTarget(scope=BroadcastScope.ROLE, identifier="noc"),
+            BroadcastMessage(type="alarm", reliable=True),
+        )
+        by_permission = await broadcaster.broadcast(
+            BroadcastTarget(scope=BroadcastScope.PERMISSION, identifier="alarms:ack"),
+            BroadcastMessage(type="ack", reliable=True),
+        )
+
+        assert by_role.delivered_count == 2
+        assert by_permission.delivered_count == 1
+        assert [m["type"] for m in sockets["noc-1"].sent] == ["alarm", "ack"]
+        assert sockets["anonymous"].sent == []
+
+    async def test_filters_are_set_intersections(self):
+        manager, _ = await make_indexed_sessions()
+        broadcaster = BroadcastManager(manager, channel_manager=None)
+
+        result = await broadcaster.broadcast(
+            BroadcastTarget(
+                scope=BroadcastScope.GLOBAL,
+                identifier="global",
+                tenant_id="isp-a",
+                require_roles=["noc", "billing"],
+                require_permissions=["alarms:read"],
+            ),
+            BroadcastMessage(type="alarm"),
+        )
+
+        assert result.delivered_count == 1
+        assert result.filtered_count == 3
+        assert manager.select_session_ids(any_roles=["noc"], tenant_id="isp-b") == {"noc-2"}
+
+    async def test_indexes_follow_reauth_and_disconnect(self):
+        manager, _ = await make_indexed_sessions()
+        changes = []
+        manager.add_index_listener(lambda *change: changes.append(change))
+
+        manager.update_session_user_info("noc-2", "user-noc-2", "isp-b", roles=["billing"])
+        await manager.remove_session("noc-1")
+
+        assert manager.select_session_ids(any_roles=["noc"]) == set()
+        assert manager.select_session_ids(any_roles=["billing"]) == {"billing-1", "noc-2"}
+        assert manager.select_session_ids(all_permissions=["alarms:ack"]) == set()
+        assert (SessionIndex.ROLE, "noc", False) in changes
+        assert (SessionIndex.PERMISSION, "alarms:ack", False) in changes
+        assert (SessionIndex.ROLE, "billing", True) not in changes
+        assert manager.get_stats()["authenticated_sessions"] == 2
+
+    @pytest.mark.skipif(not REDIS_AVAILABLE, reason="redis not installed")
+    async def test_redis_backend_mirrors_routes(self):
+        manager, _ = await make_indexed_sessions()
+        backend = RedisScalingBackend(RedisConfig(), manager, channel_manager=None)
+        backend.redis = FakeRedis()
+        backend._start_route_sync()
+        await settle()
+
+        prefix = backend.config.channel_prefix
+        instance_id = backend.instance_id
+        assert backend.redis.sets[f"{prefix}:route:role:noc"] == {instance_id}
+        assert f"{prefix}:route:user:user-noc-1" not in backend.redis.sets
+
+        await manager.remove_session("billing-1")
+        await settle()
+        assert f"{prefix}:route:role:billing" not in backend.redis.sets
+
+        backend.redis.sets[f"{prefix}:route:role:noc"].add("other-instance")
+        backend.redis.keys[f"{prefix}:instances:other-instance"] = "{}"
+        await backend.broadcast_to_role("noc", "alarm", {"id": 1})
+        await backend.broadcast_to_permission("invoices:read", "invoice", None)
+
+        assert [(channel, m["target_type"]) for channel, m in backend.redis.published] == [
+            (f"{prefix}:session:other-instance", "role")
+        ]
+        await backend._stop_route_sync()
+        assert backend.redis.sets == {f"{prefix}:route:role:noc": {"other-instance"}}
+
+    @pytest.mark.skipif(not REDIS_AVAILABLE, reason="redis not installed")
+    async def test_redis_backend_prunes_crashed_instances(self):
+        manager, _ = await make_indexed_sessions()
+        backend = RedisScalingBackend(RedisConfig(), manager, channel_manager=None)
+        backend.redis = FakeRedis()
+        prefix = backend.config.channel_prefix
+        route_key = f"{prefix}:route:role:noc"
+        backend.redis.sets[route_key] = {"live-instance", "crashed-instance"}
+        backend.redis.keys[f"{prefix}:instances:live-instance"] = "{}"
+
+        await backend.broadcast_to_role("noc", "alarm", {"id": 1})
+
+        assert [channel for channel, _ in backend.redis.published] == [
+            f"{prefix}:session:live-instance"
+        ]
+        assert backend.redis.sets[route_key] == {"live-instance"}
+        assert backend.get_stats()["routes_pruned"] == 1
+
+    @pytest.mark.skipif(not REDIS_AVAILABLE, reason="redis not installed")
+    async def test_heartbeat_restores_routes_after_pruning(self):
+        manager, _ = await make_indexed_sessions()
+        backend = RedisScalingBackend(RedisConfig(), manager, channel_manager=None)
+        backend.redis = FakeRedis()
+        backend._start_route_sync()
+        await settle()
+        prefix = backend.config.channel_prefix
+        route_key = f"{prefix}:route:role:noc"
+
+        # Another instance prunes this one while its heartbeat key is missing
+        peer = RedisScalingBackend(RedisConfig(), manager, channel_manager=None)
+        peer.redis = backend.redis
+        await peer.broadcast_to_role("noc", "alarm")
+        assert not backend.redis.sets[route_key]
+
+        await backend.heartbeat()
+        await settle()
+        assert backend.redis.sets[route_key] == {backend.instance_id}
+
+        await peer.broadcast_to_role("noc", "alarm")
+        assert backend.redis.published[-1][0] == f"{prefix}:session:{backend.instance_id}"
+        await backend._stop_route_sync()
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
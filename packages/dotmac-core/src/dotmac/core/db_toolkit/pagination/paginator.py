@@ -5,13 +5,16 @@ High-performance database pagination utilities.
 import base64
 import json
 import logging
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal
 from typing import Any, TypeVar
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import Table, func, select, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
 from dotmac.core.db_toolkit.types import (
     DatabaseError,
@@ -21,6 +24,25 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# Planner statistics for a whole table; -1 until the table is first analyzed
+_RELTUPLES_QUERY = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"
+)
+
+
+class _ExplainRows(Executable, ClauseElement):
+    """EXPLAIN wrapper used to read the planner's row estimate for a query."""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_ExplainRows)
+def _compile_explain_rows(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
 
 class DatabasePaginator:
     """
@@ -252,6 +274,261 @@ class DatabasePaginator:
 
             raise DatabaseError(msg) from e
 
+    @staticmethod
+    def _apply_keyset(
+        query,
+        cursor_field: str,
+        limit: int,
+        cursor: str | None,
+        ascending: bool,
+        tiebreaker: str | None,
+    ):
+        """
+        Restrict and order query for one keyset page.
+
+        Rows are ordered by (cursor_field, tiebreaker) so pages stay stable
+        when the sort field has duplicates. Backward cursors scan in the
+        opposite direction; the caller reverses the fetched rows.
+
+        Returns:
+            Tuple of (query, key_fields, backward)
+        """
+        model_class = query.column_descriptions[0]["type"]
+        fields = [cursor_field]
+        if tiebreaker and tiebreaker != cursor_field:
+            fields.append(tiebreaker)
+        columns = [getattr(model_class, field) for field in fields]
+
+        backward = False
+        if cursor:
+            values, backward = PaginationHelper.decode_keyset_cursor(cursor)
+            if len(values) != len(columns):
+                msg = "Cursor does not match the requested sort fields"
+                raise ValueError(msg)
+
+            if len(columns) == 1:
+                key, bound = columns[0], values[0]
+            else:
+                key, bound = tuple_(*columns), tuple_(*values)
+            scan_ascending = ascending != backward
+            query = query.where(key > bound if scan_ascending else key < bound)
+
+        scan_ascending = ascending != backward
+        order = [column.asc() if scan_ascending else column.desc() for column in columns]
+        query = query.order_by(None).order_by(*order).limit(limit + 1)
+        return query, fields, backward
+
+    @staticmethod
+    def _keyset_page(
+        rows: list[Any],
+        fields: list[str],
+        limit: int,
+        cursor: str | None,
+        backward: bool,
+    ) -> tuple[list[Any], str | None, str | None]:
+        """Trim the look-ahead row and build next/previous cursors."""
+        has_more = len(rows) > limit
+        items = list(rows[:limit])
+
+        if backward:
+            items.reverse()
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, cursor is not None
+
+        next_cursor = prev_cursor = None
+        if items and has_next:
+            next_cursor = PaginationHelper.create_keyset_cursor_from_item(items[-1], fields)
+        if items and has_prev:
+            prev_cursor = PaginationHelper.create_keyset_cursor_from_item(
+                items[0], fields, backward=True
+            )
+
+        return items, next_cursor, prev_cursor
+
+    @staticmethod
+    def keyset_paginate_query(
+        session: Session,
+        query: Query,
+        cursor_field: str,
+        limit: int,
+        cursor: str | None = None,
+        ascending: bool = True,
+        tiebreaker: str | None = "id",
+    ) -> tuple[list[Any], str | None, str | None]:
+        """
+        Keyset (seek) pagination for synchronous queries.
+
+        Each page is an index range scan starting at the cursor, so page
+        cost does not grow with depth the way OFFSET does.
+
+        Args:
+            session: Database session
+            query: Base query to paginate
+            cursor_field: Sort field
+            limit: Maximum items to return
+            cursor: Opaque cursor from a previous page (next or previous)
+            ascending: Sort direction
+            tiebreaker: Unique field appended to the sort key
+
+        Returns:
+            Tuple of (items, next_cursor, prev_cursor)
+        """
+        try:
+            page_query, fields, backward = DatabasePaginator._apply_keyset(
+                query, cursor_field, limit, cursor, ascending, tiebreaker
+            )
+            rows = page_query.all()
+            return DatabasePaginator._keyset_page(rows, fields, limit, cursor, backward)
+
+        except Exception as e:
+            logger.error("Error in keyset pagination: %s", e)
+            msg = f"Keyset pagination failed: {e}"
+
+            raise DatabaseError(msg) from e
+
+    @staticmethod
+    async def async_keyset_paginate_query(
+        session: AsyncSession,
+        query,
+        cursor_field: str,
+        limit: int,
+        cursor: str | None = None,
+        ascending: bool = True,
+        tiebreaker: str | None = "id",
+    ) -> tuple[list[Any], str | None, str | None]:
+        """
+        Keyset (seek) pagination for asynchronous queries.
+
+        Args:
+            session: Async database session
+            query: Base select to paginate
+            cursor_field: Sort field
+            limit: Maximum items to return
+            cursor: Opaque cursor from a previous page (next or previous)
+            ascending: Sort direction
+            tiebreaker: Unique field appended to the sort key
+
+        Returns:
+            Tuple of (items, next_cursor, prev_cursor)
+        """
+        try:
+            page_query, fields, backward = DatabasePaginator._apply_keyset(
+                query, cursor_field, limit, cursor, ascending, tiebreaker
+            )
+            result = await session.execute(page_query)
+            rows = result.scalars().all()
+            return DatabasePaginator._keyset_page(rows, fields, limit, cursor, backward)
+
+        except Exception as e:
+            logger.error("Error in async keyset pagination: %s", e)
+            msg = f"Async keyset pagination failed: {e}"
+
+            raise DatabaseError(msg) from e
+
+    @staticmethod
+    def _is_postgresql(session) -> bool:
+        try:
+            return session.get_bind().dialect.name == "postgresql"
+        except Exception:
+            return False
+
+    @staticmethod
+    def _count_statements(query):
+        """
+        Build statements for counting query rows.
+
+        Returns:
+            Tuple of (reltuples_params, explain_statement, count_statement);
+            reltuples_params is None unless query reads a whole table
+        """
+        if isinstance(query, Query):
+            query = query.statement
+        query = query.order_by(None).limit(None).offset(None)
+
+        froms = query.get_final_froms()
+        reltuples_params = None
+        if query.whereclause is None and len(froms) == 1 and isinstance(froms[0], Table):
+            reltuples_params = {"table": froms[0].fullname}
+
+        count_statement = select(func.count()).select_from(query.subquery())
+        return reltuples_params, _ExplainRows(query), count_statement
+
+    @staticmethod
+    def _plan_rows(plan: Any) -> int:
+        if isinstance(plan, str | bytes):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @staticmethod
+    def estimate_count(session: Session, query) -> tuple[int, bool]:
+        """
+        Estimate the number of rows a query returns.
+
+        On PostgreSQL this reads ``pg_class.reltuples`` for unfiltered
+        table scans and the planner's row estimate (EXPLAIN) otherwise, so
+        it costs the same at any table size. Other databases fall back to
+        an exact count.
+
+        Args:
+            session: Database session
+            query: Query or select to count
+
+        Returns:
+            Tuple of (count, is_estimate)
+        """
+        try:
+            reltuples_params, explain, count_statement = DatabasePaginator._count_statements(query)
+            if DatabasePaginator._is_postgresql(session):
+                if reltuples_params is not None:
+                    estimate = session.execute(_RELTUPLES_QUERY, reltuples_params).scalar()
+                    if estimate is not None and estimate >= 0:
+                        return int(estimate), True
+                plan = session.execute(explain).scalar()
+                return DatabasePaginator._plan_rows(plan), True
+
+            return session.execute(count_statement).scalar() or 0, False
+
+        except Exception as e:
+            logger.error("Error estimating count: %s", e)
+            msg = f"Count estimation failed: {e}"
+
+            raise DatabaseError(msg) from e
+
+    @staticmethod
+    async def async_estimate_count(session: AsyncSession, query) -> tuple[int, bool]:
+        """
+        Estimate the number of rows a query returns (async).
+
+        See ``estimate_count``.
+
+        Args:
+            session: Async database session
+            query: Select to count
+
+        Returns:
+            Tuple of (count, is_estimate)
+        """
+        try:
+            reltuples_params, explain, count_statement = DatabasePaginator._count_statements(query)
+            if DatabasePaginator._is_postgresql(session):
+                if reltuples_params is not None:
+                    result = await session.execute(_RELTUPLES_QUERY, reltuples_params)
+                    estimate = result.scalar()
+                    if estimate is not None and estimate >= 0:
+                        return int(estimate), True
+                result = await session.execute(explain)
+                return DatabasePaginator._plan_rows(result.scalar()), True
+
+            result = await session.execute(count_statement)
+            return result.scalar() or 0, False
+
+        except Exception as e:
+            logger.error("Error estimating count: %s", e)
+            msg = f"Count estimation failed: {e}"
+
+            raise DatabaseError(msg) from e
+
 
 class PerformancePaginator:
     """
@@ -310,7 +587,9 @@ class PerformancePaginator:
         Optimize deep pagination using cursor-based approach.
 
         Deep offset pagination becomes inefficient. This method automatically
-        switches to cursor-based pagination for deep pages.
+        switches to cursor-based pagination for deep pages. It still scans to
+        the target offset and counts every row; callers that can pass cursors
+        should use ``keyset_paginate_query`` instead.
 
         Args:
             session: Database session
@@ -368,27 +647,66 @@ class PaginationHelper:
     Utility functions for pagination operations.
     """
 
+    @staticmethod
+    def _serialize_value(value: Any) -> dict[str, Any]:
+        """Convert a cursor value to a JSON-serializable tagged dict."""
+        if isinstance(value, UUID):
+            return {"type": "uuid", "value": str(value)}
+        elif isinstance(value, datetime):
+            return {"type": "datetime", "value": value.isoformat()}
+        elif isinstance(value, date):
+            return {"type": "date", "value": value.isoformat()}
+        elif isinstance(value, Decimal):
+            return {"type": "decimal", "value": str(value)}
+        elif value is None:
+            return {"type": "none", "value": None}
+        elif isinstance(value, bool | int | float | str):
+            return {"type": type(value).__name__, "value": value}
+        elif isinstance(value, tuple | list):
+            return {
+                "type": "composite",
+                "value": [PaginationHelper._serialize_value(v) for v in value],
+            }
+        else:
+            return {"type": "str", "value": str(value)}
+
+    @staticmethod
+    def _deserialize_value(cursor_data: dict[str, Any]) -> Any:
+        """Convert a tagged dict back to the original cursor value."""
+        value_type = cursor_data["type"]
+        value = cursor_data["value"]
+
+        if value_type == "uuid":
+            return UUID(value)
+        elif value_type == "datetime":
+            return datetime.fromisoformat(value)
+        elif value_type == "date":
+            return date.fromisoformat(value)
+        elif value_type == "decimal":
+            return Decimal(value)
+        elif value_type == "int":
+            return int(value)
+        elif value_type == "float":
+            return float(value)
+        elif value_type == "composite":
+            return tuple(PaginationHelper._deserialize_value(v) for v in value)
+        else:
+            return value
+
     @staticmethod
     def encode_cursor(value: Any) -> str:
         """
         Encode cursor value to base64 string.
 
         Args:
-            value: Cursor value (UUID, datetime, int, str, etc.)
+            value: Cursor value (UUID, datetime, int, str, or a tuple of
+                these for composite keys)
 
         Returns:
             Base64 encoded cursor string
         """
         try:
-            # Convert different types to JSON-serializable format
-            if isinstance(value, UUID):
-                cursor_data = {"type": "uuid", "value": str(value)}
-            elif isinstance(value, datetime):
-                cursor_data = {"type": "datetime", "value": value.isoformat()}
-            elif isinstance(value, int | float | str):
-                cursor_data = {"type": type(value).__name__, "value": value}
-            else:
-                cursor_data = {"type": "str", "value": str(value)}
+            cursor_data = PaginationHelper._serialize_value(value)
 
             # Encode to JSON then base64
             json_str = json.dumps(cursor_data, default=str)
@@ -414,22 +732,7 @@ class PaginationHelper:
         try:
             # Decode from base64 then JSON
             json_str = base64.b64decode(cursor.encode()).decode()
-            cursor_data = json.loads(json_str)
-
-            value_type = cursor_data["type"]
-            value = cursor_data["value"]
-
-            # Convert back to original type
-            if value_type == "uuid":
-                return UUID(value)
-            elif value_type == "datetime":
-                return datetime.fromisoformat(value)
-            elif value_type == "int":
-                return int(value)
-            elif value_type == "float":
-                return float(value)
-            else:
-                return value
+            return PaginationHelper._deserialize_value(json.loads(json_str))
 
         except Exception as e:
             logger.error("Error decoding cursor: %s", e)
@@ -437,6 +740,41 @@ class PaginationHelper:
 
             raise DatabaseError(msg) from e
 
+    @staticmethod
+    def encode_keyset_cursor(values: tuple[Any, ...], backward: bool = False) -> str:
+        """
+        Encode a composite keyset cursor.
+
+        Args:
+            values: Sort key values of the boundary row
+            backward: Whether the cursor pages backward (previous page)
+
+        Returns:
+            Opaque cursor string
+        """
+        prefix = "p" if backward else "n"
+        return prefix + PaginationHelper.encode_cursor(tuple(values))
+
+    @staticmethod
+    def decode_keyset_cursor(cursor: str) -> tuple[tuple[Any, ...], bool]:
+        """
+        Decode a composite keyset cursor.
+
+        Args:
+            cursor: Cursor from ``encode_keyset_cursor``
+
+        Returns:
+            Tuple of (values, backward)
+        """
+        if not cursor or cursor[0] not in "np":
+            msg = "Invalid keyset cursor"
+            raise DatabaseError(msg)
+
+        values = PaginationHelper.decode_cursor(cursor[1:])
+        if not isinstance(values, tuple):
+            values = (values,)
+        return values, cursor[0] == "p"
+
     @staticmethod
     def create_cursor_from_item(item: Any, field_name: str) -> str:
         """
@@ -458,6 +796,30 @@ class PaginationHelper:
 
             raise DatabaseError(msg) from e
 
+    @staticmethod
+    def create_keyset_cursor_from_item(
+        item: Any, field_names: list[str], backward: bool = False
+    ) -> str:
+        """
+        Create a composite keyset cursor from database item.
+
+        Args:
+            item: Database model instance
+            field_names: Sort key fields, in order
+            backward: Whether the cursor pages backward
+
+        Returns:
+            Opaque cursor string
+        """
+        try:
+            values = tuple(getattr(item, field_name) for field_name in field_names)
+            return PaginationHelper.encode_keyset_cursor(values, backward)
+        except Exception as e:
+            logger.error("Error creating keyset cursor from item: %s", e)
+            msg = f"Failed to create cursor: {e}"
+
+            raise DatabaseError(msg) from e
+
     @staticmethod
     def calculate_pagination_info(total: int, page: int, per_page: int) -> dict[str, Any]:
         """
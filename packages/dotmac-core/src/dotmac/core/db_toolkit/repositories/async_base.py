@@ -11,13 +11,27 @@ import logging
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any, Generic
 
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import (
+    bindparam,
+    column,
+    delete,
+    func,
+    insert,
+    inspect,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
 from dotmac.core.database import TenantMixin
+from dotmac.core.db_toolkit.pagination.paginator import DatabasePaginator
 from dotmac.core.db_toolkit.types import (
     AsyncRepositoryProtocol,
+    CursorPaginationResult,
     DatabaseError,
     DuplicateEntityError,
     EntityNotFoundError,
@@ -38,6 +52,14 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Dialects with INSERT ... ON CONFLICT support for bulk_upsert
+UPSERT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+DEFAULT_CHUNK_SIZE = 1000
+
 
 class AsyncRepository(Generic[ModelType], AsyncRepositoryProtocol[ModelType]):
     """
@@ -270,12 +292,13 @@ class AsyncRepository(Generic[ModelType], AsyncRepositoryProtocol[ModelType]):
                 if user_id:
                     data["updated_by"] = user_id
 
-            # Build update query with conditions
+            # Build update query with conditions; RETURNING avoids a re-fetch
             update_query = (
                 update(self.model_class)
                 .where(self.model_class.id == entity_id)
                 .values(**data)
-                .execution_options(synchronize_session="fetch")
+                .returning(self.model_class)
+                .execution_options(synchronize_session="fetch", populate_existing=True)
             )
 
             # Add tenant filtering if supported
@@ -284,24 +307,21 @@ class AsyncRepository(Generic[ModelType], AsyncRepositoryProtocol[ModelType]):
 
             # Add soft delete filtering if supported
             if self._supports_soft_delete:
-                update_query = update_query.where(self.model_class.is_deleted is False)
+                update_query = update_query.where(self.model_class.is_deleted.is_(False))
 
             result = await self.db.execute(update_query)
+            updated_entity = result.scalar_one_or_none()
 
-            if result.rowcount == 0:
+            if updated_entity is None:
                 raise EntityNotFoundError(
                     f"{self.model_class.__name__} not found with ID: {entity_id}"
                 )
 
             if self.auto_commit:
                 await self.db.commit()
-
-            # Return updated entity
-            updated_entity = await self.get_by_id(entity_id)
-            if not updated_entity:
-                msg = f"Entity not found after update: {entity_id}"
-
-                raise EntityNotFoundError(msg)
+                # Commit expires loaded state unless expire_on_commit is disabled
+                if inspect(updated_entity).expired_attributes:
+                    await self.db.refresh(updated_entity)
 
             self._logger.info("Updated {self.model_class.__name__} with ID: %s", entity_id)
             return updated_entity
@@ -349,7 +369,7 @@ class AsyncRepository(Generic[ModelType], AsyncRepositoryProtocol[ModelType]):
                 update_query = (
                     update(self.model_class)
                     .where(self.model_class.id == entity_id)
-                    .where(self.model_class.is_deleted is False)
+                    .where(self.model_class.is_deleted.is_(False))
                     .values(**update_data)
                 )
 
@@ -427,16 +447,24 @@ class AsyncRepository(Generic[ModelType], AsyncRepositoryProtocol[ModelType]):
 
             raise DatabaseError(msg) from e
 
-    async def list_paginated(self, options: QueryOptions) -> PaginationResult[ModelType]:
+    async def list_paginated(
+        self, options: QueryOptions
+    ) -> PaginationResult[ModelType] | CursorPaginationResult[ModelType]:
         """
         List entities with full pagination metadata.
 
+        With ``options.cursor_pagination`` set, pages are fetched by keyset
+        (seek) instead of OFFSET and the total is only computed on request.
+
         Args:
-            options: Query options with pagination parameters
+            options: Query options with pagination or cursor pagination parameters
 
         Returns:
             Paginated result with metadata
         """
+        if options.cursor_pagination:
+            return await self._list_keyset(options)
+
         if not options.pagination:
             msg = "Pagination parameters required for paginated listing"
 
@@ -471,6 +499,59 @@ class AsyncRepository(Generic[ModelType], AsyncRepositoryProtocol[ModelType]):
 
             raise DatabaseError(msg) from e
 
+    async def _list_keyset(self, options: QueryOptions) -> CursorPaginationResult[ModelType]:
+        """List one keyset page; see ``list_paginated``."""
+        params = options.cursor_pagination
+        if not hasattr(self.model_class, params.cursor_field):
+            msg = f"Field {params.cursor_field} not found on model {self.model_class.__name__}"
+
+            raise ValidationError(msg)
+
+        try:
+            query = self._build_base_query(options.include_deleted)
+            query = self._apply_filters(query, options.filters)
+
+            total = None
+            total_is_estimate = False
+            if params.include_total:
+                if params.exact_total:
+                    total = await self.count(options.filters, options.include_deleted)
+                else:
+                    total, total_is_estimate = await DatabasePaginator.async_estimate_count(
+                        self.db, query
+                    )
+
+            # Add relationship loading
+            if options.relationships:
+                for rel in options.relationships:
+                    if hasattr(self.model_class, rel):
+                        query = query.options(selectinload(getattr(self.model_class, rel)))
+
+            items, next_cursor, prev_cursor = await DatabasePaginator.async_keyset_paginate_query(
+                self.db,
+                query,
+                params.cursor_field,
+                params.limit,
+                cursor=params.cursor,
+                ascending=params.ascending,
+            )
+
+            return CursorPaginationResult(
+                items=items,
+                next_cursor=next_cursor,
+                has_next=next_cursor is not None,
+                prev_cursor=prev_cursor,
+                has_prev=prev_cursor is not None,
+                total=total,
+                total_is_estimate=total_is_estimate,
+            )
+
+        except Exception as e:
+            self._logger.error("Error in keyset listing %s: %s", self.model_class.__name__, e)
+            msg = f"Failed to list entities with keyset pagination: {e}"
+
+            raise DatabaseError(msg) from e
+
     async def count(
         self,
         filters: list[QueryFilter] | None = None,
@@ -495,7 +576,7 @@ class AsyncRepository(Generic[ModelType], AsyncRepositoryProtocol[ModelType]):
 
             # Apply soft delete filtering
             if not include_deleted and self._supports_soft_delete:
-                query = query.where(self.model_class.is_deleted is False)
+                query = query.where(self.model_class.is_deleted.is_(False))
 
             # Apply filters
             if filters:
@@ -530,7 +611,7 @@ class AsyncRepository(Generic[ModelType], AsyncRepositoryProtocol[ModelType]):
 
             # Apply soft delete filtering
             if not include_deleted and self._supports_soft_delete:
-                query = query.where(self.model_class.is_deleted is False)
+                query = query.where(self.model_class.is_deleted.is_(False))
 
             result = await self.db.execute(query)
             return result.scalar() > 0
@@ -556,41 +637,323 @@ class AsyncRepository(Generic[ModelType], AsyncRepositoryProtocol[ModelType]):
         Returns:
             List of created entities
         """
+        return await self.bulk_insert(data_list, user_id=user_id)
+
+    async def bulk_insert(
+        self,
+        data_list: list[dict[str, Any]],
+        user_id: str | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        returning: bool = True,
+    ) -> list[ModelType] | int:
+        """
+        Insert many rows with one multi-row INSERT per chunk.
+
+        Args:
+            data_list: List of entity data
+            user_id: User performing the operation
+            chunk_size: Rows per INSERT statement
+            returning: Return created entities via RETURNING; when False only
+                the row count is returned and no objects are loaded
+
+        Returns:
+            Created entities, or number of rows inserted
+
+        Raises:
+            DuplicateEntityError: If a row violates a unique constraint
+            DatabaseError: If database operation fails
+        """
         try:
-            entities = []
-            for data in data_list:
-                # Add tenant_id if model supports multi-tenancy
-                if self.tenant_id and self._supports_tenant:
-                    data["tenant_id"] = self.tenant_id
+            rows = [self._prepare_insert_row(data, user_id) for data in data_list]
+            entities: list[ModelType] = []
+            inserted = 0
+
+            for chunk in self._chunks(rows, chunk_size):
+                if returning:
+                    result = await self.db.scalars(
+                        insert(self.model_class).returning(self.model_class), chunk
+                    )
+                    entities.extend(result.all())
+                else:
+                    await self.db.execute(insert(self.model_class), chunk)
+                inserted += len(chunk)
 
-                # Add audit fields if supported
-                if user_id and self._supports_audit:
-                    data["created_by"] = user_id
-                    data["updated_by"] = user_id
+            if self.auto_commit:
+                await self._commit_and_reload(entities, chunk_size)
 
-                entity = self.model_class(**data)
-                entities.append(entity)
-                self.db.add(entity)
+            self._logger.info("Bulk inserted %d %s rows", inserted, self.model_class.__name__)
+            return entities if returning else inserted
+
+        except IntegrityError as e:
+            await self.db.rollback()
+            self._logger.error(
+                "Integrity error bulk inserting %s: %s", self.model_class.__name__, e
+            )
+            msg = f"Entity already exists: {e.orig}"
+
+            raise DuplicateEntityError(msg) from e
+        except Exception as e:
+            await self.db.rollback()
+            self._logger.error("Error bulk inserting %s: %s", self.model_class.__name__, e)
+            msg = f"Failed to bulk insert entities: {e}"
+
+            raise DatabaseError(msg) from e
+
+    async def bulk_update(
+        self,
+        data_list: list[dict[str, Any]],
+        user_id: str | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        Update many rows by ID in one statement per chunk.
+
+        Each dict must contain ``id`` plus the fields to set, keyed by mapped
+        attribute name like ``bulk_insert``. Rows outside the repository's
+        tenant or soft-deleted rows are left untouched. Objects already
+        loaded in the session are not refreshed.
+
+        On PostgreSQL each chunk is one ``UPDATE ... FROM (VALUES ...)
+        RETURNING id``, so the count is exact even on drivers that cannot
+        report executemany row counts; elsewhere chunks run as executemany.
+
+        Args:
+            data_list: List of update data including ``id``
+            user_id: User performing the operation
+            chunk_size: Rows per statement
+
+        Returns:
+            Number of rows updated
+
+        Raises:
+            ValidationError: If a row has no ``id`` or an unknown field
+            DatabaseError: If database operation fails
+        """
+        if any("id" not in data for data in data_list):
+            msg = "bulk_update requires an id in every row"
+
+            raise ValidationError(msg)
+
+        columns = {attr.key: attr.columns[0] for attr in inspect(self.model_class).column_attrs}
+        unknown = {key for data in data_list for key in data} - columns.keys()
+        if unknown:
+            msg = f"Unknown {self.model_class.__name__} fields: {', '.join(sorted(unknown))}"
+
+            raise ValidationError(msg)
+
+        try:
+            table = self.model_class.__table__
+            now = datetime.now(UTC)
+            dialect = self.db.get_bind().dialect
+            from_values = dialect.name == "postgresql"
+            # Drivers that cannot total executemany rowcounts run row by row
+            per_row = not from_values and not dialect.supports_sane_multi_rowcount
+
+            # Every row of a statement needs the same SET columns
+            groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+            for data in data_list:
+                row = dict(data)
+                if self._supports_audit:
+                    row["updated_at"] = now
+                    if user_id:
+                        row["updated_by"] = user_id
+                fields = tuple(sorted(key for key in row if key != "id"))
+                groups.setdefault(fields, []).append(row)
+
+            criteria = []
+            # Add tenant filtering if supported
+            if self.tenant_id and self._supports_tenant:
+                criteria.append(columns["tenant_id"] == self.tenant_id)
+
+            # Add soft delete filtering if supported
+            if self._supports_soft_delete:
+                criteria.append(columns["is_deleted"].is_(False))
+
+            updated = 0
+            for fields, rows in groups.items():
+                for chunk in self._chunks(rows, chunk_size):
+                    if from_values:
+                        rows_table = values(
+                            column("id", columns["id"].type),
+                            *(column(field, columns[field].type) for field in fields),
+                            name="bulk_update_rows",
+                        ).data([(row["id"], *(row[field] for field in fields)) for row in chunk])
+                        update_query = (
+                            update(table)
+                            .where(columns["id"] == rows_table.c.id, *criteria)
+                            .values({columns[field]: rows_table.c[field] for field in fields})
+                            .returning(columns["id"])
+                        )
+                        result = await self.db.execute(update_query)
+                        updated += len(result.all())
+                    else:
+                        update_query = (
+                            update(table)
+                            .where(columns["id"] == bindparam("_entity_id"), *criteria)
+                            .values({columns[field]: bindparam(f"_set_{field}") for field in fields})
+                        )
+                        params = [
+                            {
+                                "_entity_id": row["id"],
+                                **{f"_set_{field}": row[field] for field in fields},
+                            }
+                            for row in chunk
+                        ]
+                        for batch in [[param] for param in params] if per_row else [params]:
+                            result = await self.db.execute(update_query, batch)
+                            updated += result.rowcount
 
             if self.auto_commit:
                 await self.db.commit()
-                for entity in entities:
-                    await self.db.refresh(entity)
-            else:
-                await self.db.flush()
-                for entity in entities:
-                    await self.db.refresh(entity)
 
-            self._logger.info("Bulk created {len(entities)} %s entities", self.model_class.__name__)
-            return entities
+            self._logger.info("Bulk updated %d %s rows", updated, self.model_class.__name__)
+            return updated
+
+        except Exception as e:
+            await self.db.rollback()
+            self._logger.error("Error bulk updating %s: %s", self.model_class.__name__, e)
+            msg = f"Failed to bulk update entities: {e}"
+
+            raise DatabaseError(msg) from e
+
+    async def bulk_upsert(
+        self,
+        data_list: list[dict[str, Any]],
+        conflict_fields: list[str] | None = None,
+        update_fields: list[str] | None = None,
+        user_id: str | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        returning: bool = True,
+    ) -> list[ModelType] | int:
+        """
+        Insert rows, updating existing ones, with INSERT ... ON CONFLICT.
+
+        Existing rows belonging to another tenant are never overwritten.
+
+        Args:
+            data_list: List of entity data
+            conflict_fields: Columns of the unique constraint (default ``id``)
+            update_fields: Columns to overwrite on conflict (default: all
+                supplied columns except conflict and creation audit fields)
+            user_id: User performing the operation
+            chunk_size: Rows per INSERT statement
+            returning: Return entities via RETURNING instead of a row count
+
+        Returns:
+            Inserted or updated entities, or number of rows affected
+
+        Raises:
+            ValidationError: If the database has no ON CONFLICT support
+            DatabaseError: If database operation fails
+        """
+        dialect = self.db.get_bind().dialect.name
+        dialect_insert = UPSERT_INSERTS.get(dialect)
+        if dialect_insert is None:
+            msg = f"bulk_upsert is not supported on {dialect}"
+
+            raise ValidationError(msg)
+
+        conflict_fields = conflict_fields or ["id"]
+
+        try:
+            rows = [self._prepare_insert_row(data, user_id) for data in data_list]
+            entities: list[ModelType] = []
+            affected = 0
+
+            for chunk in self._chunks(rows, chunk_size):
+                fields = update_fields
+                if fields is None:
+                    supplied = {key for row in chunk for key in row}
+                    fields = sorted(supplied - set(conflict_fields) - {"created_by", "created_at"})
+                    if self._supports_audit:
+                        fields = sorted({*fields, "updated_at"})
+
+                upsert_query = dialect_insert(self.model_class).values(chunk)
+                set_ = {field: upsert_query.excluded[field] for field in fields}
+                if self._supports_audit and "updated_at" in set_:
+                    set_["updated_at"] = datetime.now(UTC)
+
+                where = None
+                if self.tenant_id and self._supports_tenant:
+                    where = self.model_class.tenant_id == self.tenant_id
+
+                if set_:
+                    upsert_query = upsert_query.on_conflict_do_update(
+                        index_elements=conflict_fields, set_=set_, where=where
+                    )
+                else:
+                    upsert_query = upsert_query.on_conflict_do_nothing(
+                        index_elements=conflict_fields
+                    )
+
+                if returning:
+                    result = await self.db.scalars(
+                        upsert_query.returning(self.model_class),
+                        execution_options={"populate_existing": True},
+                    )
+                    entities.extend(result.all())
+                else:
+                    result = await self.db.execute(upsert_query)
+                    affected += result.rowcount if result.rowcount >= 0 else len(chunk)
+
+            if self.auto_commit:
+                await self._commit_and_reload(entities, chunk_size)
+
+            count = len(entities) if returning else affected
+            self._logger.info("Bulk upserted %d %s rows", count, self.model_class.__name__)
+            return entities if returning else affected
 
         except Exception as e:
             await self.db.rollback()
-            self._logger.error("Error bulk creating {self.model_class.__name__}: %s", e)
-            msg = f"Failed to bulk create entities: {e}"
+            self._logger.error("Error bulk upserting %s: %s", self.model_class.__name__, e)
+            msg = f"Failed to bulk upsert entities: {e}"
 
             raise DatabaseError(msg) from e
 
+    async def _commit_and_reload(self, entities: list[ModelType], chunk_size: int):
+        """
+        Commit, then reload entities the commit expired.
+
+        Uses one SELECT per chunk instead of a refresh per entity; nothing is
+        reloaded when the session has expire_on_commit disabled.
+        """
+        entity_ids = [entity.id for entity in entities]
+        await self.db.commit()
+
+        if not entities or not inspect(entities[0]).expired_attributes:
+            return
+
+        chunk_size = max(1, chunk_size)
+        for start in range(0, len(entity_ids), chunk_size):
+            reload_query = (
+                select(self.model_class)
+                .where(self.model_class.id.in_(entity_ids[start : start + chunk_size]))
+                .execution_options(populate_existing=True)
+            )
+            await self.db.execute(reload_query)
+
+    def _prepare_insert_row(self, data: dict[str, Any], user_id: str | None) -> dict[str, Any]:
+        """Copy row data and add tenant and audit fields."""
+        row = dict(data)
+
+        # Add tenant_id if model supports multi-tenancy
+        if self.tenant_id and self._supports_tenant:
+            row["tenant_id"] = self.tenant_id
+
+        # Add audit fields if supported
+        if user_id and self._supports_audit:
+            row["created_by"] = user_id
+            row["updated_by"] = user_id
+
+        return row
+
+    @staticmethod
+    def _chunks(rows: list[dict[str, Any]], chunk_size: int):
+        """Split rows into statement-sized chunks."""
+        chunk_size = max(1, chunk_size)
+        for start in range(0, len(rows), chunk_size):
+            yield rows[start : start + chunk_size]
+
     def _build_base_query(self, include_deleted: bool = False):
         """
         Build base query with tenant filtering and soft delete handling.
@@ -609,7 +972,7 @@ class AsyncRepository(Generic[ModelType], AsyncRepositoryProtocol[ModelType]):
 
         # Filter out soft-deleted entities if supported
         if not include_deleted and self._supports_soft_delete:
-            query = query.where(self.model_class.is_deleted is False)
+            query = query.where(self.model_class.is_deleted.is_(False))
 
         return query
 
@@ -747,7 +1110,7 @@ class AsyncTenantRepository(AsyncRepository[ModelType]):
 
             # Apply soft delete filtering
             if self._supports_soft_delete:
-                total_query = base_query.where(self.model_class.is_deleted is False)
+                total_query = base_query.where(self.model_class.is_deleted.is_(False))
             else:
                 total_query = base_query
 
@@ -776,7 +1139,7 @@ class AsyncTenantRepository(AsyncRepository[ModelType]):
 
             # Add soft delete stats if supported
             if self._supports_soft_delete:
-                deleted_query = base_query.where(self.model_class.is_deleted is True)
+                deleted_query = base_query.where(self.model_class.is_deleted.is_(True))
                 deleted_result = await self.db.execute(deleted_query)
                 stats["deleted_entities"] = deleted_result.scalar() or 0
 
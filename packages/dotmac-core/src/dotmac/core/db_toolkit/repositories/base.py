@@ -16,7 +16,9 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Query, Session, selectinload
 
 from dotmac.core.database import TenantMixin
+from dotmac.core.db_toolkit.pagination.paginator import DatabasePaginator
 from dotmac.core.db_toolkit.types import (
+    CursorPaginationResult,
     DatabaseError,
     DuplicateEntityError,
     EntityNotFoundError,
@@ -379,16 +381,24 @@ class BaseRepository(Generic[ModelType], RepositoryProtocol[ModelType]):
 
             raise DatabaseError(msg) from e
 
-    def list_paginated(self, options: QueryOptions) -> PaginationResult[ModelType]:
+    def list_paginated(
+        self, options: QueryOptions
+    ) -> PaginationResult[ModelType] | CursorPaginationResult[ModelType]:
         """
         List entities with full pagination metadata.
 
+        With ``options.cursor_pagination`` set, pages are fetched by keyset
+        (seek) instead of OFFSET and the total is only computed on request.
+
         Args:
-            options: Query options with pagination parameters
+            options: Query options with pagination or cursor pagination parameters
 
         Returns:
             Paginated result with metadata
         """
+        if options.cursor_pagination:
+            return self._list_keyset(options)
+
         if not options.pagination:
             msg = "Pagination parameters required for paginated listing"
 
@@ -422,6 +432,57 @@ class BaseRepository(Generic[ModelType], RepositoryProtocol[ModelType]):
 
             raise DatabaseError(msg) from e
 
+    def _list_keyset(self, options: QueryOptions) -> CursorPaginationResult[ModelType]:
+        """List one keyset page; see ``list_paginated``."""
+        params = options.cursor_pagination
+        if not hasattr(self.model_class, params.cursor_field):
+            msg = f"Field {params.cursor_field} not found on model {self.model_class.__name__}"
+
+            raise ValidationError(msg)
+
+        try:
+            query = self._build_base_query(options.include_deleted)
+            query = self._apply_filters(query, options.filters)
+
+            total = None
+            total_is_estimate = False
+            if params.include_total:
+                if params.exact_total:
+                    total = self.count(options.filters, options.include_deleted)
+                else:
+                    total, total_is_estimate = DatabasePaginator.estimate_count(self.db, query)
+
+            # Add relationship loading
+            if options.relationships:
+                for rel in options.relationships:
+                    if hasattr(self.model_class, rel):
+                        query = query.options(selectinload(getattr(self.model_class, rel)))
+
+            items, next_cursor, prev_cursor = DatabasePaginator.keyset_paginate_query(
+                self.db,
+                query,
+                params.cursor_field,
+                params.limit,
+                cursor=params.cursor,
+                ascending=params.ascending,
+            )
+
+            return CursorPaginationResult(
+                items=items,
+                next_cursor=next_cursor,
+                has_next=next_cursor is not None,
+                prev_cursor=prev_cursor,
+                has_prev=prev_cursor is not None,
+                total=total,
+                total_is_estimate=total_is_estimate,
+            )
+
+        except Exception as e:
+            self._logger.error("Error in keyset listing %s: %s", self.model_class.__name__, e)
+            msg = f"Failed to list entities with keyset pagination: {e}"
+
+            raise DatabaseError(msg) from e
+
     def count(
         self,
         filters: list[QueryFilter] | None = None,
@@ -446,7 +507,7 @@ class BaseRepository(Generic[ModelType], RepositoryProtocol[ModelType]):
 
             # Apply soft delete filtering
             if not include_deleted and self._supports_soft_delete:
-                query = query.filter(self.model_class.is_deleted is False)
+                query = query.filter(self.model_class.is_deleted.is_(False))
 
             # Apply filters
             if filters:
@@ -482,7 +543,7 @@ class BaseRepository(Generic[ModelType], RepositoryProtocol[ModelType]):
 
             # Apply soft delete filtering
             if not include_deleted and self._supports_soft_delete:
-                query = query.filter(self.model_class.is_deleted is False)
+                query = query.filter(self.model_class.is_deleted.is_(False))
 
             return query.scalar() > 0
 
@@ -556,7 +617,7 @@ class BaseRepository(Generic[ModelType], RepositoryProtocol[ModelType]):
 
         # Filter out soft-deleted entities if supported
         if not include_deleted and self._supports_soft_delete:
-            query = query.filter(self.model_class.is_deleted is False)
+            query = query.filter(self.model_class.is_deleted.is_(False))
 
         return query
 
@@ -737,7 +798,7 @@ class BaseTenantRepository(BaseRepository[ModelType]):
                     .filter(
                         and_(
                             self.model_class.tenant_id == self.tenant_id,
-                            self.model_class.is_deleted is True,
+                            self.model_class.is_deleted.is_(True),
                         )
                     )
                     .scalar()
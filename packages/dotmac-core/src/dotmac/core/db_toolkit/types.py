@@ -91,6 +91,8 @@ class CursorPaginationParams(BaseModel):
     cursor: str | None = Field(None, description="Cursor for pagination")
     cursor_field: str = Field("id", description="Field to use for cursor")
     ascending: bool = Field(True, description="Sort order")
+    include_total: bool = Field(False, description="Whether to return a total count")
+    exact_total: bool = Field(False, description="Count exactly instead of using planner estimates")
 
 
 class PaginationResult(BaseModel, Generic[ModelType]):
@@ -111,6 +113,10 @@ class CursorPaginationResult(BaseModel, Generic[ModelType]):
     items: list[ModelType]
     next_cursor: str | None
     has_next: bool
+    prev_cursor: str | None = None
+    has_prev: bool = False
+    total: int | None = None
+    total_is_estimate: bool = False
 
 
 class QueryOptions(BaseModel):
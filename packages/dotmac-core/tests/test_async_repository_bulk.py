@@ -0,0 +1,236 @@
+"""
+Test cases for set-based bulk operations in AsyncRepository.
+"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, String, Table, Uuid, func, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+try:
+    from dotmac.core.database import TenantMixin
+    from dotmac.core.db_toolkit.repositories.async_base import AsyncRepository
+    from dotmac.core.db_toolkit.types import DuplicateEntityError, ValidationError
+
+    DB_TOOLKIT_AVAILABLE = True
+except ImportError:
+    DB_TOOLKIT_AVAILABLE = False
+    TenantMixin = object
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+TENANT_A = uuid.UUID(int=1)
+TENANT_B = uuid.UUID(int=2)
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class UsageRecord(Base, TenantMixin):
+    __tablename__ = "bulk_usage_records"
+
+    # TenantMixin adds the tenant index through __table_args__
+    tenant_id: Mapped[uuid.UUID] = mapped_column(Uuid, nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    meter: Mapped[str] = mapped_column(String(50))
+    quantity: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_by: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    updated_by: Mapped[str | None] = mapped_column(String(50), nullable=True)
+
+
+class Meter(Base):
+    __table__ = Table(
+        "bulk_meters",
+        Base.metadata,
+        Column("id", Integer, primary_key=True),
+        Column("meter_name", String(50)),
+    )
+
+    # Attribute and column names differ, as with legacy schemas
+    name = __table__.c.meter_name
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine) as db_session:
+        yield db_session
+    await engine.dispose()
+
+
+async def all_rows(session):
+    result = await session.execute(
+        select(UsageRecord).order_by(UsageRecord.id).execution_options(populate_existing=True)
+    )
+    return result.scalars().all()
+
+
+@pytest.mark.skipif(not DB_TOOLKIT_AVAILABLE, reason="Database toolkit not available")
+class TestBulkInsert:
+    """Test bulk_insert and bulk_create."""
+
+    async def test_inserts_in_chunks_with_tenant_and_audit_fields(self, session):
+        repo = AsyncRepository(session, UsageRecord, tenant_id=TENANT_A)
+        data = [{"meter": f"m{i}", "quantity": i} for i in range(25)]
+
+        entities = await repo.bulk_insert(data, user_id="importer", chunk_size=10)
+
+        assert [e.quantity for e in entities] == list(range(25))
+        assert all(e.id is not None for e in entities)
+        assert all(e.tenant_id == TENANT_A for e in entities)
+        assert all(e.created_by == "importer" for e in entities)
+        assert "tenant_id" not in data[0]
+
+    async def test_returning_false_returns_count(self, session):
+        repo = AsyncRepository(session, UsageRecord, tenant_id=TENANT_A)
+
+        assert await repo.bulk_insert([{"meter": "a"}, {"meter": "b"}], returning=False) == 2
+        assert len(await all_rows(session)) == 2
+
+    async def test_bulk_create_uses_bulk_insert(self, session):
+        repo = AsyncRepository(session, UsageRecord, tenant_id=TENANT_A)
+
+        entities = await repo.bulk_create([{"meter": "a"}, {"meter": "b"}])
+
+        assert [e.meter for e in entities] == ["a", "b"]
+
+    async def test_duplicate_key_raises(self, session):
+        repo = AsyncRepository(session, UsageRecord, tenant_id=TENANT_A)
+        await repo.bulk_insert([{"id": 1, "meter": "a"}])
+
+        with pytest.raises(DuplicateEntityError):
+            await repo.bulk_insert([{"id": 1, "meter": "b"}])
+
+
+@pytest.mark.skipif(not DB_TOOLKIT_AVAILABLE, reason="Database toolkit not available")
+class TestBulkUpdate:
+    """Test bulk_update."""
+
+    async def test_updates_by_id_within_tenant(self, session):
+        repo_a = AsyncRepository(session, UsageRecord, tenant_id=TENANT_A)
+        repo_b = AsyncRepository(session, UsageRecord, tenant_id=TENANT_B)
+        await repo_a.bulk_insert([{"id": i, "meter": "a"} for i in range(1, 6)])
+        await repo_b.bulk_insert([{"id": 6, "meter": "b"}])
+
+        updated = await repo_a.bulk_update(
+            [
+                {"id": 1, "quantity": 10},
+                {"id": 2, "quantity": 20},
+                {"id": 3, "meter": "renamed"},
+                {"id": 6, "quantity": 60},
+            ],
+            user_id="billing",
+            chunk_size=1,
+        )
+
+        assert updated == 3
+        rows = {row.id: row for row in await all_rows(session)}
+        assert rows[1].quantity == 10
+        assert rows[2].quantity == 20
+        assert rows[3].meter == "renamed"
+        assert rows[3].updated_by == "billing"
+        assert rows[6].quantity == 0
+
+    async def test_requires_id(self, session):
+        repo = AsyncRepository(session, UsageRecord, tenant_id=TENANT_A)
+
+        with pytest.raises(ValidationError):
+            await repo.bulk_update([{"quantity": 1}])
+        with pytest.raises(ValidationError, match="quantty"):
+            await repo.bulk_update([{"id": 1, "quantty": 1}])
+
+    async def test_uses_attribute_names_like_bulk_insert(self, session):
+        repo = AsyncRepository(session, Meter)
+        await repo.bulk_insert([{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
+
+        assert await repo.bulk_update([{"id": 2, "name": "c"}, {"id": 3, "name": "d"}]) == 1
+
+        result = await session.execute(select(Meter.id, Meter.name).order_by(Meter.id))
+        assert result.all() == [(1, "a"), (2, "c")]
+
+    async def test_postgresql_counts_rows_via_returning(self):
+        from unittest.mock import AsyncMock, MagicMock
+
+        from sqlalchemy.dialects.postgresql import asyncpg
+
+        db = MagicMock()
+        db.get_bind.return_value.dialect = asyncpg.dialect()
+        db.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=[(1,)])))
+        db.commit = AsyncMock()
+        repo = AsyncRepository(db, UsageRecord, tenant_id=TENANT_A)
+
+        updated = await repo.bulk_update([{"id": 1, "quantity": 10}, {"id": 2, "quantity": 20}])
+
+        assert updated == 1
+        [call] = db.execute.await_args_list
+        sql = str(call.args[0].compile(dialect=asyncpg.dialect()))
+        assert "FROM (VALUES" in sql
+        assert "RETURNING bulk_usage_records.id" in sql
+
+
+@pytest.mark.skipif(not DB_TOOLKIT_AVAILABLE, reason="Database toolkit not available")
+class TestBulkUpsert:
+    """Test bulk_upsert."""
+
+    async def test_inserts_new_and_updates_existing_rows(self, session):
+        repo = AsyncRepository(session, UsageRecord, tenant_id=TENANT_A)
+        await repo.bulk_insert([{"id": 1, "meter": "a", "quantity": 1}])
+
+        entities = await repo.bulk_upsert(
+            [{"id": 1, "meter": "a", "quantity": 5}, {"id": 2, "meter": "b", "quantity": 7}]
+        )
+
+        assert sorted((e.id, e.quantity) for e in entities) == [(1, 5), (2, 7)]
+        rows = await all_rows(session)
+        assert [(r.id, r.quantity) for r in rows] == [(1, 5), (2, 7)]
+        assert rows[0].updated_at is not None
+
+    async def test_does_not_overwrite_other_tenants(self, session):
+        await AsyncRepository(session, UsageRecord, tenant_id=TENANT_B).bulk_insert(
+            [{"id": 1, "meter": "b", "quantity": 1}]
+        )
+        repo_a = AsyncRepository(session, UsageRecord, tenant_id=TENANT_A)
+
+        affected = await repo_a.bulk_upsert(
+            [{"id": 1, "meter": "a", "quantity": 9}], update_fields=["quantity"]
+        )
+
+        assert affected == []
+        assert (await all_rows(session))[0].quantity == 1
+
+
+@pytest.mark.skipif(not DB_TOOLKIT_AVAILABLE, reason="Database toolkit not available")
+class TestUpdateReturning:
+    """Test single-row update via RETURNING."""
+
+    async def test_update_returns_row_without_reselect(self, session):
+        repo = AsyncRepository(session, UsageRecord, tenant_id=TENANT_A)
+        [entity] = await repo.bulk_insert([{"meter": "a"}])
+
+        statements = []
+        sync_engine = session.bind.sync_engine
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        from sqlalchemy import event
+
+        event.listen(sync_engine, "before_cursor_execute", record)
+        try:
+            session.sync_session.expire_on_commit = False
+            updated = await repo.update(entity.id, {"quantity": 3})
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", record)
+
+        assert updated.quantity == 3
+        assert updated is entity
+        assert [s.split()[0] for s in statements] == ["UPDATE"]
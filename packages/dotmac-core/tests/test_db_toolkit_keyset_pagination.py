@@ -0,0 +1,202 @@
+"""
+Test cases for keyset (seek) pagination in the database toolkit.
+"""
+
+from datetime import UTC, datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import Boolean, Integer, String, create_engine, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
+
+try:
+    from dotmac.core.db_toolkit.pagination.paginator import (
+        DatabasePaginator,
+        PaginationHelper,
+        _ExplainRows,
+    )
+    from dotmac.core.db_toolkit.repositories.async_base import AsyncRepository
+    from dotmac.core.db_toolkit.repositories.base import BaseRepository
+    from dotmac.core.db_toolkit.types import (
+        CursorPaginationParams,
+        DatabaseError,
+        QueryFilter,
+        QueryOptions,
+    )
+
+    DB_TOOLKIT_AVAILABLE = True
+except ImportError:
+    DB_TOOLKIT_AVAILABLE = False
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Customer(Base):
+    __tablename__ = "keyset_customers"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(50))
+    plan: Mapped[str] = mapped_column(String(20), default="basic")
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False)
+
+
+def keyset_options(**kwargs) -> "QueryOptions":
+    filters = kwargs.pop("filters", [])
+    return QueryOptions(filters=filters, cursor_pagination=CursorPaginationParams(**kwargs))
+
+
+@pytest.fixture
+def sync_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            Customer(id=i, name=f"customer-{i % 7}", plan="pro" if i % 2 else "basic")
+            for i in range(1, 51)
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.mark.skipif(not DB_TOOLKIT_AVAILABLE, reason="Database toolkit not available")
+class TestKeysetCursors:
+    """Test composite keyset cursor encoding."""
+
+    def test_composite_values_round_trip(self):
+        values = (datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC), uuid4(), Decimal("9.99"), 7)
+        cursor = PaginationHelper.encode_keyset_cursor(values, backward=True)
+
+        assert PaginationHelper.decode_keyset_cursor(cursor) == (values, True)
+
+    def test_scalar_cursor_still_round_trips(self):
+        cursor = PaginationHelper.encode_cursor(42)
+        assert PaginationHelper.decode_cursor(cursor) == 42
+
+    def test_invalid_keyset_cursor(self):
+        with pytest.raises(DatabaseError):
+            PaginationHelper.decode_keyset_cursor("x")
+
+
+@pytest.mark.skipif(not DB_TOOLKIT_AVAILABLE, reason="Database toolkit not available")
+class TestKeysetRepositoryPagination:
+    """Test keyset mode of list_paginated."""
+
+    def test_walks_forward_over_duplicate_sort_values(self, sync_session):
+        repo = BaseRepository(sync_session, Customer)
+        seen, cursor = [], None
+        while True:
+            page = repo.list_paginated(keyset_options(limit=8, cursor=cursor, cursor_field="name"))
+            seen.extend(customer.id for customer in page.items)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+
+        expected = sorted(range(1, 51), key=lambda i: (f"customer-{i % 7}", i))
+        assert seen == expected
+
+    def test_previous_cursor_returns_previous_page(self, sync_session):
+        repo = BaseRepository(sync_session, Customer)
+        first = repo.list_paginated(keyset_options(limit=10, ascending=False))
+        second = repo.list_paginated(
+            keyset_options(limit=10, ascending=False, cursor=first.next_cursor)
+        )
+
+        assert [c.id for c in second.items] == list(range(40, 30, -1))
+        assert second.has_prev
+
+        back = repo.list_paginated(
+            keyset_options(limit=10, ascending=False, cursor=second.prev_cursor)
+        )
+        assert [c.id for c in back.items] == [c.id for c in first.items]
+        assert back.has_next
+        assert not back.has_prev
+
+    def test_filters_and_soft_delete_apply(self, sync_session):
+        sync_session.get(Customer, 1).is_deleted = True
+        sync_session.commit()
+        repo = BaseRepository(sync_session, Customer)
+
+        page = repo.list_paginated(
+            keyset_options(limit=100, filters=[QueryFilter(field="plan", value="pro")])
+        )
+
+        assert [c.id for c in page.items] == list(range(3, 51, 2))
+
+    def test_total_is_optional(self, sync_session):
+        repo = BaseRepository(sync_session, Customer)
+
+        assert repo.list_paginated(keyset_options(limit=5)).total is None
+
+        page = repo.list_paginated(keyset_options(limit=5, include_total=True))
+        # SQLite has no planner estimates, so the count is exact
+        assert page.total == 50
+        assert not page.total_is_estimate
+
+    @pytest.mark.asyncio
+    async def test_async_repository_keyset_mode(self):
+        pytest.importorskip("aiosqlite")
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            session.add_all([Customer(id=i, name=f"c{i}") for i in range(1, 26)])
+            await session.commit()
+
+            repo = AsyncRepository(session, Customer)
+            first = await repo.list_paginated(keyset_options(limit=10, include_total=True))
+            second = await repo.list_paginated(keyset_options(limit=10, cursor=first.next_cursor))
+            third = await repo.list_paginated(keyset_options(limit=10, cursor=second.next_cursor))
+
+        assert first.total == 25
+        assert [c.id for c in third.items] == list(range(21, 26))
+        assert not third.has_next
+        assert third.has_prev
+        await engine.dispose()
+
+
+@pytest.mark.skipif(not DB_TOOLKIT_AVAILABLE, reason="Database toolkit not available")
+class TestCountEstimates:
+    """Test planner-based count estimation."""
+
+    def test_explain_wraps_statement(self):
+        query = select(Customer).where(Customer.plan == "pro")
+        sql = str(_ExplainRows(query).compile(dialect=postgresql.dialect()))
+
+        assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+        assert "keyset_customers.plan" in sql
+
+    def test_unfiltered_table_uses_reltuples(self):
+        reltuples, _, _ = DatabasePaginator._count_statements(select(Customer))
+        assert reltuples == {"table": "keyset_customers"}
+
+        filtered, _, _ = DatabasePaginator._count_statements(
+            select(Customer).where(Customer.plan == "pro")
+        )
+        assert filtered is None
+
+    @pytest.mark.asyncio
+    async def test_postgresql_estimate_reads_plan_rows(self):
+        session = AsyncMock()
+        session.get_bind = Mock(return_value=Mock(dialect=Mock(name="dialect")))
+        session.get_bind.return_value.dialect.name = "postgresql"
+        session.execute.return_value = Mock(
+            scalar=Mock(return_value='[{"Plan": {"Plan Rows": 125000}}]')
+        )
+
+        total, estimated = await DatabasePaginator.async_estimate_count(
+            session, select(Customer).where(Customer.plan == "pro")
+        )
+
+        assert (total, estimated) == (125000, True)
+        assert isinstance(session.execute.call_args.args[0], _ExplainRows)
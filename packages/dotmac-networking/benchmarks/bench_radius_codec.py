@@ -0,0 +1,214 @@
+"""
+Benchmark: RADIUS parse + respond throughput.
+
+Compares the lazy ``PacketView`` path (typed accessors, pre-encoded secret,
+Access-Accept template) with eager materialization of every attribute as a
+``RADIUSAttribute``, on an Accounting-Request interim update and an
+Access-Request of realistic size:
+
+    python benchmarks/bench_radius_codec.py --packets 20000
+"""
+
+import argparse
+import asyncio
+import os
+import struct
+import sys
+from pathlib import Path
+
+from dotmac_benchmarking import BenchmarkRunner
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from dotmac.networking.automation.radius.codec import (  # noqa: E402
+    RADIUSCodec,
+    encode_attributes,
+)
+from dotmac.networking.automation.radius.types import (  # noqa: E402
+    RADIUSAttributeType as Attr,
+)
+from dotmac.networking.automation.radius.types import (  # noqa: E402
+    RADIUSPacket,
+    RADIUSPacketType,
+)
+
+SECRET = "bench-shared-secret"
+
+# Attributes read by the accounting and access handlers
+ACCOUNTING_FIELDS = [
+    Attr.ACCT_STATUS_TYPE,
+    Attr.USER_NAME,
+    Attr.ACCT_SESSION_ID,
+    Attr.NAS_IP_ADDRESS,
+    Attr.NAS_PORT,
+    Attr.CALLING_STATION_ID,
+    Attr.CALLED_STATION_ID,
+    Attr.ACCT_SESSION_TIME,
+    Attr.ACCT_INPUT_OCTETS,
+    Attr.ACCT_OUTPUT_OCTETS,
+    Attr.ACCT_INPUT_PACKETS,
+    Attr.ACCT_OUTPUT_PACKETS,
+]
+ACCESS_FIELDS = [
+    Attr.USER_NAME,
+    Attr.NAS_PORT,
+    Attr.CALLING_STATION_ID,
+    Attr.CALLED_STATION_ID,
+]
+ACCEPT_PROFILE = [
+    (Attr.SERVICE_TYPE, 2),
+    (Attr.FRAMED_PROTOCOL, 1),
+    (Attr.SESSION_TIMEOUT, 86400),
+    (Attr.IDLE_TIMEOUT, 1800),
+    (Attr.FILTER_ID, "residential-100M"),
+    (Attr.CLASS, b"profile=residential;tier=100"),
+    (85, 300),  # Acct-Interim-Interval (RFC 2869)
+]
+
+
+def _packet(packet_type, packet_id, attributes):
+    payload = encode_attributes(attributes)
+    header = struct.pack("!BBH", packet_type, packet_id, 20 + len(payload))
+    return header + os.urandom(16) + payload
+
+
+def interim_update(packet_id):
+    return _packet(
+        RADIUSPacketType.ACCOUNTING_REQUEST,
+        packet_id,
+        [
+            (Attr.ACCT_STATUS_TYPE, 3),
+            (Attr.USER_NAME, f"subscriber-{packet_id}@isp.example"),
+            (Attr.ACCT_SESSION_ID, f"0A0B{packet_id:012X}"),
+            (Attr.NAS_IP_ADDRESS, bytes((10, 0, 0, 1))),
+            (Attr.NAS_PORT, packet_id),
+            (Attr.NAS_PORT_TYPE, 15),
+            (Attr.NAS_IDENTIFIER, "bng-01.pop-03"),
+            (Attr.CALLING_STATION_ID, "00-11-22-33-44-55"),
+            (Attr.CALLED_STATION_ID, "bng-01:vlan-2001"),
+            (Attr.FRAMED_IP_ADDRESS, bytes((100, 64, 0, packet_id % 250 + 1))),
+            (Attr.SERVICE_TYPE, 2),
+            (Attr.FRAMED_PROTOCOL, 1),
+            (Attr.ACCT_AUTHENTIC, 1),
+            (Attr.ACCT_DELAY_TIME, 0),
+            (Attr.ACCT_SESSION_TIME, 3600),
+            (Attr.ACCT_INPUT_OCTETS, 123456789),
+            (Attr.ACCT_OUTPUT_OCTETS, 987654321),
+            (Attr.ACCT_INPUT_PACKETS, 120000),
+            (Attr.ACCT_OUTPUT_PACKETS, 980000),
+            (Attr.ACCT_INPUT_GIGAWORDS, 0),
+            (Attr.ACCT_OUTPUT_GIGAWORDS, 1),
+            (Attr.EVENT_TIMESTAMP, 1700000000),
+            (Attr.CLASS, b"profile=residential;tier=100"),
+        ],
+    )
+
+
+def access_request(packet_id):
+    return _packet(
+        RADIUSPacketType.ACCESS_REQUEST,
+        packet_id,
+        [
+            (Attr.USER_NAME, f"subscriber-{packet_id}@isp.example"),
+            (Attr.USER_PASSWORD, os.urandom(16)),
+            (Attr.NAS_IP_ADDRESS, bytes((10, 0, 0, 1))),
+            (Attr.NAS_PORT, packet_id),
+            (Attr.NAS_PORT_TYPE, 15),
+            (Attr.NAS_IDENTIFIER, "bng-01.pop-03"),
+            (Attr.SERVICE_TYPE, 2),
+            (Attr.FRAMED_PROTOCOL, 1),
+            (Attr.CALLING_STATION_ID, "00-11-22-33-44-55"),
+            (Attr.CALLED_STATION_ID, "bng-01:vlan-2001"),
+        ],
+    )
+
+
+def eager_round_trip(codec, datagrams, fields, response_type, profile):
+    """Materialize every attribute, look fields up by scanning, encode reply."""
+    for data in datagrams:
+        packet = codec.parse(data).to_packet()
+        for field in fields:
+            packet.get_attribute(field)
+        response = RADIUSPacket(response_type, packet.packet_id, packet.authenticator)
+        for attr_type, value in profile:
+            response.add_attribute(attr_type, value)
+        codec.encode(response, SECRET)
+
+
+def lazy_round_trip(codec, datagrams, fields, response_type, template):
+    """Read fields through the offset index and reply with a template."""
+    secret = codec.secret_for(SECRET)
+    payload = template.payload if template else b""
+    for data in datagrams:
+        view = codec.parse(data)
+        for field in fields:
+            view.get_raw(field)
+        codec.encode_response(
+            response_type, view.packet_id, view.authenticator, secret, payload
+        )
+
+
+def _as_async(fn, *args):
+    async def run():
+        fn(*args)
+
+    return run
+
+
+async def main(packets: int, samples: int):
+    runner = BenchmarkRunner()
+    codec = RADIUSCodec()
+    template = codec.register_template("residential", ACCEPT_PROFILE)
+
+    scenarios = [
+        (
+            "interim-update",
+            [interim_update(i % 256) for i in range(packets)],
+            ACCOUNTING_FIELDS,
+            RADIUSPacketType.ACCOUNTING_RESPONSE,
+            [],
+            None,
+        ),
+        (
+            "access-request",
+            [access_request(i % 256) for i in range(packets)],
+            ACCESS_FIELDS,
+            RADIUSPacketType.ACCESS_ACCEPT,
+            ACCEPT_PROFILE,
+            template,
+        ),
+    ]
+
+    for name, datagrams, fields, response_type, profile, tmpl in scenarios:
+        metadata = {"packets": packets, "scenario": name}
+
+        eager = _as_async(
+            eager_round_trip, codec, datagrams, fields, response_type, profile
+        )
+        lazy = _as_async(lazy_round_trip, codec, datagrams, fields, response_type, tmpl)
+
+        eager_result = await runner.run(
+            f"{name} eager", eager, samples=samples, metadata=metadata
+        )
+        lazy_result = await runner.run(
+            f"{name} codec", lazy, samples=samples, metadata=metadata
+        )
+
+        for result in (eager_result, lazy_result):
+            print(
+                f"{result.label:<24} avg {result.avg_duration * 1000:9.2f} ms  "
+                f"p95 {result.p95_duration * 1000:9.2f} ms  "
+                f"{packets / result.avg_duration:12.0f} pkt/s"
+            )
+        print(
+            f"{name} speedup: "
+            f"{eager_result.avg_duration / lazy_result.avg_duration:.1f}x\n"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--packets", type=int, default=20000)
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.packets, args.samples))
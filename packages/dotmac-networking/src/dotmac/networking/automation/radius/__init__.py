@@ -1,10 +1,24 @@
 """RADIUS authentication and authorization management."""
 
 from .accounting import RADIUSAccounting
+from .accounting_pipeline import (
+    AccountingSink,
+    MemoryAccountingSink,
+    ParquetAccountingSink,
+    SQLAlchemyAccountingSink,
+    WriteBehindAccountingBuffer,
+)
 from .auth import RADIUSAuthenticator
 from .coa import CoAManager
+from .codec import AttributeTemplate, ClientSecret, PacketView, RADIUSCodec
 from .manager import RADIUSManager
-from .session import RADIUSSession, RADIUSSessionManager
+from .session import (
+    MemorySessionBackend,
+    RADIUSSession,
+    RADIUSSessionManager,
+    RedisSessionBackend,
+    SessionBackend,
+)
 from .types import (
     RADIUSAttribute,
     RADIUSClient,
@@ -13,15 +27,29 @@ from .types import (
     RADIUSServerConfig,
     RADIUSUser,
 )
+from .workers import RADIUSWorkerPool
 
 __all__ = [
     "RADIUSManager",
     "RADIUSSession",
     "RADIUSSessionManager",
+    "SessionBackend",
+    "MemorySessionBackend",
+    "RedisSessionBackend",
+    "RADIUSWorkerPool",
     "RADIUSAuthenticator",
     "RADIUSClient",
     "RADIUSAccounting",
+    "AccountingSink",
+    "MemoryAccountingSink",
+    "SQLAlchemyAccountingSink",
+    "ParquetAccountingSink",
+    "WriteBehindAccountingBuffer",
     "CoAManager",
+    "RADIUSCodec",
+    "PacketView",
+    "ClientSecret",
+    "AttributeTemplate",
     "RADIUSAttribute",
     "RADIUSPacket",
     "RADIUSResponse",
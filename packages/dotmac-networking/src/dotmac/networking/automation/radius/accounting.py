@@ -5,7 +5,13 @@ RADIUS accounting processor.
 import logging
 import socket
 from datetime import UTC
+from typing import Optional
 
+from .accounting_pipeline import (
+    AccountingSink,
+    MemoryAccountingSink,
+    WriteBehindAccountingBuffer,
+)
 from .types import (
     AcctStatusType,
     RADIUSAttributeType,
@@ -22,22 +28,59 @@ class RADIUSAccounting:
     RADIUS accounting processor.
 
     Handles RADIUS accounting requests for session tracking and usage monitoring.
+    Records go through a write-behind buffer that coalesces interim updates
+    and writes batches to the configured sink.
     """
 
-    def __init__(self):
-        self._accounting_records: list[dict] = []
+    def __init__(
+        self,
+        sink: Optional[AccountingSink] = None,
+        flush_interval: float = 1.0,
+        batch_size: int = 5000,
+        max_pending: int = 100000,
+    ):
+        """
+        Initialize accounting processor.
+
+        Args:
+            sink: Destination for accounting batches (defaults to memory)
+            flush_interval: Seconds between flushes
+            batch_size: Maximum records per sink write
+            max_pending: Buffered records at which intake is paused
+        """
+        self.buffer = WriteBehindAccountingBuffer(
+            sink=sink,
+            flush_interval=flush_interval,
+            batch_size=batch_size,
+            max_pending=max_pending,
+        )
         self._running = False
 
     async def start(self):
         """Start accounting processor."""
         self._running = True
+        await self.buffer.start()
         logger.info("RADIUS accounting processor started")
 
     async def stop(self):
-        """Stop accounting processor."""
+        """Stop accounting processor, flushing buffered records."""
         self._running = False
+        await self.buffer.stop()
         logger.info("RADIUS accounting processor stopped")
 
+    @property
+    def backlogged(self) -> bool:
+        """Whether intake should pause until the buffer drains."""
+        return self.buffer.backlogged
+
+    async def wait_for_capacity(self):
+        """Wait until the write-behind buffer has room."""
+        await self.buffer.wait_for_capacity()
+
+    async def flush(self) -> int:
+        """Write buffered records to the sink now."""
+        return await self.buffer.flush()
+
     async def process_accounting_request(
         self, packet: RADIUSPacket, client: RADIUSClient
     ) -> RADIUSResponse:
@@ -107,7 +150,7 @@ class RADIUSAccounting:
                 "timestamp": session_info.get("timestamp"),
             }
 
-            self._accounting_records.append(record)
+            await self.buffer.add(record)
             logger.info(
                 f"Accounting START: {record['username']} session {record['session_id']}"
             )
@@ -137,13 +180,15 @@ class RADIUSAccounting:
                 "session_time": session_info.get("session_time"),
                 "input_octets": session_info.get("input_octets"),
                 "output_octets": session_info.get("output_octets"),
+                "input_gigawords": session_info.get("input_gigawords"),
+                "output_gigawords": session_info.get("output_gigawords"),
                 "input_packets": session_info.get("input_packets"),
                 "output_packets": session_info.get("output_packets"),
                 "terminate_cause": session_info.get("terminate_cause"),
                 "timestamp": session_info.get("timestamp"),
             }
 
-            self._accounting_records.append(record)
+            await self.buffer.add(record)
             logger.info(
                 f"Accounting STOP: {record['username']} session {record['session_id']} - Duration: {record['session_time']}s"
             )
@@ -173,12 +218,14 @@ class RADIUSAccounting:
                 "session_time": session_info.get("session_time"),
                 "input_octets": session_info.get("input_octets"),
                 "output_octets": session_info.get("output_octets"),
+                "input_gigawords": session_info.get("input_gigawords"),
+                "output_gigawords": session_info.get("output_gigawords"),
                 "input_packets": session_info.get("input_packets"),
                 "output_packets": session_info.get("output_packets"),
                 "timestamp": session_info.get("timestamp"),
             }
 
-            self._accounting_records.append(record)
+            await self.buffer.add(record)
             logger.debug(
                 f"Accounting UPDATE: {record['username']} session {record['session_id']}"
             )
@@ -267,6 +314,20 @@ class RADIUSAccounting:
         if output_octets_attr:
             info["output_octets"] = struct.unpack("!I", output_octets_attr.value)[0]
 
+        input_gigawords_attr = packet.get_attribute(
+            RADIUSAttributeType.ACCT_INPUT_GIGAWORDS
+        )
+        if input_gigawords_attr:
+            info["input_gigawords"] = struct.unpack("!I", input_gigawords_attr.value)[0]
+
+        output_gigawords_attr = packet.get_attribute(
+            RADIUSAttributeType.ACCT_OUTPUT_GIGAWORDS
+        )
+        if output_gigawords_attr:
+            info["output_gigawords"] = struct.unpack(
+                "!I", output_gigawords_attr.value
+            )[0]
+
         input_packets_attr = packet.get_attribute(
             RADIUSAttributeType.ACCT_INPUT_PACKETS
         )
@@ -288,9 +349,36 @@ class RADIUSAccounting:
         return info
 
     def get_accounting_records(self) -> list[dict]:
-        """Get all accounting records."""
-        return self._accounting_records.copy()
+        """
+        Get accounting records held in memory.
+
+        Flushed records are only available with the default memory sink;
+        interim updates within a flush window are coalesced.
+        """
+        records = []
+        if isinstance(self.buffer.sink, MemoryAccountingSink):
+            records.extend(self.buffer.sink.records)
+        records.extend(self.buffer.pending_records())
+        return records
 
     def get_user_accounting(self, username: str) -> list[dict]:
         """Get accounting records for specific user."""
-        return [r for r in self._accounting_records if r.get("username") == username]
+        return [
+            record
+            for record in self.get_accounting_records()
+            if record.get("username") == username
+        ]
+
+    def get_user_sessions(self, username: str) -> list[dict]:
+        """Get latest accounting state of each session for a user."""
+        return self.buffer.get_user_sessions(username)
+
+    def get_session_accounting(
+        self, session_id: str, client_ip: Optional[str] = None
+    ) -> Optional[dict]:
+        """Get latest accounting state for an Acct-Session-Id."""
+        return self.buffer.get_session(session_id, client_ip)
+
+    def get_stats(self) -> dict:
+        """Get write-behind pipeline statistics."""
+        return {**self.buffer.stats, "pending": self.buffer.pending_count}
@@ -0,0 +1,458 @@
+"""
+Write-behind storage for RADIUS accounting records.
+
+Accounting requests are acknowledged once buffered. Within a flush window,
+Interim-Updates for the same session are coalesced to the latest one
+(RADIUS counters are cumulative, so nothing is lost). Batches are then
+written to a pluggable sink: memory, a SQL table or a Parquet file.
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Optional, Union
+
+try:
+    from sqlalchemy import insert
+
+    SQLALCHEMY_AVAILABLE = True
+except ImportError:
+    insert = None
+    SQLALCHEMY_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = pq = None
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SessionKey = tuple[Optional[str], Optional[str]]
+
+
+class AccountingSink(ABC):
+    """Destination for flushed accounting record batches."""
+
+    @abstractmethod
+    async def write_batch(self, records: list[dict[str, Any]]) -> None:
+        """Persist a batch of records; raise to have the batch retried."""
+
+    async def close(self) -> None:
+        """Release sink resources."""
+        return None
+
+
+class MemoryAccountingSink(AccountingSink):
+    """
+    Keep flushed records in memory (default, tests and development).
+
+    Only the newest ``max_records`` records are kept; older ones are
+    discarded as new batches arrive.
+    """
+
+    def __init__(self, max_records: Optional[int] = 100000):
+        """
+        Initialize sink.
+
+        Args:
+            max_records: Records retained, or None for no limit
+        """
+        self.records: deque[dict[str, Any]] = deque(maxlen=max_records)
+
+    async def write_batch(self, records: list[dict[str, Any]]) -> None:
+        self.records.extend(records)
+
+
+class SQLAlchemyAccountingSink(AccountingSink):
+    """
+    Insert batches into a table with one executemany per flush.
+
+    The session factory returns a synchronous SQLAlchemy session; inserts run
+    in a worker thread so the event loop keeps serving packets.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        table: Any,
+        columns: Optional[list[str]] = None,
+    ):
+        """
+        Initialize sink.
+
+        Args:
+            session_factory: Callable returning a SQLAlchemy session
+            table: Table or mapped class receiving the records
+            columns: Record keys to insert (defaults to the table's columns)
+        """
+        if not SQLALCHEMY_AVAILABLE:
+            raise ImportError("sqlalchemy is required for SQLAlchemyAccountingSink")
+
+        self.session_factory = session_factory
+        self.table = table
+        table_columns = getattr(table, "__table__", table).columns
+        self.columns = columns or [column.key for column in table_columns]
+
+    def _insert(self, rows: list[dict[str, Any]]) -> None:
+        session = self.session_factory()
+        try:
+            session.execute(insert(self.table), rows)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    async def write_batch(self, records: list[dict[str, Any]]) -> None:
+        rows = [
+            {column: record.get(column) for column in self.columns}
+            for record in records
+        ]
+        await asyncio.to_thread(self._insert, rows)
+
+
+class ParquetAccountingSink(AccountingSink):
+    """Write each batch as a Parquet file under a directory."""
+
+    COLUMNS = [
+        "type",
+        "client_ip",
+        "username",
+        "session_id",
+        "nas_ip",
+        "nas_port",
+        "calling_station_id",
+        "called_station_id",
+        "session_time",
+        "input_octets",
+        "output_octets",
+        "input_gigawords",
+        "output_gigawords",
+        "input_packets",
+        "output_packets",
+        "terminate_cause",
+        "timestamp",
+    ]
+
+    def __init__(self, directory: Union[str, Path], prefix: str = "accounting"):
+        """
+        Initialize sink.
+
+        Args:
+            directory: Output directory, created if missing
+            prefix: File name prefix
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError(
+                "pyarrow is required for ParquetAccountingSink. "
+                "Install with: pip install pyarrow"
+            )
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self._sequence = 0
+
+    def _write(self, records: list[dict[str, Any]], path: Path) -> None:
+        table = pa.table(
+            {
+                column: [record.get(column) for record in records]
+                for column in self.COLUMNS
+            }
+        )
+        pq.write_table(table, path)
+
+    async def write_batch(self, records: list[dict[str, Any]]) -> None:
+        self._sequence += 1
+        path = self.directory / (
+            f"{self.prefix}-{time.time_ns()}-{self._sequence:06d}.parquet"
+        )
+        await asyncio.to_thread(self._write, records, path)
+
+
+class WriteBehindAccountingBuffer:
+    """
+    Coalescing write-behind buffer with per-session and per-user indexes.
+
+    ``add`` blocks once ``max_pending`` records are waiting, which lets the
+    packet pipeline push back on the socket reader instead of growing
+    without bound when the sink falls behind.
+    """
+
+    def __init__(
+        self,
+        sink: Optional[AccountingSink] = None,
+        flush_interval: float = 1.0,
+        batch_size: int = 5000,
+        max_pending: int = 100000,
+        closed_session_ttl: float = 3600.0,
+        idle_session_ttl: float = 7200.0,
+    ):
+        """
+        Initialize buffer.
+
+        Args:
+            sink: Batch destination (defaults to memory)
+            flush_interval: Seconds between flushes (the coalescing window)
+            batch_size: Maximum records per sink write
+            max_pending: Pending records at which ``add`` starts waiting
+            closed_session_ttl: Seconds stopped sessions stay in the index
+            idle_session_ttl: Seconds without any accounting record (a few
+                interim intervals) after which a session that never sent
+                Stop is dropped from the index
+        """
+        self.sink = sink or MemoryAccountingSink()
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self.max_pending = max(1, max_pending)
+        self.closed_session_ttl = closed_session_ttl
+        self.idle_session_ttl = idle_session_ttl
+
+        # Pending records in arrival order; interim updates coalesce in place
+        self._pending: dict[tuple, dict[str, Any]] = {}
+        self._event_sequence = 0
+
+        # Latest known state per session and sessions per user
+        self._sessions: dict[SessionKey, dict[str, Any]] = {}
+        self._user_sessions: dict[Optional[str], set[SessionKey]] = {}
+        self._session_ids: dict[Optional[str], SessionKey] = {}
+        # Oldest first, so pruning stops at the first unexpired entry
+        self._closed_at: OrderedDict[SessionKey, float] = OrderedDict()
+        self._last_seen: OrderedDict[SessionKey, float] = OrderedDict()
+
+        self._capacity = asyncio.Event()
+        self._capacity.set()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._early_flush: Optional[asyncio.Task] = None
+        self._running = False
+
+        self.stats = {
+            "received": 0,
+            "coalesced": 0,
+            "flushed": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "backpressure_waits": 0,
+        }
+
+    @staticmethod
+    def session_key(record: dict[str, Any]) -> SessionKey:
+        """Acct-Session-Id is unique per NAS, so key on both."""
+        return record.get("client_ip"), record.get("session_id")
+
+    @property
+    def pending_count(self) -> int:
+        """Records waiting to be flushed."""
+        return len(self._pending)
+
+    @property
+    def backlogged(self) -> bool:
+        """Whether the buffer is at capacity."""
+        return not self._capacity.is_set()
+
+    async def start(self):
+        """Start periodic flushing."""
+        if self._running:
+            return
+        self._running = True
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Stop flushing and write out everything pending."""
+        if not self._running:
+            return
+        self._running = False
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        await self.sink.close()
+
+    async def wait_for_capacity(self):
+        """Wait until the buffer is below ``max_pending``."""
+        if not self._capacity.is_set():
+            self.stats["backpressure_waits"] += 1
+            await self._capacity.wait()
+
+    async def add(self, record: dict[str, Any]):
+        """
+        Buffer an accounting record.
+
+        Args:
+            record: Accounting record with ``type`` start/update/stop
+        """
+        await self.wait_for_capacity()
+
+        self.stats["received"] += 1
+        key = self.session_key(record)
+        record_type = record.get("type")
+
+        if record_type == "update" and ("update", key) in self._pending:
+            # Cumulative counters: the newest interim update supersedes
+            self._pending[("update", key)] = record
+            self.stats["coalesced"] += 1
+        else:
+            if record_type == "stop" and self._pending.pop(("update", key), None):
+                # Stop carries final counters for the session
+                self.stats["coalesced"] += 1
+            if record_type == "update":
+                pending_key = ("update", key)
+            else:
+                self._event_sequence += 1
+                pending_key = (record_type, key, self._event_sequence)
+            self._pending[pending_key] = record
+
+        self._index(key, record)
+
+        if len(self._pending) >= self.max_pending:
+            self._capacity.clear()
+        if len(self._pending) >= self.batch_size and (
+            self._early_flush is None or self._early_flush.done()
+        ):
+            self._early_flush = asyncio.create_task(self.flush())
+
+    def _index(self, key: SessionKey, record: dict[str, Any]):
+        """Merge record into the session index."""
+        state = self._sessions.get(key)
+        if state is None:
+            state = self._sessions[key] = {}
+            self._user_sessions.setdefault(record.get("username"), set()).add(key)
+            self._session_ids[key[1]] = key
+
+        state.update((k, v) for k, v in record.items() if v is not None)
+        state["status"] = "stopped" if record.get("type") == "stop" else "active"
+
+        now = time.monotonic()
+        self._last_seen[key] = now
+        self._last_seen.move_to_end(key)
+        if record.get("type") == "stop":
+            self._closed_at[key] = now
+            self._closed_at.move_to_end(key)
+        else:
+            self._closed_at.pop(key, None)
+
+    async def flush(self) -> int:
+        """
+        Write pending records to the sink in batches.
+
+        Failed batches are put back and retried on the next flush; records
+        that arrived in the meantime for the same session take precedence.
+
+        Returns:
+            Number of records written
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                self._prune_sessions()
+                return 0
+
+            pending = self._pending
+            self._pending = {}
+            self._capacity.set()
+
+            written = 0
+            items = list(pending.items())
+            for start in range(0, len(items), self.batch_size):
+                batch = items[start : start + self.batch_size]
+                try:
+                    await self.sink.write_batch([record for _, record in batch])
+                except Exception as e:
+                    self.stats["failed_batches"] += 1
+                    logger.error(f"Accounting flush failed, will retry: {e}")
+                    self._requeue(items[start:])
+                    break
+                written += len(batch)
+                self.stats["batches"] += 1
+
+            self.stats["flushed"] += written
+            self._prune_sessions()
+            return written
+
+    def _requeue(self, items: list[tuple[tuple, dict[str, Any]]]):
+        """Put unwritten records back without overriding newer updates."""
+        newer = self._pending
+        self._pending = dict(items)
+        for key, record in newer.items():
+            self._pending[key] = record
+        if len(self._pending) >= self.max_pending:
+            self._capacity.clear()
+
+    def _prune_sessions(self):
+        """Drop stopped sessions and sessions whose NAS went quiet."""
+        now = time.monotonic()
+        for timestamps, ttl in (
+            (self._closed_at, self.closed_session_ttl),
+            (self._last_seen, self.idle_session_ttl),
+        ):
+            while timestamps:
+                key, seen = next(iter(timestamps.items()))
+                if seen >= now - ttl:
+                    break
+                self._forget_session(key)
+
+    def _forget_session(self, key: SessionKey):
+        self._closed_at.pop(key, None)
+        self._last_seen.pop(key, None)
+        state = self._sessions.pop(key, None)
+        if self._session_ids.get(key[1]) == key:
+            del self._session_ids[key[1]]
+        if state is not None:
+            users = self._user_sessions.get(state.get("username"))
+            if users is not None:
+                users.discard(key)
+                if not users:
+                    del self._user_sessions[state.get("username")]
+
+    async def _flush_loop(self):
+        while self._running:
+            try:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in accounting flush loop: {e}")
+
+    def get_session(
+        self, session_id: str, client_ip: Optional[str] = None
+    ) -> Optional[dict[str, Any]]:
+        """
+        Get latest accounting state for a session.
+
+        Args:
+            session_id: Acct-Session-Id
+            client_ip: NAS address; when omitted the most recently started
+                session with this ID is returned
+        """
+        key = (
+            (client_ip, session_id)
+            if client_ip is not None
+            else self._session_ids.get(session_id)
+        )
+        state = self._sessions.get(key) if key else None
+        return dict(state) if state else None
+
+    def get_user_sessions(self, username: str) -> list[dict[str, Any]]:
+        """Get latest accounting state for all sessions of a user."""
+        return [
+            dict(self._sessions[key])
+            for key in self._user_sessions.get(username, ())
+            if key in self._sessions
+        ]
+
+    def pending_records(self) -> list[dict[str, Any]]:
+        """Records not yet flushed, in arrival order."""
+        return list(self._pending.values())
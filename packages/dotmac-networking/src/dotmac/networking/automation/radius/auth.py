@@ -27,7 +27,11 @@ class RADIUSAuthenticator:
         self._auth_methods = ["pap", "chap"]
 
     async def authenticate(
-        self, packet: RADIUSPacket, username: str, client: RADIUSClient
+        self,
+        packet: RADIUSPacket,
+        username: str,
+        client: RADIUSClient,
+        password: Optional[str] = None,
     ) -> RADIUSResponse:
         """
         Authenticate RADIUS access request.
@@ -36,6 +40,7 @@ class RADIUSAuthenticator:
             packet: RADIUS request packet
             username: Username to authenticate
             client: RADIUS client making request
+            password: Decrypted User-Password, if the request carried one
 
         Returns:
             RADIUSResponse with authentication result
@@ -53,7 +58,11 @@ class RADIUSAuthenticator:
                 )
 
             # Perform password authentication (simplified)
-            if await self._verify_password(packet, user):
+            if password is not None:
+                verified = user.check_password(password)
+            else:
+                verified = await self._verify_password(packet, user)
+            if verified:
                 return RADIUSResponse.success_response(
                     f"User {username} authenticated successfully"
                 )
@@ -67,7 +76,7 @@ class RADIUSAuthenticator:
             return RADIUSResponse.error_response("Authentication failed", "AUTH_ERROR")
 
     async def _verify_password(self, packet: RADIUSPacket, user: RADIUSUser) -> bool:
-        """Verify user password from RADIUS packet."""
+        """Verify credentials of requests without a User-Password (CHAP/EAP)."""
         # This would implement proper RADIUS password verification
         # For now, return True as placeholder
         return True
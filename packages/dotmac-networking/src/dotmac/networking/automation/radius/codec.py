@@ -0,0 +1,455 @@
+"""
+RADIUS packet codec.
+
+Incoming packets are wrapped in a ``PacketView`` over a ``memoryview`` of the
+datagram: the header is decoded eagerly, attributes are located with a
+single offset scan on first access and only the values that are actually
+read are copied out. Responses are assembled into one preallocated buffer,
+shared secrets are encoded once per client and common Access-Accept
+attribute sets can be pre-serialized as templates.
+"""
+
+import hashlib
+import struct
+import threading
+from collections.abc import Iterable
+from typing import Optional, Union
+
+from .types import RADIUSAttribute, RADIUSAttributeType, RADIUSPacket, RADIUSPacketType
+
+HEADER = struct.Struct("!BBH")
+UINT32 = struct.Struct("!I")
+
+HEADER_LENGTH = 20
+MAX_PACKET_LENGTH = 4096
+MAX_ATTRIBUTE_VALUE_LENGTH = 253
+
+_PACKET_TYPES = {int(packet_type): packet_type for packet_type in RADIUSPacketType}
+
+AttributeValue = Union[str, int, bytes, bytearray, memoryview]
+AttributeSpec = Union[
+    RADIUSAttribute, tuple[Union[RADIUSAttributeType, int], AttributeValue]
+]
+
+
+def encode_attribute(
+    attr_type: Union[RADIUSAttributeType, int], value: AttributeValue
+) -> bytes:
+    """
+    Encode a single attribute as type, length and value.
+
+    Args:
+        attr_type: Attribute type
+        value: String (UTF-8), integer (32-bit) or raw bytes value
+
+    Returns:
+        Wire-format attribute
+
+    Raises:
+        ValueError: If the encoded value exceeds 253 bytes
+    """
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    elif isinstance(value, int):
+        value = UINT32.pack(value)
+    else:
+        value = bytes(value)
+
+    if len(value) > MAX_ATTRIBUTE_VALUE_LENGTH:
+        raise ValueError(
+            f"Attribute {int(attr_type)} value too long ({len(value)} bytes)"
+        )
+    return bytes((int(attr_type), len(value) + 2)) + value
+
+
+def encode_attributes(attributes: Iterable[AttributeSpec]) -> bytes:
+    """Encode attributes (``RADIUSAttribute`` or ``(type, value)`` pairs)."""
+    parts = []
+    for attribute in attributes:
+        if isinstance(attribute, RADIUSAttribute):
+            parts.append(encode_attribute(attribute.type, attribute.value))
+        else:
+            parts.append(encode_attribute(*attribute))
+    return b"".join(parts)
+
+
+class ClientSecret:
+    """
+    Precomputed shared-secret state for one RADIUS client.
+
+    The secret is encoded once, and the MD5 state after hashing the secret is
+    kept so User-Password decoding only hashes the request authenticator.
+    """
+
+    __slots__ = ("secret", "_secret_digest")
+
+    def __init__(self, shared_secret: Union[str, bytes]):
+        """
+        Initialize secret state.
+
+        Args:
+            shared_secret: Client shared secret
+        """
+        if isinstance(shared_secret, str):
+            shared_secret = shared_secret.encode("utf-8")
+        self.secret = shared_secret
+        # MD5 is required by RADIUS protocol RFC 2865 - not used for security
+        self._secret_digest = hashlib.md5(  # nosec B324
+            shared_secret, usedforsecurity=False
+        )
+
+    def response_authenticator(
+        self, header: bytes, request_authenticator: bytes, attributes: bytes
+    ) -> bytes:
+        """Compute MD5(Code+ID+Length+RequestAuth+Attributes+Secret)."""
+        digest = hashlib.md5(header, usedforsecurity=False)  # nosec B324
+        digest.update(request_authenticator)
+        digest.update(attributes)
+        digest.update(self.secret)
+        return digest.digest()
+
+    def verify_request_authenticator(self, data: Union[bytes, memoryview]) -> bool:
+        """
+        Verify an Accounting-Request (or CoA) request authenticator.
+
+        Args:
+            data: Complete packet
+
+        Returns:
+            True if the authenticator matches the shared secret
+        """
+        view = memoryview(data)
+        if len(view) < HEADER_LENGTH:
+            return False
+        digest = hashlib.md5(view[:4], usedforsecurity=False)  # nosec B324
+        digest.update(bytes(16))
+        digest.update(view[HEADER_LENGTH:])
+        digest.update(self.secret)
+        return digest.digest() == view[4:HEADER_LENGTH]
+
+    def decrypt_password(
+        self, encrypted: Union[bytes, memoryview], request_authenticator: bytes
+    ) -> bytes:
+        """
+        Decode a User-Password attribute (RFC 2865 section 5.2).
+
+        Args:
+            encrypted: Attribute value, a multiple of 16 bytes
+            request_authenticator: Request authenticator of the packet
+
+        Returns:
+            Plain-text password with trailing NUL padding removed
+        """
+        encrypted = bytes(encrypted)
+        if not encrypted or len(encrypted) % 16:
+            raise ValueError("User-Password length must be a multiple of 16")
+
+        plain = bytearray()
+        previous = request_authenticator
+        for offset in range(0, len(encrypted), 16):
+            digest = self._secret_digest.copy()
+            digest.update(previous)
+            block = encrypted[offset : offset + 16]
+            plain += (
+                int.from_bytes(block, "big") ^ int.from_bytes(digest.digest(), "big")
+            ).to_bytes(16, "big")
+            previous = block
+        return bytes(plain.rstrip(b"\x00"))
+
+
+class AttributeTemplate:
+    """Pre-serialized attribute set appended verbatim to responses."""
+
+    __slots__ = ("name", "payload")
+
+    def __init__(self, name: str, attributes: Iterable[AttributeSpec]):
+        """
+        Serialize template attributes.
+
+        Args:
+            name: Template (service profile) name
+            attributes: Attributes to serialize
+        """
+        self.name = name
+        self.payload = encode_attributes(attributes)
+
+    def __len__(self) -> int:
+        return len(self.payload)
+
+
+class PacketView:
+    """
+    Zero-copy view of a received RADIUS packet.
+
+    Exposes the same read API as ``RADIUSPacket`` (``get_attribute``,
+    ``get_attributes``, ``attributes``) so handlers work with either, plus
+    typed accessors that skip building ``RADIUSAttribute`` objects.
+    """
+
+    __slots__ = ("data", "packet_type", "packet_id", "_offsets", "_valid")
+
+    def __init__(self, data: memoryview, packet_type: RADIUSPacketType, packet_id: int):
+        self.data = data
+        self.packet_type = packet_type
+        self.packet_id = packet_id
+        self._offsets: Optional[dict[int, list[int]]] = None
+        self._valid = True
+
+    @property
+    def authenticator(self) -> bytes:
+        """Request authenticator."""
+        return bytes(self.data[4:HEADER_LENGTH])
+
+    @property
+    def length(self) -> int:
+        """Packet length from the header."""
+        return len(self.data)
+
+    @property
+    def well_formed(self) -> bool:
+        """Whether every attribute header fits inside the packet."""
+        self._index()
+        return self._valid
+
+    def _index(self) -> dict[int, list[int]]:
+        """Map attribute type to value offsets, scanning the packet once."""
+        offsets = self._offsets
+        if offsets is not None:
+            return offsets
+
+        offsets = {}
+        data = self.data
+        end = len(data)
+        position = HEADER_LENGTH
+        while position < end:
+            if position + 2 > end:
+                self._valid = False
+                break
+            attr_length = data[position + 1]
+            if attr_length < 2 or position + attr_length > end:
+                self._valid = False
+                break
+            offsets.setdefault(data[position], []).append(position)
+            position += attr_length
+
+        self._offsets = offsets
+        return offsets
+
+    def _value_at(self, position: int) -> memoryview:
+        return self.data[position + 2 : position + self.data[position + 1]]
+
+    def __contains__(self, attr_type: Union[RADIUSAttributeType, int]) -> bool:
+        return int(attr_type) in self._index()
+
+    def get_raw(
+        self, attr_type: Union[RADIUSAttributeType, int]
+    ) -> Optional[memoryview]:
+        """Get first value of attr_type as a memoryview, without copying."""
+        positions = self._index().get(int(attr_type))
+        return self._value_at(positions[0]) if positions else None
+
+    def get_value(self, attr_type: Union[RADIUSAttributeType, int]) -> Optional[bytes]:
+        """Get first value of attr_type as bytes."""
+        raw = self.get_raw(attr_type)
+        return bytes(raw) if raw is not None else None
+
+    def get_values(self, attr_type: Union[RADIUSAttributeType, int]) -> list[bytes]:
+        """Get all values of attr_type in packet order."""
+        return [
+            bytes(self._value_at(position))
+            for position in self._index().get(int(attr_type), ())
+        ]
+
+    def get_int(
+        self, attr_type: Union[RADIUSAttributeType, int], default: Optional[int] = None
+    ) -> Optional[int]:
+        """Get first value of attr_type as a 32-bit unsigned integer."""
+        raw = self.get_raw(attr_type)
+        if raw is None or len(raw) != 4:
+            return default
+        return UINT32.unpack(raw)[0]
+
+    def get_str(
+        self, attr_type: Union[RADIUSAttributeType, int], default: Optional[str] = None
+    ) -> Optional[str]:
+        """Get first value of attr_type decoded as UTF-8."""
+        raw = self.get_raw(attr_type)
+        if raw is None:
+            return default
+        return str(raw, "utf-8", "replace")
+
+    def get_attribute(
+        self, attr_type: Union[RADIUSAttributeType, int]
+    ) -> Optional[RADIUSAttribute]:
+        """Get first attribute of specified type."""
+        value = self.get_value(attr_type)
+        return RADIUSAttribute(attr_type, value) if value is not None else None
+
+    def get_attributes(
+        self, attr_type: Union[RADIUSAttributeType, int]
+    ) -> list[RADIUSAttribute]:
+        """Get all attributes of specified type."""
+        return [
+            RADIUSAttribute(attr_type, value) for value in self.get_values(attr_type)
+        ]
+
+    @property
+    def attributes(self) -> list[RADIUSAttribute]:
+        """All attributes in packet order."""
+        positions = sorted(
+            position for group in self._index().values() for position in group
+        )
+        return [
+            RADIUSAttribute(self.data[position], bytes(self._value_at(position)))
+            for position in positions
+        ]
+
+    def to_packet(self) -> RADIUSPacket:
+        """Materialize as a ``RADIUSPacket``."""
+        return RADIUSPacket(
+            packet_type=self.packet_type,
+            packet_id=self.packet_id,
+            authenticator=self.authenticator,
+            attributes=self.attributes,
+        )
+
+
+class RADIUSCodec:
+    """
+    Packet codec with per-client secret state and response templates.
+
+    Thread-safe for concurrent use; secret state and templates are created
+    once and then only read.
+    """
+
+    def __init__(self, max_packet_size: int = MAX_PACKET_LENGTH):
+        """
+        Initialize codec.
+
+        Args:
+            max_packet_size: Largest accepted packet
+        """
+        self.max_packet_size = max_packet_size
+        self._secrets: dict[Union[str, bytes], ClientSecret] = {}
+        self._templates: dict[str, AttributeTemplate] = {}
+        self._lock = threading.Lock()
+
+    def parse(self, data: Union[bytes, bytearray, memoryview]) -> Optional[PacketView]:
+        """
+        Parse a received datagram.
+
+        Only the header is decoded here; attributes are indexed lazily.
+
+        Args:
+            data: Raw datagram
+
+        Returns:
+            Packet view or None if the header is invalid
+        """
+        size = len(data)
+        if size < HEADER_LENGTH or size > self.max_packet_size:
+            return None
+
+        view = memoryview(data)
+        packet_type, packet_id, length = HEADER.unpack_from(view)
+        if length != size:
+            return None
+
+        known_type = _PACKET_TYPES.get(packet_type)
+        if known_type is None:
+            return None
+
+        return PacketView(view, known_type, packet_id)
+
+    def secret_for(self, shared_secret: Union[str, bytes]) -> ClientSecret:
+        """Get cached secret state for a shared secret."""
+        secret = self._secrets.get(shared_secret)
+        if secret is None:
+            with self._lock:
+                secret = self._secrets.setdefault(
+                    shared_secret, ClientSecret(shared_secret)
+                )
+        return secret
+
+    def register_template(
+        self, name: str, attributes: Iterable[AttributeSpec]
+    ) -> AttributeTemplate:
+        """
+        Pre-serialize an attribute set for reuse in responses.
+
+        Args:
+            name: Template name, e.g. a service profile
+            attributes: Attributes included in every response using it
+
+        Returns:
+            Registered template
+        """
+        template = AttributeTemplate(name, attributes)
+        with self._lock:
+            self._templates[name] = template
+        return template
+
+    def get_template(self, name: Optional[str]) -> Optional[AttributeTemplate]:
+        """Get template by name."""
+        return self._templates.get(name) if name else None
+
+    def remove_template(self, name: str) -> None:
+        """Remove template by name."""
+        with self._lock:
+            self._templates.pop(name, None)
+
+    def encode_response(
+        self,
+        packet_type: Union[RADIUSPacketType, int],
+        packet_id: int,
+        request_authenticator: bytes,
+        shared_secret: Union[str, bytes, ClientSecret],
+        attributes: bytes = b"",
+    ) -> bytes:
+        """
+        Build a response packet from pre-encoded attributes.
+
+        Args:
+            packet_type: Response code
+            packet_id: Identifier copied from the request
+            request_authenticator: Authenticator of the request
+            shared_secret: Client secret or its precomputed state
+            attributes: Encoded attributes
+
+        Returns:
+            Wire-format packet with response authenticator
+        """
+        if not isinstance(shared_secret, ClientSecret):
+            shared_secret = self.secret_for(shared_secret)
+
+        length = HEADER_LENGTH + len(attributes)
+        if length > MAX_PACKET_LENGTH:
+            raise ValueError(f"RADIUS packet too long ({length} bytes)")
+
+        buffer = bytearray(length)
+        HEADER.pack_into(buffer, 0, int(packet_type), packet_id, length)
+        buffer[HEADER_LENGTH:] = attributes
+        buffer[4:HEADER_LENGTH] = shared_secret.response_authenticator(
+            buffer[:4], request_authenticator, attributes
+        )
+        return bytes(buffer)
+
+    def encode(
+        self, packet: RADIUSPacket, shared_secret: Union[str, bytes, ClientSecret]
+    ) -> bytes:
+        """
+        Encode a response ``RADIUSPacket``.
+
+        Attributes are followed by the packet's pre-encoded attributes (from
+        a template), if any.
+        """
+        attributes = encode_attributes(packet.attributes)
+        if packet.encoded_attributes:
+            attributes += packet.encoded_attributes
+        return self.encode_response(
+            packet.packet_type,
+            packet.packet_id,
+            packet.authenticator,
+            shared_secret,
+            attributes,
+        )
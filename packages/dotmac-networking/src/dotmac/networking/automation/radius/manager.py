@@ -3,19 +3,20 @@ RADIUS server management and orchestration.
 """
 
 import asyncio
-import hashlib
 import logging
 import socket
 import struct
+from collections.abc import Iterable
 from contextlib import asynccontextmanager
 from typing import Any, Optional
 
 from .accounting import RADIUSAccounting
+from .accounting_pipeline import AccountingSink
 from .auth import RADIUSAuthenticator
 from .coa import CoAManager
-from .session import RADIUSSessionManager
+from .codec import AttributeSpec, AttributeTemplate, PacketView, RADIUSCodec
+from .session import RADIUSSessionManager, RedisSessionBackend
 from .types import (
-    RADIUSAttribute,
     RADIUSAttributeType,
     RADIUSClient,
     RADIUSPacket,
@@ -29,6 +30,14 @@ from .types import (
 
 logger = logging.getLogger(__name__)
 
+_SIGNED_REQUESTS = frozenset(
+    {
+        RADIUSPacketType.ACCOUNTING_REQUEST,
+        RADIUSPacketType.DISCONNECT_REQUEST,
+        RADIUSPacketType.COA_REQUEST,
+    }
+)
+
 
 class RADIUSManager:
     """
@@ -42,23 +51,49 @@ class RADIUSManager:
     - Client management and configuration
     """
 
-    def __init__(self, config: RADIUSServerConfig):
+    def __init__(
+        self,
+        config: RADIUSServerConfig,
+        accounting_sink: Optional[AccountingSink] = None,
+    ):
+        """
+        Initialize RADIUS server.
+
+        Args:
+            config: Server configuration
+            accounting_sink: Destination for accounting batches (defaults to
+                a bounded in-memory sink)
+        """
         self.config = config
         self._running = False
         self._auth_socket: Optional[socket.socket] = None
         self._acct_socket: Optional[socket.socket] = None
         self._coa_socket: Optional[socket.socket] = None
+        self._tasks: list[asyncio.Task] = []
 
         # Core components
         self.authenticator = RADIUSAuthenticator()
-        self.session_manager = RADIUSSessionManager()
-        self.accounting = RADIUSAccounting()
+        self.session_manager = RADIUSSessionManager(
+            RedisSessionBackend(config.session_backend_url)
+            if config.session_backend_url
+            else None
+        )
+        self.accounting = RADIUSAccounting(sink=accounting_sink)
         self.coa_manager = CoAManager()
+        self.codec = RADIUSCodec(config.max_packet_size)
 
         # Storage
         self._clients: dict[str, RADIUSClient] = {}
         self._users: dict[str, RADIUSUser] = {}
-        self._active_sessions: dict[str, RADIUSSession] = {}
+
+        # Packet pipeline counters
+        self._pipeline_stats = {
+            "received": 0,
+            "processed": 0,
+            "dropped": 0,
+            "errors": 0,
+            "queue_high_water": 0,
+        }
 
         # Packet handling
         self._packet_handlers = {
@@ -94,6 +129,7 @@ class RADIUSManager:
                 tasks.append(asyncio.create_task(self._process_coa_packets()))
 
             # Wait for all tasks
+            self._tasks = tasks
             if tasks:
                 await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -109,6 +145,11 @@ class RADIUSManager:
 
         self._running = False
 
+        # Stop packet processing
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
         # Close sockets
         for sock in [self._auth_socket, self._acct_socket, self._coa_socket]:
             if sock:
@@ -124,75 +165,125 @@ class RADIUSManager:
     async def _create_sockets(self):
         """Create and configure server sockets."""
         # Authentication socket
-        self._auth_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self._auth_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self._auth_socket.bind((self.config.bind_address, self.config.auth_port))
-        self._auth_socket.setblocking(False)
+        self._auth_socket = self._bind_socket(self.config.auth_port)
 
         # Accounting socket
         if self.config.enable_accounting:
-            self._acct_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self._acct_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self._acct_socket.bind((self.config.bind_address, self.config.acct_port))
-            self._acct_socket.setblocking(False)
+            self._acct_socket = self._bind_socket(self.config.acct_port)
 
         # CoA socket
         if self.config.enable_coa:
-            self._coa_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self._coa_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self._coa_socket.bind((self.config.bind_address, self.config.coa_port))
-            self._coa_socket.setblocking(False)
+            self._coa_socket = self._bind_socket(self.config.coa_port)
+
+    def _bind_socket(self, port: int) -> socket.socket:
+        """Create a non-blocking UDP socket bound to port."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.config.reuse_port:
+            # Lets several worker processes bind the same port; the kernel
+            # load-balances datagrams between them
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((self.config.bind_address, port))
+        sock.setblocking(False)
+        return sock
 
     async def _process_auth_packets(self):
         """Process authentication packets."""
-        while self._running:
-            try:
-                loop = asyncio.get_event_loop()
-                data, addr = await loop.sock_recvfrom(
-                    self._auth_socket, self.config.max_packet_size
-                )
-
-                # Process packet in background
-                asyncio.create_task(self._handle_packet(data, addr, self._auth_socket))
-
-            except Exception as e:
-                if self._running:
-                    logger.error(f"Error processing auth packet: {e}")
-                await asyncio.sleep(0.01)
+        await self._serve_socket(self._auth_socket, "auth")
 
     async def _process_acct_packets(self):
         """Process accounting packets."""
-        while self._running and self._acct_socket:
-            try:
-                loop = asyncio.get_event_loop()
-                data, addr = await loop.sock_recvfrom(
-                    self._acct_socket, self.config.max_packet_size
-                )
-
-                # Process packet in background
-                asyncio.create_task(self._handle_packet(data, addr, self._acct_socket))
-
-            except Exception as e:
-                if self._running:
-                    logger.error(f"Error processing acct packet: {e}")
-                await asyncio.sleep(0.01)
+        if self._acct_socket:
+            await self._serve_socket(self._acct_socket, "acct")
 
     async def _process_coa_packets(self):
         """Process CoA packets."""
-        while self._running and self._coa_socket:
-            try:
-                loop = asyncio.get_event_loop()
-                data, addr = await loop.sock_recvfrom(
-                    self._coa_socket, self.config.max_packet_size
-                )
+        if self._coa_socket:
+            await self._serve_socket(self._coa_socket, "CoA")
+
+    async def _serve_socket(self, sock: socket.socket, label: str):
+        """
+        Receive datagrams into a bounded queue drained by a fixed handler pool.
+
+        Memory and concurrency stay bounded under reconnect storms: when the
+        queue is full new datagrams are dropped and counted, and the NAS
+        retransmits them later.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.config.queue_size))
+        handlers = [
+            asyncio.create_task(self._packet_worker(queue, sock))
+            for _ in range(max(1, self.config.handler_concurrency))
+        ]
+        try:
+            await self._receive_loop(sock, queue, label)
+        finally:
+            for handler in handlers:
+                handler.cancel()
+            await asyncio.gather(*handlers, return_exceptions=True)
+
+    async def _receive_loop(
+        self, sock: socket.socket, queue: asyncio.Queue, label: str
+    ):
+        """Receive datagrams, draining up to a batch per loop iteration."""
+        loop = asyncio.get_running_loop()
+        max_size = self.config.max_packet_size
+        batch_size = max(1, self.config.recv_batch_size)
 
-                # Process packet in background
-                asyncio.create_task(self._handle_packet(data, addr, self._coa_socket))
+        while self._running:
+            if sock is self._acct_socket and self.accounting.backlogged:
+                # Stop reading until accounting storage catches up; the kernel
+                # buffer fills and NAS retransmits instead of memory growing
+                await self.accounting.wait_for_capacity()
+                continue
 
+            try:
+                datagram = await loop.sock_recvfrom(sock, max_size)
             except Exception as e:
                 if self._running:
-                    logger.error(f"Error processing CoA packet: {e}")
+                    logger.error(f"Error processing {label} packet: {e}")
                 await asyncio.sleep(0.01)
+                continue
+
+            self._enqueue_packet(queue, datagram)
+
+            # Drain datagrams already buffered by the kernel without yielding
+            for _ in range(batch_size - 1):
+                try:
+                    datagram = sock.recvfrom(max_size)
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError as e:
+                    if self._running:
+                        logger.error(f"Error processing {label} packet: {e}")
+                    break
+                self._enqueue_packet(queue, datagram)
+
+    def _enqueue_packet(self, queue: asyncio.Queue, datagram: tuple):
+        """Queue datagram for handling, shedding it if the queue is full."""
+        stats = self._pipeline_stats
+        stats["received"] += 1
+        try:
+            queue.put_nowait(datagram)
+        except asyncio.QueueFull:
+            stats["dropped"] += 1
+            if stats["dropped"] % 1000 == 1:
+                logger.warning(
+                    f"RADIUS packet queue full, shedding load "
+                    f"({stats['dropped']} dropped)"
+                )
+            return
+        if queue.qsize() > stats["queue_high_water"]:
+            stats["queue_high_water"] = queue.qsize()
+
+    async def _packet_worker(self, queue: asyncio.Queue, sock: socket.socket):
+        """Handle queued datagrams one at a time."""
+        while True:
+            data, addr = await queue.get()
+            try:
+                await self._handle_packet(data, addr, sock)
+            finally:
+                self._pipeline_stats["processed"] += 1
+                queue.task_done()
 
     async def _handle_packet(self, data: bytes, addr: tuple, sock: socket.socket):
         """Handle incoming RADIUS packet."""
@@ -225,47 +316,25 @@ class RADIUSManager:
                 logger.warning(f"Unhandled packet type: {packet.packet_type}")
 
         except Exception as e:
+            self._pipeline_stats["errors"] += 1
             logger.error(f"Error handling packet from {addr}: {e}")
 
-    def _parse_packet(self, data: bytes, shared_secret: str) -> Optional[RADIUSPacket]:
-        """Parse raw RADIUS packet data."""
-        if len(data) < 20:
-            return None
-
-        try:
-            # Parse header
-            packet_type, packet_id, length = struct.unpack("!BBH", data[:4])
-            authenticator = data[4:20]
-
-            # Verify length
-            if len(data) != length:
-                return None
-
-            # Parse attributes
-            attributes = []
-            offset = 20
-            while offset < len(data):
-                if offset + 2 > len(data):
-                    break
-
-                attr_type, attr_length = struct.unpack("!BB", data[offset : offset + 2])
-                if attr_length < 2 or offset + attr_length > len(data):
-                    break
-
-                attr_value = data[offset + 2 : offset + attr_length]
-                attributes.append(RADIUSAttribute(attr_type, attr_value))
-                offset += attr_length
-
-            return RADIUSPacket(
-                packet_type=RADIUSPacketType(packet_type),
-                packet_id=packet_id,
-                authenticator=authenticator,
-                attributes=attributes,
-            )
-
-        except (struct.error, ValueError) as e:
-            logger.error(f"Packet parsing error: {e}")
+    def _parse_packet(self, data: bytes, shared_secret: str) -> Optional[PacketView]:
+        """
+        Parse raw RADIUS packet data.
+
+        Accounting, Disconnect and CoA requests carry an authenticator signed
+        with the client secret (RFC 2866, RFC 5176); packets that fail the
+        check are dropped like malformed ones.
+        """
+        packet = self.codec.parse(data)
+        if packet is None or packet.packet_type not in _SIGNED_REQUESTS:
+            return packet
+        if not self.codec.secret_for(shared_secret).verify_request_authenticator(
+            packet.data
+        ):
             return None
+        return packet
 
     def _build_response_packet(
         self, response: RADIUSResponse, shared_secret: str
@@ -274,33 +343,7 @@ class RADIUSManager:
         if not response.packet:
             return b""
 
-        packet = response.packet
-
-        # Build attributes data
-        attrs_data = b""
-        for attr in packet.attributes:
-            if isinstance(attr.value, str):
-                value = attr.value.encode("utf-8")
-            elif isinstance(attr.value, int):
-                value = struct.pack("!I", attr.value)
-            else:
-                value = attr.value
-
-            attr_data = struct.pack("!BB", attr.type, len(value) + 2) + value
-            attrs_data += attr_data
-
-        # Build packet
-        length = 20 + len(attrs_data)
-        header = struct.pack("!BBH", packet.packet_type, packet.packet_id, length)
-
-        # Calculate response authenticator
-        # MD5 is required by RADIUS protocol RFC 2865 - not used for security
-        auth_data = (
-            header + packet.authenticator + attrs_data + shared_secret.encode("utf-8")
-        )
-        response_auth = hashlib.md5(auth_data, usedforsecurity=False).digest()  # nosec B324
-
-        return header + response_auth + attrs_data
+        return self.codec.encode(response.packet, shared_secret)
 
     async def _handle_access_request(
         self, packet: RADIUSPacket, client: RADIUSClient
@@ -318,9 +361,23 @@ class RADIUSManager:
                 else str(username_attr.value)
             )
 
+            password = None
+            password_attr = packet.get_attribute(RADIUSAttributeType.USER_PASSWORD)
+            if password_attr:
+                try:
+                    password = (
+                        self.codec.secret_for(client.shared_secret)
+                        .decrypt_password(password_attr.value, packet.authenticator)
+                        .decode("utf-8")
+                    )
+                except ValueError:
+                    return self._create_access_reject(
+                        packet.packet_id, "Malformed User-Password"
+                    )
+
             # Authenticate user
             auth_result = await self.authenticator.authenticate(
-                packet, username, client
+                packet, username, client, password=password
             )
 
             if auth_result.success:
@@ -341,6 +398,11 @@ class RADIUSManager:
                         socket.inet_aton(session.framed_ip),
                     )
 
+                # Append pre-serialized service profile attributes
+                template = self._get_service_profile(username)
+                if template:
+                    response_packet.encoded_attributes = template.payload
+
                 return RADIUSResponse.success_response(
                     message="Access granted",
                     packet=response_packet,
@@ -423,10 +485,16 @@ class RADIUSManager:
 
         # Store session
         await self.session_manager.create_session(session)
-        self._active_sessions[session.session_id] = session
 
         return session
 
+    def _get_service_profile(self, username: str) -> Optional[AttributeTemplate]:
+        """Get the response template for the user's service profile."""
+        user = self._users.get(username) or self.authenticator.get_user(username)
+        if not user:
+            return None
+        return self.codec.get_template(user.attributes.get("service_profile"))
+
     def _get_client(self, ip_address: str) -> Optional[RADIUSClient]:
         """Get RADIUS client by IP address."""
         return self._clients.get(ip_address)
@@ -435,6 +503,7 @@ class RADIUSManager:
     def add_client(self, client: RADIUSClient):
         """Add RADIUS client."""
         self._clients[client.ip_address] = client
+        self.codec.secret_for(client.shared_secret)
         logger.info(f"Added RADIUS client: {client.name} ({client.ip_address})")
 
     def remove_client(self, ip_address: str):
@@ -447,6 +516,31 @@ class RADIUSManager:
         """Get all RADIUS clients."""
         return list(self._clients.values())
 
+    # Service Profiles
+    def register_service_profile(
+        self, name: str, attributes: Iterable[AttributeSpec]
+    ) -> AttributeTemplate:
+        """
+        Register Access-Accept attributes for a service profile.
+
+        Users whose ``attributes["service_profile"]`` names the profile get
+        these attributes, pre-serialized once, in every Access-Accept.
+
+        Args:
+            name: Service profile name
+            attributes: ``RADIUSAttribute`` objects or ``(type, value)`` pairs
+
+        Returns:
+            Registered attribute template
+        """
+        template = self.codec.register_template(name, attributes)
+        logger.info(f"Registered RADIUS service profile: {name}")
+        return template
+
+    def remove_service_profile(self, name: str):
+        """Remove service profile."""
+        self.codec.remove_template(name)
+
     # User Management
     def add_user(self, user: RADIUSUser):
         """Add RADIUS user."""
@@ -468,32 +562,29 @@ class RADIUSManager:
         return list(self._users.values())
 
     # Session Management
-    def get_active_sessions(self) -> list[RADIUSSession]:
-        """Get all active sessions."""
-        return list(self._active_sessions.values())
+    async def get_active_sessions(self) -> list[RADIUSSession]:
+        """Get all active sessions across workers."""
+        return await self.session_manager.load_active_sessions()
 
-    def get_session(self, session_id: str) -> Optional[RADIUSSession]:
-        """Get session by ID."""
-        return self._active_sessions.get(session_id)
+    async def get_session(self, session_id: str) -> Optional[RADIUSSession]:
+        """Get session by ID, whichever worker created it."""
+        return await self.session_manager.load_session(session_id)
 
     async def disconnect_session(
         self, session_id: str, reason: str = "Administrative disconnect"
     ) -> bool:
         """Disconnect active session."""
-        session = self._active_sessions.get(session_id)
-        if not session:
+        session = await self.session_manager.load_session(session_id)
+        if not session or session.status != RADIUSSessionStatus.ACTIVE:
             return False
 
         try:
             # Send CoA disconnect
             await self.coa_manager.disconnect_session(session, reason)
 
-            # Update session status
+            # Drop the session from the shared store
             session.status = RADIUSSessionStatus.TERMINATED
-            await self.session_manager.update_session(session)
-
-            # Remove from active sessions
-            del self._active_sessions[session_id]
+            await self.session_manager.remove_session(session_id)
 
             return True
 
@@ -502,11 +593,11 @@ class RADIUSManager:
             return False
 
     # Statistics and Monitoring
-    def get_server_stats(self) -> dict[str, Any]:
+    async def get_server_stats(self) -> dict[str, Any]:
         """Get server statistics."""
         return {
             "running": self._running,
-            "active_sessions": len(self._active_sessions),
+            "active_sessions": len(await self.get_active_sessions()),
             "registered_clients": len(self._clients),
             "registered_users": len(self._users),
             "auth_port": self.config.auth_port,
@@ -514,6 +605,8 @@ class RADIUSManager:
             "coa_port": self.config.coa_port,
             "accounting_enabled": self.config.enable_accounting,
             "coa_enabled": self.config.enable_coa,
+            "pipeline": dict(self._pipeline_stats),
+            "accounting": self.accounting.get_stats(),
         }
 
     @asynccontextmanager
@@ -3,23 +3,208 @@ RADIUS session management.
 """
 
 import asyncio
+import json
 import logging
+from abc import ABC, abstractmethod
 from datetime import UTC, datetime
-from typing import Optional
+from typing import Any, Optional
 
 from .types import RADIUSSession, RADIUSSessionStatus
 
+try:
+    import redis.asyncio as aioredis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+class SessionBackend(ABC):
+    """Storage backend for RADIUS sessions."""
+
+    @abstractmethod
+    async def save(self, session: RADIUSSession) -> None:
+        """Create or replace session."""
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[RADIUSSession]:
+        """Get session by ID."""
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> Optional[RADIUSSession]:
+        """Delete session, returning it if it existed."""
+
+    @abstractmethod
+    async def get_user_sessions(self, username: str) -> list[RADIUSSession]:
+        """Get all sessions for user."""
+
+    @abstractmethod
+    async def list_sessions(self) -> list[RADIUSSession]:
+        """Get all sessions."""
+
+    async def close(self) -> None:
+        """Release backend resources."""
+        return None
+
+
+class MemorySessionBackend(SessionBackend):
+    """Process-local session storage (single worker)."""
+
+    def __init__(self):
+        self._sessions: dict[str, RADIUSSession] = {}
+
+    async def save(self, session: RADIUSSession) -> None:
+        self._sessions[session.session_id] = session
+
+    async def get(self, session_id: str) -> Optional[RADIUSSession]:
+        return self._sessions.get(session_id)
+
+    async def delete(self, session_id: str) -> Optional[RADIUSSession]:
+        return self._sessions.pop(session_id, None)
+
+    async def get_user_sessions(self, username: str) -> list[RADIUSSession]:
+        return [s for s in self._sessions.values() if s.username == username]
+
+    async def list_sessions(self) -> list[RADIUSSession]:
+        return list(self._sessions.values())
+
+
+class RedisSessionBackend(SessionBackend):
+    """
+    Redis session storage shared by all server workers.
+
+    Each session is a JSON string under ``{prefix}{session_id}``; set
+    ``{prefix}all`` indexes every session ID and ``{prefix}user:{username}``
+    the sessions of one user. Session keys expire with the session's
+    timeouts, so sessions of a crashed worker do not linger; index members
+    whose key has expired are dropped when the index is read.
+    """
+
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379/0",
+        prefix: str = "radius:session:",
+        client: Any = None,
+        default_ttl: Optional[int] = 86400,
+    ):
+        """
+        Initialize backend.
+
+        Args:
+            redis_url: Redis connection URL
+            prefix: Key prefix for session keys and indexes
+            client: Optional existing ``redis.asyncio`` client
+            default_ttl: Expiry in seconds for sessions without a session or
+                idle timeout, or None to keep them until deleted
+        """
+        if client is None and not REDIS_AVAILABLE:
+            raise ImportError(
+                "redis is required for RedisSessionBackend. "
+                "Install with: pip install redis"
+            )
+
+        self.redis_url = redis_url
+        self.prefix = prefix
+        self._redis = client
+        self._owns_client = client is None
+        self.default_ttl = default_ttl
+
+    def _client(self):
+        if self._redis is None:
+            self._redis = aioredis.from_url(self.redis_url)
+        return self._redis
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    def _user_key(self, username: str) -> str:
+        return f"{self.prefix}user:{username}"
+
+    @property
+    def _all_key(self) -> str:
+        return f"{self.prefix}all"
+
+    def _ttl(self, session: RADIUSSession) -> Optional[int]:
+        """Seconds until the session times out, counted from this write."""
+        limits = []
+        if session.session_timeout:
+            limits.append(session.session_timeout - session.session_time)
+        if session.idle_timeout:
+            limits.append(session.idle_timeout)
+        if not limits:
+            return self.default_ttl
+        return max(1, min(limits))
+
+    async def save(self, session: RADIUSSession) -> None:
+        pipe = self._client().pipeline(transaction=True)
+        pipe.set(
+            self._key(session.session_id),
+            json.dumps(session.to_dict()),
+            ex=self._ttl(session),
+        )
+        pipe.sadd(self._all_key, session.session_id)
+        pipe.sadd(self._user_key(session.username), session.session_id)
+        await pipe.execute()
+
+    async def get(self, session_id: str) -> Optional[RADIUSSession]:
+        data = await self._client().get(self._key(session_id))
+        return RADIUSSession.from_dict(json.loads(data)) if data else None
+
+    async def delete(self, session_id: str) -> Optional[RADIUSSession]:
+        session = await self.get(session_id)
+        pipe = self._client().pipeline(transaction=True)
+        pipe.delete(self._key(session_id))
+        pipe.srem(self._all_key, session_id)
+        if session:
+            pipe.srem(self._user_key(session.username), session_id)
+        await pipe.execute()
+        return session
+
+    async def _load_many(self, index_key: str) -> list[RADIUSSession]:
+        client = self._client()
+        session_ids = sorted(
+            member.decode() if isinstance(member, bytes) else member
+            for member in await client.smembers(index_key)
+        )
+        if not session_ids:
+            return []
+        values = await client.mget([self._key(sid) for sid in session_ids])
+
+        expired = [sid for sid, value in zip(session_ids, values) if not value]
+        if expired:
+            pipe = client.pipeline(transaction=True)
+            pipe.srem(index_key, *expired)
+            pipe.srem(self._all_key, *expired)
+            await pipe.execute()
+
+        return [RADIUSSession.from_dict(json.loads(value)) for value in values if value]
+
+    async def get_user_sessions(self, username: str) -> list[RADIUSSession]:
+        return await self._load_many(self._user_key(username))
+
+    async def list_sessions(self) -> list[RADIUSSession]:
+        return await self._load_many(self._all_key)
+
+    async def close(self) -> None:
+        if self._redis is not None and self._owns_client:
+            await self._redis.aclose()
+            self._redis = None
+
+
 class RADIUSSessionManager:
     """
     RADIUS session lifecycle management.
 
-    Manages active RADIUS sessions, tracking, and cleanup.
+    Manages active RADIUS sessions, tracking, and cleanup. Sessions are
+    written through to the backend; the synchronous getters read the sessions
+    this process has seen, the ``load_*`` coroutines read the shared backend.
     """
 
-    def __init__(self):
+    def __init__(self, backend: Optional[SessionBackend] = None):
+        self.backend = backend or MemorySessionBackend()
         self._sessions: dict[str, RADIUSSession] = {}
         self._running = False
         self._cleanup_task: Optional[asyncio.Task] = None
@@ -46,10 +231,12 @@ class RADIUSSessionManager:
             except asyncio.CancelledError:
                 pass
 
+        await self.backend.close()
         logger.info("RADIUS session manager stopped")
 
     async def create_session(self, session: RADIUSSession) -> RADIUSSession:
         """Create new RADIUS session."""
+        await self.backend.save(session)
         self._sessions[session.session_id] = session
         logger.info(
             f"Created RADIUS session {session.session_id} for user {session.username}"
@@ -58,21 +245,43 @@ class RADIUSSessionManager:
 
     async def update_session(self, session: RADIUSSession):
         """Update existing session."""
-        if session.session_id in self._sessions:
+        if session.session_id in self._sessions or await self.backend.get(
+            session.session_id
+        ):
+            await self.backend.save(session)
             self._sessions[session.session_id] = session
             logger.debug(f"Updated RADIUS session {session.session_id}")
 
     async def remove_session(self, session_id: str) -> bool:
         """Remove session."""
-        if session_id in self._sessions:
-            session = self._sessions[session_id]
-            del self._sessions[session_id]
+        session = await self.backend.delete(session_id)
+        session = self._sessions.pop(session_id, None) or session
+        if session:
             logger.info(
                 f"Removed RADIUS session {session_id} for user {session.username}"
             )
             return True
         return False
 
+    async def load_session(self, session_id: str) -> Optional[RADIUSSession]:
+        """Get session by ID from the shared backend."""
+        session = await self.backend.get(session_id)
+        if session:
+            self._sessions[session_id] = session
+        return session
+
+    async def load_user_sessions(self, username: str) -> list[RADIUSSession]:
+        """Get all sessions for user from the shared backend."""
+        return await self.backend.get_user_sessions(username)
+
+    async def load_active_sessions(self) -> list[RADIUSSession]:
+        """Get all active sessions from the shared backend."""
+        return [
+            s
+            for s in await self.backend.list_sessions()
+            if s.status == RADIUSSessionStatus.ACTIVE
+        ]
+
     def get_session(self, session_id: str) -> Optional[RADIUSSession]:
         """Get session by ID."""
         return self._sessions.get(session_id)
@@ -104,7 +313,16 @@ class RADIUSSessionManager:
         now = datetime.now(UTC)
         expired_sessions = []
 
-        for session in self._sessions.values():
+        # Sessions gone from the backend (expired keys, removed by another
+        # worker) are dropped from this process's view as well
+        local_ids = list(self._sessions)
+        sessions = await self.backend.list_sessions()
+        live_ids = {session.session_id for session in sessions}
+        for session_id in local_ids:
+            if session_id not in live_ids:
+                self._sessions.pop(session_id, None)
+
+        for session in sessions:
             # Check for session timeout
             if (
                 session.session_timeout
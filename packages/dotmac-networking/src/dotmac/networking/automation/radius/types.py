@@ -2,7 +2,7 @@
 RADIUS protocol types and data structures.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import UTC, datetime
 from enum import Enum, IntEnum
 from typing import Any, Optional, Union
@@ -161,9 +161,12 @@ class RADIUSAttribute:
 
     def __post_init__(self):
         """Validate attribute after initialization."""
-        if isinstance(self.type, int) and self.type not in RADIUSAttributeType:
-            # Allow unknown attribute types for vendor-specific attributes
-            pass
+        if not isinstance(self.type, RADIUSAttributeType):
+            try:
+                self.type = RADIUSAttributeType(self.type)
+            except ValueError:
+                # Allow unknown attribute types for vendor-specific attributes
+                pass
 
 
 @dataclass
@@ -174,6 +177,8 @@ class RADIUSPacket:
     packet_id: int
     authenticator: bytes
     attributes: list[RADIUSAttribute] = field(default_factory=list)
+    # Pre-serialized attributes (e.g. a response template) appended on encode
+    encoded_attributes: bytes = b""
 
     def get_attribute(
         self, attr_type: Union[RADIUSAttributeType, int]
@@ -287,6 +292,30 @@ class RADIUSSession:
         self.last_update = datetime.now(UTC)
         self.session_time = int((self.last_update - self.start_time).total_seconds())
 
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize session to JSON-compatible dict."""
+        data = asdict(self)
+        data["status"] = self.status.value
+        data["start_time"] = self.start_time.isoformat()
+        data["last_update"] = self.last_update.isoformat()
+        for name in ("service_type", "terminate_cause"):
+            if data[name] is not None:
+                data[name] = int(data[name])
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RADIUSSession":
+        """Deserialize session from ``to_dict`` output."""
+        data = dict(data)
+        data["status"] = RADIUSSessionStatus(data["status"])
+        data["start_time"] = datetime.fromisoformat(data["start_time"])
+        data["last_update"] = datetime.fromisoformat(data["last_update"])
+        if data.get("service_type") is not None:
+            data["service_type"] = RADIUSServiceType(data["service_type"])
+        if data.get("terminate_cause") is not None:
+            data["terminate_cause"] = AcctTerminateCause(data["terminate_cause"])
+        return cls(**data)
+
 
 @dataclass
 class RADIUSClient:
@@ -317,6 +346,15 @@ class RADIUSServerConfig:
     enable_coa: bool = True
     enable_accounting: bool = True
     log_level: str = "INFO"
+    # Multi-worker server mode
+    workers: int = 1
+    reuse_port: bool = False
+    # Bounded packet pipeline (per socket, per worker)
+    queue_size: int = 1024
+    handler_concurrency: int = 32
+    recv_batch_size: int = 64
+    # Shared session store, e.g. "redis://localhost:6379/0"
+    session_backend_url: Optional[str] = None
 
 
 class RADIUSException(Exception):
@@ -0,0 +1,187 @@
+"""
+Multi-process RADIUS server mode.
+
+Runs one ``RADIUSManager`` per worker process, all bound to the same
+auth/acct/CoA ports with ``SO_REUSEPORT`` so the kernel spreads datagrams
+across workers. Sessions stay coherent across workers when the server
+config points ``session_backend_url`` at a shared Redis.
+"""
+
+import asyncio
+import dataclasses
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from collections.abc import Callable
+from typing import Optional
+
+from .manager import RADIUSManager
+from .types import RADIUSException, RADIUSServerConfig
+
+logger = logging.getLogger(__name__)
+
+ManagerFactory = Callable[[RADIUSServerConfig], RADIUSManager]
+
+
+async def _serve(manager: RADIUSManager):
+    """Run manager until SIGTERM/SIGINT."""
+    loop = asyncio.get_running_loop()
+    stop_requested = asyncio.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stop_requested.set)
+
+    server = asyncio.create_task(manager.start())
+    stopper = asyncio.create_task(stop_requested.wait())
+    await asyncio.wait({server, stopper}, return_when=asyncio.FIRST_COMPLETED)
+
+    await manager.stop()
+    stopper.cancel()
+    await asyncio.gather(server, stopper, return_exceptions=True)
+
+
+def _run_worker(
+    config: RADIUSServerConfig, manager_factory: ManagerFactory, index: int
+):
+    """Worker process entry point."""
+    logger.info(f"RADIUS worker {index} starting (pid {os.getpid()})")
+    asyncio.run(_serve(manager_factory(config)))
+    logger.info(f"RADIUS worker {index} stopped")
+
+
+class RADIUSWorkerPool:
+    """
+    Supervisor for a pool of RADIUS worker processes.
+
+    The manager factory is called in each worker with the server config and
+    must return a fully configured manager (clients, users, profiles). With
+    the ``spawn`` start method it must be importable at module level.
+    """
+
+    def __init__(
+        self,
+        config: RADIUSServerConfig,
+        manager_factory: ManagerFactory = RADIUSManager,
+        workers: Optional[int] = None,
+        start_method: Optional[str] = None,
+    ):
+        """
+        Initialize worker pool.
+
+        Args:
+            config: Server configuration shared by all workers
+            manager_factory: Callable building a manager from the config
+            workers: Number of processes (defaults to ``config.workers``)
+            start_method: multiprocessing start method (default ``fork``
+                where available)
+
+        Raises:
+            RADIUSException: If the platform lacks SO_REUSEPORT
+        """
+        if not hasattr(socket, "SO_REUSEPORT"):
+            raise RADIUSException("Multi-worker mode requires SO_REUSEPORT")
+
+        self.workers = max(1, workers or config.workers)
+        self.config = dataclasses.replace(config, reuse_port=True)
+        self.manager_factory = manager_factory
+
+        if start_method is None:
+            available = multiprocessing.get_all_start_methods()
+            start_method = "fork" if "fork" in available else "spawn"
+        self._context = multiprocessing.get_context(start_method)
+        self._processes: list[Optional[multiprocessing.process.BaseProcess]] = []
+        self._stopping = False
+
+    def _spawn(self, index: int):
+        process = self._context.Process(
+            target=_run_worker,
+            args=(self.config, self.manager_factory, index),
+            name=f"radius-worker-{index}",
+            daemon=False,
+        )
+        process.start()
+        return process
+
+    def start(self):
+        """Start all worker processes."""
+        self._stopping = False
+        self._processes = [self._spawn(index) for index in range(self.workers)]
+        logger.info(
+            f"Started {self.workers} RADIUS workers on {self.config.bind_address} "
+            f"(auth {self.config.auth_port}, acct {self.config.acct_port})"
+        )
+
+    def restart_dead_workers(self) -> int:
+        """
+        Replace workers that exited unexpectedly.
+
+        Returns:
+            Number of workers restarted
+        """
+        restarted = 0
+        if self._stopping:
+            return restarted
+
+        for index, process in enumerate(self._processes):
+            if process is not None and not process.is_alive():
+                logger.warning(
+                    f"RADIUS worker {index} exited with code {process.exitcode}, "
+                    "restarting"
+                )
+                self._processes[index] = self._spawn(index)
+                restarted += 1
+        return restarted
+
+    def stop(self, timeout: float = 10.0):
+        """
+        Stop workers gracefully, killing any that outlive timeout.
+
+        Args:
+            timeout: Seconds to wait for workers to exit
+        """
+        self._stopping = True
+        for process in self._processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            if process is None:
+                continue
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+        logger.info("RADIUS workers stopped")
+
+    def alive_count(self) -> int:
+        """Number of running worker processes."""
+        return sum(1 for p in self._processes if p is not None and p.is_alive())
+
+    def run(self, check_interval: float = 1.0):
+        """
+        Start workers and supervise them until SIGTERM/SIGINT.
+
+        Args:
+            check_interval: Seconds between liveness checks
+        """
+
+        def request_stop(signum, frame):
+            self._stopping = True
+
+        previous = {
+            signum: signal.signal(signum, request_stop)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            self.start()
+            while not self._stopping:
+                time.sleep(check_interval)
+                self.restart_dead_workers()
+        finally:
+            self.stop()
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
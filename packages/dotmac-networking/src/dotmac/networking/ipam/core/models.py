@@ -56,13 +56,17 @@ try:
             String(100), nullable=True, index=True
         )  # User ID who last updated
 
+    # Native inet on PostgreSQL (GiST-indexable, supports && >>= <<=),
+    # plain text on other dialects such as SQLite
+    InetType = String(43).with_variant(INET(), "postgresql")
+
     SQLALCHEMY_AVAILABLE = True
 except ImportError:
     SQLALCHEMY_AVAILABLE = False
     # Create minimal stubs for when SQLAlchemy is not available
     Column = String = Text = Boolean = DateTime = Date = None
     Integer = Numeric = JSON = ForeignKey = Index = None
-    UUID = INET = relationship = hybrid_property = SQLEnum = None
+    UUID = INET = InetType = relationship = hybrid_property = SQLEnum = None
     TenantModel = StatusMixin = AuditMixin = None
 
 
@@ -110,11 +114,11 @@ if SQLALCHEMY_AVAILABLE:
         description = Column(Text, nullable=True)
 
         # Network configuration
-        cidr = Column(INET, nullable=False, index=True)
+        cidr = Column(InetType, nullable=False, index=True)
         network_type = Column(SQLEnum(NetworkType), nullable=False, index=True)
 
         # Network properties
-        gateway = Column(INET, nullable=True)
+        gateway = Column(InetType, nullable=True)
         dns_servers = Column(JSON, nullable=True)  # List of DNS server IPs
         dhcp_enabled = Column(Boolean, default=False, nullable=False)
 
@@ -139,6 +143,12 @@ if SQLALCHEMY_AVAILABLE:
             Index("ix_networks_tenant_cidr", "tenant_id", "cidr"),
             Index("ix_networks_type_site", "network_type", "site_id"),
             Index("ix_networks_vlan", "vlan_id"),
+            Index(
+                "ix_networks_cidr_gist",
+                "cidr",
+                postgresql_using="gist",
+                postgresql_ops={"cidr": "inet_ops"},
+            ),
         )
 
         @hybrid_property
@@ -188,7 +198,7 @@ if SQLALCHEMY_AVAILABLE:
         )
 
         # IP allocation details
-        ip_address = Column(INET, nullable=False, index=True)
+        ip_address = Column(InetType, nullable=False, index=True)
         allocation_type = Column(
             String(50), default="dynamic", nullable=False
         )  # dynamic, static, dhcp
@@ -249,6 +259,12 @@ if SQLALCHEMY_AVAILABLE:
             Index("ix_allocations_assigned", "assigned_to", "assigned_resource_id"),
             Index("ix_allocations_expires", "expires_at"),
             Index("ix_allocations_mac", "mac_address"),
+            Index(
+                "ix_allocations_ip_gist",
+                "ip_address",
+                postgresql_using="gist",
+                postgresql_ops={"ip_address": "inet_ops"},
+            ),
         )
 
         @hybrid_property
@@ -293,7 +309,7 @@ if SQLALCHEMY_AVAILABLE:
         )
 
         # Reservation details
-        ip_address = Column(INET, nullable=False, index=True)
+        ip_address = Column(InetType, nullable=False, index=True)
         reservation_status = Column(
             SQLEnum(ReservationStatus),
             default=ReservationStatus.RESERVED,
@@ -334,6 +350,12 @@ if SQLALCHEMY_AVAILABLE:
             ),
             Index("ix_reservations_expires", "expires_at"),
             Index("ix_reservations_priority", "priority"),
+            Index(
+                "ix_reservations_ip_gist",
+                "ip_address",
+                postgresql_using="gist",
+                postgresql_ops={"ip_address": "inet_ops"},
+            ),
         )
 
         @hybrid_property
@@ -9,6 +9,8 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Optional, Union
 
+from ..utils.prefix_index import PrefixIndex
+
 try:
     from ..core.models import NetworkType
 
@@ -486,32 +488,16 @@ class NetworkPlanner:
         """
         conflicts = []
 
+        existing_index = PrefixIndex()
+        for position, existing in enumerate(existing_subnets):
+            try:
+                existing_index.add(ipaddress.ip_network(existing), position)
+            except ValueError:
+                continue
+
         for proposed in proposed_subnets:
             try:
                 proposed_net = ipaddress.ip_network(proposed)
-
-                for existing in existing_subnets:
-                    try:
-                        existing_net = ipaddress.ip_network(existing)
-
-                        if proposed_net.overlaps(existing_net):
-                            conflicts.append(
-                                {
-                                    "type": "overlap",
-                                    "proposed_subnet": proposed,
-                                    "existing_subnet": existing,
-                                    "severity": (
-                                        "high"
-                                        if proposed_net == existing_net
-                                        else "medium"
-                                    ),
-                                    "description": f"Proposed subnet {proposed} overlaps with existing subnet {existing}",
-                                }
-                            )
-
-                    except ValueError:
-                        continue
-
             except ValueError:
                 conflicts.append(
                     {
@@ -521,6 +507,25 @@ class NetworkPlanner:
                         "description": f"Invalid CIDR format: {proposed}",
                     }
                 )
+                continue
+
+            # Report in existing_subnets order
+            overlaps = sorted(
+                existing_index.iter_overlaps(proposed_net), key=lambda item: item[1]
+            )
+            for existing_net, position in overlaps:
+                existing = existing_subnets[position]
+                conflicts.append(
+                    {
+                        "type": "overlap",
+                        "proposed_subnet": proposed,
+                        "existing_subnet": existing,
+                        "severity": (
+                            "high" if proposed_net == existing_net else "medium"
+                        ),
+                        "description": f"Proposed subnet {proposed} overlaps with existing subnet {existing}",
+                    }
+                )
 
         return conflicts
 
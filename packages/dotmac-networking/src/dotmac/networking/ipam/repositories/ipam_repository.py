@@ -2,11 +2,25 @@
 IPAM Repository - Database access layer for IPAM operations.
 """
 
+import ipaddress
 from datetime import datetime, timezone
 from typing import Any, Optional
 
 try:
-    from sqlalchemy import and_, asc, desc, func, or_
+    from sqlalchemy import (
+        and_,
+        asc,
+        cast,
+        desc,
+        exists,
+        func,
+        literal,
+        or_,
+        select,
+        union,
+        union_all,
+    )
+    from sqlalchemy.dialects.postgresql import INET
     from sqlalchemy.exc import IntegrityError
     from sqlalchemy.orm import Session
 
@@ -16,6 +30,7 @@ except ImportError:
     Session = None
     IntegrityError = Exception
     and_ = or_ = desc = asc = func = None
+    cast = exists = literal = select = union = union_all = INET = None
 
 try:
     from ..core.exceptions import (
@@ -42,6 +57,9 @@ except ImportError:
         ReservationNotFoundError
     ) = Exception
 
+from ..utils.address_index import AddressIndexRegistry, FreeRangeIndex, get_host_bounds
+from ..utils.prefix_index import TenantPrefixIndexRegistry
+
 
 class IPAMRepository:
     """
@@ -51,17 +69,35 @@ class IPAMRepository:
     with proper error handling and tenant isolation.
     """
 
-    def __init__(self, database_session: Session):
+    def __init__(
+        self,
+        database_session: Session,
+        address_index: Optional[AddressIndexRegistry] = None,
+        prefix_index: Optional[TenantPrefixIndexRegistry] = None,
+    ):
         """
         Initialize repository with database session.
 
         Args:
             database_session: SQLAlchemy session instance
+            address_index: Optional free-space index registry, shared between
+                repositories that should see each other's allocations
+            prefix_index: Optional per-tenant prefix index registry used for
+                overlap detection
         """
         if not SQLALCHEMY_AVAILABLE or not MODELS_AVAILABLE:
             raise ImportError("Repository requires SQLAlchemy and IPAM models")
 
         self.db = database_session
+        self.address_index = address_index or AddressIndexRegistry()
+        self.prefix_index = prefix_index or TenantPrefixIndexRegistry()
+
+    def _is_postgresql(self) -> bool:
+        """Check whether the session is bound to PostgreSQL (native inet ops)."""
+        try:
+            return self.db.get_bind().dialect.name == "postgresql"
+        except Exception:
+            return False
 
     # Network Repository Methods
 
@@ -83,6 +119,8 @@ class IPAMRepository:
             self.db.add(network)
             self.db.commit()
             self.db.refresh(network)
+            if network.is_active is not False:
+                self.prefix_index.add(network.tenant_id, str(network.cidr), network.id)
             return network
         except IntegrityError as e:
             self.db.rollback()
@@ -104,7 +142,7 @@ class IPAMRepository:
             .filter(
                 IPNetwork.tenant_id == tenant_id,
                 IPNetwork.network_id == network_id,
-                IPNetwork.is_active is True,
+                IPNetwork.is_active.is_(True),
             )
             .first()
         )
@@ -133,7 +171,7 @@ class IPAMRepository:
             List of network objects
         """
         query = self.db.query(IPNetwork).filter(
-            IPNetwork.tenant_id == tenant_id, IPNetwork.is_active is True
+            IPNetwork.tenant_id == tenant_id, IPNetwork.is_active.is_(True)
         )
 
         if network_type:
@@ -182,6 +220,9 @@ class IPAMRepository:
         try:
             self.db.commit()
             self.db.refresh(network)
+            if "cidr" in updates or "is_active" in updates:
+                self.prefix_index.invalidate(tenant_id)
+                self.address_index.invalidate((tenant_id, str(network.id)))
             return network
         except IntegrityError as e:
             self.db.rollback()
@@ -206,12 +247,18 @@ class IPAMRepository:
         network.updated_at = datetime.now(timezone.utc)
 
         self.db.commit()
+        self.prefix_index.remove(tenant_id, str(network.cidr), network.id)
+        self.address_index.invalidate((tenant_id, str(network.id)))
         return True
 
     def get_overlapping_networks(self, tenant_id: str, cidr: str) -> list[IPNetwork]:
         """
         Find networks that overlap with given CIDR.
 
+        On PostgreSQL this is a GiST-indexed ``&&`` query; elsewhere it uses
+        the tenant's prefix index, which is loaded from the database on first
+        use and kept current by create/update/delete_network.
+
         Args:
             tenant_id: Tenant identifier
             cidr: CIDR to check for overlaps
@@ -219,28 +266,114 @@ class IPAMRepository:
         Returns:
             List of overlapping network objects
         """
-        # This is a simplified check - in production you might want
-        # to use database-specific IP range operators
-        networks = self.get_networks_by_tenant(tenant_id)
-
-        import ipaddress
-
         try:
             new_network = ipaddress.ip_network(cidr, strict=False)
-            overlapping = []
+        except ValueError:
+            return []
 
-            for network in networks:
-                try:
-                    existing_network = ipaddress.ip_network(network.cidr, strict=False)
-                    if new_network.overlaps(existing_network):
-                        overlapping.append(network)
-                except ValueError:
-                    continue
+        if self._is_postgresql():
+            return (
+                self.db.query(IPNetwork)
+                .filter(
+                    IPNetwork.tenant_id == tenant_id,
+                    IPNetwork.is_active.is_(True),
+                    IPNetwork.cidr.op("&&")(cast(str(new_network), INET)),
+                )
+                .all()
+            )
+
+        index = self.prefix_index.get(
+            tenant_id, lambda: self._load_tenant_prefixes(tenant_id)
+        )
+        network_ids = [network_id for _, network_id in index.iter_overlaps(new_network)]
+        if not network_ids:
+            return []
 
-            return overlapping
+        return (
+            self.db.query(IPNetwork)
+            .filter(
+                IPNetwork.tenant_id == tenant_id,
+                IPNetwork.id.in_(network_ids),
+                IPNetwork.is_active.is_(True),
+            )
+            .all()
+        )
+
+    def get_networks_containing_ip(
+        self, tenant_id: str, ip_address: str
+    ) -> list[IPNetwork]:
+        """
+        Find active networks containing an IP address, widest first.
+
+        Args:
+            tenant_id: Tenant identifier
+            ip_address: IP address to look up
+
+        Returns:
+            List of containing network objects
+        """
+        try:
+            address = ipaddress.ip_address(ip_address)
         except ValueError:
             return []
 
+        if self._is_postgresql():
+            return (
+                self.db.query(IPNetwork)
+                .filter(
+                    IPNetwork.tenant_id == tenant_id,
+                    IPNetwork.is_active.is_(True),
+                    IPNetwork.cidr.op(">>=")(cast(str(address), INET)),
+                )
+                .order_by(func.masklen(IPNetwork.cidr))
+                .all()
+            )
+
+        index = self.prefix_index.get(
+            tenant_id, lambda: self._load_tenant_prefixes(tenant_id)
+        )
+        host_network = ipaddress.ip_network(address)
+        network_ids = [
+            network_id
+            for network, network_id in index.iter_overlaps(host_network)
+            if host_network.subnet_of(network)
+        ]
+        if not network_ids:
+            return []
+
+        networks = (
+            self.db.query(IPNetwork)
+            .filter(
+                IPNetwork.tenant_id == tenant_id,
+                IPNetwork.id.in_(network_ids),
+                IPNetwork.is_active.is_(True),
+            )
+            .all()
+        )
+        return sorted(
+            networks,
+            key=lambda network: ipaddress.ip_network(
+                str(network.cidr), strict=False
+            ).prefixlen,
+        )
+
+    def _load_tenant_prefixes(self, tenant_id: str) -> list[tuple[str, Any]]:
+        """Load (cidr, primary key) pairs for a tenant's active networks."""
+        rows = (
+            self.db.query(IPNetwork.cidr, IPNetwork.id)
+            .filter(IPNetwork.tenant_id == tenant_id, IPNetwork.is_active.is_(True))
+            .all()
+        )
+
+        prefixes = []
+        for row in rows:
+            try:
+                network = ipaddress.ip_network(str(row.cidr), strict=False)
+            except ValueError:
+                continue
+            prefixes.append((network, row.id))
+        return prefixes
+
     # Allocation Repository Methods
 
     def create_allocation(self, **allocation_data) -> IPAllocation:
@@ -261,6 +394,7 @@ class IPAMRepository:
             self.db.add(allocation)
             self.db.commit()
             self.db.refresh(allocation)
+            self._sync_allocation_index(allocation)
             return allocation
         except IntegrityError as e:
             self.db.rollback()
@@ -398,6 +532,7 @@ class IPAMRepository:
         try:
             self.db.commit()
             self.db.refresh(allocation)
+            self._sync_allocation_index(allocation)
             return allocation
         except IntegrityError as e:
             self.db.rollback()
@@ -451,6 +586,7 @@ class IPAMRepository:
             self.db.add(reservation)
             self.db.commit()
             self.db.refresh(reservation)
+            self._sync_reservation_index(reservation)
             return reservation
         except IntegrityError as e:
             self.db.rollback()
@@ -583,6 +719,7 @@ class IPAMRepository:
         try:
             self.db.commit()
             self.db.refresh(reservation)
+            self._sync_reservation_index(reservation)
             return reservation
         except IntegrityError as e:
             self.db.rollback()
@@ -616,6 +753,173 @@ class IPAMRepository:
 
         return query.all()
 
+    # Free-Space Index Methods
+
+    def _get_address_index(self, network: IPNetwork) -> FreeRangeIndex:
+        """
+        Get free-space index for network, building it from the database.
+
+        Args:
+            network: Network object
+
+        Returns:
+            Free-space index for the network
+        """
+
+        def load_used_addresses() -> list[str]:
+            allocations = (
+                self.db.query(IPAllocation.ip_address)
+                .filter(
+                    IPAllocation.tenant_id == network.tenant_id,
+                    IPAllocation.network_id == network.id,
+                    IPAllocation.allocation_status == AllocationStatus.ALLOCATED,
+                )
+                .all()
+            )
+            reservations = (
+                self.db.query(IPReservation.ip_address)
+                .filter(
+                    IPReservation.tenant_id == network.tenant_id,
+                    IPReservation.network_id == network.id,
+                    IPReservation.reservation_status == ReservationStatus.RESERVED,
+                )
+                .all()
+            )
+            return [str(row.ip_address) for row in allocations] + [
+                str(row.ip_address) for row in reservations
+            ]
+
+        return self.address_index.get(
+            (network.tenant_id, str(network.id)),
+            ipaddress.ip_network(network.cidr, strict=False),
+            load_used_addresses,
+        )
+
+    def _sync_allocation_index(self, allocation: IPAllocation) -> None:
+        """Reflect allocation status in the free-space index."""
+        key = (allocation.tenant_id, str(allocation.network_id))
+        if self.address_index.peek(key) is None:
+            return
+
+        if allocation.allocation_status == AllocationStatus.ALLOCATED:
+            self.address_index.mark_used(key, allocation.ip_address)
+        elif self.get_reservation_by_ip(allocation.tenant_id, allocation.ip_address):
+            # Address is still held by a reservation
+            self.address_index.mark_used(key, allocation.ip_address)
+        else:
+            self.address_index.mark_free(key, allocation.ip_address)
+
+    def _sync_reservation_index(self, reservation: IPReservation) -> None:
+        """Reflect reservation status in the free-space index."""
+        key = (reservation.tenant_id, str(reservation.network_id))
+        if self.address_index.peek(key) is None:
+            return
+
+        if reservation.reservation_status == ReservationStatus.RESERVED:
+            self.address_index.mark_used(key, reservation.ip_address)
+        elif self.get_allocation_by_ip(reservation.tenant_id, reservation.ip_address):
+            # Reservation converted into (or coexists with) an allocation
+            self.address_index.mark_used(key, reservation.ip_address)
+        else:
+            self.address_index.mark_free(key, reservation.ip_address)
+
+    def find_next_available_ip(self, tenant_id: str, network_id: str) -> Optional[str]:
+        """
+        Find the lowest free host address in a network.
+
+        Args:
+            tenant_id: Tenant identifier
+            network_id: Network identifier
+
+        Returns:
+            Free IP address or None if the network is full
+
+        Raises:
+            NetworkNotFoundError: If network doesn't exist
+        """
+        network = self.get_network_by_id(tenant_id, network_id)
+        if not network:
+            raise NetworkNotFoundError(network_id)
+
+        if self._is_postgresql():
+            return self._find_first_free_ip_native(network)
+
+        address = self._get_address_index(network).first_free()
+        return str(address) if address is not None else None
+
+    def _find_first_free_ip_native(self, network: IPNetwork) -> Optional[str]:
+        """
+        Find the first free host address with a single SQL gap query.
+
+        Candidates are the first host plus every used address + 1; the answer
+        is the lowest candidate inside the host range that is not itself in
+        use. Used addresses are selected with GiST-indexed ``<<=`` containment.
+        """
+        net = ipaddress.ip_network(str(network.cidr), strict=False)
+        first_host, last_host = get_host_bounds(net)
+        if first_host > last_host:
+            return None
+
+        network_cidr = cast(str(net), INET)
+        first = cast(str(ipaddress.ip_address(first_host)), INET)
+        last = cast(str(ipaddress.ip_address(last_host)), INET)
+
+        used = union(
+            select(IPAllocation.ip_address.label("ip")).where(
+                IPAllocation.tenant_id == network.tenant_id,
+                IPAllocation.allocation_status == AllocationStatus.ALLOCATED,
+                IPAllocation.ip_address.op("<<=")(network_cidr),
+            ),
+            select(IPReservation.ip_address.label("ip")).where(
+                IPReservation.tenant_id == network.tenant_id,
+                IPReservation.reservation_status == ReservationStatus.RESERVED,
+                IPReservation.ip_address.op("<<=")(network_cidr),
+            ),
+        ).cte("used")
+
+        candidates = union_all(
+            select(first.label("candidate")),
+            select(used.c.ip.op("+")(literal(1)).label("candidate")),
+        ).subquery("candidates")
+
+        statement = (
+            select(func.host(candidates.c.candidate))
+            .where(
+                candidates.c.candidate.between(first, last),
+                ~exists().where(used.c.ip == candidates.c.candidate),
+            )
+            .order_by(candidates.c.candidate)
+            .limit(1)
+        )
+
+        return self.db.execute(statement).scalar()
+
+    def find_available_block(
+        self, tenant_id: str, network_id: str, count: int
+    ) -> Optional[list[str]]:
+        """
+        Find the first run of contiguous free host addresses in a network.
+
+        Args:
+            tenant_id: Tenant identifier
+            network_id: Network identifier
+            count: Number of contiguous addresses required
+
+        Returns:
+            List of free IP addresses or None if no run is large enough
+
+        Raises:
+            NetworkNotFoundError: If network doesn't exist
+        """
+        network = self.get_network_by_id(tenant_id, network_id)
+        if not network:
+            raise NetworkNotFoundError(network_id)
+
+        start = self._get_address_index(network).find_contiguous(count)
+        if start is None:
+            return None
+        return [str(start + offset) for offset in range(count)]
+
     # Analytics and Reporting Methods
 
     def get_network_utilization_stats(
@@ -663,10 +967,72 @@ class IPAMRepository:
             .all()
         )
 
-        # Calculate totals
-        import ipaddress
+        return self._build_utilization_stats(
+            network, network_id, allocation_counts, reservation_counts
+        )
+
+    def get_tenant_utilization_stats(self, tenant_id: str) -> dict[str, Any]:
+        """
+        Get utilization statistics for every active network of a tenant.
+
+        Status counts for all networks are fetched with one grouped query per
+        table instead of two queries per network.
 
-        net = ipaddress.ip_network(network.cidr)
+        Args:
+            tenant_id: Tenant identifier
+
+        Returns:
+            Dictionary mapping network_id to utilization statistics
+        """
+        networks = self.get_networks_by_tenant(tenant_id)
+        if not networks:
+            return {}
+
+        allocation_counts: dict[Any, list[tuple[Any, int]]] = {}
+        for network_pk, status, count in (
+            self.db.query(
+                IPAllocation.network_id,
+                IPAllocation.allocation_status,
+                func.count(IPAllocation.id),
+            )
+            .filter(IPAllocation.tenant_id == tenant_id)
+            .group_by(IPAllocation.network_id, IPAllocation.allocation_status)
+            .all()
+        ):
+            allocation_counts.setdefault(network_pk, []).append((status, count))
+
+        reservation_counts: dict[Any, list[tuple[Any, int]]] = {}
+        for network_pk, status, count in (
+            self.db.query(
+                IPReservation.network_id,
+                IPReservation.reservation_status,
+                func.count(IPReservation.id),
+            )
+            .filter(IPReservation.tenant_id == tenant_id)
+            .group_by(IPReservation.network_id, IPReservation.reservation_status)
+            .all()
+        ):
+            reservation_counts.setdefault(network_pk, []).append((status, count))
+
+        return {
+            str(network.network_id): self._build_utilization_stats(
+                network,
+                network.network_id,
+                allocation_counts.get(network.id, []),
+                reservation_counts.get(network.id, []),
+            )
+            for network in networks
+        }
+
+    def _build_utilization_stats(
+        self,
+        network: IPNetwork,
+        network_id: str,
+        allocation_counts: list[tuple[Any, int]],
+        reservation_counts: list[tuple[Any, int]],
+    ) -> dict[str, Any]:
+        """Build utilization statistics from per-status counts."""
+        net = ipaddress.ip_network(str(network.cidr), strict=False)
         total_addresses = net.num_addresses
         usable_addresses = (
             max(0, net.num_addresses - 2) if net.prefixlen < 30 else net.num_addresses
@@ -715,51 +1081,37 @@ class IPAMRepository:
             Dictionary with tenant summary statistics
         """
         # Network counts
-        total_networks = (
-            self.db.query(func.count(IPNetwork.id))
-            .filter(IPNetwork.tenant_id == tenant_id, IPNetwork.is_active is True)
-            .scalar()
-        )
-
         networks_by_type = (
             self.db.query(
                 IPNetwork.network_type, func.count(IPNetwork.id).label("count")
             )
-            .filter(IPNetwork.tenant_id == tenant_id, IPNetwork.is_active is True)
+            .filter(IPNetwork.tenant_id == tenant_id, IPNetwork.is_active.is_(True))
             .group_by(IPNetwork.network_type)
             .all()
         )
+        total_networks = sum(count for _, count in networks_by_type)
 
-        # Allocation counts
-        total_allocations = (
-            self.db.query(func.count(IPAllocation.id))
+        # Allocation and reservation counts, one aggregate query per table
+        total_allocations, active_allocations = (
+            self.db.query(
+                func.count(IPAllocation.id),
+                func.count(IPAllocation.id).filter(
+                    IPAllocation.allocation_status == AllocationStatus.ALLOCATED
+                ),
+            )
             .filter(IPAllocation.tenant_id == tenant_id)
-            .scalar()
+            .one()
         )
 
-        active_allocations = (
-            self.db.query(func.count(IPAllocation.id))
-            .filter(
-                IPAllocation.tenant_id == tenant_id,
-                IPAllocation.allocation_status == AllocationStatus.ALLOCATED,
+        total_reservations, active_reservations = (
+            self.db.query(
+                func.count(IPReservation.id),
+                func.count(IPReservation.id).filter(
+                    IPReservation.reservation_status == ReservationStatus.RESERVED
+                ),
             )
-            .scalar()
-        )
-
-        # Reservation counts
-        total_reservations = (
-            self.db.query(func.count(IPReservation.id))
             .filter(IPReservation.tenant_id == tenant_id)
-            .scalar()
-        )
-
-        active_reservations = (
-            self.db.query(func.count(IPReservation.id))
-            .filter(
-                IPReservation.tenant_id == tenant_id,
-                IPReservation.reservation_status == ReservationStatus.RESERVED,
-            )
-            .scalar()
+            .one()
         )
 
         return {
@@ -831,6 +1183,11 @@ class IPAMRepository:
 
             self.db.commit()
 
+            for allocation in expired_allocations:
+                self._sync_allocation_index(allocation)
+            for reservation in expired_reservations:
+                self._sync_reservation_index(reservation)
+
         return {
             "dry_run": dry_run,
             "expired_allocations": len(expired_allocations),
@@ -208,6 +208,48 @@ class IPAMSDK:
             **kwargs,
         )
 
+    async def allocate_ips_bulk(
+        self,
+        network_id: str,
+        count: Optional[int] = None,
+        requests: Optional[list[dict[str, Any]]] = None,
+        allocation_type: str = "dynamic",
+        lease_time: int = 86400,
+        contiguous: bool = False,
+        **kwargs,
+    ) -> list[dict[str, Any]]:
+        """
+        Allocate many IP addresses from a network in a single transaction.
+
+        Args:
+            network_id: Network to allocate from
+            count: Number of dynamic addresses to allocate
+            requests: Per-address parameters (ip_address, hostname, mac_address,
+                assigned_to, ...) as accepted by allocate_ip
+            allocation_type: Default allocation type for every address
+            lease_time: Default lease duration in seconds
+            contiguous: Allocate dynamic addresses as one contiguous block
+            **kwargs: Additional defaults applied to every allocation
+
+        Returns:
+            List of allocation dictionaries in request order
+
+        Raises:
+            NetworkNotFoundError: If network doesn't exist
+            IPAddressConflictError: If a requested IP is already allocated
+            InsufficientAddressSpaceError: If the network cannot satisfy the batch
+        """
+        return await self._service.allocate_ips_bulk(
+            tenant_id=self.tenant_id,
+            network_id=network_id,
+            count=count,
+            requests=requests,
+            contiguous=contiguous,
+            allocation_type=allocation_type,
+            lease_time=lease_time,
+            **kwargs,
+        )
+
     async def release_ip(self, allocation_id: str) -> dict[str, Any]:
         """
         Release allocated IP address.
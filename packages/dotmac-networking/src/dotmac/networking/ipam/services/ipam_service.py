@@ -23,14 +23,21 @@ from ..core.models import (
     NetworkType,
     ReservationStatus,
 )
+from ..utils.address_index import AddressIndexRegistry, FreeRangeIndex
+from ..utils.prefix_index import PrefixIndex, TenantPrefixIndexRegistry
 
 try:
+    from sqlalchemy import cast, insert
+    from sqlalchemy.dialects.postgresql import INET
+    from sqlalchemy.exc import IntegrityError
     from sqlalchemy.orm import Session
 
     SQLALCHEMY_AVAILABLE = True
 except ImportError:
     SQLALCHEMY_AVAILABLE = False
     Session = None
+    IntegrityError = Exception
+    cast = insert = INET = None
 
 MODELS_AVAILABLE = True
 
@@ -48,6 +55,10 @@ class IPAMService:
         self._in_memory_allocations = {}
         self._in_memory_reservations = {}
         self._in_memory_ip_index = {}
+        self._address_index = AddressIndexRegistry()
+        self._prefix_index = TenantPrefixIndexRegistry()
+        self._prefix_rows: dict[str, dict[Any, str]] = {}
+        self._prefix_synced_at: dict[str, datetime] = {}
 
         # Configuration defaults
         self.default_lease_time = self.config.get("allocation", {}).get(
@@ -65,6 +76,15 @@ class IPAMService:
         self.conflict_detection = self.config.get("allocation", {}).get(
             "conflict_detection", True
         )
+        self.max_bulk_allocation = self.config.get("allocation", {}).get(
+            "max_bulk_allocation", 10000
+        )
+        self.bulk_query_chunk_size = self.config.get("allocation", {}).get(
+            "bulk_query_chunk_size", 1000
+        )
+        self.prefix_sync_grace = timedelta(
+            seconds=self.config.get("network", {}).get("prefix_sync_grace", 300)
+        )
 
     def _use_database(self) -> bool:
         """Check if database operations should be used."""
@@ -132,9 +152,11 @@ class IPAMService:
             self.db.add(network_obj)
             self.db.commit()
             self.db.refresh(network_obj)
+            self._remember_prefix(tenant_id, network_obj.id, str(network_obj.cidr))
             return self._network_to_dict(network_obj)
         else:
             self._in_memory_networks[network_id] = network_data
+            self._prefix_index.add(tenant_id, network, network_data["cidr"])
             return network_data
 
     async def allocate_ip(self, tenant_id: str, **kwargs) -> dict[str, Any]:
@@ -148,66 +170,135 @@ class IPAMService:
 
         network = ipaddress.ip_network(network_data["cidr"])
 
-        # Check for specific IP request
-        requested_ip = kwargs.get("ip_address")
-        if requested_ip:
-            ip_addr = ipaddress.ip_address(requested_ip)
-            if ip_addr not in network:
-                raise IPAMError(
-                    f"IP {requested_ip} not in network {network_data['cidr']}"
-                )
-
-            if self.conflict_detection and await self._check_ip_conflict(
-                tenant_id, str(ip_addr)
-            ):
-                raise IPAddressConflictError(str(ip_addr))
-        else:
-            # Find next available IP
-            ip_addr = await self._find_next_available_ip(tenant_id, network)
-            if not ip_addr:
-                raise InsufficientAddressSpaceError(network_id)
+        self._lock_network(network_data)
+        try:
+            ip_addr = await self._select_address(
+                tenant_id, network, network_data, kwargs.get("ip_address")
+            )
+        except IPAMError:
+            if self._use_database():
+                self.db.rollback()
+            raise
 
-        allocation_id = str(uuid4())
-        lease_time = min(
-            kwargs.get("lease_time", self.default_lease_time), self.max_lease_time
+        allocation_data = self._build_allocation_data(
+            tenant_id, network_id, network_data, ip_addr, kwargs
         )
-
-        allocation_data = {
-            "allocation_id": allocation_id,
-            "tenant_id": tenant_id,
-            "network_id": (
-                network_data.get("id") if self._use_database() else network_id
-            ),
-            "ip_address": str(ip_addr),
-            "allocation_type": kwargs.get("allocation_type", "dynamic"),
-            "allocation_status": (
-                AllocationStatus.ALLOCATED if MODELS_AVAILABLE else "allocated"
-            ),
-            "assigned_to": kwargs.get("assigned_to"),
-            "assigned_resource_id": kwargs.get("assigned_resource_id"),
-            "assigned_resource_type": kwargs.get("assigned_resource_type"),
-            "lease_time": lease_time,
-            "hostname": kwargs.get("hostname"),
-            "mac_address": kwargs.get("mac_address"),
-            "description": kwargs.get("description"),
-            "tags": kwargs.get("tags", {}),
-            "allocated_at": self._utc_now(),
-            "expires_at": self._utc_now() + timedelta(seconds=lease_time),
-            "created_at": self._utc_now(),
-            "updated_at": self._utc_now(),
-        }
+        allocation_id = allocation_data["allocation_id"]
 
         if self._use_database():
             allocation_obj = IPAllocation(**allocation_data)
             self.db.add(allocation_obj)
             self.db.commit()
             self.db.refresh(allocation_obj)
+            self._address_index.mark_used(
+                self._index_key(tenant_id, network_data, network_id), ip_addr
+            )
             return self._allocation_to_dict(allocation_obj)
         else:
             self._in_memory_allocations[allocation_id] = allocation_data
             self._in_memory_ip_index[str(ip_addr)] = allocation_id
+            self._address_index.mark_used(
+                self._index_key(tenant_id, network_data, network_id), ip_addr
+            )
             return allocation_data
 
+    async def allocate_ips_bulk(
+        self,
+        tenant_id: str,
+        network_id: str,
+        count: Optional[int] = None,
+        requests: Optional[list[dict[str, Any]]] = None,
+        contiguous: bool = False,
+        **defaults,
+    ) -> list[dict[str, Any]]:
+        """
+        Allocate many IP addresses from a network in one transaction.
+
+        Either ``count`` dynamic addresses or a list of per-address
+        ``requests`` (each optionally naming an ``ip_address`` plus the same
+        fields accepted by ``allocate_ip``) may be given. The network row is
+        locked for the duration, conflicts are checked with a single query
+        per table and all rows are written with one multi-row INSERT whose
+        RETURNING rows are converted like ``allocate_ip`` results.
+
+        Args:
+            tenant_id: Tenant identifier
+            network_id: Network to allocate from
+            count: Number of dynamic addresses to allocate
+            requests: Per-address allocation parameters
+            contiguous: Allocate dynamic addresses as one contiguous block
+            **defaults: Allocation fields applied to every request
+
+        Returns:
+            List of allocation dictionaries in request order
+
+        Raises:
+            NetworkNotFoundError: If network doesn't exist
+            IPAddressConflictError: If a requested IP is already in use
+            InsufficientAddressSpaceError: If the network cannot satisfy the batch
+        """
+        if (count is None) == (requests is None):
+            raise IPAMError("Specify exactly one of count or requests")
+
+        if requests is None:
+            requests = [{} for _ in range(count)]
+        if not requests:
+            return []
+        if len(requests) > self.max_bulk_allocation:
+            raise IPAMError(
+                f"Bulk allocation of {len(requests)} addresses exceeds limit "
+                f"of {self.max_bulk_allocation}"
+            )
+
+        network_data = await self._get_network(tenant_id, network_id)
+        if not network_data:
+            raise NetworkNotFoundError(network_id)
+
+        network = ipaddress.ip_network(network_data["cidr"])
+
+        self._lock_network(network_data)
+        try:
+            addresses = await self._select_bulk_addresses(
+                tenant_id, network, network_data, requests, contiguous
+            )
+        except IPAMError:
+            if self._use_database():
+                self.db.rollback()
+            raise
+
+        rows = [
+            self._build_allocation_data(
+                tenant_id, network_id, network_data, ip_addr, {**defaults, **request}
+            )
+            for ip_addr, request in zip(addresses, requests)
+        ]
+
+        index_key = self._index_key(tenant_id, network_data, network_id)
+
+        if self._use_database():
+            try:
+                table = IPAllocation.__table__
+                allocations = self.db.execute(
+                    insert(table).returning(*table.c, sort_by_parameter_order=True),
+                    rows,
+                ).all()
+                self.db.commit()
+            except IntegrityError as e:
+                self.db.rollback()
+                self._address_index.invalidate(index_key)
+                raise IPAMError(f"Failed to allocate IP batch: {e}") from e
+            results = [self._allocation_to_dict(allocation) for allocation in allocations]
+        else:
+            for row in rows:
+                self._in_memory_allocations[row["allocation_id"]] = row
+                self._in_memory_ip_index[row["ip_address"]] = row["allocation_id"]
+            results = rows
+
+        for ip_addr in addresses:
+            self._address_index.mark_used(index_key, ip_addr)
+
+        return results
+
     async def reserve_ip(self, tenant_id: str, **kwargs) -> dict[str, Any]:
         """Reserve IP address for future allocation."""
         network_id = kwargs["network_id"]
@@ -263,10 +354,16 @@ class IPAMService:
             self.db.add(reservation_obj)
             self.db.commit()
             self.db.refresh(reservation_obj)
+            self._address_index.mark_used(
+                self._index_key(tenant_id, network_data, network_id), ip_addr
+            )
             return self._reservation_to_dict(reservation_obj)
         else:
             self._in_memory_reservations[reservation_id] = reservation_data
             self._in_memory_ip_index[str(ip_addr)] = f"reserved:{reservation_id}"
+            self._address_index.mark_used(
+                self._index_key(tenant_id, network_data, network_id), ip_addr
+            )
             return reservation_data
 
     async def release_allocation(
@@ -290,6 +387,9 @@ class IPAMService:
             allocation.updated_at = self._utc_now()
 
             self.db.commit()
+            self._address_index.mark_free(
+                (tenant_id, str(allocation.network_id)), allocation.ip_address
+            )
             return self._allocation_to_dict(allocation)
         else:
             if allocation_id not in self._in_memory_allocations:
@@ -305,6 +405,9 @@ class IPAMService:
             allocation["allocation_status"] = "released"
             allocation["released_at"] = self._utc_now()
             allocation["updated_at"] = self._utc_now()
+            self._address_index.mark_free(
+                (tenant_id, str(allocation["network_id"])), ip_address
+            )
 
             return allocation
 
@@ -390,7 +493,7 @@ class IPAMService:
                 .filter(
                     IPNetwork.tenant_id == tenant_id,
                     IPNetwork.network_id == network_id,
-                    IPNetwork.is_active is True,
+                    IPNetwork.is_active.is_(True),
                 )
                 .first()
             )
@@ -398,30 +501,175 @@ class IPAMService:
         else:
             return self._in_memory_networks.get(network_id)
 
+    def _lock_network(self, network_data: dict[str, Any]) -> None:
+        """Lock the network row so allocators for it are serialized."""
+        if self._use_database():
+            self.db.query(IPNetwork).filter(
+                IPNetwork.id == network_data["id"]
+            ).with_for_update().first()
+
+    async def _select_address(
+        self,
+        tenant_id: str,
+        network: Union[ipaddress.IPv4Network, ipaddress.IPv6Network],
+        network_data: dict[str, Any],
+        requested_ip: Optional[str],
+    ) -> Union[ipaddress.IPv4Address, ipaddress.IPv6Address]:
+        """Validate a requested address or pick the next free one."""
+        if requested_ip:
+            ip_addr = ipaddress.ip_address(requested_ip)
+            if ip_addr not in network:
+                raise IPAMError(
+                    f"IP {requested_ip} not in network {network_data['cidr']}"
+                )
+
+            if self.conflict_detection and await self._check_ip_conflict(
+                tenant_id, str(ip_addr)
+            ):
+                raise IPAddressConflictError(str(ip_addr))
+            return ip_addr
+
+        ip_addr = await self._find_next_available_ip(tenant_id, network, network_data)
+        if not ip_addr:
+            raise InsufficientAddressSpaceError(network_data["network_id"])
+        return ip_addr
+
     async def _check_network_overlap(self, tenant_id: str, cidr: str) -> Optional[str]:
-        """Check for overlapping networks."""
-        new_network = ipaddress.ip_network(cidr)
+        """
+        Check for overlapping networks.
+
+        The tenant prefix index is per-process. With a database session its
+        hits are re-checked so networks deleted by other workers are dropped,
+        and a miss is confirmed against the database so networks they created
+        are seen: a GiST-indexed ``&&`` query on PostgreSQL, or elsewhere an
+        incremental sync of the networks changed since the last load.
+        """
+        network = ipaddress.ip_network(cidr)
+        index = self._prefix_index.get(
+            tenant_id, lambda: self._load_tenant_prefixes(tenant_id)
+        )
+        if not self._use_database():
+            overlap = index.first_overlap(network)
+            return overlap[1] if overlap else None
 
-        if self._use_database():
-            networks = (
-                self.db.query(IPNetwork)
-                .filter(IPNetwork.tenant_id == tenant_id, IPNetwork.is_active is True)
-                .all()
+        overlap = self._confirm_overlap(tenant_id, index, network)
+        if overlap:
+            return overlap
+
+        if self._is_postgresql():
+            row = (
+                self.db.query(IPNetwork.id, IPNetwork.cidr)
+                .filter(
+                    IPNetwork.tenant_id == tenant_id,
+                    IPNetwork.is_active.is_(True),
+                    IPNetwork.cidr.op("&&")(cast(str(network), INET)),
+                )
+                .first()
             )
+            if row is None:
+                return None
+            self._remember_prefix(tenant_id, row.id, str(row.cidr))
+            return str(row.cidr)
 
-            for network in networks:
-                existing_network = ipaddress.ip_network(network.cidr)
-                if new_network.overlaps(existing_network):
-                    return network.cidr
-        else:
-            for network_data in self._in_memory_networks.values():
-                if network_data.get("tenant_id") == tenant_id:
-                    existing_network = ipaddress.ip_network(network_data["cidr"])
-                    if new_network.overlaps(existing_network):
-                        return network_data["cidr"]
+        if self._sync_tenant_prefixes(tenant_id):
+            return self._confirm_overlap(tenant_id, index, network)
+        return None
 
+    def _confirm_overlap(
+        self,
+        tenant_id: str,
+        index: PrefixIndex,
+        network: Union[ipaddress.IPv4Network, ipaddress.IPv6Network],
+    ) -> Optional[str]:
+        """Return the first indexed overlap that is still an active network."""
+        for _, cidr in list(index.iter_overlaps(network)):
+            active = (
+                self.db.query(IPNetwork.id)
+                .filter(
+                    IPNetwork.tenant_id == tenant_id,
+                    IPNetwork.is_active.is_(True),
+                    IPNetwork.cidr == cidr,
+                )
+                .first()
+            )
+            if active:
+                return cidr
+
+            rows = self._prefix_rows.setdefault(tenant_id, {})
+            for network_pk in [pk for pk, value in rows.items() if value == cidr]:
+                del rows[network_pk]
+            while index.remove(cidr, cidr):
+                pass
         return None
 
+    def _remember_prefix(self, tenant_id: str, network_pk: Any, cidr: str) -> None:
+        """Record a network in the tenant prefix index, replacing its old CIDR."""
+        rows = self._prefix_rows.setdefault(tenant_id, {})
+        previous = rows.pop(network_pk, None)
+        if previous is not None:
+            self._prefix_index.remove(tenant_id, previous, previous)
+        rows[network_pk] = cidr
+        self._prefix_index.add(tenant_id, cidr, cidr)
+
+    def _sync_tenant_prefixes(self, tenant_id: str) -> bool:
+        """
+        Apply networks created, changed or deactivated since the last sync.
+
+        Rows are matched by primary key, so re-reading changes inside the
+        grace window (clock skew and late commits between workers) is
+        harmless. Returns True if the index changed.
+        """
+        synced_at = self._utc_now().replace(tzinfo=None)
+        query = self.db.query(IPNetwork.id, IPNetwork.cidr, IPNetwork.is_active).filter(
+            IPNetwork.tenant_id == tenant_id
+        )
+        since = self._prefix_synced_at.get(tenant_id)
+        if since is not None:
+            query = query.filter(IPNetwork.updated_at >= since - self.prefix_sync_grace)
+
+        rows = self._prefix_rows.setdefault(tenant_id, {})
+        changed = False
+        for row in query.all():
+            if row.is_active:
+                if rows.get(row.id) != str(row.cidr):
+                    self._remember_prefix(tenant_id, row.id, str(row.cidr))
+                    changed = True
+            elif row.id in rows:
+                cidr = rows.pop(row.id)
+                self._prefix_index.remove(tenant_id, cidr, cidr)
+                changed = True
+
+        self._prefix_synced_at[tenant_id] = synced_at
+        return changed
+
+    def _is_postgresql(self) -> bool:
+        """Check whether the session is bound to PostgreSQL (native inet ops)."""
+        try:
+            return self.db.get_bind().dialect.name == "postgresql"
+        except Exception:
+            return False
+
+    def _load_tenant_prefixes(self, tenant_id: str) -> list[tuple[str, str]]:
+        """Load (cidr, cidr) pairs for a tenant's active networks."""
+        if self._use_database():
+            synced_at = self._utc_now().replace(tzinfo=None)
+            networks = (
+                self.db.query(IPNetwork.id, IPNetwork.cidr)
+                .filter(IPNetwork.tenant_id == tenant_id, IPNetwork.is_active.is_(True))
+                .all()
+            )
+            rows = {row.id: str(row.cidr) for row in networks}
+            self._prefix_rows[tenant_id] = rows
+            self._prefix_synced_at[tenant_id] = synced_at
+            return [(cidr, cidr) for cidr in rows.values()]
+
+        return [
+            (network_data["cidr"], network_data["cidr"])
+            for network_data in self._in_memory_networks.values()
+            if network_data.get("tenant_id") == tenant_id
+            and network_data.get("is_active", True)
+        ]
+
     async def _check_ip_conflict(self, tenant_id: str, ip_address: str) -> bool:
         """Check if IP address is already allocated or reserved."""
         if self._use_database():
@@ -452,131 +700,301 @@ class IPAMService:
         else:
             return ip_address in self._in_memory_ip_index
 
-    async def _find_next_available_ip(
+    def _build_allocation_data(
         self,
         tenant_id: str,
-        network: Union[ipaddress.IPv4Network, ipaddress.IPv6Network],
-    ) -> Optional[Union[ipaddress.IPv4Address, ipaddress.IPv6Address]]:
-        """Find next available IP in network using optimized batch scanning."""
+        network_id: str,
+        network_data: dict[str, Any],
+        ip_addr: Union[ipaddress.IPv4Address, ipaddress.IPv6Address],
+        params: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Build allocation record from request parameters."""
+        now = self._utc_now()
+        lease_time = min(
+            params.get("lease_time", self.default_lease_time), self.max_lease_time
+        )
+
+        data = {
+            "allocation_id": uuid4() if self._use_database() else str(uuid4()),
+            "tenant_id": tenant_id,
+            "network_id": (
+                network_data.get("id") if self._use_database() else network_id
+            ),
+            "ip_address": str(ip_addr),
+            "allocation_type": params.get("allocation_type", "dynamic"),
+            "allocation_status": (
+                AllocationStatus.ALLOCATED if MODELS_AVAILABLE else "allocated"
+            ),
+            "assigned_to": params.get("assigned_to"),
+            "assigned_resource_id": params.get("assigned_resource_id"),
+            "assigned_resource_type": params.get("assigned_resource_type"),
+            "lease_time": lease_time,
+            "hostname": params.get("hostname"),
+            "mac_address": params.get("mac_address"),
+            "description": params.get("description"),
+            "tags": params.get("tags", {}),
+            "allocated_at": now,
+            "expires_at": now + timedelta(seconds=lease_time),
+            "created_at": now,
+            "updated_at": now,
+        }
         if self._use_database():
-            return await self._find_next_available_ip_batch(tenant_id, network)
-        else:
-            return await self._find_next_available_ip_sequential(tenant_id, network)
+            data["id"] = uuid4()
+        return data
+
+    async def _get_conflicting_ips(
+        self, tenant_id: str, ip_addresses: list[str]
+    ) -> set[str]:
+        """Get the subset of addresses already allocated or reserved."""
+        if not ip_addresses:
+            return set()
+
+        if not self._use_database():
+            return {ip for ip in ip_addresses if ip in self._in_memory_ip_index}
+
+        conflicts = set()
+        for start in range(0, len(ip_addresses), self.bulk_query_chunk_size):
+            chunk = ip_addresses[start : start + self.bulk_query_chunk_size]
+            allocations = (
+                self.db.query(IPAllocation.ip_address)
+                .filter(
+                    IPAllocation.tenant_id == tenant_id,
+                    IPAllocation.ip_address.in_(chunk),
+                    IPAllocation.allocation_status == AllocationStatus.ALLOCATED,
+                )
+                .all()
+            )
+            reservations = (
+                self.db.query(IPReservation.ip_address)
+                .filter(
+                    IPReservation.tenant_id == tenant_id,
+                    IPReservation.ip_address.in_(chunk),
+                    IPReservation.reservation_status == ReservationStatus.RESERVED,
+                )
+                .all()
+            )
+            conflicts.update(str(row.ip_address) for row in allocations)
+            conflicts.update(str(row.ip_address) for row in reservations)
+
+        return conflicts
 
-    async def _find_next_available_ip_batch(
+    async def _select_bulk_addresses(
         self,
         tenant_id: str,
         network: Union[ipaddress.IPv4Network, ipaddress.IPv6Network],
-    ) -> Optional[Union[ipaddress.IPv4Address, ipaddress.IPv6Address]]:
-        """Optimized IP scanning using batch database queries."""
-        # For large networks (>1024 addresses), use batch queries
-        if network.num_addresses > 1024:
-            return await self._find_next_available_ip_large_network(tenant_id, network)
-
-        # For smaller networks, get all allocated/reserved IPs in one query
-        network_data = await self._get_network(tenant_id, str(network))
-        if not network_data:
-            return None
+        network_data: dict[str, Any],
+        requests: list[dict[str, Any]],
+        contiguous: bool,
+    ) -> list[Union[ipaddress.IPv4Address, ipaddress.IPv6Address]]:
+        """Choose an address for every bulk request, in request order."""
+        explicit = {}
+        taken = set()
+        for position, request in enumerate(requests):
+            requested_ip = request.get("ip_address")
+            if not requested_ip:
+                continue
+            ip_addr = ipaddress.ip_address(requested_ip)
+            if ip_addr not in network:
+                raise IPAMError(
+                    f"IP {requested_ip} not in network {network_data['cidr']}"
+                )
+            if ip_addr in taken:
+                raise IPAddressConflictError(str(ip_addr))
+            explicit[position] = ip_addr
+            taken.add(ip_addr)
 
-        # Get all allocated IPs for this network
-        allocated_ips = set()
+        if contiguous and explicit:
+            raise IPAMError("Contiguous allocation cannot include explicit addresses")
 
-        # Query allocations
-        allocations = (
-            self.db.query(IPAllocation.ip_address)
-            .filter(
-                IPAllocation.tenant_id == tenant_id,
-                IPAllocation.network_id == network_data["id"],
-                IPAllocation.allocation_status == AllocationStatus.ALLOCATED,
-            )
-            .all()
-        )
-        allocated_ips.update(str(alloc.ip_address) for alloc in allocations)
-
-        # Query reservations
-        reservations = (
-            self.db.query(IPReservation.ip_address)
-            .filter(
-                IPReservation.tenant_id == tenant_id,
-                IPReservation.network_id == network_data["id"],
-                IPReservation.reservation_status == ReservationStatus.RESERVED,
+        if self.conflict_detection:
+            conflicts = await self._get_conflicting_ips(
+                tenant_id, [str(ip) for ip in explicit.values()]
             )
-            .all()
-        )
-        allocated_ips.update(str(res.ip_address) for res in reservations)
+            if conflicts:
+                raise IPAddressConflictError(min(conflicts))
+
+        needed = len(requests) - len(explicit)
+        index = self._get_address_index(tenant_id, network, network_data)
+        rebuilt = False
+        dynamic = []
+
+        while len(dynamic) < needed:
+            if contiguous:
+                start = index.find_contiguous(needed)
+                candidates = (
+                    None
+                    if start is None
+                    else [start + offset for offset in range(needed)]
+                )
+            else:
+                candidates = []
+                for ip_addr in index.iter_free():
+                    if ip_addr in taken:
+                        continue
+                    candidates.append(ip_addr)
+                    if len(dynamic) + len(candidates) == needed:
+                        break
+                if len(dynamic) + len(candidates) < needed:
+                    candidates = None
+
+            if candidates is None:
+                if not rebuilt:
+                    index = self._rebuild_address_index(
+                        tenant_id, network, network_data
+                    )
+                    rebuilt = True
+                    if index is not None:
+                        continue
+                raise InsufficientAddressSpaceError(network_data["network_id"])
+
+            stale = set()
+            if self._use_database() and self.conflict_detection:
+                stale = await self._get_conflicting_ips(
+                    tenant_id, [str(ip) for ip in candidates]
+                )
 
-        # Find first available IP
-        for ip in network.hosts():
-            if str(ip) not in allocated_ips:
-                return ip
+            # The index may be behind other writers: drop stale entries and
+            # keep the rest (a contiguous block must be re-picked whole).
+            for ip_addr in candidates:
+                if str(ip_addr) in stale:
+                    index.mark_used(ip_addr)
 
-        return None
+            if contiguous and stale:
+                continue
+
+            fresh = [ip for ip in candidates if str(ip) not in stale]
+            dynamic.extend(fresh)
+            taken.update(fresh)
 
-    async def _find_next_available_ip_large_network(
+        dynamic_iter = iter(dynamic)
+        return [
+            explicit[position] if position in explicit else next(dynamic_iter)
+            for position in range(len(requests))
+        ]
+
+    def _index_key(
         self,
         tenant_id: str,
-        network: Union[ipaddress.IPv4Network, ipaddress.IPv6Network],
-    ) -> Optional[Union[ipaddress.IPv4Address, ipaddress.IPv6Address]]:
-        """Handle large networks with range-based scanning."""
-        # For very large networks, scan in chunks
-        chunk_size = 1024
-        network_hosts = list(network.hosts())
-
-        for i in range(0, len(network_hosts), chunk_size):
-            chunk = network_hosts[i : i + chunk_size]
-            ip_strings = [str(ip) for ip in chunk]
+        network_data: dict[str, Any],
+        network_id: Optional[str] = None,
+    ) -> tuple[str, str]:
+        """Get free-space index key for a network (keyed like allocation rows)."""
+        if self._use_database():
+            return tenant_id, str(network_data["id"])
+        return tenant_id, str(network_id or network_data["network_id"])
 
-            # Check if any IPs in this chunk are allocated
-            network_data = await self._get_network(tenant_id, str(network))
+    def _load_used_addresses(
+        self,
+        tenant_id: str,
+        network: Union[ipaddress.IPv4Network, ipaddress.IPv6Network],
+        network_data: Optional[dict[str, Any]],
+    ) -> list[str]:
+        """Load allocated and reserved addresses for building a free-space index."""
+        if self._use_database():
             if not network_data:
-                return None
+                return []
 
-            # Query allocations for this IP range
-            allocated_ips_query = (
+            allocations = (
                 self.db.query(IPAllocation.ip_address)
                 .filter(
                     IPAllocation.tenant_id == tenant_id,
                     IPAllocation.network_id == network_data["id"],
                     IPAllocation.allocation_status == AllocationStatus.ALLOCATED,
-                    IPAllocation.ip_address.in_(ip_strings),
                 )
                 .all()
             )
-
-            # Query reservations for this IP range
-            reserved_ips_query = (
+            reservations = (
                 self.db.query(IPReservation.ip_address)
                 .filter(
                     IPReservation.tenant_id == tenant_id,
                     IPReservation.network_id == network_data["id"],
                     IPReservation.reservation_status == ReservationStatus.RESERVED,
-                    IPReservation.ip_address.in_(ip_strings),
                 )
                 .all()
             )
+            return [str(row.ip_address) for row in allocations] + [
+                str(row.ip_address) for row in reservations
+            ]
+
+        used = []
+        for ip_address in self._in_memory_ip_index:
+            try:
+                if ipaddress.ip_address(ip_address) in network:
+                    used.append(ip_address)
+            except ValueError:
+                continue
+        return used
+
+    def _get_address_index(
+        self,
+        tenant_id: str,
+        network: Union[ipaddress.IPv4Network, ipaddress.IPv6Network],
+        network_data: Optional[dict[str, Any]] = None,
+    ) -> FreeRangeIndex:
+        """Get free-space index for network, building it lazily."""
+        if not network_data:
+            # Unregistered network: build a throwaway index
+            return FreeRangeIndex(
+                network, self._load_used_addresses(tenant_id, network, None)
+            )
 
-            # Collect used IPs in this chunk
-            used_ips = set()
-            used_ips.update(str(alloc.ip_address) for alloc in allocated_ips_query)
-            used_ips.update(str(res.ip_address) for res in reserved_ips_query)
-
-            # Find first available IP in chunk
-            for ip in chunk:
-                if str(ip) not in used_ips:
-                    return ip
+        return self._address_index.get(
+            self._index_key(tenant_id, network_data),
+            network,
+            lambda: self._load_used_addresses(tenant_id, network, network_data),
+        )
 
-        return None
+    def _rebuild_address_index(
+        self,
+        tenant_id: str,
+        network: Union[ipaddress.IPv4Network, ipaddress.IPv6Network],
+        network_data: Optional[dict[str, Any]],
+    ) -> Optional[FreeRangeIndex]:
+        """
+        Reload a network's free-space index from the database.
+
+        Addresses released by other writers stay marked used in this
+        process's index, so an exhausted index is rebuilt once before the
+        network is reported full. Returns None when there is nothing to
+        reload from.
+        """
+        if not self._use_database() or not network_data:
+            return None
+        self._address_index.invalidate(self._index_key(tenant_id, network_data))
+        return self._get_address_index(tenant_id, network, network_data)
 
-    async def _find_next_available_ip_sequential(
+    async def _find_next_available_ip(
         self,
         tenant_id: str,
         network: Union[ipaddress.IPv4Network, ipaddress.IPv6Network],
+        network_data: Optional[dict[str, Any]] = None,
     ) -> Optional[Union[ipaddress.IPv4Address, ipaddress.IPv6Address]]:
-        """Fallback sequential scanning for in-memory mode."""
-        for ip in network.hosts():
-            if not await self._check_ip_conflict(tenant_id, str(ip)):
-                return ip
-        return None
+        """Find next available IP in network using the free-space index."""
+        index = self._get_address_index(tenant_id, network, network_data)
+        rebuilt = False
+
+        while True:
+            candidate = index.first_free()
+            if candidate is None:
+                if rebuilt:
+                    return None
+                index = self._rebuild_address_index(tenant_id, network, network_data)
+                if index is None:
+                    return None
+                rebuilt = True
+                continue
+
+            # The index is per-process; other writers may have taken the
+            # address since it was built, so confirm against the database.
+            if (
+                self._use_database()
+                and self.conflict_detection
+                and await self._check_ip_conflict(tenant_id, str(candidate))
+            ):
+                index.mark_used(candidate)
+                continue
+
+            return candidate
 
     def _network_to_dict(self, network) -> dict[str, Any]:
         """Convert network object to dictionary."""
@@ -40,6 +40,7 @@ try:
         ReservationStatus,
     )
     from ..repositories.ipam_repository import IPAMRepository
+    from ..utils.prefix_index import find_overlapping_pairs
 
     MODELS_AVAILABLE = True
 except ImportError:
@@ -289,16 +290,13 @@ def generate_utilization_report(self, tenant_id: Optional[str] = None):
             # Analyze each tenant
             for tid in tenants:
                 tenant_summary = repository.get_tenant_summary(tid)
-                tenant_networks = repository.get_networks_by_tenant(tid)
 
-                tenant_data = {"summary": tenant_summary, "networks": {}}
+                # Detailed stats for every network of the tenant in one pass
+                tenant_networks = repository.get_tenant_utilization_stats(tid)
 
-                # Get detailed stats for each network
-                for network in tenant_networks:
-                    network_stats = repository.get_network_utilization_stats(
-                        tid, network.network_id
-                    )
-                    tenant_data["networks"][str(network.network_id)] = network_stats
+                tenant_data = {"summary": tenant_summary, "networks": tenant_networks}
+
+                for network_stats in tenant_networks.values():
 
                     # Add to global summary
                     report_data["summary"]["total_addresses"] += network_stats[
@@ -386,13 +384,42 @@ def audit_ip_conflicts(self, tenant_id: Optional[str] = None):
                     }
                 )
 
+            # Find overlapping active networks with one sorted sweep per tenant
+            network_query = db.query(
+                IPNetwork.tenant_id, IPNetwork.network_id, IPNetwork.cidr
+            ).filter(IPNetwork.is_active.is_(True))
+            if tenant_id:
+                network_query = network_query.filter(IPNetwork.tenant_id == tenant_id)
+
+            networks_by_tenant = {}
+            for tid, network_id, cidr in network_query.all():
+                networks_by_tenant.setdefault(tid, []).append(
+                    (str(cidr), str(network_id))
+                )
+
+            for tid, networks in networks_by_tenant.items():
+                for (outer, outer_id), (inner, inner_id) in find_overlapping_pairs(
+                    networks
+                ):
+                    conflicts.append(
+                        {
+                            "type": "overlapping_networks",
+                            "tenant_id": tid,
+                            "network_id": outer_id,
+                            "cidr": str(outer),
+                            "overlapping_network_id": inner_id,
+                            "overlapping_cidr": str(inner),
+                            "severity": "high" if outer == inner else "medium",
+                        }
+                    )
+
             # Find allocations in inactive networks
             inactive_network_allocations = (
                 db.query(IPAllocation)
                 .join(IPNetwork)
                 .filter(
                     IPAllocation.allocation_status == AllocationStatus.ALLOCATED,
-                    IPNetwork.is_active is False,
+                    IPNetwork.is_active.is_(False),
                 )
             )
             if tenant_id:
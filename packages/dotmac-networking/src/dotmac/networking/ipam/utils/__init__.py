@@ -1,5 +1,13 @@
 """IPAM utilities package."""
 
+from .address_index import AddressIndexRegistry, FreeRangeIndex, get_host_bounds
+from .prefix_index import (
+    PrefixIndex,
+    PrefixTrie,
+    TenantPrefixIndexRegistry,
+    find_overlapping_pairs,
+)
+
 try:
     from .network_utils import (
         calculate_network_info,
@@ -42,4 +50,11 @@ __all__ = [
     "get_network_address_range",
     "get_usable_address_range",
     "calculate_network_utilization",
+    "AddressIndexRegistry",
+    "FreeRangeIndex",
+    "get_host_bounds",
+    "PrefixIndex",
+    "PrefixTrie",
+    "TenantPrefixIndexRegistry",
+    "find_overlapping_pairs",
 ]
@@ -0,0 +1,368 @@
+"""
+Free-space index for IPAM next-available address lookups.
+
+Each network's host range is tracked as a sorted list of disjoint free
+ranges held as integers, so the next free address is the head of the list
+and marking an address used or free is a binary search plus a local split
+or merge. Indexes are rebuilt lazily from the persisted allocations and
+reservations and then updated incrementally as addresses change state.
+"""
+
+import ipaddress
+import threading
+from bisect import bisect_right
+from collections.abc import Callable, Hashable, Iterable
+from typing import Optional, Union
+
+IPAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+IPNetworkType = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def get_host_bounds(network: IPNetworkType) -> tuple[int, int]:
+    """
+    Get the first and last assignable host addresses as integers.
+
+    Mirrors ``network.hosts()``: IPv4 networks larger than /31 exclude the
+    network and broadcast addresses, IPv6 networks larger than /127 exclude
+    the Subnet-Router anycast address.
+
+    Args:
+        network: Network to compute bounds for
+
+    Returns:
+        Tuple of (first_host, last_host); empty when first_host > last_host
+    """
+    first = int(network.network_address)
+    last = int(network.broadcast_address)
+
+    if network.version == 4:
+        if network.prefixlen < 31:
+            return first + 1, last - 1
+        return first, last
+
+    if network.prefixlen < 127:
+        return first + 1, last
+    return first, last
+
+
+class FreeRangeIndex:
+    """
+    Free-range index for the host addresses of a single network.
+
+    Free space is stored as two parallel sorted lists of range starts and
+    ends, which keeps memory proportional to fragmentation rather than
+    network size (a /64 with a handful of allocations is a handful of ranges).
+    """
+
+    def __init__(
+        self,
+        network: Union[str, IPNetworkType],
+        used_addresses: Optional[Iterable[Union[str, int, IPAddress]]] = None,
+    ):
+        """
+        Build index for network with the given addresses marked as used.
+
+        Args:
+            network: Network CIDR or network object
+            used_addresses: Addresses already allocated or reserved
+        """
+        if isinstance(network, str):
+            network = ipaddress.ip_network(network, strict=False)
+
+        self.network = network
+        self._address_class = (
+            ipaddress.IPv4Address if network.version == 4 else ipaddress.IPv6Address
+        )
+        self._first, self._last = get_host_bounds(network)
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        self._free_count = 0
+
+        self._build(used_addresses or ())
+
+    def _build(self, used_addresses: Iterable[Union[str, int, IPAddress]]) -> None:
+        """Compute free ranges as the gaps between sorted used addresses."""
+        used = sorted(
+            {
+                value
+                for value in (self._to_int(address) for address in used_addresses)
+                if value is not None and self._first <= value <= self._last
+            }
+        )
+
+        cursor = self._first
+        for value in used:
+            if value > cursor:
+                self._append_range(cursor, value - 1)
+            cursor = value + 1
+
+        if cursor <= self._last:
+            self._append_range(cursor, self._last)
+
+    def _append_range(self, start: int, end: int) -> None:
+        self._starts.append(start)
+        self._ends.append(end)
+        self._free_count += end - start + 1
+
+    def _to_int(self, address: Union[str, int, IPAddress]) -> Optional[int]:
+        """Convert an address to its integer form, ignoring foreign versions."""
+        if isinstance(address, int):
+            return address
+        try:
+            address = ipaddress.ip_address(str(address))
+        except ValueError:
+            return None
+        if address.version != self.network.version:
+            return None
+        return int(address)
+
+    def _find_range(self, value: int) -> int:
+        """Get position of the free range containing value, or -1."""
+        position = bisect_right(self._starts, value) - 1
+        if position >= 0 and self._ends[position] >= value:
+            return position
+        return -1
+
+    @property
+    def free_count(self) -> int:
+        """Number of free host addresses."""
+        return self._free_count
+
+    @property
+    def range_count(self) -> int:
+        """Number of disjoint free ranges (fragmentation)."""
+        return len(self._starts)
+
+    def is_free(self, address: Union[str, int, IPAddress]) -> bool:
+        """Check whether address is a free host address of this network."""
+        value = self._to_int(address)
+        return value is not None and self._find_range(value) >= 0
+
+    def first_free(self) -> Optional[IPAddress]:
+        """Get the lowest free host address without marking it used."""
+        if not self._starts:
+            return None
+        return self._address_class(self._starts[0])
+
+    def find_contiguous(self, count: int) -> Optional[IPAddress]:
+        """
+        Find the first run of count contiguous free addresses.
+
+        Args:
+            count: Number of contiguous addresses required
+
+        Returns:
+            Start address of the run or None if no run is large enough
+        """
+        if count < 1:
+            raise ValueError("count must be positive")
+
+        for start, end in zip(self._starts, self._ends):
+            if end - start + 1 >= count:
+                return self._address_class(start)
+        return None
+
+    def mark_used(self, address: Union[str, int, IPAddress]) -> bool:
+        """
+        Remove address from free space.
+
+        Returns:
+            True if the address was free, False otherwise
+        """
+        value = self._to_int(address)
+        if value is None:
+            return False
+
+        position = self._find_range(value)
+        if position < 0:
+            return False
+
+        start = self._starts[position]
+        end = self._ends[position]
+
+        if start == end:
+            del self._starts[position]
+            del self._ends[position]
+        elif value == start:
+            self._starts[position] = value + 1
+        elif value == end:
+            self._ends[position] = value - 1
+        else:
+            self._ends[position] = value - 1
+            self._starts.insert(position + 1, value + 1)
+            self._ends.insert(position + 1, end)
+
+        self._free_count -= 1
+        return True
+
+    def mark_free(self, address: Union[str, int, IPAddress]) -> bool:
+        """
+        Return address to free space, merging with adjacent ranges.
+
+        Returns:
+            True if the address was used, False if already free or out of range
+        """
+        value = self._to_int(address)
+        if value is None or not self._first <= value <= self._last:
+            return False
+
+        position = bisect_right(self._starts, value) - 1
+        if position >= 0 and self._ends[position] >= value:
+            return False
+
+        joins_left = position >= 0 and self._ends[position] == value - 1
+        joins_right = (
+            position + 1 < len(self._starts)
+            and self._starts[position + 1] == value + 1
+        )
+
+        if joins_left and joins_right:
+            self._ends[position] = self._ends[position + 1]
+            del self._starts[position + 1]
+            del self._ends[position + 1]
+        elif joins_left:
+            self._ends[position] = value
+        elif joins_right:
+            self._starts[position + 1] = value
+        else:
+            self._starts.insert(position + 1, value)
+            self._ends.insert(position + 1, value)
+
+        self._free_count += 1
+        return True
+
+    def allocate_next(self) -> Optional[IPAddress]:
+        """Take the lowest free address, marking it used."""
+        if not self._starts:
+            return None
+        value = self._starts[0]
+        self.mark_used(value)
+        return self._address_class(value)
+
+    def allocate_block(self, count: int) -> Optional[list[IPAddress]]:
+        """
+        Take the first run of count contiguous free addresses.
+
+        Args:
+            count: Number of contiguous addresses required
+
+        Returns:
+            Addresses in ascending order or None if no run is large enough
+        """
+        if count < 1:
+            raise ValueError("count must be positive")
+
+        for position, (start, end) in enumerate(zip(self._starts, self._ends)):
+            if end - start + 1 < count:
+                continue
+
+            if end - start + 1 == count:
+                del self._starts[position]
+                del self._ends[position]
+            else:
+                self._starts[position] = start + count
+            self._free_count -= count
+            return [self._address_class(start + offset) for offset in range(count)]
+
+        return None
+
+    def iter_free(self, limit: Optional[int] = None) -> Iterable[IPAddress]:
+        """
+        Iterate free addresses in ascending order.
+
+        Args:
+            limit: Optional maximum number of addresses to yield
+        """
+        produced = 0
+        for start, end in zip(list(self._starts), list(self._ends)):
+            for value in range(start, end + 1):
+                if limit is not None and produced >= limit:
+                    return
+                yield self._address_class(value)
+                produced += 1
+
+
+class AddressIndexRegistry:
+    """
+    Registry of per-network free-space indexes.
+
+    Indexes are keyed by a caller-chosen hashable (typically tenant and
+    network primary key), built on first use from a loader returning the
+    addresses currently in use, and kept current through ``mark_used`` /
+    ``mark_free``. Updates for networks that have not been loaded are
+    ignored since the next build reads the authoritative state anyway.
+    """
+
+    def __init__(self):
+        """Initialize empty registry."""
+        self._indexes: dict[Hashable, FreeRangeIndex] = {}
+        self._lock = threading.RLock()
+
+    def get(
+        self,
+        key: Hashable,
+        network: Union[str, IPNetworkType],
+        loader: Callable[[], Iterable[Union[str, IPAddress]]],
+    ) -> FreeRangeIndex:
+        """
+        Get index for key, building it from loader when missing or stale.
+
+        Args:
+            key: Index key
+            network: Network the index covers
+            loader: Callable returning used addresses for the network
+
+        Returns:
+            Free-space index for the network
+        """
+        if isinstance(network, str):
+            network = ipaddress.ip_network(network, strict=False)
+
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None or index.network != network:
+                index = FreeRangeIndex(network, loader())
+                self._indexes[key] = index
+            return index
+
+    def peek(self, key: Hashable) -> Optional[FreeRangeIndex]:
+        """Get index for key if it has been built."""
+        return self._indexes.get(key)
+
+    def mark_used(self, key: Hashable, address: Union[str, IPAddress]) -> bool:
+        """Mark address used in the index for key if loaded."""
+        with self._lock:
+            index = self._indexes.get(key)
+            return index.mark_used(address) if index is not None else False
+
+    def mark_free(self, key: Hashable, address: Union[str, IPAddress]) -> bool:
+        """Mark address free in the index for key if loaded."""
+        with self._lock:
+            index = self._indexes.get(key)
+            return index.mark_free(address) if index is not None else False
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Drop cached indexes so they are rebuilt on next use.
+
+        Args:
+            key: Index to drop, or None to drop all indexes
+        """
+        with self._lock:
+            if key is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(key, None)
+
+    def invalidate_tenant(self, tenant_id: str) -> None:
+        """Drop all indexes whose key is a tuple starting with tenant_id."""
+        with self._lock:
+            for key in [
+                key
+                for key in self._indexes
+                if isinstance(key, tuple) and key and key[0] == tenant_id
+            ]:
+                del self._indexes[key]
+
+    def __len__(self) -> int:
+        return len(self._indexes)
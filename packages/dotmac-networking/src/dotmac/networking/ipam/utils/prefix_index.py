@@ -0,0 +1,392 @@
+"""
+Prefix index for IPAM overlap and conflict detection.
+
+Networks are stored in a path-compressed binary (Patricia) trie per IP
+version, so finding every stored prefix that overlaps a query prefix costs
+O(prefix length) plus the size of the answer, independent of how many
+networks a tenant has. For a full audit, ``find_overlapping_pairs`` runs a
+single sorted sweep instead of comparing every pair.
+"""
+
+import ipaddress
+import threading
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from typing import Any, Optional, Union
+
+IPNetworkType = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def _to_network(cidr: Union[str, IPNetworkType]) -> IPNetworkType:
+    if isinstance(cidr, (ipaddress.IPv4Network, ipaddress.IPv6Network)):
+        return cidr
+    return ipaddress.ip_network(str(cidr), strict=False)
+
+
+class _Node:
+    """Trie node holding the values stored at exactly this prefix."""
+
+    __slots__ = ("prefix", "length", "children", "values", "count")
+
+    def __init__(self, prefix: int, length: int):
+        self.prefix = prefix
+        self.length = length
+        self.children: list[Optional[_Node]] = [None, None]
+        self.values: list[Any] = []
+        # Number of values stored in this node's subtree
+        self.count = 0
+
+
+class PrefixTrie:
+    """Patricia trie of prefixes for a single address width."""
+
+    def __init__(self, width: int):
+        """
+        Initialize empty trie.
+
+        Args:
+            width: Address width in bits (32 for IPv4, 128 for IPv6)
+        """
+        self.width = width
+        self._root = _Node(0, 0)
+
+    def __len__(self) -> int:
+        return self._root.count
+
+    def _bit(self, prefix: int, position: int) -> int:
+        return (prefix >> (self.width - 1 - position)) & 1
+
+    def _common_length(self, a: int, b: int, limit: int) -> int:
+        difference = a ^ b
+        if not difference:
+            return limit
+        return min(limit, self.width - difference.bit_length())
+
+    def _covers(self, node: _Node, prefix: int, length: int) -> bool:
+        """Check whether node's prefix contains (prefix, length)."""
+        return (
+            node.length <= length
+            and self._common_length(node.prefix, prefix, node.length) == node.length
+        )
+
+    def insert(self, prefix: int, length: int, value: Any) -> None:
+        """Store value under prefix/length."""
+        path = [self._root]
+        node = self._root
+
+        while True:
+            if node.length == length:
+                node.values.append(value)
+                break
+
+            bit = self._bit(prefix, node.length)
+            child = node.children[bit]
+            if child is None:
+                leaf = _Node(prefix, length)
+                leaf.values.append(value)
+                leaf.count = 1
+                node.children[bit] = leaf
+                break
+
+            common = self._common_length(
+                prefix, child.prefix, min(length, child.length)
+            )
+            if common == child.length:
+                node = child
+                path.append(node)
+                continue
+
+            if common == length:
+                # New prefix sits between node and child
+                inner = _Node(prefix, length)
+                inner.values.append(value)
+                inner.children[self._bit(child.prefix, length)] = child
+                inner.count = child.count + 1
+                node.children[bit] = inner
+                break
+
+            # Prefixes diverge below node: join them under a glue node
+            mask = ~((1 << (self.width - common)) - 1)
+            glue = _Node(prefix & mask, common)
+            leaf = _Node(prefix, length)
+            leaf.values.append(value)
+            leaf.count = 1
+            glue.children[self._bit(prefix, common)] = leaf
+            glue.children[self._bit(child.prefix, common)] = child
+            glue.count = child.count + 1
+            node.children[bit] = glue
+            break
+
+        for ancestor in path:
+            ancestor.count += 1
+
+    def remove(self, prefix: int, length: int, value: Any) -> bool:
+        """
+        Remove one occurrence of value stored under prefix/length.
+
+        Returns:
+            True if the value was found and removed
+        """
+        path = [self._root]
+        node = self._root
+
+        while node.length < length:
+            child = node.children[self._bit(prefix, node.length)]
+            if child is None or not self._covers(child, prefix, length):
+                return False
+            node = child
+            path.append(node)
+
+        if node.length != length or node.prefix != prefix:
+            return False
+        try:
+            node.values.remove(value)
+        except ValueError:
+            return False
+
+        for ancestor in path:
+            ancestor.count -= 1
+
+        # Splice out nodes that no longer carry values or branch
+        for position in range(len(path) - 1, 0, -1):
+            current = path[position]
+            parent = path[position - 1]
+            if current.values:
+                break
+            remaining = [child for child in current.children if child is not None]
+            if len(remaining) > 1:
+                break
+            slot = parent.children.index(current)
+            parent.children[slot] = remaining[0] if remaining else None
+
+        return True
+
+    def _iter_subtree(self, node: _Node) -> Iterator[tuple[int, int, Any]]:
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            for value in current.values:
+                yield current.prefix, current.length, value
+            for child in reversed(current.children):
+                if child is not None and child.count:
+                    stack.append(child)
+
+    def iter_overlaps(self, prefix: int, length: int) -> Iterator[tuple[int, int, Any]]:
+        """
+        Iterate stored entries overlapping prefix/length.
+
+        Covering prefixes are yielded first (shortest first), followed by the
+        prefix itself and everything nested inside it.
+        """
+        node = self._root
+
+        while True:
+            if node.length == length:
+                yield from self._iter_subtree(node)
+                return
+
+            for value in node.values:
+                yield node.prefix, node.length, value
+
+            child = node.children[self._bit(prefix, node.length)]
+            if child is None or not child.count:
+                return
+
+            if self._covers(child, prefix, length):
+                node = child
+                continue
+
+            # Child is longer than the query: overlaps only if nested inside it
+            if (
+                child.length > length
+                and self._common_length(child.prefix, prefix, length) == length
+            ):
+                yield from self._iter_subtree(child)
+            return
+
+    def __iter__(self) -> Iterator[tuple[int, int, Any]]:
+        return self._iter_subtree(self._root)
+
+
+class PrefixIndex:
+    """
+    Overlap index over IPv4 and IPv6 networks.
+
+    Values are arbitrary (network IDs, positions, ORM primary keys); the
+    same CIDR may be stored several times with different values.
+    """
+
+    def __init__(self, entries: Optional[Iterable[tuple[Any, Any]]] = None):
+        """
+        Initialize index.
+
+        Args:
+            entries: Optional (cidr, value) pairs to load
+        """
+        self._tries = {4: PrefixTrie(32), 6: PrefixTrie(128)}
+        for cidr, value in entries or ():
+            self.add(cidr, value)
+
+    def __len__(self) -> int:
+        return len(self._tries[4]) + len(self._tries[6])
+
+    def add(self, cidr: Union[str, IPNetworkType], value: Any) -> None:
+        """Add network with associated value."""
+        network = _to_network(cidr)
+        self._tries[network.version].insert(
+            int(network.network_address), network.prefixlen, value
+        )
+
+    def remove(self, cidr: Union[str, IPNetworkType], value: Any) -> bool:
+        """Remove network/value pair, returning True if it was present."""
+        network = _to_network(cidr)
+        return self._tries[network.version].remove(
+            int(network.network_address), network.prefixlen, value
+        )
+
+    @staticmethod
+    def _to_result(
+        version: int, prefix: int, length: int, value: Any
+    ) -> tuple[IPNetworkType, Any]:
+        network_class = ipaddress.IPv4Network if version == 4 else ipaddress.IPv6Network
+        return network_class((prefix, length)), value
+
+    def iter_overlaps(
+        self, cidr: Union[str, IPNetworkType]
+    ) -> Iterator[tuple[IPNetworkType, Any]]:
+        """Iterate (network, value) pairs overlapping cidr."""
+        network = _to_network(cidr)
+        trie = self._tries[network.version]
+        for prefix, length, value in trie.iter_overlaps(
+            int(network.network_address), network.prefixlen
+        ):
+            yield self._to_result(network.version, prefix, length, value)
+
+    def overlaps(
+        self, cidr: Union[str, IPNetworkType]
+    ) -> list[tuple[IPNetworkType, Any]]:
+        """Get all (network, value) pairs overlapping cidr."""
+        return list(self.iter_overlaps(cidr))
+
+    def first_overlap(
+        self, cidr: Union[str, IPNetworkType]
+    ) -> Optional[tuple[IPNetworkType, Any]]:
+        """Get one overlapping (network, value) pair, or None."""
+        return next(self.iter_overlaps(cidr), None)
+
+    def __iter__(self) -> Iterator[tuple[IPNetworkType, Any]]:
+        for version, trie in self._tries.items():
+            for prefix, length, value in trie:
+                yield self._to_result(version, prefix, length, value)
+
+
+def find_overlapping_pairs(
+    entries: Iterable[tuple[Union[str, IPNetworkType], Any]],
+) -> list[tuple[tuple[IPNetworkType, Any], tuple[IPNetworkType, Any]]]:
+    """
+    Find every pair of overlapping networks with one sorted sweep.
+
+    CIDR prefixes are either disjoint or nested, so after sorting by start
+    address (widest first) each network overlaps exactly the networks still
+    open on the sweep stack. Invalid CIDRs are skipped.
+
+    Args:
+        entries: (cidr, value) pairs
+
+    Returns:
+        List of ((outer_network, outer_value), (inner_network, inner_value))
+    """
+    items = []
+    for cidr, value in entries:
+        try:
+            network = _to_network(cidr)
+        except ValueError:
+            continue
+        items.append(
+            (
+                network.version,
+                int(network.network_address),
+                -int(network.broadcast_address),
+                network,
+                value,
+            )
+        )
+
+    items.sort(key=lambda item: item[:3])
+
+    pairs = []
+    stack: list[tuple[int, int, IPNetworkType, Any]] = []
+    for version, start, negative_end, network, value in items:
+        while stack and (stack[-1][0] != version or stack[-1][1] < start):
+            stack.pop()
+        for _, _, open_network, open_value in stack:
+            pairs.append(((open_network, open_value), (network, value)))
+        stack.append((version, -negative_end, network, value))
+
+    return pairs
+
+
+class TenantPrefixIndexRegistry:
+    """
+    Per-tenant prefix indexes, loaded lazily and updated incrementally.
+
+    Updates for tenants that have not been loaded yet are ignored, since the
+    next load reads the authoritative network list anyway.
+    """
+
+    def __init__(self):
+        """Initialize empty registry."""
+        self._indexes: dict[Hashable, PrefixIndex] = {}
+        self._lock = threading.RLock()
+
+    def get(
+        self,
+        tenant_id: Hashable,
+        loader: Callable[[], Iterable[tuple[Any, Any]]],
+    ) -> PrefixIndex:
+        """
+        Get prefix index for tenant, building it from loader when missing.
+
+        Args:
+            tenant_id: Tenant identifier
+            loader: Callable returning (cidr, value) pairs for the tenant
+
+        Returns:
+            Prefix index for the tenant
+        """
+        with self._lock:
+            index = self._indexes.get(tenant_id)
+            if index is None:
+                index = PrefixIndex(loader())
+                self._indexes[tenant_id] = index
+            return index
+
+    def add(
+        self, tenant_id: Hashable, cidr: Union[str, IPNetworkType], value: Any
+    ) -> None:
+        """Add network to tenant index if loaded."""
+        with self._lock:
+            index = self._indexes.get(tenant_id)
+            if index is not None:
+                index.add(cidr, value)
+
+    def remove(
+        self, tenant_id: Hashable, cidr: Union[str, IPNetworkType], value: Any
+    ) -> None:
+        """Remove network from tenant index if loaded."""
+        with self._lock:
+            index = self._indexes.get(tenant_id)
+            if index is not None:
+                index.remove(cidr, value)
+
+    def invalidate(self, tenant_id: Optional[Hashable] = None) -> None:
+        """
+        Drop cached indexes so they are rebuilt on next use.
+
+        Args:
+            tenant_id: Tenant to drop, or None to drop all tenants
+        """
+        with self._lock:
+            if tenant_id is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(tenant_id, None)
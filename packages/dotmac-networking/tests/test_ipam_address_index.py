@@ -0,0 +1,405 @@
+"""
+Tests for the IPAM free-space index.
+"""
+
+import ipaddress
+import random
+from uuid import uuid4
+
+import pytest
+
+from dotmac.networking.ipam.core.exceptions import (
+    InsufficientAddressSpaceError,
+    IPAddressConflictError,
+    IPAMError,
+)
+from dotmac.networking.ipam.services.ipam_service import IPAMService
+from dotmac.networking.ipam.utils.address_index import (
+    AddressIndexRegistry,
+    FreeRangeIndex,
+    get_host_bounds,
+)
+
+NETWORK_ID = uuid4()
+
+class TestHostBounds:
+    """Test host range calculation matches ipaddress.hosts()."""
+
+    @pytest.mark.parametrize(
+        "cidr",
+        [
+            "192.168.1.0/24",
+            "10.0.0.0/30",
+            "10.0.0.0/31",
+            "10.0.0.1/32",
+            "2001:db8::/126",
+            "2001:db8::/127",
+            "2001:db8::1/128",
+        ],
+    )
+    def test_bounds_match_hosts(self, cidr):
+        network = ipaddress.ip_network(cidr)
+        hosts = list(network.hosts()) or [network.network_address]
+        first, last = get_host_bounds(network)
+
+        assert first == int(hosts[0])
+        assert last == int(hosts[-1])
+
+
+class TestFreeRangeIndex:
+    """Test free-range bookkeeping."""
+
+    def test_empty_network_first_free(self):
+        index = FreeRangeIndex("192.168.1.0/24")
+
+        assert index.first_free() == ipaddress.ip_address("192.168.1.1")
+        assert index.free_count == 254
+        assert index.range_count == 1
+
+    def test_build_from_used_addresses(self):
+        index = FreeRangeIndex(
+            "192.168.1.0/24", ["192.168.1.1", "192.168.1.2", "192.168.1.4", "10.0.0.1"]
+        )
+
+        assert index.first_free() == ipaddress.ip_address("192.168.1.3")
+        assert index.free_count == 251
+        assert index.range_count == 2
+        assert not index.is_free("192.168.1.4")
+        assert index.is_free("192.168.1.5")
+
+    def test_mark_used_splits_and_mark_free_merges(self):
+        index = FreeRangeIndex("10.0.0.0/29")
+
+        assert index.mark_used("10.0.0.3") is True
+        assert index.range_count == 2
+        assert index.mark_used("10.0.0.3") is False
+
+        assert index.mark_free("10.0.0.3") is True
+        assert index.range_count == 1
+        assert index.free_count == 6
+        assert index.mark_free("10.0.0.3") is False
+
+    def test_mark_free_rejects_network_and_broadcast(self):
+        index = FreeRangeIndex("10.0.0.0/29")
+
+        assert index.mark_free("10.0.0.0") is False
+        assert index.mark_free("10.0.0.7") is False
+        assert index.free_count == 6
+
+    def test_allocate_next_until_full(self):
+        index = FreeRangeIndex("10.0.0.0/30")
+
+        assert index.allocate_next() == ipaddress.ip_address("10.0.0.1")
+        assert index.allocate_next() == ipaddress.ip_address("10.0.0.2")
+        assert index.allocate_next() is None
+        assert index.free_count == 0
+
+    def test_allocate_block_skips_fragmented_ranges(self):
+        index = FreeRangeIndex("10.0.0.0/24", ["10.0.0.3", "10.0.0.6"])
+
+        assert index.find_contiguous(4) == ipaddress.ip_address("10.0.0.7")
+        block = index.allocate_block(4)
+
+        assert [str(ip) for ip in block] == [
+            "10.0.0.7",
+            "10.0.0.8",
+            "10.0.0.9",
+            "10.0.0.10",
+        ]
+        assert index.first_free() == ipaddress.ip_address("10.0.0.1")
+        assert index.find_contiguous(254) is None
+        assert index.allocate_block(1000) is None
+
+    def test_large_ipv6_network(self):
+        index = FreeRangeIndex("2001:db8::/64", ["2001:db8::1"])
+
+        assert index.first_free() == ipaddress.ip_address("2001:db8::2")
+        assert index.free_count == 2**64 - 2
+
+    def test_matches_linear_scan(self):
+        network = ipaddress.ip_network("10.1.0.0/22")
+        hosts = list(network.hosts())
+        rng = random.Random(7)
+        used = set(rng.sample(hosts, 600))
+        index = FreeRangeIndex(network, used)
+
+        for _ in range(500):
+            address = rng.choice(hosts)
+            if address in used:
+                assert index.mark_free(address)
+                used.discard(address)
+            else:
+                assert index.mark_used(address)
+                used.add(address)
+
+            expected = next((ip for ip in hosts if ip not in used), None)
+            assert index.first_free() == expected
+
+        assert index.free_count == len(hosts) - len(used)
+        assert list(index.iter_free()) == [ip for ip in hosts if ip not in used]
+
+
+class TestAddressIndexRegistry:
+    """Test lazy building and incremental updates."""
+
+    def test_builds_once_and_tracks_updates(self):
+        registry = AddressIndexRegistry()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return ["10.0.0.1"]
+
+        index = registry.get(("t1", "n1"), "10.0.0.0/24", loader)
+        assert registry.get(("t1", "n1"), "10.0.0.0/24", loader) is index
+        assert len(calls) == 1
+
+        registry.mark_used(("t1", "n1"), "10.0.0.2")
+        assert index.first_free() == ipaddress.ip_address("10.0.0.3")
+
+        registry.mark_free(("t1", "n1"), "10.0.0.1")
+        assert index.first_free() == ipaddress.ip_address("10.0.0.1")
+
+    def test_updates_to_unloaded_networks_are_ignored(self):
+        registry = AddressIndexRegistry()
+
+        assert registry.mark_used(("t1", "n1"), "10.0.0.2") is False
+        assert len(registry) == 0
+
+    def test_invalidate_tenant(self):
+        registry = AddressIndexRegistry()
+        registry.get(("t1", "n1"), "10.0.0.0/24", list)
+        registry.get(("t2", "n1"), "10.0.1.0/24", list)
+
+        registry.invalidate_tenant("t1")
+
+        assert registry.peek(("t1", "n1")) is None
+        assert registry.peek(("t2", "n1")) is not None
+
+
+class TestServiceFreeSpaceIndex:
+    """Test IPAMService keeps the index in sync (in-memory mode)."""
+
+    @pytest.mark.asyncio
+    async def test_allocate_release_reuses_address(self):
+        service = IPAMService()
+        await service.create_network("tenant-1", network_id="net-1", cidr="10.0.0.0/29")
+
+        first = await service.allocate_ip("tenant-1", network_id="net-1")
+        second = await service.allocate_ip("tenant-1", network_id="net-1")
+        await service.reserve_ip("tenant-1", network_id="net-1", ip_address="10.0.0.3")
+        third = await service.allocate_ip("tenant-1", network_id="net-1")
+
+        assert [first["ip_address"], second["ip_address"], third["ip_address"]] == [
+            "10.0.0.1",
+            "10.0.0.2",
+            "10.0.0.4",
+        ]
+
+        await service.release_allocation("tenant-1", first["allocation_id"])
+        reused = await service.allocate_ip("tenant-1", network_id="net-1")
+        assert reused["ip_address"] == "10.0.0.1"
+
+
+class TestBulkAllocation:
+    """Test IPAMService.allocate_ips_bulk (in-memory mode)."""
+
+    @staticmethod
+    async def _create_service():
+        service = IPAMService()
+        await service.create_network("tenant-1", network_id="net-1", cidr="10.0.0.0/28")
+        return service
+
+    @pytest.mark.asyncio
+    async def test_allocate_count(self):
+        service = await self._create_service()
+        await service.allocate_ip("tenant-1", network_id="net-1", ip_address="10.0.0.2")
+
+        allocations = await service.allocate_ips_bulk(
+            "tenant-1", "net-1", count=3, hostname="olt-1"
+        )
+
+        assert [a["ip_address"] for a in allocations] == [
+            "10.0.0.1",
+            "10.0.0.3",
+            "10.0.0.4",
+        ]
+        assert all(a["hostname"] == "olt-1" for a in allocations)
+        assert len({a["allocation_id"] for a in allocations}) == 3
+
+    @pytest.mark.asyncio
+    async def test_allocate_requests_mixes_explicit_and_dynamic(self):
+        service = await self._create_service()
+        allocations = await service.allocate_ips_bulk(
+            "tenant-1",
+            "net-1",
+            requests=[
+                {"hostname": "a"},
+                {"ip_address": "10.0.0.1", "hostname": "b"},
+                {"hostname": "c"},
+            ],
+        )
+
+        assert [(a["hostname"], a["ip_address"]) for a in allocations] == [
+            ("a", "10.0.0.2"),
+            ("b", "10.0.0.1"),
+            ("c", "10.0.0.3"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_contiguous_block(self):
+        service = await self._create_service()
+        await service.allocate_ip("tenant-1", network_id="net-1", ip_address="10.0.0.3")
+
+        allocations = await service.allocate_ips_bulk(
+            "tenant-1", "net-1", count=4, contiguous=True
+        )
+
+        assert [a["ip_address"] for a in allocations] == [
+            "10.0.0.4",
+            "10.0.0.5",
+            "10.0.0.6",
+            "10.0.0.7",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_conflicting_request_allocates_nothing(self):
+        service = await self._create_service()
+        await service.allocate_ip("tenant-1", network_id="net-1", ip_address="10.0.0.5")
+
+        with pytest.raises(IPAddressConflictError):
+            await service.allocate_ips_bulk(
+                "tenant-1",
+                "net-1",
+                requests=[{}, {"ip_address": "10.0.0.5"}],
+            )
+
+        with pytest.raises(IPAddressConflictError):
+            await service.allocate_ips_bulk(
+                "tenant-1",
+                "net-1",
+                requests=[{"ip_address": "10.0.0.6"}, {"ip_address": "10.0.0.6"}],
+            )
+
+        assert len(service._in_memory_allocations) == 1
+
+    @pytest.mark.asyncio
+    async def test_insufficient_space(self):
+        service = await self._create_service()
+        with pytest.raises(InsufficientAddressSpaceError):
+            await service.allocate_ips_bulk("tenant-1", "net-1", count=15)
+
+        allocations = await service.allocate_ips_bulk("tenant-1", "net-1", count=14)
+        assert len(allocations) == 14
+
+    @pytest.mark.asyncio
+    async def test_requires_count_or_requests(self):
+        service = await self._create_service()
+        with pytest.raises(IPAMError):
+            await service.allocate_ips_bulk("tenant-1", "net-1")
+
+
+class TestBulkAllocationDatabase:
+    """Test IPAMService.allocate_ips_bulk against a database session."""
+
+    @pytest.fixture
+    def db(self):
+        sqlalchemy = pytest.importorskip("sqlalchemy")
+        from sqlalchemy.orm import sessionmaker
+
+        from dotmac.networking.ipam.core.models import IPNetwork, NetworkType
+
+        engine = sqlalchemy.create_engine("sqlite://")
+        IPNetwork.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        session.add(
+            IPNetwork(
+                id=uuid4(),
+                tenant_id="tenant-1",
+                network_id=NETWORK_ID,
+                cidr="10.0.0.0/28",
+                network_type=NetworkType.CUSTOMER,
+            )
+        )
+        session.commit()
+        yield session
+        session.close()
+        engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_returns_same_shape_as_allocate_ip(self, db):
+        service = IPAMService(database_session=db)
+        single = await service.allocate_ip("tenant-1", network_id=NETWORK_ID)
+
+        allocations = await service.allocate_ips_bulk(
+            "tenant-1", NETWORK_ID, requests=[{"hostname": "a"}, {"hostname": "b"}]
+        )
+
+        assert [a["ip_address"] for a in allocations] == ["10.0.0.2", "10.0.0.3"]
+        assert [a["hostname"] for a in allocations] == ["a", "b"]
+        for allocation in allocations:
+            assert allocation.keys() == single.keys()
+            assert type(allocation["allocation_id"]) is type(single["allocation_id"])
+            assert allocation["network_id"] == single["network_id"]
+
+    @pytest.mark.asyncio
+    async def test_single_and_bulk_allocation_lock_network_row(self, db, monkeypatch):
+        from sqlalchemy.orm import Query
+
+        from dotmac.networking.ipam.core.models import IPNetwork
+
+        locked = []
+        with_for_update = Query.with_for_update
+
+        def record_lock(query, **kwargs):
+            locked.append(query.column_descriptions[0]["entity"])
+            return with_for_update(query, **kwargs)
+
+        monkeypatch.setattr(Query, "with_for_update", record_lock)
+        service = IPAMService(database_session=db)
+
+        await service.allocate_ip("tenant-1", network_id=NETWORK_ID)
+        await service.allocate_ips_bulk("tenant-1", NETWORK_ID, count=2)
+        with pytest.raises(IPAddressConflictError):
+            await service.allocate_ip(
+                "tenant-1", network_id=NETWORK_ID, ip_address="10.0.0.1"
+            )
+
+        assert locked == [IPNetwork, IPNetwork, IPNetwork]
+        assert not db.in_transaction()
+
+    @staticmethod
+    def _purge_elsewhere(db, addresses):
+        """Purge allocations as another worker would, behind the index."""
+        from dotmac.networking.ipam.core.models import IPAllocation
+
+        db.query(IPAllocation).filter(IPAllocation.ip_address.in_(addresses)).delete(
+            synchronize_session=False
+        )
+        db.commit()
+
+    @pytest.mark.asyncio
+    async def test_rebuilds_exhausted_index_from_database(self, db):
+        service = IPAMService(database_session=db)
+        await service.allocate_ips_bulk("tenant-1", NETWORK_ID, count=14)
+        with pytest.raises(InsufficientAddressSpaceError):
+            await service.allocate_ip("tenant-1", network_id=NETWORK_ID)
+
+        self._purge_elsewhere(db, ["10.0.0.4"])
+
+        single = await service.allocate_ip("tenant-1", network_id=NETWORK_ID)
+        assert single["ip_address"] == "10.0.0.4"
+
+    @pytest.mark.asyncio
+    async def test_bulk_rebuilds_exhausted_index_from_database(self, db):
+        service = IPAMService(database_session=db)
+        await service.allocate_ips_bulk("tenant-1", NETWORK_ID, count=14)
+
+        self._purge_elsewhere(db, ["10.0.0.9", "10.0.0.10"])
+
+        allocations = await service.allocate_ips_bulk(
+            "tenant-1", NETWORK_ID, count=2, contiguous=True
+        )
+        assert [a["ip_address"] for a in allocations] == ["10.0.0.9", "10.0.0.10"]
+        with pytest.raises(InsufficientAddressSpaceError):
+            await service.allocate_ips_bulk("tenant-1", NETWORK_ID, count=1)
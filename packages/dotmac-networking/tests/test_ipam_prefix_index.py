@@ -0,0 +1,260 @@
+"""
+Tests for the IPAM prefix index and its overlap-detection call sites.
+"""
+
+import ipaddress
+import random
+
+import pytest
+
+from dotmac.networking.ipam.core.exceptions import NetworkOverlapError
+from dotmac.networking.ipam.planning.network_planner import NetworkPlanner
+from dotmac.networking.ipam.services.ipam_service import IPAMService
+from dotmac.networking.ipam.utils.prefix_index import (
+    PrefixIndex,
+    TenantPrefixIndexRegistry,
+    find_overlapping_pairs,
+)
+
+
+def _random_networks(rng, count):
+    networks = []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            address = 0x0A000000 | rng.getrandbits(24)
+            networks.append(
+                ipaddress.ip_network((address, rng.randint(8, 30)), strict=False)
+            )
+        else:
+            address = (0x20010DB8 << 96) | (rng.getrandbits(32) << 64)
+            networks.append(
+                ipaddress.ip_network((address, rng.randint(32, 64)), strict=False)
+            )
+    return networks
+
+
+class TestPrefixIndex:
+    """Test trie lookups against brute-force overlap checks."""
+
+    def test_supernet_subnet_and_equal(self):
+        index = PrefixIndex(
+            [
+                ("10.0.0.0/8", "a"),
+                ("10.1.0.0/16", "b"),
+                ("10.1.2.0/24", "c"),
+                ("192.168.0.0/16", "d"),
+                ("2001:db8::/32", "e"),
+            ]
+        )
+
+        assert sorted(v for _, v in index.overlaps("10.1.0.0/16")) == ["a", "b", "c"]
+        assert sorted(v for _, v in index.overlaps("10.1.2.128/25")) == ["a", "b", "c"]
+        assert sorted(v for _, v in index.overlaps("10.2.0.0/16")) == ["a"]
+        assert index.overlaps("172.16.0.0/12") == []
+        assert [v for _, v in index.overlaps("2001:db8:1::/48")] == ["e"]
+        assert index.first_overlap("11.0.0.0/8") is None
+
+    def test_remove(self):
+        index = PrefixIndex(
+            [("10.0.0.0/24", 1), ("10.0.0.0/24", 2), ("10.0.1.0/24", 3)]
+        )
+
+        assert index.remove("10.0.0.0/24", 1) is True
+        assert index.remove("10.0.0.0/24", 1) is False
+        assert index.remove("10.0.2.0/24", 3) is False
+        assert [v for _, v in index.overlaps("10.0.0.0/23")] == [2, 3]
+        assert len(index) == 2
+
+    def test_matches_brute_force(self):
+        rng = random.Random(42)
+        networks = _random_networks(rng, 1500)
+        index = PrefixIndex((network, i) for i, network in enumerate(networks))
+
+        removed = set(rng.sample(range(len(networks)), 300))
+        for i in removed:
+            assert index.remove(networks[i], i)
+        live = [(n, i) for i, n in enumerate(networks) if i not in removed]
+
+        for query in _random_networks(rng, 300):
+            expected = sorted(
+                i
+                for network, i in live
+                if network.version == query.version and network.overlaps(query)
+            )
+            assert sorted(v for _, v in index.overlaps(query)) == expected
+
+    def test_overlapping_pairs_sweep(self):
+        rng = random.Random(7)
+        entries = [(network, i) for i, network in enumerate(_random_networks(rng, 400))]
+
+        expected = {
+            frozenset((a[1], b[1]))
+            for position, a in enumerate(entries)
+            for b in entries[position + 1 :]
+            if a[0].version == b[0].version and a[0].overlaps(b[0])
+        }
+        pairs = find_overlapping_pairs(entries)
+
+        assert {frozenset((outer[1], inner[1])) for outer, inner in pairs} == expected
+        assert all(inner[0].subnet_of(outer[0]) for outer, inner in pairs)
+
+    def test_registry_ignores_unloaded_tenants(self):
+        registry = TenantPrefixIndexRegistry()
+        registry.add("t1", "10.0.0.0/24", "n1")
+
+        index = registry.get("t1", lambda: [("10.0.1.0/24", "n2")])
+        registry.add("t1", "10.0.2.0/24", "n3")
+
+        assert sorted(v for _, v in index.overlaps("10.0.0.0/16")) == ["n2", "n3"]
+
+
+class TestOverlapCallSites:
+    """Test planner and service use the prefix index correctly."""
+
+    def test_planner_detect_subnet_conflicts(self):
+        planner = NetworkPlanner()
+
+        conflicts = planner.detect_subnet_conflicts(
+            ["10.0.0.0/16", "not-a-cidr", "192.168.1.0/24"],
+            ["10.0.5.0/24", "bogus", "10.0.0.0/16", "172.16.0.0/12"],
+        )
+
+        assert [
+            (c["type"], c.get("existing_subnet"), c["severity"]) for c in conflicts
+        ] == [
+            ("overlap", "10.0.5.0/24", "medium"),
+            ("overlap", "10.0.0.0/16", "high"),
+            ("invalid_cidr", None, "high"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_service_rejects_overlapping_network(self):
+        service = IPAMService()
+        await service.create_network("tenant-1", network_id="n1", cidr="10.0.0.0/16")
+        await service.create_network("tenant-2", network_id="n2", cidr="10.0.0.0/24")
+
+        with pytest.raises(NetworkOverlapError):
+            await service.create_network(
+                "tenant-1", network_id="n3", cidr="10.0.4.0/24"
+            )
+
+        await service.create_network("tenant-1", network_id="n4", cidr="10.1.0.0/24")
+        with pytest.raises(NetworkOverlapError):
+            await service.create_network(
+                "tenant-1", network_id="n5", cidr="10.1.0.0/16"
+            )
+
+
+class TestServiceOverlapWithDatabase:
+    """Test overlap checks see networks written by other processes."""
+
+    @pytest.fixture
+    def session_factory(self):
+        sqlalchemy = pytest.importorskip("sqlalchemy")
+        from sqlalchemy.orm import sessionmaker
+        from sqlalchemy.pool import StaticPool
+
+        from dotmac.networking.ipam.core.models import IPNetwork
+
+        engine = sqlalchemy.create_engine("sqlite://", poolclass=StaticPool)
+        IPNetwork.metadata.create_all(engine)
+        yield sessionmaker(bind=engine)
+        engine.dispose()
+
+    @staticmethod
+    def _add_network(db, cidr):
+        from uuid import uuid4
+
+        from dotmac.networking.ipam.core.models import IPNetwork, NetworkType
+
+        db.add(
+            IPNetwork(
+                id=uuid4(),
+                tenant_id="tenant-1",
+                network_id=uuid4(),
+                cidr=cidr,
+                network_type=NetworkType.CUSTOMER,
+            )
+        )
+        db.commit()
+
+    @pytest.mark.asyncio
+    async def test_confirms_index_miss_against_database(self, session_factory):
+        service = IPAMService(database_session=session_factory())
+        assert await service._check_network_overlap("tenant-1", "10.0.4.0/24") is None
+
+        # Another worker creates a covering network after the index was loaded
+        self._add_network(session_factory(), "10.0.0.0/16")
+
+        assert (
+            await service._check_network_overlap("tenant-1", "10.0.4.0/24")
+            == "10.0.0.0/16"
+        )
+        assert await service._check_network_overlap("tenant-1", "10.1.0.0/24") is None
+
+    @staticmethod
+    def _deactivate_network(db, cidr):
+        from datetime import datetime
+
+        from dotmac.networking.ipam.core.models import IPNetwork
+
+        db.query(IPNetwork).filter(IPNetwork.cidr == cidr).update(
+            {IPNetwork.is_active: False, IPNetwork.updated_at: datetime.utcnow()},
+            synchronize_session=False,
+        )
+        db.commit()
+
+    @pytest.mark.asyncio
+    async def test_rechecks_index_hit_against_database(self, session_factory):
+        self._add_network(session_factory(), "10.0.0.0/16")
+        service = IPAMService(database_session=session_factory())
+        assert (
+            await service._check_network_overlap("tenant-1", "10.0.4.0/24")
+            == "10.0.0.0/16"
+        )
+
+        # Another worker deletes the network the index still holds
+        self._deactivate_network(session_factory(), "10.0.0.0/16")
+
+        assert await service._check_network_overlap("tenant-1", "10.0.4.0/24") is None
+
+    @pytest.mark.asyncio
+    async def test_index_miss_syncs_changes_without_reloading(self, session_factory):
+        self._add_network(session_factory(), "10.1.0.0/16")
+        service = IPAMService(database_session=session_factory())
+        assert await service._check_network_overlap("tenant-1", "10.0.4.0/24") is None
+        index = service._prefix_index.get("tenant-1", lambda: pytest.fail("reload"))
+
+        self._add_network(session_factory(), "10.0.0.0/16")
+        self._deactivate_network(session_factory(), "10.1.0.0/16")
+
+        assert (
+            await service._check_network_overlap("tenant-1", "10.0.4.0/24")
+            == "10.0.0.0/16"
+        )
+        assert await service._check_network_overlap("tenant-1", "10.1.4.0/24") is None
+        assert sorted(str(network) for network, _ in index) == ["10.0.0.0/16"]
+        assert (
+            service._prefix_index.get("tenant-1", lambda: pytest.fail("reload"))
+            is index
+        )
+
+    @pytest.mark.asyncio
+    async def test_postgresql_uses_inet_overlap_operator(
+        self, session_factory, monkeypatch
+    ):
+        from sqlalchemy.dialects import postgresql
+        from sqlalchemy.orm import Query
+
+        service = IPAMService(database_session=session_factory())
+        monkeypatch.setattr(service, "_is_postgresql", lambda: True)
+        captured = []
+        monkeypatch.setattr(
+            Query, "first", lambda query: captured.append(query.statement) or None
+        )
+
+        assert await service._check_network_overlap("tenant-1", "10.0.4.0/24") is None
+
+        sql = str(captured[-1].compile(dialect=postgresql.dialect()))
+        assert "&&" in sql
+        assert "CAST" in sql
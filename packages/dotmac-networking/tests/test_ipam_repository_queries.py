@@ -0,0 +1,172 @@
+"""
+Tests for IPAM repository range queries and aggregate reporting.
+
+Runs against in-memory SQLite (portable fallback paths) and checks that the
+PostgreSQL paths compile to native inet operators.
+"""
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from dotmac.networking.ipam.core.models import (  # noqa: E402
+    AllocationStatus,
+    IPAllocation,
+    IPNetwork,
+    IPReservation,
+    NetworkType,
+    ReservationStatus,
+)
+from dotmac.networking.ipam.repositories.ipam_repository import (  # noqa: E402
+    IPAMRepository,
+)
+
+TENANT = "tenant-a"
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    IPNetwork.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def add_network(db, cidr, tenant_id=TENANT, **kwargs):
+    network = IPNetwork(
+        id=uuid4(),
+        tenant_id=tenant_id,
+        network_id=uuid4(),
+        cidr=cidr,
+        network_type=kwargs.pop("network_type", NetworkType.CUSTOMER),
+        **kwargs,
+    )
+    db.add(network)
+    db.commit()
+    return network
+
+
+def add_allocation(db, network, ip_address, status=AllocationStatus.ALLOCATED):
+    allocation = IPAllocation(
+        id=uuid4(),
+        tenant_id=network.tenant_id,
+        allocation_id=uuid4(),
+        network_id=network.id,
+        ip_address=ip_address,
+        allocation_status=status,
+    )
+    db.add(allocation)
+    db.commit()
+    return allocation
+
+
+def add_reservation(db, network, ip_address, status=ReservationStatus.RESERVED):
+    reservation = IPReservation(
+        id=uuid4(),
+        tenant_id=network.tenant_id,
+        reservation_id=uuid4(),
+        network_id=network.id,
+        ip_address=ip_address,
+        reservation_status=status,
+        expires_at=datetime.utcnow() + timedelta(hours=1),
+    )
+    db.add(reservation)
+    db.commit()
+    return reservation
+
+
+class _ScalarResult:
+    def scalar(self):
+        return None
+
+
+class TestRangeQueries:
+    def test_overlapping_networks(self, session):
+        repo = IPAMRepository(session)
+        outer = add_network(session, "10.0.0.0/16")
+        inner = add_network(session, "10.0.5.0/24")
+        add_network(session, "192.168.0.0/24")
+        add_network(session, "10.0.0.0/8", tenant_id="tenant-b")
+
+        found = {n.id for n in repo.get_overlapping_networks(TENANT, "10.0.5.128/25")}
+        assert found == {outer.id, inner.id}
+        assert repo.get_overlapping_networks(TENANT, "172.16.0.0/12") == []
+
+    def test_networks_containing_ip(self, session):
+        repo = IPAMRepository(session)
+        outer = add_network(session, "10.0.0.0/16")
+        inner = add_network(session, "10.0.5.0/24")
+        add_network(session, "10.0.6.0/24")
+        add_network(session, "10.0.5.0/24", is_active=False)
+
+        found = repo.get_networks_containing_ip(TENANT, "10.0.5.7")
+        assert [n.id for n in found] == [outer.id, inner.id]
+        assert repo.get_networks_containing_ip(TENANT, "not-an-ip") == []
+
+    def test_find_next_available_ip_skips_used(self, session):
+        repo = IPAMRepository(session)
+        network = add_network(session, "10.1.0.0/29")
+        add_allocation(session, network, "10.1.0.1")
+        add_reservation(session, network, "10.1.0.2")
+        add_allocation(session, network, "10.1.0.3", AllocationStatus.RELEASED)
+
+        assert repo.find_next_available_ip(TENANT, network.network_id) == "10.1.0.3"
+
+    def test_native_queries_compile_for_postgresql(self, session):
+        repo = IPAMRepository(session)
+        network = add_network(session, "10.1.0.0/29")
+        session.refresh(network)
+
+        captured = []
+        session.execute = (
+            lambda statement: captured.append(statement) or _ScalarResult()
+        )
+        repo._find_first_free_ip_native(network)
+
+        sql = str(captured[0].compile(dialect=postgresql.dialect()))
+        assert "<<=" in sql
+        assert "host(" in sql
+        assert "LIMIT" in sql
+
+
+class TestAggregateReporting:
+    def test_tenant_summary(self, session):
+        repo = IPAMRepository(session)
+        network = add_network(session, "10.2.0.0/24")
+        add_network(session, "10.3.0.0/24", network_type=NetworkType.MANAGEMENT)
+        add_network(session, "10.4.0.0/24", is_active=False)
+        add_allocation(session, network, "10.2.0.1")
+        add_allocation(session, network, "10.2.0.2", AllocationStatus.RELEASED)
+        add_reservation(session, network, "10.2.0.3")
+
+        summary = repo.get_tenant_summary(TENANT)
+        assert summary["networks"]["total"] == 2
+        assert summary["allocations"] == {"total": 2, "active": 1}
+        assert summary["reservations"] == {"total": 1, "active": 1}
+
+    def test_tenant_utilization_matches_per_network_stats(self, session):
+        repo = IPAMRepository(session)
+        first = add_network(session, "10.5.0.0/24")
+        second = add_network(session, "10.6.0.0/28")
+        add_allocation(session, first, "10.5.0.1")
+        add_allocation(session, first, "10.5.0.2")
+        add_reservation(session, second, "10.6.0.1")
+
+        stats = repo.get_tenant_utilization_stats(TENANT)
+        assert set(stats) == {str(first.network_id), str(second.network_id)}
+        for network in (first, second):
+            expected = repo.get_network_utilization_stats(TENANT, network.network_id)
+            assert stats[str(network.network_id)] == expected
+        assert stats[str(first.network_id)]["allocated_count"] == 2
+        assert stats[str(second.network_id)]["reserved_count"] == 1
@@ -0,0 +1,270 @@
+"""
+Tests for the write-behind RADIUS accounting pipeline.
+"""
+
+import asyncio
+import struct
+
+import pytest
+
+from dotmac.networking.automation.radius.accounting import RADIUSAccounting
+from dotmac.networking.automation.radius.accounting_pipeline import (
+    AccountingSink,
+    MemoryAccountingSink,
+    SQLAlchemyAccountingSink,
+    WriteBehindAccountingBuffer,
+)
+from dotmac.networking.automation.radius.codec import RADIUSCodec, encode_attributes
+from dotmac.networking.automation.radius.manager import RADIUSManager
+from dotmac.networking.automation.radius.types import (
+    RADIUSAttributeType,
+    RADIUSClient,
+    RADIUSPacketType,
+    RADIUSServerConfig,
+)
+
+CLIENT = RADIUSClient(name="bng", ip_address="10.0.0.1", shared_secret="s")
+
+
+def accounting_request(status, session_id, username="alice", octets=0):
+    payload = encode_attributes(
+        [
+            (RADIUSAttributeType.ACCT_STATUS_TYPE, status),
+            (RADIUSAttributeType.USER_NAME, username),
+            (RADIUSAttributeType.ACCT_SESSION_ID, session_id),
+            (RADIUSAttributeType.ACCT_INPUT_OCTETS, octets),
+            (RADIUSAttributeType.ACCT_OUTPUT_OCTETS, octets * 2),
+            (RADIUSAttributeType.ACCT_OUTPUT_GIGAWORDS, 1),
+        ]
+    )
+    data = (
+        struct.pack("!BBH", RADIUSPacketType.ACCOUNTING_REQUEST, 1, 20 + len(payload))
+        + bytes(16)
+        + payload
+    )
+    return RADIUSCodec().parse(data)
+
+
+def record(record_type, session_id, username="alice", **fields):
+    return {
+        "type": record_type,
+        "client_ip": "10.0.0.1",
+        "session_id": session_id,
+        "username": username,
+        **fields,
+    }
+
+
+class FailingSink(AccountingSink):
+    def __init__(self, failures):
+        self.failures = failures
+        self.records = []
+
+    async def write_batch(self, records):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        self.records.extend(records)
+
+
+class TestWriteBehindBuffer:
+    @pytest.mark.asyncio
+    async def test_interim_updates_coalesce_per_session(self):
+        buffer = WriteBehindAccountingBuffer()
+        await buffer.add(record("start", "s1"))
+        for octets in (100, 200, 300):
+            await buffer.add(record("update", "s1", input_octets=octets))
+        await buffer.add(record("update", "s2", username="bob", input_octets=5))
+
+        assert buffer.pending_count == 3
+        assert buffer.stats["coalesced"] == 2
+
+        assert await buffer.flush() == 3
+        written = buffer.sink.records
+        assert [(r["type"], r["session_id"]) for r in written] == [
+            ("start", "s1"),
+            ("update", "s1"),
+            ("update", "s2"),
+        ]
+        assert written[1]["input_octets"] == 300
+
+    @pytest.mark.asyncio
+    async def test_stop_supersedes_pending_update(self):
+        buffer = WriteBehindAccountingBuffer()
+        await buffer.add(record("update", "s1", input_octets=1))
+        await buffer.add(record("stop", "s1", input_octets=2))
+
+        assert [r["type"] for r in buffer.pending_records()] == ["stop"]
+        assert buffer.get_session("s1")["status"] == "stopped"
+
+    @pytest.mark.asyncio
+    async def test_session_and_user_indexes(self):
+        buffer = WriteBehindAccountingBuffer()
+        await buffer.add(record("start", "s1", nas_port=7))
+        await buffer.add(record("update", "s1", input_octets=10))
+        await buffer.add(record("start", "s2"))
+        await buffer.add(record("start", "s3", username="bob"))
+        await buffer.flush()
+
+        state = buffer.get_session("s1")
+        assert state["nas_port"] == 7
+        assert state["input_octets"] == 10
+        assert state["status"] == "active"
+        assert buffer.get_session("s1", client_ip="10.9.9.9") is None
+        assert {s["session_id"] for s in buffer.get_user_sessions("alice")} == {
+            "s1",
+            "s2",
+        }
+
+    @pytest.mark.asyncio
+    async def test_closed_sessions_are_pruned(self):
+        buffer = WriteBehindAccountingBuffer(closed_session_ttl=0)
+        await buffer.add(record("start", "s1"))
+        await buffer.add(record("stop", "s1"))
+        await buffer.flush()
+
+        assert buffer.get_session("s1") is None
+        assert buffer.get_user_sessions("alice") == []
+
+    @pytest.mark.asyncio
+    async def test_idle_sessions_expire_after_last_interim_update(self, monkeypatch):
+        from dotmac.networking.automation.radius import accounting_pipeline
+
+        clock = [0.0]
+        monkeypatch.setattr(accounting_pipeline.time, "monotonic", lambda: clock[0])
+        buffer = WriteBehindAccountingBuffer(idle_session_ttl=60)
+        await buffer.add(record("start", "s1"))
+        await buffer.add(record("start", "s2"))
+        clock[0] = 50.0
+        await buffer.add(record("update", "s1", input_octets=10))
+
+        clock[0] = 70.0
+        await buffer.flush()
+
+        assert buffer.get_session("s1")["input_octets"] == 10
+        assert buffer.get_session("s2") is None
+        assert [s["session_id"] for s in buffer.get_user_sessions("alice")] == ["s1"]
+
+        clock[0] = 111.0
+        await buffer.flush()
+        assert buffer.get_session("s1") is None
+        assert buffer.get_user_sessions("alice") == []
+
+    @pytest.mark.asyncio
+    async def test_failed_batches_are_retried_without_losing_newer_data(self):
+        sink = FailingSink(failures=1)
+        buffer = WriteBehindAccountingBuffer(sink=sink)
+        await buffer.add(record("update", "s1", input_octets=1))
+
+        assert await buffer.flush() == 0
+        assert buffer.stats["failed_batches"] == 1
+        await buffer.add(record("update", "s1", input_octets=2))
+
+        assert await buffer.flush() == 1
+        assert sink.records[0]["input_octets"] == 2
+
+    @pytest.mark.asyncio
+    async def test_add_blocks_when_full_until_flush(self):
+        buffer = WriteBehindAccountingBuffer(max_pending=2, batch_size=100)
+        await buffer.add(record("start", "s1"))
+        await buffer.add(record("start", "s2"))
+        assert buffer.backlogged
+
+        blocked = asyncio.create_task(buffer.add(record("start", "s3")))
+        await asyncio.sleep(0)
+        assert not blocked.done()
+
+        await buffer.flush()
+        await asyncio.wait_for(blocked, 1)
+        assert buffer.stats["backpressure_waits"] == 1
+        assert buffer.pending_count == 1
+
+    @pytest.mark.asyncio
+    async def test_background_flush_and_stop_drain(self):
+        buffer = WriteBehindAccountingBuffer(flush_interval=0.01)
+        await buffer.start()
+        await buffer.add(record("start", "s1"))
+        await asyncio.sleep(0.05)
+        assert len(buffer.sink.records) == 1
+
+        await buffer.add(record("stop", "s1"))
+        await buffer.stop()
+        assert [r["type"] for r in buffer.sink.records] == ["start", "stop"]
+
+
+class TestRADIUSAccounting:
+    @pytest.mark.asyncio
+    async def test_interim_update_storm_is_coalesced(self):
+        accounting = RADIUSAccounting()
+        await accounting.process_accounting_request(
+            accounting_request(1, "abc"), CLIENT
+        )
+        for octets in range(1, 101):
+            await accounting.process_accounting_request(
+                accounting_request(3, "abc", octets=octets), CLIENT
+            )
+
+        records = accounting.get_accounting_records()
+        assert [r["type"] for r in records] == ["start", "update"]
+        assert records[1]["input_octets"] == 100
+        assert records[1]["output_gigawords"] == 1
+
+        session = accounting.get_session_accounting("abc")
+        assert session["output_octets"] == 200
+        assert accounting.get_user_accounting("alice") == records
+        assert accounting.get_user_sessions("alice")[0]["session_id"] == "abc"
+        assert accounting.get_stats()["coalesced"] == 99
+
+    def test_manager_uses_configured_sink(self):
+        sink = FailingSink(failures=0)
+        manager = RADIUSManager(RADIUSServerConfig(), accounting_sink=sink)
+        assert manager.accounting.buffer.sink is sink
+
+
+class TestSQLAlchemySink:
+    @pytest.mark.asyncio
+    async def test_batches_are_inserted(self):
+        sqlalchemy = pytest.importorskip("sqlalchemy")
+        from sqlalchemy.orm import sessionmaker
+        from sqlalchemy.pool import StaticPool
+
+        # Inserts run in a worker thread; share the single in-memory database
+        engine = sqlalchemy.create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        metadata = sqlalchemy.MetaData()
+        table = sqlalchemy.Table(
+            "radius_accounting",
+            metadata,
+            sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+            sqlalchemy.Column("type", sqlalchemy.String(10)),
+            sqlalchemy.Column("session_id", sqlalchemy.String(64)),
+            sqlalchemy.Column("input_octets", sqlalchemy.BigInteger),
+        )
+        metadata.create_all(engine)
+
+        sink = SQLAlchemyAccountingSink(
+            sessionmaker(bind=engine), table, ["type", "session_id", "input_octets"]
+        )
+        buffer = WriteBehindAccountingBuffer(sink=sink, batch_size=2)
+        for index in range(5):
+            await buffer.add(record("update", f"s{index}", input_octets=index))
+        await buffer.flush()
+
+        with engine.connect() as connection:
+            rows = connection.execute(sqlalchemy.select(table)).fetchall()
+        assert len(rows) == 5
+        assert buffer.stats["batches"] == 3
+
+    def test_memory_sink_is_default(self):
+        assert isinstance(WriteBehindAccountingBuffer().sink, MemoryAccountingSink)
+
+    @pytest.mark.asyncio
+    async def test_memory_sink_keeps_newest_records(self):
+        sink = MemoryAccountingSink(max_records=3)
+        await sink.write_batch([record("update", f"s{i}") for i in range(2)])
+        await sink.write_batch([record("update", f"s{i}") for i in range(2, 5)])
+
+        assert [r["session_id"] for r in sink.records] == ["s2", "s3", "s4"]
@@ -0,0 +1,327 @@
+"""
+Tests for the RADIUS packet codec.
+"""
+
+import hashlib
+import struct
+
+import pytest
+
+from dotmac.networking.automation.radius.codec import (
+    ClientSecret,
+    RADIUSCodec,
+    encode_attribute,
+    encode_attributes,
+)
+from dotmac.networking.automation.radius.manager import RADIUSManager
+from dotmac.networking.automation.radius.types import (
+    RADIUSAttribute,
+    RADIUSAttributeType,
+    RADIUSClient,
+    RADIUSPacket,
+    RADIUSPacketType,
+    RADIUSServerConfig,
+    RADIUSUser,
+)
+
+SECRET = "testing123"
+REQUEST_AUTH = bytes(range(16))
+
+
+def build_packet(packet_type, packet_id, attributes, authenticator=REQUEST_AUTH):
+    payload = encode_attributes(attributes)
+    header = struct.pack("!BBH", packet_type, packet_id, 20 + len(payload))
+    return header + authenticator + payload
+
+
+def encrypt_password(password, secret=SECRET, request_auth=REQUEST_AUTH):
+    """User-Password hiding computed directly from RFC 2865."""
+    padded = password + b"\x00" * (-len(password) % 16)
+    encrypted = b""
+    previous = request_auth
+    for offset in range(0, len(padded), 16):
+        key = hashlib.md5(secret.encode() + previous, usedforsecurity=False)
+        block = bytes(a ^ b for a, b in zip(padded[offset : offset + 16], key.digest()))
+        encrypted += block
+        previous = block
+    return encrypted
+
+
+def sign_request(data, secret=SECRET):
+    """Fill in an Accounting-Request authenticator (RFC 2866)."""
+    unsigned = data[:4] + bytes(16) + data[20:]
+    signature = hashlib.md5(unsigned + secret.encode(), usedforsecurity=False).digest()
+    return data[:4] + signature + data[20:]
+
+
+def reference_response_auth(data, request_auth, secret):
+    """Response authenticator computed directly from RFC 2865."""
+    return hashlib.md5(
+        data[:4] + request_auth + data[20:] + secret.encode(),
+        usedforsecurity=False,
+    ).digest()
+
+
+class TestPacketView:
+    def test_header_and_typed_accessors(self):
+        data = build_packet(
+            RADIUSPacketType.ACCOUNTING_REQUEST,
+            7,
+            [
+                (RADIUSAttributeType.USER_NAME, "alice"),
+                (RADIUSAttributeType.ACCT_STATUS_TYPE, 3),
+                (RADIUSAttributeType.ACCT_INPUT_OCTETS, 123456),
+                (RADIUSAttributeType.CLASS, b"a"),
+                (RADIUSAttributeType.CLASS, b"b"),
+            ],
+        )
+        view = RADIUSCodec().parse(data)
+
+        assert view.packet_type == RADIUSPacketType.ACCOUNTING_REQUEST
+        assert view.packet_id == 7
+        assert view.authenticator == REQUEST_AUTH
+        assert view.get_str(RADIUSAttributeType.USER_NAME) == "alice"
+        assert view.get_int(RADIUSAttributeType.ACCT_INPUT_OCTETS) == 123456
+        assert view.get_values(RADIUSAttributeType.CLASS) == [b"a", b"b"]
+        assert view.get_value(RADIUSAttributeType.NAS_PORT) is None
+        assert RADIUSAttributeType.ACCT_STATUS_TYPE in view
+        assert view.well_formed
+
+    def test_compatible_with_radius_packet_api(self):
+        attributes = [
+            (RADIUSAttributeType.USER_NAME, "bob"),
+            (RADIUSAttributeType.NAS_PORT, 12),
+        ]
+        view = RADIUSCodec().parse(
+            build_packet(RADIUSPacketType.ACCESS_REQUEST, 1, attributes)
+        )
+
+        attr = view.get_attribute(RADIUSAttributeType.USER_NAME)
+        assert attr.value == b"bob"
+        assert [a.type for a in view.attributes] == [1, 5]
+
+        packet = view.to_packet()
+        assert isinstance(packet, RADIUSPacket)
+        assert packet.get_attribute(RADIUSAttributeType.NAS_PORT).value == (
+            struct.pack("!I", 12)
+        )
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"\x01\x01\x00\x14",  # shorter than header
+            struct.pack("!BBH", 1, 1, 30) + REQUEST_AUTH,  # length mismatch
+            struct.pack("!BBH", 99, 1, 20) + REQUEST_AUTH,  # unknown code
+        ],
+    )
+    def test_rejects_invalid_header(self, data):
+        assert RADIUSCodec().parse(data) is None
+
+    def test_truncated_attribute_stops_scan(self):
+        data = build_packet(
+            RADIUSPacketType.ACCESS_REQUEST,
+            1,
+            [(RADIUSAttributeType.USER_NAME, "carol")],
+        )
+        data = data[:2] + struct.pack("!H", len(data) + 3) + data[4:] + b"\x04\x09\x00"
+        view = RADIUSCodec().parse(data)
+
+        assert view.get_str(RADIUSAttributeType.USER_NAME) == "carol"
+        assert view.get_value(RADIUSAttributeType.NAS_IP_ADDRESS) is None
+        assert not view.well_formed
+
+
+class TestEncoding:
+    def test_encode_attribute_types(self):
+        assert encode_attribute(1, "ab") == b"\x01\x04ab"
+        assert encode_attribute(27, 3600) == b"\x1b\x06" + struct.pack("!I", 3600)
+        with pytest.raises(ValueError):
+            encode_attribute(18, b"x" * 254)
+
+    def test_response_authenticator_matches_rfc(self):
+        codec = RADIUSCodec()
+        packet = RADIUSPacket(
+            packet_type=RADIUSPacketType.ACCESS_ACCEPT,
+            packet_id=42,
+            authenticator=REQUEST_AUTH,
+        )
+        packet.add_attribute(RADIUSAttributeType.REPLY_MESSAGE, "welcome")
+
+        data = codec.encode(packet, SECRET)
+
+        assert data[0] == RADIUSPacketType.ACCESS_ACCEPT
+        assert data[1] == 42
+        assert struct.unpack("!H", data[2:4])[0] == len(data)
+        assert data[4:20] == reference_response_auth(data, REQUEST_AUTH, SECRET)
+
+    def test_unsigned_accounting_request_is_dropped(self):
+        manager = RADIUSManager(RADIUSServerConfig())
+        data = build_packet(
+            RADIUSPacketType.ACCOUNTING_REQUEST,
+            4,
+            [(RADIUSAttributeType.ACCT_STATUS_TYPE, 1)],
+        )
+
+        assert manager._parse_packet(data, SECRET) is None
+        assert manager._parse_packet(sign_request(data), SECRET) is not None
+        assert manager._parse_packet(sign_request(data, "other"), SECRET) is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("encrypted", "expected"),
+        [
+            (encrypt_password(b"s3cret"), RADIUSPacketType.ACCESS_ACCEPT),
+            (encrypt_password(b"wrong"), RADIUSPacketType.ACCESS_REJECT),
+            (encrypt_password(b"s3cret", secret="other"), RADIUSPacketType.ACCESS_REJECT),
+            (b"short", RADIUSPacketType.ACCESS_REJECT),
+        ],
+    )
+    async def test_access_request_checks_user_password(self, encrypted, expected):
+        manager = RADIUSManager(RADIUSServerConfig())
+        client = RADIUSClient(name="nas", ip_address="192.0.2.1", shared_secret=SECRET)
+        manager.add_client(client)
+        manager.authenticator.add_user(RADIUSUser(username="erin", password="s3cret"))
+
+        request = manager._parse_packet(
+            build_packet(
+                RADIUSPacketType.ACCESS_REQUEST,
+                5,
+                [
+                    (RADIUSAttributeType.USER_NAME, "erin"),
+                    (RADIUSAttributeType.USER_PASSWORD, encrypted),
+                ],
+            ),
+            SECRET,
+        )
+        response = await manager._handle_access_request(request, client)
+
+        assert response.packet.packet_type == expected
+
+    def test_template_appended_after_attributes(self):
+        codec = RADIUSCodec()
+        template = codec.register_template(
+            "gold",
+            [
+                (RADIUSAttributeType.SESSION_TIMEOUT, 86400),
+                RADIUSAttribute(RADIUSAttributeType.FILTER_ID, "gold-100M"),
+            ],
+        )
+        packet = RADIUSPacket(
+            packet_type=RADIUSPacketType.ACCESS_ACCEPT,
+            packet_id=1,
+            authenticator=REQUEST_AUTH,
+            encoded_attributes=template.payload,
+        )
+        packet.add_attribute(RADIUSAttributeType.FRAMED_IP_ADDRESS, b"\x0a\x00\x00\x01")
+
+        view = codec.parse(codec.encode(packet, SECRET))
+        assert [a.type for a in view.attributes] == [8, 27, 11]
+        assert view.get_str(RADIUSAttributeType.FILTER_ID) == "gold-100M"
+        assert codec.get_template("gold") is template
+        assert codec.get_template(None) is None
+
+
+class TestClientSecret:
+    def test_secret_state_is_cached(self):
+        codec = RADIUSCodec()
+        assert codec.secret_for(SECRET) is codec.secret_for(SECRET)
+
+    def test_decrypt_password(self):
+        password = b"a-rather-long-password"
+        encrypted = encrypt_password(password)
+
+        secret = ClientSecret(SECRET)
+        assert secret.decrypt_password(encrypted, REQUEST_AUTH) == password
+        assert secret.decrypt_password(encrypted, REQUEST_AUTH) == password
+        with pytest.raises(ValueError):
+            secret.decrypt_password(b"short", REQUEST_AUTH)
+
+    def test_verify_request_authenticator(self):
+        signed = sign_request(
+            build_packet(
+                RADIUSPacketType.ACCOUNTING_REQUEST,
+                3,
+                [(RADIUSAttributeType.ACCT_STATUS_TYPE, 3)],
+            )
+        )
+
+        assert ClientSecret(SECRET).verify_request_authenticator(signed)
+        assert not ClientSecret("other").verify_request_authenticator(signed)
+
+
+class TestManagerIntegration:
+    @pytest.mark.asyncio
+    async def test_access_accept_includes_service_profile(self):
+        manager = RADIUSManager(RADIUSServerConfig())
+        client = RADIUSClient(name="nas", ip_address="192.0.2.1", shared_secret=SECRET)
+        manager.add_client(client)
+        manager.authenticator.add_user(
+            RADIUSUser(username="dave", attributes={"service_profile": "gold"})
+        )
+        manager.register_service_profile(
+            "gold", [(RADIUSAttributeType.SESSION_TIMEOUT, 3600)]
+        )
+
+        request = manager._parse_packet(
+            build_packet(
+                RADIUSPacketType.ACCESS_REQUEST,
+                9,
+                [
+                    (RADIUSAttributeType.USER_NAME, "dave"),
+                    (RADIUSAttributeType.NAS_PORT, 1),
+                    (RADIUSAttributeType.CALLING_STATION_ID, "00-11-22-33-44-55"),
+                ],
+            ),
+            SECRET,
+        )
+        response = await manager._handle_access_request(request, client)
+        data = manager._build_response_packet(response, SECRET)
+
+        reply = manager.codec.parse(data)
+        assert reply.packet_type == RADIUSPacketType.ACCESS_ACCEPT
+        assert reply.packet_id == 9
+        assert reply.get_int(RADIUSAttributeType.SESSION_TIMEOUT) == 3600
+        assert data[4:20] == reference_response_auth(data, REQUEST_AUTH, SECRET)
+
+    def test_unsigned_accounting_request_is_dropped(self):
+        manager = RADIUSManager(RADIUSServerConfig())
+        data = build_packet(
+            RADIUSPacketType.ACCOUNTING_REQUEST,
+            4,
+            [(RADIUSAttributeType.ACCT_STATUS_TYPE, 1)],
+        )
+
+        assert manager._parse_packet(data, SECRET) is None
+        assert manager._parse_packet(sign_request(data), SECRET) is not None
+        assert manager._parse_packet(sign_request(data, "other"), SECRET) is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("encrypted", "expected"),
+        [
+            (encrypt_password(b"s3cret"), RADIUSPacketType.ACCESS_ACCEPT),
+            (encrypt_password(b"wrong"), RADIUSPacketType.ACCESS_REJECT),
+            (encrypt_password(b"s3cret", secret="other"), RADIUSPacketType.ACCESS_REJECT),
+            (b"short", RADIUSPacketType.ACCESS_REJECT),
+        ],
+    )
+    async def test_access_request_checks_user_password(self, encrypted, expected):
+        manager = RADIUSManager(RADIUSServerConfig())
+        client = RADIUSClient(name="nas", ip_address="192.0.2.1", shared_secret=SECRET)
+        manager.add_client(client)
+        manager.authenticator.add_user(RADIUSUser(username="erin", password="s3cret"))
+
+        request = manager._parse_packet(
+            build_packet(
+                RADIUSPacketType.ACCESS_REQUEST,
+                5,
+                [
+                    (RADIUSAttributeType.USER_NAME, "erin"),
+                    (RADIUSAttributeType.USER_PASSWORD, encrypted),
+                ],
+            ),
+            SECRET,
+        )
+        response = await manager._handle_access_request(request, client)
+
+        assert response.packet.packet_type == expected
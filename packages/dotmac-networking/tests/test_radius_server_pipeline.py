@@ -0,0 +1,274 @@
+"""
+Tests for the bounded RADIUS packet pipeline, shared session backends and
+multi-worker server mode.
+"""
+
+import asyncio
+import socket
+import struct
+from unittest.mock import AsyncMock
+
+import pytest
+
+from dotmac.networking.automation.radius.codec import encode_attributes
+from dotmac.networking.automation.radius.manager import RADIUSManager
+from dotmac.networking.automation.radius.session import (
+    MemorySessionBackend,
+    RADIUSSessionManager,
+    RedisSessionBackend,
+)
+from dotmac.networking.automation.radius.types import (
+    RADIUSAttributeType,
+    RADIUSClient,
+    RADIUSPacketType,
+    RADIUSServerConfig,
+    RADIUSSession,
+    RADIUSSessionStatus,
+    RADIUSUser,
+)
+from dotmac.networking.automation.radius.workers import RADIUSWorkerPool
+
+SECRET = "testing123"
+
+
+def access_request(packet_id, username="alice"):
+    payload = encode_attributes([(RADIUSAttributeType.USER_NAME, username)])
+    header = struct.pack(
+        "!BBH", RADIUSPacketType.ACCESS_REQUEST, packet_id, 20 + len(payload)
+    )
+    return header + bytes(16) + payload
+
+
+def free_udp_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def configured_manager(config):
+    """Manager factory used in worker processes."""
+    manager = RADIUSManager(config)
+    manager.add_client(
+        RADIUSClient(name="local", ip_address="127.0.0.1", shared_secret=SECRET)
+    )
+    manager.authenticator.add_user(RADIUSUser(username="alice"))
+    return manager
+
+
+class TestPacketPipeline:
+    @pytest.mark.asyncio
+    async def test_overload_is_shed_and_counted(self):
+        manager = RADIUSManager(RADIUSServerConfig(queue_size=2))
+        queue = asyncio.Queue(maxsize=2)
+
+        for packet_id in range(5):
+            manager._enqueue_packet(queue, (access_request(packet_id), ("x", 1)))
+
+        stats = (await manager.get_server_stats())["pipeline"]
+        assert stats["received"] == 5
+        assert stats["dropped"] == 3
+        assert stats["queue_high_water"] == 2
+        assert queue.qsize() == 2
+
+    @pytest.mark.asyncio
+    async def test_serves_batches_through_bounded_handlers(self):
+        config = RADIUSServerConfig(
+            bind_address="127.0.0.1",
+            auth_port=free_udp_port(),
+            handler_concurrency=2,
+            recv_batch_size=8,
+        )
+        manager = configured_manager(config)
+        server_sock = manager._bind_socket(config.auth_port)
+        manager._running = True
+        server = asyncio.create_task(manager._serve_socket(server_sock, "auth"))
+
+        client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        client.settimeout(2)
+        try:
+            for packet_id in range(20):
+                client.sendto(
+                    access_request(packet_id), ("127.0.0.1", config.auth_port)
+                )
+
+            loop = asyncio.get_running_loop()
+            replies = set()
+            for _ in range(20):
+                data = await loop.run_in_executor(None, client.recv, 4096)
+                assert data[0] == RADIUSPacketType.ACCESS_ACCEPT
+                replies.add(data[1])
+            assert replies == set(range(20))
+        finally:
+            manager._running = False
+            server.cancel()
+            await asyncio.gather(server, return_exceptions=True)
+            server_sock.close()
+            client.close()
+
+        stats = (await manager.get_server_stats())["pipeline"]
+        assert stats["received"] == 20
+        assert stats["processed"] == 20
+        assert stats["dropped"] == 0
+        assert len(manager.session_manager.get_active_sessions()) == 20
+
+    def test_reuse_port_allows_shared_binding(self):
+        config = RADIUSServerConfig(
+            bind_address="127.0.0.1", auth_port=free_udp_port(), reuse_port=True
+        )
+        first = RADIUSManager(config)._bind_socket(config.auth_port)
+        second = RADIUSManager(config)._bind_socket(config.auth_port)
+        try:
+            assert first.getsockname() == second.getsockname()
+        finally:
+            first.close()
+            second.close()
+
+
+class TestSessionBackends:
+    def test_session_round_trips_through_dict(self):
+        session = RADIUSSession(
+            username="bob", nas_ip="10.0.0.1", status=RADIUSSessionStatus.ACTIVE
+        )
+        restored = RADIUSSession.from_dict(session.to_dict())
+        assert restored == session
+
+    @pytest.mark.asyncio
+    async def test_memory_backend_is_default(self):
+        manager = RADIUSSessionManager()
+        assert isinstance(manager.backend, MemorySessionBackend)
+
+        session = await manager.create_session(RADIUSSession(username="carol"))
+        assert manager.get_session(session.session_id) is session
+        assert await manager.remove_session(session.session_id)
+        assert not await manager.remove_session(session.session_id)
+
+    @pytest.mark.asyncio
+    async def test_redis_backend_shares_sessions_between_workers(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        worker_a = RADIUSSessionManager(
+            RedisSessionBackend(client=fakeredis.aioredis.FakeRedis(server=server))
+        )
+        worker_b = RADIUSSessionManager(
+            RedisSessionBackend(client=fakeredis.aioredis.FakeRedis(server=server))
+        )
+
+        session = await worker_a.create_session(
+            RADIUSSession(username="dave", status=RADIUSSessionStatus.ACTIVE)
+        )
+
+        loaded = await worker_b.load_session(session.session_id)
+        assert loaded.username == "dave"
+        assert [s.session_id for s in await worker_b.load_user_sessions("dave")] == [
+            session.session_id
+        ]
+
+        loaded.status = RADIUSSessionStatus.TERMINATED
+        await worker_b.update_session(loaded)
+        reloaded = await worker_a.load_session(session.session_id)
+        assert reloaded.status == RADIUSSessionStatus.TERMINATED
+
+        assert await worker_b.remove_session(session.session_id)
+        assert await worker_a.load_session(session.session_id) is None
+        assert await worker_a.load_user_sessions("dave") == []
+
+    @pytest.mark.asyncio
+    async def test_redis_session_keys_expire_with_session_timeouts(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        client = fakeredis.aioredis.FakeRedis()
+        backend = RedisSessionBackend(client=client, default_ttl=600)
+
+        timed = RADIUSSession(username="dave", session_timeout=3600, session_time=600)
+        idle = RADIUSSession(username="dave", session_timeout=3600, idle_timeout=300)
+        untimed = RADIUSSession(username="dave")
+        for session in (timed, idle, untimed):
+            await backend.save(session)
+
+        assert await client.ttl(backend._key(timed.session_id)) == 3000
+        assert await client.ttl(backend._key(idle.session_id)) == 300
+        assert await client.ttl(backend._key(untimed.session_id)) == 600
+
+        # An expired key leaves its index entries behind until they are read
+        await client.delete(backend._key(idle.session_id))
+        assert {s.session_id for s in await backend.get_user_sessions("dave")} == {
+            timed.session_id,
+            untimed.session_id,
+        }
+        assert await client.scard(backend._user_key("dave")) == 2
+        assert await client.scard(backend._all_key) == 2
+
+    @pytest.mark.asyncio
+    async def test_cleanup_prunes_sessions_gone_from_backend(self):
+        backend = MemorySessionBackend()
+        worker_a = RADIUSSessionManager(backend)
+        worker_b = RADIUSSessionManager(backend)
+        session = await worker_a.create_session(RADIUSSession(username="frank"))
+        kept = await worker_a.create_session(RADIUSSession(username="frank"))
+
+        assert await worker_b.remove_session(session.session_id)
+        assert worker_a.get_session(session.session_id) is session
+
+        await worker_a._cleanup_expired_sessions()
+        assert worker_a.get_session(session.session_id) is None
+        assert worker_a.get_user_sessions("frank") == [kept]
+
+    @pytest.mark.asyncio
+    async def test_manager_reads_sessions_from_shared_backend(self):
+        backend = MemorySessionBackend()
+        worker_a = RADIUSManager(RADIUSServerConfig())
+        worker_b = RADIUSManager(RADIUSServerConfig())
+        for manager in (worker_a, worker_b):
+            manager.session_manager = RADIUSSessionManager(backend)
+            manager.coa_manager.disconnect_session = AsyncMock(return_value=True)
+
+        session = await worker_a.session_manager.create_session(
+            RADIUSSession(username="erin", status=RADIUSSessionStatus.ACTIVE)
+        )
+
+        assert (await worker_b.get_session(session.session_id)).username == "erin"
+        assert [s.session_id for s in await worker_b.get_active_sessions()] == [
+            session.session_id
+        ]
+        assert (await worker_b.get_server_stats())["active_sessions"] == 1
+
+        assert await worker_b.disconnect_session(session.session_id)
+        worker_b.coa_manager.disconnect_session.assert_awaited_once()
+        assert await worker_a.get_session(session.session_id) is None
+        assert await worker_a.get_active_sessions() == []
+        assert not await worker_a.disconnect_session(session.session_id)
+
+
+@pytest.mark.skipif(
+    not hasattr(socket, "SO_REUSEPORT"), reason="SO_REUSEPORT not supported"
+)
+class TestWorkerPool:
+    def test_workers_share_port_and_answer_requests(self):
+        config = RADIUSServerConfig(
+            bind_address="127.0.0.1",
+            auth_port=free_udp_port(),
+            enable_accounting=False,
+            enable_coa=False,
+        )
+        pool = RADIUSWorkerPool(config, configured_manager, workers=2)
+        assert pool.config.reuse_port
+
+        pool.start()
+        client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        client.settimeout(0.5)
+        try:
+            assert pool.alive_count() == 2
+            for attempt in range(20):
+                client.sendto(access_request(attempt), ("127.0.0.1", config.auth_port))
+                try:
+                    data = client.recv(4096)
+                except socket.timeout:
+                    continue
+                assert data[0] == RADIUSPacketType.ACCESS_ACCEPT
+                break
+            else:
+                pytest.fail("No response from RADIUS workers")
+        finally:
+            client.close()
+            pool.stop(timeout=5)
+
+        assert pool.alive_count() == 0
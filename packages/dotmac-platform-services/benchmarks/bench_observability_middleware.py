@@ -0,0 +1,170 @@
+"""
+Benchmark: observability middleware overhead on a trivial FastAPI route.
+
+Compares the stacked BaseHTTPMiddleware layers (security, performance,
+logging, tracing, metrics, ObservabilityMiddleware) with the single-pass
+ObservabilityASGIMiddleware. Requests are driven in-process through the ASGI
+interface, so the numbers isolate middleware cost from the HTTP server:
+
+    python benchmarks/bench_observability_middleware.py --requests 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+import structlog
+from dotmac_benchmarking import BenchmarkRunner
+from fastapi import FastAPI
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from dotmac.platform.observability.config import ObservabilityConfig
+from dotmac.platform.observability.middleware import (
+    LoggingMiddleware,
+    MetricsMiddleware,
+    ObservabilityASGIMiddleware,
+    ObservabilityMiddleware,
+    PerformanceMonitoringMiddleware,
+    SecurityMiddleware,
+    TracingMiddleware,
+    setup_observability_middleware,
+)
+
+
+class StackedMiddlewareConfig(ObservabilityConfig):
+    """Settings the BaseHTTPMiddleware classes read from their config."""
+
+    json_logging: bool = True
+    slow_request_threshold: float = 1000.0
+
+
+def configure_logging() -> None:
+    """Stdlib-backed structlog, as StructuredLogger sets it up, with INFO filtered.
+
+    Measures middleware work rather than log I/O: INFO records are built and
+    then dropped by the level filter.
+    """
+    logging.basicConfig(format="%(message)s", level=logging.WARNING)
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.JSONRenderer(),
+        ],
+        wrapper_class=structlog.stdlib.BoundLogger,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
+
+
+def trivial_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/customers/{customer_id}")
+    async def get_customer(customer_id: str):
+        return {"id": customer_id, "status": "active"}
+
+    return app
+
+
+def stacked_app() -> FastAPI:
+    app = trivial_app()
+    config = StackedMiddlewareConfig()
+    # Same order the previous setup_observability_middleware used
+    app.add_middleware(SecurityMiddleware, config=config, service_name="bench")
+    app.add_middleware(PerformanceMonitoringMiddleware, config=config, service_name="bench")
+    app.add_middleware(LoggingMiddleware, config=config, service_name="bench")
+    app.add_middleware(TracingMiddleware, config=config, service_name="bench")
+    app.add_middleware(MetricsMiddleware, service_name="bench")
+    app.add_middleware(ObservabilityMiddleware, config=config, service_name="bench")
+    return app
+
+
+def fused_app() -> FastAPI:
+    app = trivial_app()
+    setup_observability_middleware(app, service_name="bench")
+    return app
+
+
+def request_scope(index: int) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": f"/customers/{index % 500}",
+        "raw_path": f"/customers/{index % 500}".encode(),
+        "query_string": b"",
+        "root_path": "",
+        # Spread clients so per-IP rate limit warnings do not fire
+        "client": (f"10.0.{index % 250}.{index % 7}", 50000),
+        "server": ("testserver", 80),
+        "headers": [
+            (b"host", b"testserver"),
+            (b"user-agent", b"bench/1.0"),
+            (b"accept", b"application/json"),
+            (b"x-tenant-id", b"tenant-1"),
+            (b"x-correlation-id", f"corr-{index}".encode()),
+        ],
+    }
+
+
+async def serve(app: FastAPI, requests: int) -> None:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"unexpected status {message['status']}")
+
+    for index in range(requests):
+        await app(request_scope(index), receive, send)
+
+
+async def main(requests: int, samples: int):
+    configure_logging()
+    apps = {"bare": trivial_app(), "stacked": stacked_app(), "fused": fused_app()}
+    for app in apps.values():
+        await serve(app, 100)
+
+    runner = BenchmarkRunner()
+    rps = {}
+    for name, app in apps.items():
+        result = await runner.run(
+            f"middleware {name}",
+            lambda app=app: serve(app, requests),
+            samples=samples,
+            metadata={"requests": requests},
+        )
+        rps[name] = requests / result.avg_duration
+        print(
+            f"{result.label:<20} avg {result.avg_duration:7.3f} s  "
+            f"p95 {result.p95_duration:7.3f} s  {rps[name]:9.0f} req/s"
+        )
+
+    print(f"fused vs stacked: {rps['fused'] / rps['stacked']:.2f}x requests/s")
+    overhead = {name: 1e6 / rps[name] - 1e6 / rps["bare"] for name in ("stacked", "fused")}
+    print(
+        f"middleware overhead per request: stacked {overhead['stacked']:.0f} us, "
+        f"fused {overhead['fused']:.0f} us"
+    )
+
+    # 500 distinct customer paths collapse onto one route template
+    layer = apps["fused"].middleware_stack
+    while not isinstance(layer, ObservabilityASGIMiddleware):
+        layer = layer.app
+    print(f"fused endpoint stats: {sorted(layer.get_performance_stats())}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.samples))
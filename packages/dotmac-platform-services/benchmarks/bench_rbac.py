@@ -0,0 +1,163 @@
+"""
+Benchmark: RBAC permission checks.
+
+Builds a role graph shaped like a multi-tenant ISP deployment (departmental
+role chains inheriting from shared base roles, a mix of exact, wildcard and
+pattern permissions) and runs permission checks for users with one to three
+roles, with and without the result cache. A cache smaller than the working
+set of (user, action, resource) keys measures eviction churn:
+
+    python benchmarks/bench_rbac.py --checks 1000000
+    python benchmarks/bench_rbac.py --cache-size 1000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+from dotmac_benchmarking import BenchmarkRunner
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from dotmac.platform.auth.rbac_engine import Permission, RBACEngine, Role
+
+RESOURCES = [
+    "customer",
+    "customer_contact",
+    "customer_note",
+    "invoice",
+    "payment",
+    "refund",
+    "subscription",
+    "service",
+    "device",
+    "ticket",
+    "ticket_comment",
+    "ip_address",
+    "radius_session",
+    "report",
+    "user",
+    "tenant",
+]
+ACTIONS = ["read", "write", "delete", "approve", "export_csv", "export_pdf", "execute"]
+DEPARTMENTS = ["support", "billing", "noc", "sales", "field", "finance", "provisioning"]
+
+
+def build_engine(cache_size: int, seed: int = 7) -> RBACEngine:
+    """Role graph: base roles, department chains of depth 4, tenant admins."""
+    rng = random.Random(seed)  # noqa: S311 - reproducible workload
+    engine = RBACEngine(cache_size=cache_size)
+
+    engine.add_role(
+        Role("employee", permissions={Permission("read", "user"), Permission("read", "tenant")})
+    )
+    engine.add_role(
+        Role(
+            "reporting",
+            permissions={Permission("export.*", "report"), Permission("read", "report")},
+            parent_roles={"employee"},
+        )
+    )
+
+    for department in DEPARTMENTS:
+        parent = "employee"
+        for level in ("agent", "senior", "lead", "manager"):
+            name = f"{department}_{level}"
+            permissions = {
+                Permission(rng.choice(ACTIONS[:3]), rng.choice(RESOURCES)) for _ in range(12)
+            }
+            if level in ("lead", "manager"):
+                permissions.add(Permission("approve", rng.choice(RESOURCES)))
+                permissions.add(Permission("read", "customer_.*"))
+            if level == "manager":
+                permissions.add(Permission("*", rng.choice(RESOURCES)))
+            parents = {parent, "reporting"} if level == "manager" else {parent}
+            engine.add_role(Role(name, permissions=permissions, parent_roles=parents))
+            parent = name
+
+    engine.add_role(
+        Role(
+            "tenant_admin",
+            permissions={Permission("read", "*"), Permission("write", "*")},
+            parent_roles={"support_manager", "billing_manager"},
+        )
+    )
+    return engine
+
+
+def assign_users(engine: RBACEngine, users: int, seed: int = 11) -> list[str]:
+    rng = random.Random(seed)  # noqa: S311 - reproducible workload
+    roles = [name for name in engine.roles if name not in ("super_admin", "admin", "guest")]
+    user_ids = []
+    for index in range(users):
+        user_id = f"user-{index}"
+        for role_name in rng.sample(roles, rng.randint(1, 3)):
+            engine.assign_user_role(user_id, role_name)
+        user_ids.append(user_id)
+    return user_ids
+
+
+def check_requests(user_ids: list[str], checks: int, seed: int = 13) -> list[tuple[str, ...]]:
+    """Skewed traffic: a few active users and common endpoints dominate."""
+    rng = random.Random(seed)  # noqa: S311 - reproducible workload
+    users = rng.choices(user_ids, weights=[1 / (i + 1) for i in range(len(user_ids))], k=checks)
+    actions = rng.choices(ACTIONS, weights=[50, 20, 5, 5, 5, 5, 10], k=checks)
+    resources = rng.choices(RESOURCES, k=checks)
+    return list(zip(users, actions, resources, strict=True))
+
+
+def run_checks(engine: RBACEngine, requests: list[tuple[str, ...]], use_cache: bool) -> int:
+    check = engine.check_permission
+    granted = 0
+    for user_id, action, resource in requests:
+        if check(user_id, action, resource, use_cache=use_cache):
+            granted += 1
+    return granted
+
+
+def _as_async(fn, *args):
+    async def run():
+        fn(*args)
+
+    return run
+
+
+async def main(checks: int, users: int, samples: int, cache_size: int):
+    runner = BenchmarkRunner()
+    engine = build_engine(cache_size)
+    user_ids = assign_users(engine, users)
+    requests = check_requests(user_ids, checks)
+    metadata = {"checks": checks, "users": users, "roles": len(engine.roles)}
+
+    print(
+        f"{len(engine.roles)} roles, {users} users, {checks} checks, "
+        f"{run_checks(engine, requests[:10000], False) / 100:.0f}% granted"
+    )
+
+    for label, use_cache in (("uncached", False), ("cached", True)):
+        engine.clear_cache()
+        result = await runner.run(
+            f"rbac {label}",
+            _as_async(run_checks, engine, requests, use_cache),
+            samples=samples,
+            metadata={**metadata, "cache": use_cache},
+        )
+        print(
+            f"{result.label:<16} avg {result.avg_duration:7.3f} s  "
+            f"p95 {result.p95_duration:7.3f} s  "
+            f"{checks / result.avg_duration:12.0f} checks/s"
+        )
+
+    print(f"cache: {engine.get_cache_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--checks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--samples", type=int, default=3)
+    parser.add_argument("--cache-size", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.checks, args.users, args.samples, args.cache_size))
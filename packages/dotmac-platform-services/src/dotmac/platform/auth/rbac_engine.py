@@ -12,12 +12,48 @@ Provides comprehensive role and permission management with:
 
 import logging
 import re
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Permission components that grant every action or resource
+WILDCARDS = frozenset({"*", "all"})
+
+_PATTERN_CHARS = frozenset(r".*+?^${}[]|()\\")
+
+# Action and resource are matched together as "action\nresource"
+_ANY_COMPONENT = r"[^\n]*"
+
+
+def _is_pattern(value: str) -> bool:
+    """Check if a permission component is a regex pattern."""
+    return not _PATTERN_CHARS.isdisjoint(value)
+
+
+@lru_cache(maxsize=1024)
+def _compile_component(pattern: str) -> re.Pattern[str] | None:
+    """Compile a permission component pattern; None if it is not valid regex."""
+    try:
+        return re.compile(pattern)
+    except re.error:
+        logger.warning("Ignoring invalid permission pattern: %s", pattern)
+        return None
+
+
+def _component_matches(granted: str, required: str) -> bool:
+    """Check one permission component (action or resource) against a request."""
+    if granted in WILDCARDS or granted == required:
+        return True
+    if _is_pattern(granted):
+        compiled = _compile_component(granted)
+        return compiled is not None and compiled.match(required) is not None
+    return False
+
 
 class PermissionType(str, Enum):
     """Types of permissions."""
@@ -63,41 +99,20 @@ class Permission:
         self.resource = self.resource.lower()
 
     def matches(self, required_action: str, required_resource: str) -> bool:
-        """Check if this permission matches the required permission."""
-        # Exact match
-        if self.action == required_action.lower() and self.resource == required_resource.lower():
-            return True
-
-        # Wildcard matches
-        if self.action in ("*", "all"):
-            if self.resource == required_resource.lower() or self.resource == "*":
-                return True
-
-        if self.resource in ("*", "all"):
-            if self.action == required_action.lower() or self.action == "*":
-                return True
-
-        # Pattern-based matching (regex)
-        if self._is_pattern(self.action) and re.match(self.action, required_action) and (
-            self.resource == required_resource.lower()
-            or self.resource == "*"
-            or (self._is_pattern(self.resource) and re.match(self.resource, required_resource))
-        ):
-            return True
-
-        if self._is_pattern(self.resource) and re.match(self.resource, required_resource):
-            if (
-                self.action == required_action.lower()
-                or self.action == "*"
-                or (self._is_pattern(self.action) and re.match(self.action, required_action))
-            ):
-                return True
-
-        return False
+        """
+        Check if this permission matches the required permission.
+
+        Each component matches exactly, as a wildcard (``*`` or ``all``) or,
+        when it contains regex metacharacters, as a pattern anchored at the
+        start of the required value.
+        """
+        return _component_matches(self.action, required_action.lower()) and _component_matches(
+            self.resource, required_resource.lower()
+        )
 
     def _is_pattern(self, value: str) -> bool:
         """Check if value is a regex pattern."""
-        return any(char in value for char in r".*+?^${}[]|()\\")
+        return _is_pattern(value)
 
     def __str__(self) -> str:
         """String representation."""
@@ -122,6 +137,104 @@ class Permission:
         )
 
 
+class CompiledPermissions:
+    """
+    A set of permissions compiled for fast matching.
+
+    Exact and wildcard permissions become hash-set lookups; all pattern
+    permissions are combined into one regex over ``"action\\nresource"``.
+    """
+
+    __slots__ = ("allow_all", "any_action", "any_resource", "exact", "pattern")
+
+    def __init__(self, permissions: Iterable[Permission] = ()) -> None:
+        self.allow_all = False
+        self.exact: set[tuple[str, str]] = set()
+        self.any_action: set[str] = set()  # resources granted for every action
+        self.any_resource: set[str] = set()  # actions granted on every resource
+
+        alternatives = []
+        for permission in permissions:
+            action, resource = permission.action, permission.resource
+            action_wildcard = action in WILDCARDS
+            resource_wildcard = resource in WILDCARDS
+            action_pattern = not action_wildcard and _is_pattern(action)
+            resource_pattern = not resource_wildcard and _is_pattern(resource)
+
+            if action_pattern or resource_pattern:
+                if (action_pattern and _compile_component(action) is None) or (
+                    resource_pattern and _compile_component(resource) is None
+                ):
+                    continue
+                alternatives.append(
+                    f"(?:{self._component_regex(action)}){_ANY_COMPONENT}\n"
+                    f"(?:{self._component_regex(resource)})"
+                )
+            elif action_wildcard and resource_wildcard:
+                self.allow_all = True
+            elif action_wildcard:
+                self.any_action.add(resource)
+            elif resource_wildcard:
+                self.any_resource.add(action)
+            else:
+                self.exact.add((action, resource))
+
+        self.pattern = self._combine(alternatives)
+
+    @staticmethod
+    def _component_regex(value: str) -> str:
+        if value in WILDCARDS:
+            return _ANY_COMPONENT
+        if _is_pattern(value):
+            return value
+        return re.escape(value) + "$"
+
+    @staticmethod
+    def _combine(alternatives: list[str]) -> re.Pattern[str] | None:
+        if not alternatives:
+            return None
+        try:
+            return re.compile("|".join(f"(?:{alt})" for alt in alternatives), re.MULTILINE)
+        except re.error:
+            # e.g. duplicate group names across patterns; match one at a time
+            logger.warning("Permission patterns cannot be combined into one regex")
+            compiled = [re.compile(alt, re.MULTILINE) for alt in alternatives]
+            return _PatternList(compiled)
+
+    def matches(self, action: str, resource: str) -> bool:
+        """Check whether any compiled permission grants action on resource."""
+        action = action.lower()
+        resource = resource.lower()
+
+        if (
+            self.allow_all
+            or (action, resource) in self.exact
+            or resource in self.any_action
+            or action in self.any_resource
+        ):
+            return True
+
+        if self.pattern is None or "\n" in action or "\n" in resource:
+            return False
+        return self.pattern.match(f"{action}\n{resource}") is not None
+
+
+class _PatternList:
+    """Fallback for pattern sets that cannot share one regex."""
+
+    __slots__ = ("patterns",)
+
+    def __init__(self, patterns: list[re.Pattern[str]]) -> None:
+        self.patterns = patterns
+
+    def match(self, value: str) -> re.Match[str] | None:
+        for pattern in self.patterns:
+            found = pattern.match(value)
+            if found is not None:
+                return found
+        return None
+
+
 @dataclass
 class Role:
     """Represents a role with permissions and hierarchy."""
@@ -133,6 +246,13 @@ class Role:
     is_system_role: bool = False  # System roles cannot be modified
     tenant_id: str | None = None  # For multi-tenant roles
 
+    _compiled: CompiledPermissions | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _on_change: Callable[[], None] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self):
         """Validate role."""
         if not self.name:
@@ -163,6 +283,7 @@ class Role:
             raise TypeError("Permission must be Permission instance or string")
 
         self.permissions.add(permission)
+        self._changed()
 
     def remove_permission(self, permission: Permission | str) -> bool:
         """Remove a permission from this role."""
@@ -171,27 +292,53 @@ class Role:
             for perm in self.permissions:
                 if str(perm) == permission:
                     self.permissions.remove(perm)
+                    self._changed()
                     return True
             return False
 
         if permission in self.permissions:
             self.permissions.remove(permission)
+            self._changed()
             return True
         return False
 
     def has_permission(self, action: str, resource: str) -> bool:
         """Check if role has specific permission (not considering inheritance)."""
-        return any(permission.matches(action, resource) for permission in self.permissions)
+        return self.compiled_permissions().matches(action, resource)
+
+    def compiled_permissions(self) -> CompiledPermissions:
+        """
+        Get this role's permissions compiled for matching.
+
+        Rebuilt after ``add_permission``/``remove_permission``; call
+        ``invalidate`` after mutating ``permissions`` directly.
+        """
+        if self._compiled is None:
+            self._compiled = CompiledPermissions(self.permissions)
+        return self._compiled
+
+    def invalidate(self) -> None:
+        """Drop compiled state after permissions or parents changed."""
+        self._changed()
+
+    def _changed(self) -> None:
+        self._compiled = None
+        if self._on_change is not None:
+            self._on_change()
 
     def add_parent_role(self, role_name: str) -> None:
         """Add a parent role for inheritance."""
         if role_name == self.name:
             raise ValueError("Role cannot inherit from itself")
         self.parent_roles.add(role_name.lower().strip())
+        self._changed()
 
     def remove_parent_role(self, role_name: str) -> None:
         """Remove a parent role."""
-        self.parent_roles.discard(role_name.lower().strip())
+        role_name = role_name.lower().strip()
+        if role_name in self.parent_roles:
+            self.parent_roles.discard(role_name)
+            self._changed()
 
     def __str__(self) -> str:
         """String representation."""
@@ -209,37 +356,79 @@ class Role:
 
 
 class PermissionCache:
-    """Cache for permission lookups to improve performance."""
+    """Bounded LRU cache for permission lookups with per-user invalidation."""
 
     def __init__(self, max_size: int = 1000) -> None:
-        self.cache: dict[str, bool] = {}
-        self.max_size = max_size
+        self.cache: OrderedDict[Hashable, bool] = OrderedDict()
+        self.max_size = max(1, max_size)
+        self._user_keys: dict[str, set[Hashable]] = {}
+        self._key_users: dict[Hashable, str] = {}
         self._hits = 0
         self._misses = 0
+        self._evictions = 0
 
-    def get(self, key: str) -> bool | None:
+    def get(self, key: Hashable) -> bool | None:
         """Get cached result."""
         result = self.cache.get(key)
-        if result is not None:
-            self._hits += 1
-        else:
+        if result is None:
             self._misses += 1
+            return None
+
+        self.cache.move_to_end(key)
+        self._hits += 1
         return result
 
-    def set(self, key: str, value: bool) -> None:
-        """Set cached result."""
-        if len(self.cache) >= self.max_size:
-            # Simple LRU: remove oldest entry
-            oldest_key = next(iter(self.cache))
-            del self.cache[oldest_key]
+    def set(self, key: Hashable, value: bool, user_id: str | None = None) -> None:
+        """
+        Set cached result, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key
+            value: Permission check result
+            user_id: Owner of the entry, for ``invalidate_user``
+        """
+        if key in self.cache:
+            self.cache.move_to_end(key)
+        elif len(self.cache) >= self.max_size:
+            evicted, _ = self.cache.popitem(last=False)
+            self._forget(evicted)
+            self._evictions += 1
 
         self.cache[key] = value
+        if user_id is not None:
+            self._user_keys.setdefault(user_id, set()).add(key)
+            self._key_users[key] = user_id
+
+    def invalidate_user(self, user_id: str) -> int:
+        """
+        Remove all cached entries for a user.
+
+        Returns:
+            Number of entries removed
+        """
+        keys = self._user_keys.pop(user_id, set())
+        for key in keys:
+            self.cache.pop(key, None)
+            self._key_users.pop(key, None)
+        return len(keys)
+
+    def _forget(self, key: Hashable) -> None:
+        user_id = self._key_users.pop(key, None)
+        if user_id is not None:
+            keys = self._user_keys.get(user_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._user_keys[user_id]
 
     def clear(self) -> None:
         """Clear cache."""
         self.cache.clear()
+        self._user_keys.clear()
+        self._key_users.clear()
         self._hits = 0
         self._misses = 0
+        self._evictions = 0
 
     def get_stats(self) -> dict[str, Any]:
         """Get cache statistics."""
@@ -251,6 +440,8 @@ class PermissionCache:
             "misses": self._misses,
             "hit_rate": hit_rate,
             "cache_size": len(self.cache),
+            "max_size": self.max_size,
+            "evictions": self._evictions,
         }
 
 
@@ -276,6 +467,15 @@ class RBACEngine:
         # Track inheritance graph for cycle detection
         self._inheritance_graph: dict[str, set[str]] = {}
 
+        # Each role mapped to itself plus all roles it inherits from
+        self._role_closure: dict[str, frozenset[str]] = {}
+
+        # Compiled permissions per distinct set of directly assigned roles,
+        # and the matcher each user currently resolves to
+        self._role_set_matchers: dict[frozenset[str], CompiledPermissions] = {}
+        self._user_matchers: dict[str, CompiledPermissions] = {}
+        self._empty_matcher = CompiledPermissions()
+
         # Initialize with common system roles
         self._initialize_system_roles()
 
@@ -330,12 +530,13 @@ class RBACEngine:
         if role.parent_roles:
             self._check_inheritance_cycle(role.name, role.parent_roles)
 
-        self.roles[role.name] = role
-        self._update_inheritance_graph(role)
+        previous = self.roles.get(role.name)
+        if previous is not None and previous is not role:
+            previous._on_change = None
 
-        # Clear cache when roles change
-        if self.cache:
-            self.cache.clear()
+        self.roles[role.name] = role
+        role._on_change = self._on_roles_changed
+        self._on_roles_changed()
 
         logger.debug(f"Added role: {role.name}")
 
@@ -363,10 +564,8 @@ class RBACEngine:
             other_role.remove_parent_role(role_name)
 
         del self.roles[role_name]
-
-        # Clear cache
-        if self.cache:
-            self.cache.clear()
+        role._on_change = None
+        self._on_roles_changed()
 
         logger.debug(f"Removed role: {role_name}")
         return True
@@ -394,11 +593,7 @@ class RBACEngine:
         self.user_roles[user_id].add(role_name)
 
         # Clear cache for this user
-        if self.cache:
-            # Remove all cached entries for this user
-            keys_to_remove = [k for k in self.cache.cache if k.startswith(f"{user_id}:")]
-            for key in keys_to_remove:
-                del self.cache.cache[key]
+        self._invalidate_user(user_id)
 
         logger.debug(f"Assigned role {role_name} to user {user_id}")
         return True
@@ -418,10 +613,7 @@ class RBACEngine:
                 del self.user_roles[user_id]
 
             # Clear cache for this user
-            if self.cache:
-                keys_to_remove = [k for k in self.cache.cache if k.startswith(f"{user_id}:")]
-                for key in keys_to_remove:
-                    del self.cache.cache[key]
+            self._invalidate_user(user_id)
 
             logger.debug(f"Removed role {role_name} from user {user_id}")
             return True
@@ -436,18 +628,14 @@ class RBACEngine:
             return direct_roles.copy()
 
         # Include inherited roles
-        all_roles = set(direct_roles)
-        for role_name in direct_roles:
-            all_roles.update(self._get_inherited_roles(role_name))
-
-        return all_roles
+        return self._expand_roles(direct_roles)
 
     def check_permission(
         self, user_id: str, action: str, resource: str, use_cache: bool = True
     ) -> bool:
         """Check if user has permission for action on resource."""
         # Create cache key
-        cache_key = f"{user_id}:{action}:{resource}"
+        cache_key = (user_id, action, resource)
 
         # Check cache first
         if use_cache and self.cache:
@@ -455,23 +643,19 @@ class RBACEngine:
             if cached_result is not None:
                 return cached_result
 
-        # Get user roles (including inherited)
-        user_roles = self.get_user_roles(user_id, include_inherited=True)
-
-        # Check permissions
-        has_permission = False
-        for role_name in user_roles:
-            role = self.roles.get(role_name)
-            if role and role.has_permission(action, resource):
-                has_permission = True
-                break
+        # Match against the user's compiled permissions (including inherited)
+        has_permission = self._get_user_matcher(user_id).matches(action, resource)
 
         # Cache result
         if use_cache and self.cache:
-            self.cache.set(cache_key, has_permission)
+            self.cache.set(cache_key, has_permission, user_id=user_id)
 
         logger.debug(
-            f"Permission check: user={user_id}, action={action}, resource={resource}, result={has_permission}"
+            "Permission check: user=%s, action=%s, resource=%s, result=%s",
+            user_id,
+            action,
+            resource,
+            has_permission,
         )
         return has_permission
 
@@ -487,24 +671,85 @@ class RBACEngine:
 
         return permissions
 
-    def _get_inherited_roles(self, role_name: str, visited: set[str] | None = None) -> set[str]:
-        """Get all inherited roles recursively."""
-        if visited is None:
-            visited = set()
-
-        if role_name in visited:
-            return set()  # Cycle detection
+    def _get_inherited_roles(self, role_name: str) -> set[str]:
+        """Get all inherited roles from the precomputed closure."""
+        if role_name not in self.roles:
+            return set()
+        return set(self._role_closure.get(role_name, ())) - {role_name}
+
+    def _expand_roles(self, role_names: Iterable[str]) -> set[str]:
+        """Expand role names with everything they inherit."""
+        expanded: set[str] = set()
+        for role_name in role_names:
+            expanded.update(self._role_closure.get(role_name, (role_name,)))
+        return expanded
+
+    def _on_roles_changed(self) -> None:
+        """Recompute role closure and drop compiled state after a role change."""
+        for role in self.roles.values():
+            self._update_inheritance_graph(role)
+        self._rebuild_role_closure()
+        self._role_set_matchers.clear()
+        self._user_matchers.clear()
+        if self.cache:
+            self.cache.clear()
 
-        visited.add(role_name)
-        inherited = set()
+    def _rebuild_role_closure(self) -> None:
+        """Precompute the transitive inheritance closure of every role."""
+        closure: dict[str, frozenset[str]] = {}
 
-        role = self.roles.get(role_name)
-        if role:
-            for parent_role in role.parent_roles:
-                inherited.add(parent_role)
-                inherited.update(self._get_inherited_roles(parent_role, visited.copy()))
+        def visit(role_name: str, path: set[str]) -> frozenset[str]:
+            if role_name in closure:
+                return closure[role_name]
+            if role_name in path:
+                return frozenset()  # Cycle; rejected on add_role
 
-        return inherited
+            path.add(role_name)
+            members = {role_name}
+            role = self.roles.get(role_name)
+            if role:
+                for parent_role in role.parent_roles:
+                    members.update(visit(parent_role, path))
+            path.discard(role_name)
+
+            closure[role_name] = frozenset(members)
+            return closure[role_name]
+
+        for role_name in self.roles:
+            visit(role_name, set())
+
+        self._role_closure = closure
+
+    def _get_user_matcher(self, user_id: str) -> CompiledPermissions:
+        """Get compiled permissions for a user, shared by users with the same roles."""
+        matcher = self._user_matchers.get(user_id)
+        if matcher is not None:
+            return matcher
+
+        direct_roles = self.user_roles.get(user_id)
+        if not direct_roles:
+            return self._empty_matcher
+
+        role_set = frozenset(direct_roles)
+        matcher = self._role_set_matchers.get(role_set)
+        if matcher is None:
+            permissions = [
+                permission
+                for role_name in self._expand_roles(role_set)
+                if role_name in self.roles
+                for permission in self.roles[role_name].permissions
+            ]
+            matcher = CompiledPermissions(permissions)
+            self._role_set_matchers[role_set] = matcher
+
+        self._user_matchers[user_id] = matcher
+        return matcher
+
+    def _invalidate_user(self, user_id: str) -> None:
+        """Drop compiled state and cached results for one user."""
+        self._user_matchers.pop(user_id, None)
+        if self.cache:
+            self.cache.invalidate_user(user_id)
 
     def _update_inheritance_graph(self, role: Role) -> None:
         """Update inheritance graph for cycle detection."""
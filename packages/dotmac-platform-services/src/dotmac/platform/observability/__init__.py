@@ -152,6 +152,7 @@ try:
     from .middleware import (
         LoggingMiddleware,
         MetricsMiddleware,
+        ObservabilityASGIMiddleware,
         ObservabilityMiddleware,
         TracingMiddleware,
     )
@@ -160,7 +161,7 @@ try:
 except ImportError as e:
     warnings.warn(f"Observability middleware not available: {e}", stacklevel=2)
     ObservabilityMiddleware = MetricsMiddleware = TracingMiddleware = None  # type: ignore
-    LoggingMiddleware = None  # type: ignore
+    LoggingMiddleware = ObservabilityASGIMiddleware = None  # type: ignore
     _middleware_available = False
 
 # Service initialization and management
@@ -238,16 +239,15 @@ def add_observability_middleware(app, config: dict[str, Any] | None = None):
     if config is None:
         config = {}
 
-    # Add logging middleware
-    if _logging_available and LoggingMiddleware is not None:
-        app.add_middleware(LoggingMiddleware)
-
-    # Add metrics middleware
-    if _metrics_available and MetricsMiddleware is not None:
-        app.add_middleware(MetricsMiddleware)
-
-    # Add tracing middleware
-    if _tracing_available and TracingMiddleware is not None:
-        app.add_middleware(TracingMiddleware)
+    # One raw ASGI layer covers logging, metrics and tracing in a single pass
+    if _middleware_available and ObservabilityASGIMiddleware is not None:
+        app.add_middleware(
+            ObservabilityASGIMiddleware,
+            enable_metrics=_metrics_available,
+            enable_tracing=_tracing_available,
+            enable_logging=_logging_available,
+            enable_performance=False,
+            enable_security=False,
+        )
 
     return app
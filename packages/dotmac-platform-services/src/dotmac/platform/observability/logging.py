@@ -482,7 +482,7 @@ class StructuredLogger:
             self._add_context,
         ]
 
-        if self.config.json_logging:
+        if self.config.enable_structured_logging:
             processors.append(structlog.processors.JSONRenderer())
         else:
             processors.append(structlog.processors.KeyValueRenderer())
@@ -500,16 +500,12 @@ class StructuredLogger:
         )
 
     def _add_context(self, logger, method_name, event_dict):
-        """Add common context to log events."""
-        event_dict.update(
-            {
-                "service": self.service_name,
-                "correlation_id": self.correlation_id,
-            }
-        )
+        """Add common context to log events; fields passed explicitly win."""
+        event_dict["service"] = self.service_name
+        event_dict.setdefault("correlation_id", self.correlation_id)
 
         if self.tenant_id:
-            event_dict["tenant_id"] = self.tenant_id
+            event_dict.setdefault("tenant_id", self.tenant_id)
 
         return event_dict
 
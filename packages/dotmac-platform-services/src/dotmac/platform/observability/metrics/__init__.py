@@ -8,6 +8,12 @@ from .business import (
     TenantMetrics,
     initialize_tenant_metrics,
 )
+from .endpoint_stats import (
+    DEFAULT_LATENCY_BUCKETS_MS,
+    OVERFLOW_ENDPOINT,
+    EndpointStats,
+    LatencyHistogram,
+)
 from .registry import (
     MetricDefinition,
     MetricsRegistry,
@@ -16,8 +22,12 @@ from .registry import (
 )
 
 __all__ = [
+    "DEFAULT_LATENCY_BUCKETS_MS",
+    "OVERFLOW_ENDPOINT",
     "BusinessMetricSpec",
     "BusinessMetricType",
+    "EndpointStats",
+    "LatencyHistogram",
     "MetricDefinition",
     "MetricType",
     "MetricsRegistry",
@@ -0,0 +1,207 @@
+"""
+Bounded per-endpoint latency statistics.
+
+Endpoints are keyed by route template. Each keeps a fixed-bucket latency
+histogram instead of raw samples, and the table holds at most
+``max_endpoints`` entries; unmatched paths and anything beyond the limit are
+folded into a single overflow entry, so memory stays constant no matter how
+many distinct URLs are requested.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import Any
+
+DEFAULT_LATENCY_BUCKETS_MS = (
+    5.0,
+    10.0,
+    25.0,
+    50.0,
+    100.0,
+    250.0,
+    500.0,
+    1000.0,
+    2500.0,
+    5000.0,
+    10000.0,
+)
+
+OVERFLOW_ENDPOINT = "__overflow__"
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with request, error and slow counters."""
+
+    __slots__ = (
+        "bounds",
+        "bucket_counts",
+        "count",
+        "error_count",
+        "last_updated",
+        "max_ms",
+        "min_ms",
+        "slow_count",
+        "tenants",
+        "tenants_capped",
+        "total_ms",
+    )
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS) -> None:
+        self.bounds = tuple(bounds)
+        # One extra bucket for observations above the last bound
+        self.bucket_counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+        self.error_count = 0
+        self.slow_count = 0
+        self.tenants: set[str] = set()
+        self.tenants_capped = False
+        self.last_updated = 0.0
+
+    def observe(
+        self,
+        duration_ms: float,
+        is_error: bool = False,
+        is_slow: bool = False,
+        tenant_id: str | None = None,
+        max_tenants: int = 1000,
+    ) -> None:
+        """Record one request."""
+        self.bucket_counts[bisect_left(self.bounds, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.min_ms = min(self.min_ms, duration_ms)
+        self.max_ms = max(self.max_ms, duration_ms)
+        if is_error:
+            self.error_count += 1
+        if is_slow:
+            self.slow_count += 1
+        if tenant_id is not None and tenant_id not in self.tenants:
+            if len(self.tenants) < max_tenants:
+                self.tenants.add(tenant_id)
+            else:
+                self.tenants_capped = True
+        self.last_updated = time.time()
+
+    def percentile(self, quantile: float) -> float:
+        """
+        Estimate a latency percentile from the buckets.
+
+        Returns the upper bound of the bucket holding the quantile, clamped to
+        the observed maximum.
+        """
+        if not self.count:
+            return 0.0
+        rank = quantile * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.bucket_counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                if index < len(self.bounds):
+                    return min(self.bounds[index], self.max_ms)
+                break
+        return self.max_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summary in the shape of the middleware performance stats."""
+        count = self.count
+        return {
+            "total_requests": count,
+            "average_duration_ms": self.total_ms / count if count else 0.0,
+            "min_duration_ms": self.min_ms if count else 0.0,
+            "max_duration_ms": self.max_ms,
+            "p50_duration_ms": self.percentile(0.5),
+            "p95_duration_ms": self.percentile(0.95),
+            "p99_duration_ms": self.percentile(0.99),
+            "error_rate": self.error_count / count if count else 0.0,
+            "slow_request_rate": self.slow_count / count if count else 0.0,
+            "unique_tenants": len(self.tenants),
+            "unique_tenants_capped": self.tenants_capped,
+            "buckets": dict(zip([*self.bounds, float("inf")], self.bucket_counts, strict=True)),
+            "last_updated": self.last_updated,
+        }
+
+
+class EndpointStats:
+    """
+    Thread-safe table of latency histograms keyed by endpoint.
+
+    Args:
+        max_endpoints: Distinct endpoints tracked before folding into overflow
+        slow_threshold_ms: Requests slower than this count as slow
+        buckets_ms: Histogram bucket upper bounds in milliseconds
+        max_tenants_per_endpoint: Distinct tenants remembered per endpoint
+    """
+
+    def __init__(
+        self,
+        max_endpoints: int = 500,
+        slow_threshold_ms: float = 1000.0,
+        buckets_ms: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS,
+        max_tenants_per_endpoint: int = 1000,
+    ) -> None:
+        self.max_endpoints = max_endpoints
+        self.slow_threshold_ms = slow_threshold_ms
+        self.buckets_ms = tuple(sorted(buckets_ms))
+        self.max_tenants_per_endpoint = max_tenants_per_endpoint
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        endpoint: str | None,
+        duration_ms: float,
+        status_code: int,
+        tenant_id: str | None = None,
+    ) -> None:
+        """
+        Record a request.
+
+        Args:
+            endpoint: Endpoint key such as ``"GET /customers/{id}"``; ``None``
+                for requests that matched no route
+            duration_ms: Request duration
+            status_code: Response status code
+            tenant_id: Tenant identifier
+        """
+        with self._lock:
+            histogram = self._histograms.get(endpoint or OVERFLOW_ENDPOINT)
+            if histogram is None:
+                if endpoint is not None and len(self._histograms) >= self.max_endpoints:
+                    endpoint = None
+                histogram = self._histograms.get(endpoint or OVERFLOW_ENDPOINT)
+                if histogram is None:
+                    histogram = LatencyHistogram(self.buckets_ms)
+                    self._histograms[endpoint or OVERFLOW_ENDPOINT] = histogram
+            histogram.observe(
+                duration_ms,
+                is_error=status_code >= 400,
+                is_slow=duration_ms > self.slow_threshold_ms,
+                tenant_id=tenant_id,
+                max_tenants=self.max_tenants_per_endpoint,
+            )
+
+    def get(self, endpoint: str) -> LatencyHistogram | None:
+        """Get the histogram for an endpoint."""
+        return self._histograms.get(endpoint)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Summaries for all endpoints with at least one request."""
+        with self._lock:
+            return {
+                endpoint: histogram.to_dict()
+                for endpoint, histogram in self._histograms.items()
+                if histogram.count
+            }
+
+    def clear(self) -> None:
+        """Drop all recorded statistics."""
+        with self._lock:
+            self._histograms.clear()
+
+    def __len__(self) -> int:
+        return len(self._histograms)
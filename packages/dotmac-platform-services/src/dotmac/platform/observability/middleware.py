@@ -12,14 +12,15 @@ Provides:
 
 import threading
 import time
+from collections import deque
 from collections.abc import Callable
 from typing import Any
 from uuid import uuid4
 
 try:
     from fastapi import FastAPI, Request, Response
-    from fastapi.middleware.base import BaseHTTPMiddleware
-    from starlette.middleware.base import RequestResponseEndpoint
+    from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
     _fastapi_available = True
 except ImportError:
@@ -27,19 +28,60 @@ except ImportError:
     # Provide minimal fallback
     BaseHTTPMiddleware = object
     Request = Response = RequestResponseEndpoint = None
+    ASGIApp = Message = Receive = Scope = Send = Any
+
+try:
+    import prometheus_client  # noqa: F401
+
+    _prometheus_available = True
+except ImportError:
+    _prometheus_available = False
+
+try:
+    import psutil
+
+    _psutil_available = True
+except ImportError:
+    psutil = None
+    _psutil_available = False
 
 import contextlib
 
 from .config import ObservabilityConfig
 from .logging import AuditLogger, LogContext, PerformanceLogger, StructuredLogger
-from .tracing import TraceCorrelator, TracingManager
-
+from .metrics.endpoint_stats import EndpointStats
 from .metrics.registry import (
     MetricDefinition,
-    MetricType,
     MetricsRegistry,
+    MetricType,
     initialize_metrics_registry,
 )
+from .tracing import TraceCorrelator, TracingManager
+
+# Endpoint label for requests that matched no route (404s, scanners)
+UNMATCHED_ROUTE = "__unmatched__"
+# Endpoint label for gauges tracked across all routes of a method
+ALL_ENDPOINTS = "*"
+
+
+def route_template(scope: Scope, root_path: str = "") -> str:
+    """
+    Route template of the matched route, e.g. ``/customers/{id}``.
+
+    The router stores the matched route in the ASGI scope, so this is only
+    meaningful once the application has handled the request. ``root_path`` is
+    the scope's root path seen by the middleware; any prefix that mounts append
+    to it is kept. Returns ``UNMATCHED_ROUTE`` when no route matched,
+    so raw paths never become metric labels.
+    """
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if not template:
+        return UNMATCHED_ROUTE
+    mount_prefix = scope.get("root_path", "")[len(root_path) :]
+    return f"{mount_prefix}{template}" if mount_prefix else template
 
 
 class MetricsCollector:
@@ -236,25 +278,22 @@ class MetricsMiddleware(BaseHTTPMiddleware if _fastapi_available else object):
             return await call_next(request)
 
         method = request.method
-        endpoint = request.url.path
         tenant_id = request.headers.get("X-Tenant-ID", "unknown")
+        root_path = request.scope.get("root_path", "")
 
-        # Record request start
+        # Record request start; in-flight requests are counted per method
+        # because the route is only known once the router has run
         start_time = time.time()
-        self.metrics.record_active_request(method, endpoint, tenant_id, 1)
-
-        # Record request size
-        content_length = request.headers.get("content-length")
-        if content_length:
-            with contextlib.suppress(ValueError):
-                self.metrics.record_request_size(method, endpoint, int(content_length), tenant_id)
+        self.metrics.record_active_request(method, ALL_ENDPOINTS, tenant_id, 1)
 
         try:
             response = await call_next(request)
             duration = time.time() - start_time
+            endpoint = route_template(request.scope, root_path)
 
             # Record response metrics
             self.metrics.record_request(method, endpoint, response.status_code, duration, tenant_id)
+            self._record_request_size(request, method, endpoint, tenant_id)
 
             # Record response size
             response_size = response.headers.get("content-length")
@@ -273,6 +312,7 @@ class MetricsMiddleware(BaseHTTPMiddleware if _fastapi_available else object):
 
         except Exception as e:
             duration = time.time() - start_time
+            endpoint = route_template(request.scope, root_path)
 
             # Record error metrics
             self.metrics.record_request(method, endpoint, 500, duration, tenant_id)
@@ -282,7 +322,16 @@ class MetricsMiddleware(BaseHTTPMiddleware if _fastapi_available else object):
 
         finally:
             # Record request end
-            self.metrics.record_active_request(method, endpoint, tenant_id, -1)
+            self.metrics.record_active_request(method, ALL_ENDPOINTS, tenant_id, -1)
+
+    def _record_request_size(
+        self, request: Request, method: str, endpoint: str, tenant_id: str
+    ) -> None:
+        """Record the request body size from its Content-Length header."""
+        content_length = request.headers.get("content-length")
+        if content_length:
+            with contextlib.suppress(ValueError):
+                self.metrics.record_request_size(method, endpoint, int(content_length), tenant_id)
 
 
 class TracingMiddleware(BaseHTTPMiddleware if _fastapi_available else object):
@@ -329,7 +378,6 @@ class TracingMiddleware(BaseHTTPMiddleware if _fastapi_available else object):
         span_attributes = {
             "http.method": request.method,
             "http.url": str(request.url),
-            "http.route": request.url.path,
             "http.user_agent": headers.get("user-agent", ""),
             "correlation_id": correlation_id,
         }
@@ -339,6 +387,8 @@ class TracingMiddleware(BaseHTTPMiddleware if _fastapi_available else object):
         if user_id:
             span_attributes["user.id"] = user_id
 
+        root_path = request.scope.get("root_path", "")
+
         with tracer.trace("http.request", attributes=span_attributes) as span:
             try:
                 # Add trace context to request state
@@ -350,6 +400,7 @@ class TracingMiddleware(BaseHTTPMiddleware if _fastapi_available else object):
                 response = await call_next(request)
 
                 # Update span with response info
+                span.set_attribute("http.route", route_template(request.scope, root_path))
                 span.set_attribute("http.status_code", response.status_code)
                 span.set_attribute("response.size", len(getattr(response, "body", b"")))
 
@@ -516,6 +567,8 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware if _fastapi_available e
         service_name: str = "api",
         slow_request_threshold: float = 1000.0,  # ms
         memory_monitoring: bool = True,
+        *,
+        max_endpoints: int = 500,
     ) -> None:
         if _fastapi_available:
             super().__init__(app)
@@ -529,9 +582,8 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware if _fastapi_available e
         self.performance_logger = PerformanceLogger(self.logger)
         self.metrics = MetricsCollector(service_name)
 
-        # Performance tracking state
-        self._request_stats: dict[str, dict[str, Any]] = {}
-        self._lock = threading.Lock()
+        # Performance tracking state, keyed by route template
+        self._request_stats = EndpointStats(max_endpoints, slow_request_threshold)
 
     async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
         """Monitor request performance."""
@@ -540,6 +592,7 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware if _fastapi_available e
 
         endpoint_key = f"{request.method} {request.url.path}"
         tenant_id = request.headers.get("X-Tenant-ID", "unknown")
+        root_path = request.scope.get("root_path", "")
 
         # Start performance monitoring
         start_time = time.time()
@@ -578,13 +631,21 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware if _fastapi_available e
             )
 
             # Update endpoint statistics
-            self._update_endpoint_stats(endpoint_key, duration_ms, response.status_code, tenant_id)
+            route = route_template(request.scope, root_path)
+            route_key = f"{request.method} {route}"
+            self._update_endpoint_stats(
+                route_key if route != UNMATCHED_ROUTE else None,
+                duration_ms,
+                response.status_code,
+                tenant_id,
+            )
 
             # Log slow requests
             if duration_ms > self.slow_request_threshold:
                 self.logger.warning(
                     "Slow request detected",
                     endpoint=endpoint_key,
+                    route=route_key,
                     duration_ms=duration_ms,
                     threshold_ms=self.slow_request_threshold,
                     status_code=response.status_code,
@@ -596,7 +657,7 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware if _fastapi_available e
             # Record business metrics
             operation_status = "success" if response.status_code < 400 else "error"
             self.metrics.record_business_operation(
-                operation=endpoint_key.replace(" ", "_").lower(),
+                operation=route_key.replace(" ", "_").lower(),
                 status=operation_status,
                 tenant_id=tenant_id,
             )
@@ -620,11 +681,15 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware if _fastapi_available e
             )
 
             # Update endpoint statistics
-            self._update_endpoint_stats(endpoint_key, duration_ms, 500, tenant_id)
+            route = route_template(request.scope, root_path)
+            route_key = f"{request.method} {route}"
+            self._update_endpoint_stats(
+                route_key if route != UNMATCHED_ROUTE else None, duration_ms, 500, tenant_id
+            )
 
             # Record business metrics
             self.metrics.record_business_operation(
-                operation=endpoint_key.replace(" ", "_").lower(),
+                operation=route_key.replace(" ", "_").lower(),
                 status="error",
                 tenant_id=tenant_id,
             )
@@ -645,58 +710,14 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware if _fastapi_available e
             return None
 
     def _update_endpoint_stats(
-        self, endpoint: str, duration_ms: float, status_code: int, tenant_id: str
+        self, endpoint: str | None, duration_ms: float, status_code: int, tenant_id: str
     ) -> None:
-        """Update endpoint performance statistics."""
-        with self._lock:
-            if endpoint not in self._request_stats:
-                self._request_stats[endpoint] = {
-                    "total_requests": 0,
-                    "total_duration": 0.0,
-                    "min_duration": float("inf"),
-                    "max_duration": 0.0,
-                    "error_count": 0,
-                    "slow_request_count": 0,
-                    "tenants": set(),
-                    "last_updated": time.time(),
-                }
-
-            stats = self._request_stats[endpoint]
-            stats["total_requests"] += 1
-            stats["total_duration"] += duration_ms
-            stats["min_duration"] = min(stats["min_duration"], duration_ms)
-            stats["max_duration"] = max(stats["max_duration"], duration_ms)
-            stats["last_updated"] = time.time()
-            stats["tenants"].add(tenant_id)
-
-            if status_code >= 400:
-                stats["error_count"] += 1
-
-            if duration_ms > self.slow_request_threshold:
-                stats["slow_request_count"] += 1
+        """Update endpoint performance statistics; ``None`` for unmatched paths."""
+        self._request_stats.record(endpoint, duration_ms, status_code, tenant_id)
 
     def get_performance_stats(self) -> dict[str, Any]:
         """Get current performance statistics."""
-        with self._lock:
-            stats = {}
-            for endpoint, data in self._request_stats.items():
-                if data["total_requests"] > 0:
-                    avg_duration = data["total_duration"] / data["total_requests"]
-                    error_rate = data["error_count"] / data["total_requests"]
-                    slow_rate = data["slow_request_count"] / data["total_requests"]
-
-                    stats[endpoint] = {
-                        "total_requests": data["total_requests"],
-                        "average_duration_ms": avg_duration,
-                        "min_duration_ms": data["min_duration"],
-                        "max_duration_ms": data["max_duration"],
-                        "error_rate": error_rate,
-                        "slow_request_rate": slow_rate,
-                        "unique_tenants": len(data["tenants"]),
-                        "last_updated": data["last_updated"],
-                    }
-
-            return stats
+        return self._request_stats.snapshot()
 
 
 class ObservabilityMiddleware(BaseHTTPMiddleware if _fastapi_available else object):
@@ -718,8 +739,10 @@ class ObservabilityMiddleware(BaseHTTPMiddleware if _fastapi_available else obje
         self.audit_logger = AuditLogger(service_name, config)
         self.tracing_manager = TracingManager(config)
 
-        # Performance tracking
-        self._request_metrics: dict[str, Any] = {}
+        # Performance tracking, keyed by route template
+        self._request_metrics = EndpointStats(
+            slow_threshold_ms=getattr(self.config, "slow_request_threshold", 1000.0)
+        )
 
     async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
         """Process request with full observability."""
@@ -756,6 +779,7 @@ class ObservabilityMiddleware(BaseHTTPMiddleware if _fastapi_available else obje
             span_attributes["user.id"] = user_id
 
         start_time = time.time()
+        root_path = request.scope.get("root_path", "")
 
         with tracer.trace("http.request", attributes=span_attributes) as span:
             try:
@@ -796,9 +820,11 @@ class ObservabilityMiddleware(BaseHTTPMiddleware if _fastapi_available else obje
                 )
 
                 # Log performance metrics
+                route = route_template(request.scope, root_path)
+                span.set_attribute("http.route", route)
                 self._track_performance(
                     method=request.method,
-                    path=request.url.path,
+                    route=route,
                     status_code=response.status_code,
                     duration_ms=duration_ms,
                 )
@@ -883,27 +909,14 @@ class ObservabilityMiddleware(BaseHTTPMiddleware if _fastapi_available else obje
 
         return any(pattern in path for pattern in sensitive_patterns)
 
-    def _track_performance(self, method: str, path: str, status_code: int, duration_ms: float) -> None:
+    def _track_performance(
+        self, method: str, route: str, status_code: int, duration_ms: float
+    ) -> None:
         """Track performance metrics."""
-        endpoint_key = f"{method} {path}"
-
-        if endpoint_key not in self._request_metrics:
-            self._request_metrics[endpoint_key] = {
-                "count": 0,
-                "total_duration": 0,
-                "max_duration": 0,
-                "min_duration": float("inf"),
-                "error_count": 0,
-            }
-
-        metrics = self._request_metrics[endpoint_key]
-        metrics["count"] += 1
-        metrics["total_duration"] += duration_ms
-        metrics["max_duration"] = max(metrics["max_duration"], duration_ms)
-        metrics["min_duration"] = min(metrics["min_duration"], duration_ms)
-
-        if status_code >= 400:
-            metrics["error_count"] += 1
+        endpoint_key = f"{method} {route}"
+        self._request_metrics.record(
+            endpoint_key if route != UNMATCHED_ROUTE else None, duration_ms, status_code
+        )
 
         # Log slow requests
         if duration_ms > self.config.slow_request_threshold:
@@ -1048,6 +1061,535 @@ class SecurityMiddleware(BaseHTTPMiddleware if _fastapi_available else object):
             )
 
 
+# Request headers read by ObservabilityASGIMiddleware, as sent by ASGI servers
+_OBSERVED_HEADERS = {
+    b"x-correlation-id": "correlation_id",
+    b"x-tenant-id": "tenant_id",
+    b"x-user-id": "user_id",
+    b"x-trace-id": "trace_id",
+    b"user-agent": "user_agent",
+    b"content-length": "content_length",
+}
+
+_SENSITIVE_HEADERS = frozenset(
+    {
+        "authorization",
+        "x-api-key",
+        "cookie",
+        "x-auth-token",
+        "x-vault-token",
+        "x-secret-key",
+        "x-access-token",
+    }
+)
+
+_SENSITIVE_ENDPOINTS = (
+    "/api/auth/",
+    "/api/admin/",
+    "/api/users/",
+    "/api/secrets/",
+    "/api/billing/",
+    "/api/tenant/",
+)
+
+_SUSPICIOUS_PATTERNS = (
+    "select",
+    "union",
+    "drop",
+    "insert",
+    "update",
+    "delete",  # SQL injection
+    "<script>",
+    "javascript:",
+    "onload=",
+    "onerror=",  # XSS
+    "../",
+    "..\\",
+    "/etc/passwd",
+    "/etc/shadow",  # Path traversal
+    "cmd.exe",
+    "/bin/sh",
+    "powershell",  # Command injection
+)
+
+
+class MemorySampler:
+    """
+    Process RSS sampled at most once per interval.
+
+    psutil calls cost a syscall each; per-request deltas are also meaningless
+    with concurrent requests, so the middleware reports the latest sample.
+    """
+
+    def __init__(self, interval: float = 5.0) -> None:
+        self.interval = interval
+        self.rss_mb: float | None = None
+        self._process = psutil.Process() if _psutil_available else None
+        self._sampled_at = float("-inf")
+
+    def sample(self, now: float) -> float | None:
+        """Return current RSS in MB, refreshing it if the interval elapsed."""
+        if self._process is not None and now - self._sampled_at >= self.interval:
+            self._sampled_at = now
+            with contextlib.suppress(Exception):
+                self.rss_mb = self._process.memory_info().rss / 1024 / 1024
+        return self.rss_mb
+
+
+class _RequestLabels:
+    """Metric label dicts for one (method, endpoint, tenant), built once."""
+
+    __slots__ = ("base", "errors", "operation_error", "operation_success", "status")
+
+    def __init__(self, method: str, endpoint: str, tenant_id: str) -> None:
+        self.base = {"method": method, "endpoint": endpoint, "tenant_id": tenant_id}
+        operation = f"{method}_{endpoint}".lower()
+        self.operation_success = {
+            "operation": operation,
+            "tenant_id": tenant_id,
+            "status": "success",
+        }
+        self.operation_error = {**self.operation_success, "status": "error"}
+        self.status: dict[int, dict[str, str]] = {}
+        self.errors: dict[str, dict[str, str]] = {}
+
+    def with_status(self, status_code: int) -> dict[str, str]:
+        labels = self.status.get(status_code)
+        if labels is None:
+            labels = self.status[status_code] = {**self.base, "status_code": str(status_code)}
+        return labels
+
+    def with_error(self, error_type: str) -> dict[str, str]:
+        labels = self.errors.get(error_type)
+        if labels is None:
+            labels = self.errors[error_type] = {**self.base, "error_type": error_type}
+        return labels
+
+
+class _RequestRecord:
+    """Per-request fields, read once from the ASGI scope."""
+
+    __slots__ = (
+        "active_labels",
+        "client_ip",
+        "content_length",
+        "correlation_id",
+        "error",
+        "headers",
+        "method",
+        "path",
+        "query_string",
+        "response_size",
+        "root_path",
+        "span",
+        "status_code",
+        "tenant_id",
+        "tenant_label",
+        "trace_id",
+        "tracer",
+        "user_agent",
+        "user_id",
+    )
+
+    def __init__(self, scope: Scope) -> None:
+        observed: dict[str, str] = {}
+        for name, value in scope["headers"]:
+            field = _OBSERVED_HEADERS.get(name)
+            if field is not None:
+                observed[field] = value.decode("latin-1")
+
+        client = scope.get("client")
+        self.method: str = scope["method"]
+        self.path: str = scope["path"]
+        self.root_path: str = scope.get("root_path", "")
+        self.query_string = scope.get("query_string", b"").decode("latin-1")
+        self.client_ip = client[0] if client else "unknown"
+        self.correlation_id = observed.get("correlation_id") or str(uuid4())
+        self.tenant_id = observed.get("tenant_id")
+        self.tenant_label = self.tenant_id or "unknown"
+        self.user_id = observed.get("user_id")
+        self.trace_id = observed.get("trace_id")
+        self.user_agent = observed.get("user_agent", "")
+        self.content_length = observed.get("content_length")
+        self.headers: dict[str, str] | None = None
+        self.active_labels: _RequestLabels | None = None
+        self.tracer: Any = None
+        self.span: Any = None
+        # Reported when the app raises before starting a response
+        self.status_code = 500
+        self.response_size = 0
+        self.error: Exception | None = None
+
+    def span_attributes(self, scope: Scope) -> dict[str, Any]:
+        attributes = {
+            "http.method": self.method,
+            "http.scheme": scope.get("scheme", "http"),
+            "http.target": f"{self.path}?{self.query_string}" if self.query_string else self.path,
+            "http.user_agent": self.user_agent,
+            "correlation_id": self.correlation_id,
+        }
+        if self.tenant_id:
+            attributes["tenant.id"] = self.tenant_id
+        if self.user_id:
+            attributes["user.id"] = self.user_id
+        return attributes
+
+
+class ObservabilityASGIMiddleware:
+    """
+    Single-pass observability middleware implemented as raw ASGI.
+
+    Replaces the stack of ``BaseHTTPMiddleware`` layers (metrics, tracing,
+    logging, performance, security and ``ObservabilityMiddleware``) with one
+    layer. Request headers are read once from ``scope``, one span and one
+    completion log record are produced per request, metric label dicts are
+    cached per endpoint, and process memory is sampled on an interval.
+
+    Metrics and endpoint statistics are keyed by the matched route template
+    (``/customers/{id}``), not the raw path, so label cardinality is bounded
+    by the number of routes; requests that match no route share the
+    ``UNMATCHED_ROUTE`` label.
+
+    Request context is exposed via ``request.state``: ``correlation_id``,
+    ``tenant_id``, ``user_id``, ``trace_id``, ``span``, ``tracer`` and
+    ``logger``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        config: ObservabilityConfig | None = None,
+        service_name: str = "api",
+        *,
+        enable_metrics: bool = True,
+        enable_tracing: bool = True,
+        enable_logging: bool = True,
+        enable_performance: bool = True,
+        enable_security: bool = True,
+        slow_request_threshold: float = 1000.0,  # ms
+        memory_sample_interval: float = 5.0,  # seconds
+        log_headers: bool = False,
+        rate_limit_window: float = 60.0,
+        rate_limit_max_requests: int = 100,
+        max_tracked_clients: int = 10000,
+        max_label_sets: int = 4096,
+        max_endpoints: int = 500,
+    ) -> None:
+        self.app = app
+        self.config = config or ObservabilityConfig()
+        self.service_name = service_name
+        self.enable_metrics = enable_metrics
+        self.enable_tracing = enable_tracing
+        self.enable_logging = enable_logging
+        self.enable_performance = enable_performance
+        self.enable_security = enable_security
+        self.slow_request_threshold = slow_request_threshold
+        self.log_headers = log_headers
+        self.rate_limit_window = rate_limit_window
+        self.rate_limit_max_requests = rate_limit_max_requests
+        self.max_tracked_clients = max_tracked_clients
+        self.max_label_sets = max_label_sets
+
+        self.logger = StructuredLogger(f"{service_name}.requests", self.config)
+        self.audit_logger = AuditLogger(service_name, self.config)
+        self.metrics = MetricsCollector(service_name) if enable_metrics else None
+        self.tracing_manager = TracingManager(config) if enable_tracing else None
+        self.memory = MemorySampler(memory_sample_interval)
+
+        self._labels: dict[tuple[str, str, str], _RequestLabels] = {}
+        self._active: dict[tuple[str, str, str], int] = {}
+        self._request_stats = EndpointStats(max_endpoints, slow_request_threshold)
+        self._client_requests: dict[str, deque[float]] = {}
+        self._failed_attempts: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        request = _RequestRecord(scope)
+        if self.log_headers:
+            request.headers = self._sanitize_headers(scope["headers"])
+
+        if self.enable_security:
+            self._check_request_security(request)
+
+        if self.metrics is not None:
+            # The route is unknown until the router runs, so in-flight
+            # requests are counted across all endpoints of a method
+            request.active_labels = self._get_labels(
+                request.method, ALL_ENDPOINTS, request.tenant_label
+            )
+            self._record_active(request.active_labels, 1)
+
+        if self.tracing_manager is not None:
+            request.tracer = self.tracing_manager.get_tracer(self.service_name, request.tenant_id)
+            request.span = request.tracer.start_span(
+                "http.request", attributes=request.span_attributes(scope)
+            )
+            if request.trace_id:
+                request.span.trace_id = request.trace_id
+
+        state = scope.setdefault("state", {})
+        state["correlation_id"] = request.correlation_id
+        state["tenant_id"] = request.tenant_id
+        state["user_id"] = request.user_id
+        state["logger"] = self.logger
+        if request.span is not None:
+            state["trace_id"] = request.span.trace_id
+            state["span"] = request.span
+            state["tracer"] = request.tracer
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                request.status_code = message["status"]
+                headers = list(message.get("headers", ()))
+                headers.append((b"x-correlation-id", request.correlation_id.encode("latin-1")))
+                if request.span is not None:
+                    headers.append((b"x-trace-id", request.span.trace_id.encode("latin-1")))
+                    headers.append((b"x-span-id", request.span.span_id.encode("latin-1")))
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                headers.append((b"x-response-time", f"{elapsed_ms:.2f}ms".encode("latin-1")))
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                request.response_size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            request.error = e
+            raise
+        finally:
+            self._finish_request(
+                request,
+                route_template(scope, request.root_path),
+                (time.perf_counter() - start) * 1000,
+            )
+
+    def _finish_request(self, request: "_RequestRecord", route: str, duration_ms: float) -> None:
+        """Record metrics, span, stats and the log record for a finished request."""
+        method, path, status_code = request.method, request.path, request.status_code
+        error = request.error
+        is_error = error is not None or status_code >= 400
+
+        if request.active_labels is not None:
+            registry = self.metrics.registry
+            labels = self._get_labels(method, route, request.tenant_label)
+            if request.content_length:
+                with contextlib.suppress(ValueError):
+                    registry.observe_histogram(
+                        "http_request_size_bytes", int(request.content_length), labels.base
+                    )
+            status_labels = labels.with_status(status_code)
+            registry.increment_counter("http_requests_total", 1, status_labels)
+            registry.observe_histogram(
+                "http_request_duration_seconds", duration_ms / 1000, labels.base
+            )
+            if request.response_size:
+                registry.observe_histogram(
+                    "http_response_size_bytes", request.response_size, status_labels
+                )
+            if error is not None:
+                registry.increment_counter(
+                    "http_errors_total", 1, labels.with_error(type(error).__name__)
+                )
+            elif status_code >= 400:
+                error_type = "client_error" if status_code < 500 else "server_error"
+                registry.increment_counter("http_errors_total", 1, labels.with_error(error_type))
+            if self.enable_performance:
+                registry.increment_counter(
+                    "business_operations_total",
+                    1,
+                    labels.operation_error if is_error else labels.operation_success,
+                )
+            self._record_active(request.active_labels, -1)
+
+        span = request.span
+        if span is not None:
+            span.set_attribute("http.route", route)
+            span.set_attribute("http.status_code", status_code)
+            span.set_attribute("response.size", request.response_size)
+            span.set_attribute("response.duration_ms", duration_ms)
+            if error is not None:
+                span.record_exception(error)
+            elif status_code >= 400:
+                span.set_status("error", f"HTTP {status_code}")
+            span.finish()
+
+        memory_mb = None
+        if self.enable_performance:
+            memory_mb = self.memory.sample(time.monotonic())
+            self._request_stats.record(
+                f"{method} {route}" if route != UNMATCHED_ROUTE else None,
+                duration_ms,
+                status_code,
+                request.tenant_label,
+            )
+
+        if self.enable_security and status_code == 401:
+            self._track_failed_attempt(request.client_ip, path)
+
+        if not self.enable_logging:
+            return
+
+        fields: dict[str, Any] = {
+            "method": method,
+            "path": path,
+            "route": route,
+            "query_string": request.query_string,
+            "status_code": status_code,
+            "duration_ms": duration_ms,
+            "response_size": request.response_size,
+            "correlation_id": request.correlation_id,
+            "tenant_id": request.tenant_id,
+            "user_id": request.user_id,
+            "client_ip": request.client_ip,
+            "user_agent": request.user_agent,
+        }
+        if request.headers is not None:
+            fields["headers"] = request.headers
+        if error is not None:
+            self.logger.error(
+                "Request failed", error=str(error), error_type=type(error).__name__, **fields
+            )
+        else:
+            self.logger.info("Request completed", **fields)
+
+        if duration_ms > self.slow_request_threshold:
+            self.logger.warning(
+                "Slow request detected",
+                endpoint=f"{method} {route}",
+                path=path,
+                duration_ms=duration_ms,
+                threshold_ms=self.slow_request_threshold,
+                status_code=status_code,
+                tenant_id=request.tenant_id,
+                memory_rss_mb=memory_mb,
+            )
+
+        if any(prefix in path for prefix in _SENSITIVE_ENDPOINTS):
+            self.audit_logger.user_action(
+                user_id=request.user_id or "anonymous",
+                action=f"{method} {path}",
+                resource=path,
+                success=not is_error,
+                details={
+                    "status_code": status_code,
+                    "duration_ms": duration_ms,
+                    "ip_address": request.client_ip,
+                },
+            )
+
+    def _get_labels(self, method: str, endpoint: str, tenant_id: str) -> _RequestLabels:
+        """Get cached label dicts, building them on first use."""
+        key = (method, endpoint, tenant_id)
+        labels = self._labels.get(key)
+        if labels is None:
+            labels = _RequestLabels(method, endpoint, tenant_id)
+            if len(self._labels) < self.max_label_sets:
+                self._labels[key] = labels
+        return labels
+
+    def _record_active(self, labels: _RequestLabels, delta: int) -> None:
+        """Set the in-flight gauge to the current count for these labels."""
+        base = labels.base
+        key = (base["method"], base["endpoint"], base["tenant_id"])
+        with self._lock:
+            active = self._active.get(key, 0) + delta
+            if active:
+                self._active[key] = active
+            else:
+                self._active.pop(key, None)
+        self.metrics.registry.set_gauge("http_requests_active", active, base)
+
+    def _check_request_security(self, request: _RequestRecord) -> None:
+        """Suspicious pattern and request rate checks."""
+        target = request.path.lower()
+        if request.query_string:
+            target = f"{target}?{request.query_string.lower()}"
+        if any(pattern in target for pattern in _SUSPICIOUS_PATTERNS):
+            self.logger.security(
+                "Suspicious request detected",
+                risk_level="high",
+                ip_address=request.client_ip,
+                user_agent=request.user_agent,
+                path=request.path,
+                method=request.method,
+            )
+
+        if self._check_rate_limit(request.client_ip, time.monotonic()):
+            self.logger.security(
+                "Rate limit exceeded",
+                risk_level="medium",
+                ip_address=request.client_ip,
+                path=request.path,
+            )
+
+    def _check_rate_limit(self, client_ip: str, now: float) -> bool:
+        """Sliding window request count per client."""
+        with self._lock:
+            requests = self._client_requests.pop(client_ip, None)
+            if requests is None:
+                requests = deque()
+                if len(self._client_requests) >= self.max_tracked_clients:
+                    # Drop the least recently seen client
+                    del self._client_requests[next(iter(self._client_requests))]
+            # Re-insert so dict order tracks recency
+            self._client_requests[client_ip] = requests
+
+            cutoff = now - self.rate_limit_window
+            while requests and requests[0] <= cutoff:
+                requests.popleft()
+            requests.append(now)
+            return len(requests) > self.rate_limit_max_requests
+
+    def _track_failed_attempt(self, client_ip: str, path: str) -> None:
+        """Track failed authentication attempts."""
+        with self._lock:
+            client_data = self._failed_attempts.get(client_ip)
+            if client_data is None:
+                if len(self._failed_attempts) >= self.max_tracked_clients:
+                    del self._failed_attempts[next(iter(self._failed_attempts))]
+                client_data = self._failed_attempts[client_ip] = {
+                    "count": 0,
+                    "last_attempt": 0.0,
+                    "paths": deque(maxlen=5),
+                }
+            client_data["count"] += 1
+            client_data["last_attempt"] = time.time()
+            client_data["paths"].append(path)
+            count = client_data["count"]
+            recent_paths = list(client_data["paths"])
+
+        # Alert on multiple failed attempts
+        if count > 5:
+            self.logger.security(
+                "Multiple failed authentication attempts",
+                risk_level="high",
+                ip_address=client_ip,
+                attempt_count=count,
+                recent_paths=recent_paths,
+            )
+
+    def get_performance_stats(self) -> dict[str, Any]:
+        """Get current performance statistics, keyed by ``"METHOD /route/{param}"``."""
+        return self._request_stats.snapshot()
+
+    def _sanitize_headers(self, raw_headers: list[tuple[bytes, bytes]]) -> dict[str, str]:
+        """Decode request headers with sensitive values redacted."""
+        headers = {}
+        for name, value in raw_headers:
+            key = name.decode("latin-1")
+            if key in _SENSITIVE_HEADERS:
+                headers[key] = "***REDACTED***"
+            else:
+                headers[key] = value.decode("latin-1")
+        return headers
+
+
 # Factory functions and utilities
 def setup_observability_middleware(
     app: "FastAPI",
@@ -1058,37 +1600,28 @@ def setup_observability_middleware(
     enable_logging: bool = True,
     enable_performance: bool = True,
     enable_security: bool = True,
+    **middleware_options: Any,
 ) -> None:
-    """Set up comprehensive observability middleware for FastAPI app."""
+    """
+    Set up comprehensive observability middleware for FastAPI app.
+
+    Installs a single ``ObservabilityASGIMiddleware``; the individual
+    ``BaseHTTPMiddleware`` classes remain available for custom stacks.
+    """
     if not _fastapi_available:
         raise ImportError("FastAPI not available for middleware setup")
 
-    # Add middleware in reverse order (FastAPI processes them in reverse)
-
-    # Security middleware (first to process)
-    if enable_security:
-        app.add_middleware(SecurityMiddleware, config=config, service_name=service_name)
-
-    # Performance monitoring
-    if enable_performance:
-        app.add_middleware(
-            PerformanceMonitoringMiddleware, config=config, service_name=service_name
-        )
-
-    # Detailed logging
-    if enable_logging:
-        app.add_middleware(LoggingMiddleware, config=config, service_name=service_name)
-
-    # Distributed tracing
-    if enable_tracing:
-        app.add_middleware(TracingMiddleware, config=config, service_name=service_name)
-
-    # Metrics collection
-    if enable_metrics:
-        app.add_middleware(MetricsMiddleware, service_name=service_name)
-
-    # Main observability middleware (last to process, first to receive)
-    app.add_middleware(ObservabilityMiddleware, config=config, service_name=service_name)
+    app.add_middleware(
+        ObservabilityASGIMiddleware,
+        config=config,
+        service_name=service_name,
+        enable_metrics=enable_metrics,
+        enable_tracing=enable_tracing,
+        enable_logging=enable_logging,
+        enable_performance=enable_performance,
+        enable_security=enable_security,
+        **middleware_options,
+    )
 
     # Add metrics endpoint
     if enable_metrics and _prometheus_available:
@@ -1105,6 +1638,17 @@ def setup_observability_middleware(
             return PlainTextResponse(metrics_collector.get_metrics())
 
 
+def create_observability_asgi_middleware(
+    config: ObservabilityConfig | None = None, service_name: str = "api", **kwargs
+) -> Callable:
+    """Create single-pass observability middleware factory."""
+
+    def middleware_factory(app):
+        return ObservabilityASGIMiddleware(app, config, service_name, **kwargs)
+
+    return middleware_factory
+
+
 def create_observability_middleware(
     config: ObservabilityConfig | None = None, service_name: str = "api"
 ) -> Callable:
@@ -0,0 +1,157 @@
+"""
+RBAC engine tests: compiled permission matching, role closure and LRU cache.
+"""
+
+import pytest
+
+from dotmac.platform.auth.rbac_engine import (
+    CompiledPermissions,
+    Permission,
+    PermissionCache,
+    RBACEngine,
+    Role,
+)
+
+
+class TestCompiledPermissions:
+    """Compiled matcher agrees with Permission.matches."""
+
+    PERMISSIONS = [
+        Permission("read", "invoice"),
+        Permission("*", "ticket"),
+        Permission("write", "all"),
+        Permission("export.*", "report"),
+        Permission("read", "customer_.*"),
+        Permission("approve", "^refund$"),
+    ]
+
+    REQUESTS = [
+        ("read", "invoice"),
+        ("READ", "Invoice"),
+        ("delete", "invoice"),
+        ("close", "ticket"),
+        ("write", "anything"),
+        ("export_csv", "report"),
+        ("export_csv", "reports"),
+        ("export_csv", "invoice"),
+        ("read", "customer_contacts"),
+        ("write", "customer_contacts"),
+        ("approve", "refund"),
+        ("approve", "refunds"),
+    ]
+
+    def test_matches_same_as_individual_permissions(self):
+        compiled = CompiledPermissions(self.PERMISSIONS)
+
+        for action, resource in self.REQUESTS:
+            expected = any(p.matches(action, resource) for p in self.PERMISSIONS)
+            assert compiled.matches(action, resource) == expected, (action, resource)
+
+    def test_exact_and_wildcards_use_hash_sets(self):
+        compiled = CompiledPermissions(self.PERMISSIONS)
+
+        assert ("read", "invoice") in compiled.exact
+        assert "ticket" in compiled.any_action
+        assert "write" in compiled.any_resource
+        assert compiled.pattern is not None
+
+    def test_full_wildcard(self):
+        compiled = CompiledPermissions([Permission("*", "*")])
+
+        assert compiled.allow_all
+        assert compiled.matches("delete", "tenant")
+
+    def test_invalid_pattern_never_matches(self):
+        compiled = CompiledPermissions([Permission("read", "[unclosed"), Permission("read", "a")])
+
+        assert compiled.matches("read", "a")
+        assert not compiled.matches("read", "[unclosed")
+        assert not Permission("read", "[unclosed").matches("read", "x")
+
+    def test_action_wildcard_does_not_use_regex_star(self):
+        # "*" used to reach re.match("*", ...) and raise re.error
+        assert not Permission("*", "user").matches("read", "billing")
+
+
+class TestRoleClosure:
+    """Inheritance is precomputed and kept current."""
+
+    @pytest.fixture
+    def engine(self):
+        engine = RBACEngine()
+        engine.add_role(Role("support", permissions={Permission("read", "ticket")}))
+        engine.add_role(
+            Role("billing", permissions={Permission("read", "invoice")}, parent_roles={"support"})
+        )
+        engine.add_role(
+            Role(
+                "manager",
+                permissions={Permission("approve", "refund")},
+                parent_roles={"billing"},
+            )
+        )
+        engine.assign_user_role("u1", "manager")
+        return engine
+
+    def test_inherited_permissions(self, engine):
+        assert engine.get_user_roles("u1") == {"manager", "billing", "support"}
+        assert engine.check_permission("u1", "read", "ticket")
+        assert engine.check_permission("u1", "approve", "refund")
+        assert not engine.check_permission("u1", "delete", "ticket")
+
+    def test_role_changes_take_effect(self, engine):
+        assert not engine.check_permission("u1", "close", "ticket")
+
+        engine.get_role("support").add_permission("close:ticket")
+        assert engine.check_permission("u1", "close", "ticket")
+
+        engine.get_role("billing").remove_parent_role("support")
+        assert not engine.check_permission("u1", "read", "ticket")
+
+    def test_remove_role_updates_closure(self, engine):
+        engine.remove_role("support")
+
+        assert engine.get_user_roles("u1") == {"manager", "billing"}
+        assert not engine.check_permission("u1", "read", "ticket")
+
+    def test_assignment_invalidates_only_that_user(self, engine):
+        engine.assign_user_role("u2", "support")
+        assert engine.check_permission("u1", "read", "ticket")
+        assert not engine.check_permission("u2", "read", "invoice")
+
+        engine.assign_user_role("u2", "billing")
+
+        assert engine.check_permission("u2", "read", "invoice")
+        assert engine.cache.get(("u1", "read", "ticket")) is True
+
+    def test_cycle_is_rejected(self, engine):
+        engine.add_role(Role("auditor", parent_roles={"manager"}))
+
+        with pytest.raises(ValueError):
+            engine.add_role(Role("support", parent_roles={"auditor"}))
+
+
+class TestPermissionCache:
+    """Cache evicts least recently used entries."""
+
+    def test_lru_eviction(self):
+        cache = PermissionCache(max_size=2)
+        cache.set("a", True)
+        cache.set("b", False)
+        assert cache.get("a") is True
+
+        cache.set("c", True)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is True
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_invalidate_user(self):
+        cache = PermissionCache()
+        cache.set(("u1", "read", "x"), True, user_id="u1")
+        cache.set(("u1", "write", "x"), False, user_id="u1")
+        cache.set(("u2", "read", "x"), True, user_id="u2")
+
+        assert cache.invalidate_user("u1") == 2
+        assert cache.get(("u1", "read", "x")) is None
+        assert cache.get(("u2", "read", "x")) is True
@@ -0,0 +1,255 @@
+"""
+Tests for the single-pass ASGI observability middleware.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from dotmac.platform.observability.logging import StructuredLogger
+from dotmac.platform.observability.metrics.endpoint_stats import OVERFLOW_ENDPOINT, EndpointStats
+from dotmac.platform.observability.middleware import (
+    UNMATCHED_ROUTE,
+    MemorySampler,
+    ObservabilityASGIMiddleware,
+    setup_observability_middleware,
+)
+
+
+def build_app(**options) -> tuple[FastAPI, TestClient]:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str, request: Request):
+        return {
+            "item_id": item_id,
+            "correlation_id": request.state.correlation_id,
+            "tenant_id": request.state.tenant_id,
+            "trace_id": request.state.trace_id,
+        }
+
+    @app.get("/api/auth/login")
+    async def login():
+        return JSONResponse({"detail": "invalid"}, status_code=401)
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    router = APIRouter()
+
+    @router.get("/customers/{customer_id:int}")
+    async def get_customer(customer_id: int):
+        return {"id": customer_id}
+
+    sub_app = FastAPI()
+    sub_app.include_router(router)
+    app.mount("/v2", sub_app)
+
+    setup_observability_middleware(app, service_name="test-api", **options)
+    return app, TestClient(app, raise_server_exceptions=False)
+
+
+def get_middleware(app: FastAPI) -> ObservabilityASGIMiddleware:
+    if app.middleware_stack is None:
+        app.middleware_stack = app.build_middleware_stack()
+    layer = app.middleware_stack
+    while not isinstance(layer, ObservabilityASGIMiddleware):
+        layer = layer.app
+    return layer
+
+
+class TestObservabilityASGIMiddleware:
+    def test_single_middleware_installed(self):
+        app, _ = build_app()
+
+        assert [m.cls for m in app.user_middleware] == [ObservabilityASGIMiddleware]
+
+    def test_correlation_and_trace_headers(self):
+        _, client = build_app()
+
+        response = client.get(
+            "/items/42", headers={"X-Correlation-ID": "corr-1", "X-Tenant-ID": "tenant-a"}
+        )
+
+        body = response.json()
+        assert body["correlation_id"] == "corr-1"
+        assert body["tenant_id"] == "tenant-a"
+        assert response.headers["x-correlation-id"] == "corr-1"
+        assert response.headers["x-trace-id"] == body["trace_id"]
+        assert response.headers["x-response-time"].endswith("ms")
+
+    def test_incoming_trace_id_is_continued(self):
+        _, client = build_app()
+
+        response = client.get("/items/1", headers={"X-Trace-ID": "trace-from-upstream"})
+
+        assert response.json()["trace_id"] == "trace-from-upstream"
+
+    def test_generates_correlation_id(self):
+        _, client = build_app()
+
+        response = client.get("/items/1")
+
+        assert response.json()["correlation_id"] == response.headers["x-correlation-id"]
+
+    def test_endpoint_stats_and_errors(self):
+        app, client = build_app()
+        client.get("/items/1")
+        client.get("/items/1")
+        client.get("/boom")
+
+        stats = get_middleware(app).get_performance_stats()
+        assert stats["GET /items/{item_id}"]["total_requests"] == 2
+        assert stats["GET /items/{item_id}"]["error_rate"] == 0
+        assert stats["GET /boom"]["error_rate"] == 1
+
+    def test_stats_keyed_by_route_template(self):
+        app, client = build_app()
+        for item_id in range(20):
+            client.get(f"/items/{item_id}")
+        client.get("/v2/customers/7")
+        client.get("/no/such/path")
+        client.get("/another/missing/path")
+
+        stats = get_middleware(app).get_performance_stats()
+        assert set(stats) == {
+            "GET /items/{item_id}",
+            "GET /v2/customers/{customer_id}",
+            OVERFLOW_ENDPOINT,
+        }
+        assert stats["GET /items/{item_id}"]["total_requests"] == 20
+        assert stats[OVERFLOW_ENDPOINT]["total_requests"] == 2
+        assert stats[OVERFLOW_ENDPOINT]["error_rate"] == 1
+
+    def test_metric_labels_use_route_template(self):
+        app, client = build_app()
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/missing")
+
+        endpoints = {endpoint for _, endpoint, _ in get_middleware(app)._labels}
+        assert endpoints == {"*", "/items/{item_id}", UNMATCHED_ROUTE}
+
+    def test_failed_attempts_are_bounded(self):
+        app, client = build_app(max_tracked_clients=1)
+        for _ in range(7):
+            client.get("/api/auth/login")
+
+        attempts = get_middleware(app)._failed_attempts["testclient"]
+        assert attempts["count"] == 7
+        assert list(attempts["paths"]) == ["/api/auth/login"] * 5
+
+    def test_rate_limit_window(self):
+        app, _ = build_app(rate_limit_max_requests=2, rate_limit_window=10)
+        middleware = get_middleware(app)
+
+        assert not middleware._check_rate_limit("1.2.3.4", 0.0)
+        assert not middleware._check_rate_limit("1.2.3.4", 1.0)
+        assert middleware._check_rate_limit("1.2.3.4", 2.0)
+        assert not middleware._check_rate_limit("1.2.3.4", 11.5)
+
+    def test_label_sets_are_cached(self):
+        app, client = build_app(max_label_sets=2)
+        client.get("/items/1")
+        client.get("/items/1")
+        client.get("/boom")
+
+        middleware = get_middleware(app)
+        assert list(middleware._labels) == [
+            ("GET", "*", "unknown"),
+            ("GET", "/items/{item_id}", "unknown"),
+        ]
+        assert middleware._active == {}
+
+    def test_audit_and_security_events_use_platform_loggers(self):
+        app, client = build_app()
+        middleware = get_middleware(app)
+        middleware.audit_logger.user_action = Mock()
+        middleware.logger.security = Mock()
+
+        client.get("/api/auth/login")
+        client.get("/items/select")
+
+        assert isinstance(middleware.logger, StructuredLogger)
+        middleware.audit_logger.user_action.assert_called_once()
+        audit = middleware.audit_logger.user_action.call_args.kwargs
+        assert audit["action"] == "GET /api/auth/login"
+        assert audit["success"] is False
+        assert audit["details"]["status_code"] == 401
+        middleware.logger.security.assert_called_once()
+        assert middleware.logger.security.call_args.args == ("Suspicious request detected",)
+
+    def test_headers_are_redacted_when_logged(self):
+        app, _ = build_app(log_headers=True)
+
+        headers = get_middleware(app)._sanitize_headers(
+            [(b"authorization", b"Bearer secret"), (b"accept", b"*/*")]
+        )
+
+        assert headers == {"authorization": "***REDACTED***", "accept": "*/*"}
+
+    @pytest.mark.asyncio
+    async def test_non_http_scopes_pass_through(self):
+        calls = []
+
+        async def app(scope, receive, send):
+            calls.append(scope["type"])
+
+        middleware = ObservabilityASGIMiddleware(app, enable_tracing=False)
+        await middleware({"type": "lifespan"}, None, None)
+
+        assert calls == ["lifespan"]
+
+
+class TestEndpointStats:
+    def test_fixed_buckets_and_percentiles(self):
+        stats = EndpointStats(buckets_ms=(10, 100, 1000))
+        for duration_ms in [5] * 90 + [50] * 9 + [5000]:
+            stats.record("GET /items/{item_id}", duration_ms, 200, "tenant-a")
+
+        summary = stats.snapshot()["GET /items/{item_id}"]
+        assert summary["total_requests"] == 100
+        assert summary["buckets"] == {10: 90, 100: 9, 1000: 0, float("inf"): 1}
+        assert summary["p50_duration_ms"] == 10
+        assert summary["p95_duration_ms"] == 100
+        assert summary["p99_duration_ms"] == 100
+        assert summary["max_duration_ms"] == 5000
+        assert summary["unique_tenants"] == 1
+
+    def test_endpoints_beyond_limit_share_overflow_entry(self):
+        stats = EndpointStats(max_endpoints=2)
+        for index in range(10):
+            stats.record(f"GET /route-{index}", 1.0, 200)
+        stats.record(None, 1.0, 404)
+
+        summary = stats.snapshot()
+        assert len(stats) == 3
+        assert summary["GET /route-0"]["total_requests"] == 1
+        assert summary[OVERFLOW_ENDPOINT]["total_requests"] == 9
+        assert summary[OVERFLOW_ENDPOINT]["error_rate"] == 1 / 9
+
+    def test_tenants_per_endpoint_are_capped(self):
+        stats = EndpointStats(max_tenants_per_endpoint=2)
+        for tenant in ("a", "b", "c"):
+            stats.record("GET /items", 1.0, 200, tenant)
+
+        summary = stats.snapshot()["GET /items"]
+        assert summary["unique_tenants"] == 2
+        assert summary["unique_tenants_capped"] is True
+
+
+class TestMemorySampler:
+    def test_samples_once_per_interval(self):
+        sampler = MemorySampler(interval=10)
+        if sampler._process is None:
+            pytest.skip("psutil not installed")
+
+        first = sampler.sample(100.0)
+        sampler.rss_mb = -1.0
+        assert sampler.sample(105.0) == -1.0
+        assert sampler.sample(110.0) != -1.0
+        assert first > 0
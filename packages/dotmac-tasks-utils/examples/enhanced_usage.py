@@ -108,7 +108,7 @@ async def main():
         print(f"Submitted normal priority task: {task_id2}")
         
         # Check queue status
-        queue_size = queue.get_queue_size()
+        queue_size = await queue.get_queue_size()
         print(f"Current queue size: {queue_size}")
         
     else:
@@ -127,7 +127,7 @@ class HealthChecker:
             )
 
         try:
-            depth = self.redis_queue.get_queue_size()
+            depth = await self.redis_queue.get_queue_size()
 
             if depth > self.thresholds["queue_depth_critical"]:
                 status = HealthStatus.UNHEALTHY
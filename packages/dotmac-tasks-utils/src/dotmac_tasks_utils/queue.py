@@ -1,43 +1,230 @@
 """Redis-based task queue for dotmac-tasks-utils."""
 from __future__ import annotations
 
+import asyncio
 import json
+import time
 import uuid
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from .types import TaskId, TaskOptions, TaskResult, TaskStatus
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
 try:
-    import redis
-    from redis import Redis
+    import redis.asyncio as aioredis
     REDIS_AVAILABLE = True
 except ImportError:
-    redis = None
-    Redis = Any  # Type placeholder
+    aioredis = None
     REDIS_AVAILABLE = False
 
+# Ready-set scores are ``-priority * PRIORITY_SPAN + sequence`` so higher
+# priorities sort first and tasks of equal priority keep enqueue order. Scores
+# stay exact doubles while ``priority * PRIORITY_SPAN`` is below 2**53.
+PRIORITY_SPAN = 2**40
+
+# Maximum delayed or expired-lease tasks moved back to the ready set per dequeue
+MAINTENANCE_BATCH = 100
+
+# Scripts reach task hashes through the key prefix passed in ARGV, so on Redis
+# Cluster the queue name needs a hash tag, e.g. "{dotmac:tasks}".
+_READY_SCORE = """
+local function ready_score(task_key)
+    local priority = tonumber(redis.call('HGET', task_key, 'priority') or '0')
+    return -priority * tonumber(ARGV_SPAN) + redis.call('INCR', KEYS_SEQ)
+end
+"""
+
+_ENQUEUE_SCRIPT = """
+local ARGV_SPAN, KEYS_SEQ = ARGV[11], KEYS[4]
+""" + _READY_SCORE + """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('HSET', KEYS[1],
+    'task_id', ARGV[1], 'data', ARGV[2], 'priority', ARGV[3],
+    'max_attempts', ARGV[4], 'timeout', ARGV[5], 'delay', ARGV[6], 'tags', ARGV[7],
+    'enqueued_at', ARGV[8], 'attempts', 0, 'status', 'pending')
+local ready_at = tonumber(ARGV[9])
+if ready_at and ready_at > tonumber(ARGV[10]) then
+    redis.call('ZADD', KEYS[3], ready_at, ARGV[1])
+else
+    redis.call('ZADD', KEYS[2], ready_score(KEYS[1]), ARGV[1])
+end
+return 1
+"""
+
+_DEQUEUE_SCRIPT = """
+local ARGV_SPAN, KEYS_SEQ = ARGV[6], KEYS[4]
+""" + _READY_SCORE + """
+local now = tonumber(ARGV[1])
+local count = tonumber(ARGV[2])
+local default_timeout = tonumber(ARGV[3])
+local prefix = ARGV[4]
+local batch = tonumber(ARGV[7])
+local ttl = tonumber(ARGV[8])
+
+-- Promote delayed tasks that are due
+local due = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now, 'LIMIT', 0, batch)
+for _, id in ipairs(due) do
+    redis.call('ZREM', KEYS[2], id)
+    redis.call('ZADD', KEYS[1], ready_score(prefix .. id), id)
+end
+
+-- Requeue tasks whose lease expired, or fail them when out of attempts
+local expired = redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', now, 'LIMIT', 0, batch)
+for _, id in ipairs(expired) do
+    local key = prefix .. id
+    redis.call('ZREM', KEYS[3], id)
+    redis.call('HDEL', key, 'lease', 'lease_expires_at')
+    local attempts = tonumber(redis.call('HGET', key, 'attempts') or '0')
+    local max_attempts = tonumber(redis.call('HGET', key, 'max_attempts') or '1')
+    if attempts >= max_attempts then
+        redis.call('HSET', key, 'status', 'failed', 'error', 'lease expired',
+            'completed_at', now)
+        redis.call('EXPIRE', key, ttl)
+    else
+        redis.call('HSET', key, 'status', 'retry')
+        redis.call('ZADD', KEYS[1], ready_score(key), id)
+    end
+end
+
+-- Lease the next tasks in priority/FIFO order
+local leased = {}
+for i, id in ipairs(redis.call('ZRANGE', KEYS[1], 0, count - 1)) do
+    local key = prefix .. id
+    redis.call('ZREM', KEYS[1], id)
+    if redis.call('EXISTS', key) == 1 then
+        local timeout = tonumber(redis.call('HGET', key, 'timeout')) or default_timeout
+        local deadline = now + timeout
+        local lease = ARGV[5] .. ':' .. i
+        redis.call('HINCRBY', key, 'attempts', 1)
+        redis.call('HSET', key, 'status', 'running', 'lease', lease,
+            'lease_expires_at', deadline)
+        redis.call('HSETNX', key, 'started_at', now)
+        redis.call('ZADD', KEYS[3], deadline, id)
+        table.insert(leased, redis.call('HGETALL', key))
+    end
+end
+return leased
+"""
+
+_EXTEND_SCRIPT = """
+if ARGV[2] ~= '' and redis.call('HGET', KEYS[1], 'lease') ~= ARGV[2] then
+    return 0
+end
+if not redis.call('ZSCORE', KEYS[2], ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[1])
+redis.call('HSET', KEYS[1], 'lease_expires_at', ARGV[3])
+return 1
+"""
+
+_COMPLETE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+if ARGV[2] ~= '' and redis.call('HGET', KEYS[1], 'lease') ~= ARGV[2] then
+    return 0
+end
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('ZREM', KEYS[3], ARGV[1])
+redis.call('ZREM', KEYS[4], ARGV[1])
+redis.call('HDEL', KEYS[1], 'lease', 'lease_expires_at')
+redis.call('HSET', KEYS[1], 'status', ARGV[3], 'completed_at', ARGV[5])
+if ARGV[4] ~= '' then
+    redis.call('HSET', KEYS[1], 'error', ARGV[4])
+end
+if ARGV[6] ~= '' then
+    redis.call('SET', KEYS[5], ARGV[6], 'EX', ARGV[7])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[7])
+return 1
+"""
+
+_RELEASE_SCRIPT = """
+local ARGV_SPAN, KEYS_SEQ = ARGV[6], KEYS[5]
+""" + _READY_SCORE + """
+if ARGV[2] ~= '' and redis.call('HGET', KEYS[1], 'lease') ~= ARGV[2] then
+    return 0
+end
+if redis.call('ZREM', KEYS[2], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('HDEL', KEYS[1], 'lease', 'lease_expires_at')
+if ARGV[5] ~= '' then
+    redis.call('HSET', KEYS[1], 'error', ARGV[5])
+end
+local attempts = tonumber(redis.call('HGET', KEYS[1], 'attempts') or '0')
+local max_attempts = tonumber(redis.call('HGET', KEYS[1], 'max_attempts') or '1')
+if attempts >= max_attempts then
+    redis.call('HSET', KEYS[1], 'status', 'failed', 'completed_at', ARGV[3])
+    redis.call('EXPIRE', KEYS[1], ARGV[7])
+    return 2
+end
+redis.call('HSET', KEYS[1], 'status', 'retry')
+local delay = tonumber(ARGV[4])
+if delay > 0 then
+    redis.call('ZADD', KEYS[4], tonumber(ARGV[3]) + delay, ARGV[1])
+else
+    redis.call('ZADD', KEYS[3], ready_score(KEYS[1]), ARGV[1])
+end
+return 1
+"""
+
+_CLEAR_SCRIPT = """
+local ids = redis.call('ZRANGE', KEYS[1], 0, -1)
+for _, id in ipairs(redis.call('ZRANGE', KEYS[2], 0, -1)) do
+    ids[#ids + 1] = id
+end
+-- DEL in batches to stay under Lua's unpack() limit
+for first = 1, #ids, 1000 do
+    local keys = {}
+    for i = first, math.min(first + 999, #ids) do
+        keys[#keys + 1] = ARGV[1] .. ids[i]
+    end
+    redis.call('DEL', unpack(keys))
+end
+redis.call('DEL', KEYS[1], KEYS[2])
+return #ids
+"""
+
 
 class RedisTaskQueue:
     """
     Redis-based task queue with priority support.
 
-    Provides persistent task queueing with Redis as the backend.
+    Tasks are stored in per-task hashes and referenced by ID from three
+    sorted sets: ``ready`` (ordered by priority, then FIFO), ``delayed``
+    (scored by the time a task becomes due) and ``leased`` (scored by lease
+    expiry). Every state change runs as a Lua script, so a worker that dies
+    after dequeuing never loses a task: once its lease expires the task is
+    moved back to the ready set by the next dequeue, until ``max_attempts``
+    is used up.
     """
 
     def __init__(
         self,
-        redis_client: Redis | None = None,
+        redis_client: aioredis.Redis | None = None,
         queue_name: str = "dotmac:tasks",
         result_ttl: int = 3600,
+        visibility_timeout: float = 30.0,
+        poll_interval: float = 0.1,
     ) -> None:
         """
         Initialize the Redis task queue.
 
         Args:
-            redis_client: Redis client instance
+            redis_client: Async Redis client instance (``redis.asyncio``)
             queue_name: Base name for Redis keys
             result_ttl: TTL for task results in seconds
+            visibility_timeout: Default lease duration in seconds; a task's
+                ``TaskOptions.timeout`` overrides it
+            poll_interval: Seconds between polls for blocking dequeues
 
         Raises:
             ImportError: If Redis is not installed
@@ -47,7 +234,7 @@ class RedisTaskQueue:
             raise ImportError(msg)
 
         if redis_client is None:
-            redis_client = redis.Redis(
+            redis_client = aioredis.Redis(
                 host="localhost",
                 port=6379,
                 db=0,
@@ -57,11 +244,23 @@ class RedisTaskQueue:
         self.redis = redis_client
         self.queue_name = queue_name
         self.result_ttl = result_ttl
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
 
         # Redis key patterns
-        self._queue_key = f"{queue_name}:queue"
+        self._ready_key = f"{queue_name}:ready"
+        self._delayed_key = f"{queue_name}:delayed"
+        self._leased_key = f"{queue_name}:leased"
+        self._seq_key = f"{queue_name}:seq"
+        self._task_key_pattern = f"{queue_name}:task:"
         self._result_key_pattern = f"{queue_name}:result:"
-        self._status_key_pattern = f"{queue_name}:status:"
+
+        self._enqueue_script = self.redis.register_script(_ENQUEUE_SCRIPT)
+        self._dequeue_script = self.redis.register_script(_DEQUEUE_SCRIPT)
+        self._extend_script = self.redis.register_script(_EXTEND_SCRIPT)
+        self._complete_script = self.redis.register_script(_COMPLETE_SCRIPT)
+        self._release_script = self.redis.register_script(_RELEASE_SCRIPT)
+        self._clear_script = self.redis.register_script(_CLEAR_SCRIPT)
 
     async def enqueue(
         self,
@@ -72,10 +271,13 @@ class RedisTaskQueue:
         """
         Enqueue a task for processing.
 
+        Enqueueing an ID that is already queued or running is a no-op.
+
         Args:
             task_data: Task data to enqueue
             task_id: Optional custom task ID
-            options: Task execution options
+            options: Task execution options; ``delay`` holds the task in the
+                delayed set until it is due
 
         Returns:
             Task ID for tracking
@@ -86,27 +288,25 @@ class RedisTaskQueue:
         if options is None:
             options = TaskOptions()
 
-        # Create task payload
-        payload = {
-            "task_id": task_id,
-            "data": task_data,
-            "options": {
-                "priority": options.priority.value,
-                "max_attempts": options.max_attempts,
-                "timeout": options.timeout,
-                "delay": options.delay,
-                "tags": options.tags or {},
-            },
-            "enqueued_at": datetime.utcnow().isoformat(),
-            "attempts": 0,
-        }
-
-        # Store initial status
-        await self._set_task_status(task_id, TaskStatus.PENDING)
-
-        # Add to priority queue (higher priority = higher score)
-        score = options.priority.value
-        self.redis.zadd(self._queue_key, {json.dumps(payload): score})
+        now = time.time()
+        ready_at = now + options.delay if options.delay else ""
+
+        await self._enqueue_script(
+            keys=[self._task_key(task_id), self._ready_key, self._delayed_key, self._seq_key],
+            args=[
+                task_id,
+                json.dumps(task_data),
+                options.priority.value,
+                options.max_attempts,
+                options.timeout or "",
+                options.delay or "",
+                json.dumps(options.tags or {}),
+                datetime.utcnow().isoformat(),
+                ready_at,
+                now,
+                PRIORITY_SPAN,
+            ],
+        )
 
         return task_id
 
@@ -120,19 +320,142 @@ class RedisTaskQueue:
         Returns:
             Task payload or None if no tasks available
         """
-        if timeout:
-            # Blocking pop with timeout
-            result = self.redis.bzpopmax(self._queue_key, timeout=int(timeout))
-            if result:
-                _, task_json, _ = result
-                return json.loads(task_json)
-            return None
-        # Non-blocking pop
-        result = self.redis.zpopmax(self._queue_key, count=1)
-        if result:
-            task_json, _ = result[0]
-            return json.loads(task_json)
-        return None
+        tasks = await self.dequeue_batch(1, timeout=timeout)
+        return tasks[0] if tasks else None
+
+    async def dequeue_batch(
+        self,
+        count: int,
+        timeout: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Lease up to ``count`` tasks in priority order.
+
+        Each returned payload carries a ``lease_id`` that must be passed to
+        :meth:`extend_lease`, :meth:`set_result` or :meth:`release` while the
+        lease (``lease_expires_at``, epoch seconds) is held.
+
+        Args:
+            count: Maximum number of tasks to lease
+            timeout: Optional blocking timeout in seconds
+
+        Returns:
+            Leased task payloads, empty if none became available
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            leased = await self._dequeue_script(
+                keys=[self._ready_key, self._delayed_key, self._leased_key, self._seq_key],
+                args=[
+                    time.time(),
+                    count,
+                    self.visibility_timeout,
+                    self._task_key_pattern,
+                    uuid.uuid4().hex,
+                    PRIORITY_SPAN,
+                    MAINTENANCE_BATCH,
+                    self.result_ttl,
+                ],
+            )
+            if leased or deadline is None or time.monotonic() >= deadline:
+                return [self._task_payload(self._pairs_to_dict(fields)) for fields in leased]
+            await asyncio.sleep(self.poll_interval)
+
+    async def extend_lease(
+        self,
+        task_id: TaskId,
+        lease_id: str | None = None,
+        visibility_timeout: float | None = None,
+    ) -> bool:
+        """
+        Extend a task lease (heartbeat).
+
+        Args:
+            task_id: Leased task ID
+            lease_id: Lease to extend; None extends whoever holds the lease
+            visibility_timeout: New lease duration from now in seconds
+
+        Returns:
+            False if the task is no longer leased under ``lease_id``
+        """
+        extended = await self._extend_script(
+            keys=[self._task_key(task_id), self._leased_key],
+            args=[
+                task_id,
+                lease_id or "",
+                time.time() + (visibility_timeout or self.visibility_timeout),
+            ],
+        )
+        return bool(extended)
+
+    @asynccontextmanager
+    async def lease_heartbeat(
+        self,
+        task: dict[str, Any],
+        interval: float | None = None,
+    ) -> AsyncIterator[None]:
+        """
+        Keep a dequeued task leased while the block runs.
+
+        Args:
+            task: Payload returned by :meth:`dequeue` or :meth:`dequeue_batch`
+            interval: Seconds between extensions (default: a third of the lease)
+        """
+        lease_seconds = task["options"]["timeout"] or self.visibility_timeout
+        interval = interval or lease_seconds / 3
+
+        async def beat() -> None:
+            while await self.extend_lease(task["task_id"], task["lease_id"], lease_seconds):
+                await asyncio.sleep(interval)
+
+        heartbeat = asyncio.create_task(beat())
+        try:
+            yield
+        finally:
+            heartbeat.cancel()
+            with suppress(asyncio.CancelledError):
+                await heartbeat
+
+    async def release(
+        self,
+        task_id: TaskId,
+        lease_id: str | None = None,
+        delay: float | None = None,
+        error: str | None = None,
+    ) -> bool:
+        """
+        Give up a lease so the task is retried.
+
+        The task is marked failed instead when it has used ``max_attempts``.
+
+        Args:
+            task_id: Leased task ID
+            lease_id: Lease to release; None releases whoever holds the lease
+            delay: Optional seconds to wait before the task is ready again
+            error: Optional error message to record
+
+        Returns:
+            False if the task is no longer leased under ``lease_id``
+        """
+        released = await self._release_script(
+            keys=[
+                self._task_key(task_id),
+                self._leased_key,
+                self._ready_key,
+                self._delayed_key,
+                self._seq_key,
+            ],
+            args=[
+                task_id,
+                lease_id or "",
+                time.time(),
+                delay or 0,
+                error or "",
+                PRIORITY_SPAN,
+                self.result_ttl,
+            ],
+        )
+        return bool(released)
 
     async def get_status(self, task_id: TaskId) -> TaskResult[Any]:
         """
@@ -147,27 +470,16 @@ class RedisTaskQueue:
         Raises:
             KeyError: If task not found
         """
-        status_key = f"{self._status_key_pattern}{task_id}"
-        result_key = f"{self._result_key_pattern}{task_id}"
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self._task_key(task_id))
+            pipe.get(f"{self._result_key_pattern}{task_id}")
+            task_info, result_data = await pipe.execute()
 
-        status_data = self.redis.get(status_key)
-        if not status_data:
+        if not task_info:
             msg = f"Task {task_id} not found"
             raise KeyError(msg)
 
-        status_info = json.loads(status_data)
-        result_data = self.redis.get(result_key)
-
-        return TaskResult[Any](
-            task_id=task_id,
-            status=TaskStatus(status_info["status"]),
-            result=json.loads(result_data) if result_data else None,
-            error=status_info.get("error"),
-            started_at=self._parse_datetime(status_info.get("started_at")),
-            completed_at=self._parse_datetime(status_info.get("completed_at")),
-            attempts=status_info.get("attempts", 0),
-            max_attempts=status_info.get("max_attempts", 1),
-        )
+        return self._task_result(task_info, result_data)
 
     async def set_result(
         self,
@@ -175,24 +487,43 @@ class RedisTaskQueue:
         result: Any,
         status: TaskStatus,
         error: str | None = None,
-    ) -> None:
+        lease_id: str | None = None,
+    ) -> bool:
         """
         Set task result and status.
 
+        Completing a task ends its lease; a queued or delayed task (e.g. one
+        being cancelled) is removed from the queue.
+
         Args:
             task_id: Task ID
             result: Task result data
             status: Final task status
             error: Optional error message
-        """
-        result_key = f"{self._result_key_pattern}{task_id}"
-
-        # Store result
-        if result is not None:
-            self.redis.setex(result_key, self.result_ttl, json.dumps(result))
+            lease_id: Lease that must still be held; None completes unconditionally
 
-        # Update status
-        await self._set_task_status(task_id, status, error=error, completed=True)
+        Returns:
+            False if the task is unknown or its lease was lost to another worker
+        """
+        completed = await self._complete_script(
+            keys=[
+                self._task_key(task_id),
+                self._leased_key,
+                self._ready_key,
+                self._delayed_key,
+                f"{self._result_key_pattern}{task_id}",
+            ],
+            args=[
+                task_id,
+                lease_id or "",
+                status.value,
+                error or "",
+                time.time(),
+                json.dumps(result) if result is not None else "",
+                self.result_ttl,
+            ],
+        )
+        return bool(completed)
 
     async def list_tasks(
         self,
@@ -209,85 +540,134 @@ class RedisTaskQueue:
         Returns:
             List of task results
         """
-        # Get all task status keys
-        pattern = f"{self._status_key_pattern}*"
-        keys = self.redis.keys(pattern)
+        keys = []
+        async for key in self.redis.scan_iter(match=f"{self._task_key_pattern}*"):
+            keys.append(key)
+            if len(keys) >= limit:  # Limit to avoid memory issues
+                break
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.hgetall(key)
+            task_infos = await pipe.execute()
 
         tasks = []
-        for key in keys[:limit]:  # Limit to avoid memory issues
+        for task_info in task_infos:
             try:
-                task_id = key.split(":")[-1]
-                task_result = await self.get_status(task_id)
+                task_result = self._task_result(task_info, None)
+            except (KeyError, ValueError):
+                continue  # Skip expired or invalid entries
 
-                if status is None or task_result.status == status:
-                    tasks.append(task_result)
-
-            except (KeyError, json.JSONDecodeError):
-                continue  # Skip invalid entries
+            if status is None or task_result.status == status:
+                tasks.append(task_result)
 
         return tasks
 
-    def get_queue_size(self) -> int:
+    async def get_queue_size(self) -> int:
         """
         Get the current queue size.
 
         Returns:
-            Number of tasks in queue
+            Number of ready and delayed tasks in queue
         """
-        return self.redis.zcard(self._queue_key)
-
-    def clear_queue(self) -> int:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zcard(self._ready_key)
+            pipe.zcard(self._delayed_key)
+            ready, delayed = await pipe.execute()
+        return ready + delayed
+
+    async def get_stats(self) -> dict[str, int]:
+        """Get ready, delayed and leased task counts."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zcard(self._ready_key)
+            pipe.zcard(self._delayed_key)
+            pipe.zcard(self._leased_key)
+            ready, delayed, leased = await pipe.execute()
+        return {"ready": ready, "delayed": delayed, "leased": leased}
+
+    async def clear_queue(self) -> int:
         """
-        Clear all tasks from the queue.
+        Clear all queued tasks (ready and delayed) from the queue.
+
+        Runs as one script, so a task enqueued concurrently is either
+        removed with the rest or left fully intact.
 
         Returns:
             Number of tasks removed
         """
-        return self.redis.delete(self._queue_key)
+        removed = await self._clear_script(
+            keys=[self._ready_key, self._delayed_key],
+            args=[self._task_key_pattern],
+        )
+        return int(removed)
 
-    async def _set_task_status(
-        self,
-        task_id: TaskId,
-        status: TaskStatus,
-        error: str | None = None,
-        completed: bool = False,
-    ) -> None:
-        """Set task status in Redis."""
-        status_key = f"{self._status_key_pattern}{task_id}"
-
-        # Get existing status or create new
-        existing = self.redis.get(status_key)
-        if existing:
-            status_info = json.loads(existing)
-        else:
-            status_info = {
-                "task_id": task_id,
-                "attempts": 0,
-                "max_attempts": 1,
-            }
-
-        # Update status
-        status_info["status"] = status.value
-        if error:
-            status_info["error"] = error
-        if status == TaskStatus.RUNNING and "started_at" not in status_info:
-            status_info["started_at"] = datetime.utcnow().isoformat()
-        if completed:
-            status_info["completed_at"] = datetime.utcnow().isoformat()
-
-        # Store with TTL
-        self.redis.setex(status_key, self.result_ttl, json.dumps(status_info))
+    def _task_key(self, task_id: TaskId) -> str:
+        """Redis key of a task hash."""
+        return f"{self._task_key_pattern}{task_id}"
+
+    @staticmethod
+    def _pairs_to_dict(fields: list[Any]) -> dict[str, str]:
+        """Convert a flat HGETALL reply from a script into a dict."""
+        return {
+            _text(fields[index]): _text(fields[index + 1]) for index in range(0, len(fields), 2)
+        }
+
+    def _task_payload(self, task_info: dict[str, str]) -> dict[str, Any]:
+        """Build the payload handed to workers from a task hash."""
+        return {
+            "task_id": task_info["task_id"],
+            "data": json.loads(task_info["data"]),
+            "options": {
+                "priority": int(task_info["priority"]),
+                "max_attempts": int(task_info["max_attempts"]),
+                "timeout": _optional_float(task_info.get("timeout")),
+                "delay": _optional_float(task_info.get("delay")),
+                "tags": json.loads(task_info.get("tags") or "{}"),
+            },
+            "enqueued_at": task_info["enqueued_at"],
+            "attempts": int(task_info.get("attempts", 0)),
+            "lease_id": task_info.get("lease"),
+            "lease_expires_at": _optional_float(task_info.get("lease_expires_at")),
+        }
+
+    def _task_result(self, task_info: dict[str, str], result_data: str | None) -> TaskResult[Any]:
+        """Build a TaskResult from a task hash."""
+        task_info = {_text(key): _text(value) for key, value in task_info.items()}
+        return TaskResult[Any](
+            task_id=task_info["task_id"],
+            status=TaskStatus(task_info["status"]),
+            result=json.loads(result_data) if result_data else None,
+            error=task_info.get("error"),
+            started_at=self._parse_datetime(task_info.get("started_at")),
+            completed_at=self._parse_datetime(task_info.get("completed_at")),
+            attempts=int(task_info.get("attempts", 0)),
+            max_attempts=int(task_info.get("max_attempts", 1)),
+        )
 
     def _parse_datetime(self, dt_str: str | None) -> datetime | None:
-        """Parse datetime string."""
+        """Parse an epoch-seconds or ISO datetime string."""
         if not dt_str:
             return None
+        try:
+            return datetime.utcfromtimestamp(float(dt_str))
+        except ValueError:
+            pass
         try:
             return datetime.fromisoformat(dt_str)
         except (ValueError, TypeError):
             return None
 
 
+def _text(value: Any) -> str:
+    """Decode a Redis reply value for clients without ``decode_responses``."""
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _optional_float(value: str | None) -> float | None:
+    """Parse an optional numeric hash field stored as '' when unset."""
+    return float(value) if value else None
+
+
 # Simple factory function
 def create_redis_queue(
     redis_url: str | None = None,
@@ -313,8 +693,8 @@ def create_redis_queue(
         raise ImportError(msg)
 
     if redis_url:
-        redis_client = redis.from_url(redis_url, decode_responses=True, **kwargs)
+        redis_client = aioredis.from_url(redis_url, decode_responses=True, **kwargs)
     else:
-        redis_client = redis.Redis(decode_responses=True, **kwargs)
+        redis_client = aioredis.Redis(decode_responses=True, **kwargs)
 
     return RedisTaskQueue(redis_client, queue_name)
@@ -0,0 +1,184 @@
+"""Tests for the Redis task queue."""
+
+import asyncio
+import time
+
+import pytest
+
+from dotmac_tasks_utils.types import TaskOptions, TaskPriority, TaskStatus
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # fakeredis needs lupa to run Lua scripts
+
+from dotmac_tasks_utils.queue import RedisTaskQueue  # noqa: E402
+
+
+@pytest.fixture
+def queue():
+    """Queue backed by an in-process fake Redis server."""
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    return RedisTaskQueue(client, queue_name="test", visibility_timeout=30.0, poll_interval=0.01)
+
+
+class TestRedisTaskQueue:
+    """Test the RedisTaskQueue class."""
+
+    @pytest.mark.asyncio
+    async def test_priority_then_fifo_order(self, queue):
+        """Higher priorities dequeue first, equal priorities in enqueue order."""
+        for name, priority in [
+            ("normal-1", TaskPriority.NORMAL),
+            ("low", TaskPriority.LOW),
+            ("critical", TaskPriority.CRITICAL),
+            ("normal-2", TaskPriority.NORMAL),
+            ("high", TaskPriority.HIGH),
+            ("normal-3", TaskPriority.NORMAL),
+        ]:
+            options = TaskOptions(priority=priority)
+            await queue.enqueue({"name": name}, task_id=name, options=options)
+
+        tasks = await queue.dequeue_batch(4)
+        assert [task["data"]["name"] for task in tasks] == [
+            "critical", "high", "normal-1", "normal-2",
+        ]
+        rest = await queue.dequeue_batch(10)
+        assert [task["task_id"] for task in rest] == ["normal-3", "low"]
+        assert await queue.dequeue() is None
+
+        stats = await queue.get_stats()
+        assert stats == {"ready": 0, "delayed": 0, "leased": 6}
+
+    @pytest.mark.asyncio
+    async def test_payload_stored_by_id(self, queue):
+        """Payloads live in a hash referenced by ID; re-enqueueing is a no-op."""
+        task_id = await queue.enqueue({"invoice": 7}, options=TaskOptions(tags={"kind": "billing"}))
+        await queue.enqueue({"invoice": 8}, task_id=task_id)
+
+        assert await queue.redis.zrange("test:ready", 0, -1) == [task_id]
+        assert await queue.get_queue_size() == 1
+
+        task = await queue.dequeue()
+        assert task["data"] == {"invoice": 7}
+        assert task["options"]["tags"] == {"kind": "billing"}
+        assert task["attempts"] == 1
+        assert (await queue.get_status(task_id)).status == TaskStatus.RUNNING
+
+    @pytest.mark.asyncio
+    async def test_delayed_tasks_are_promoted_when_due(self, queue):
+        """Delayed tasks are held back until their delay has passed."""
+        await queue.enqueue({"n": 1}, task_id="later", options=TaskOptions(delay=0.2))
+        await queue.enqueue({"n": 2}, task_id="now")
+
+        assert [task["task_id"] for task in await queue.dequeue_batch(10)] == ["now"]
+        assert await queue.get_stats() == {"ready": 0, "delayed": 1, "leased": 1}
+
+        task = await queue.dequeue(timeout=2.0)
+        assert task["task_id"] == "later"
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_redelivered(self, queue):
+        """A task whose worker died is redelivered after the visibility timeout."""
+        options = TaskOptions(max_attempts=2, timeout=0.1)
+        await queue.enqueue({"n": 1}, task_id="t1", options=options)
+
+        first = await queue.dequeue()
+        assert await queue.dequeue() is None
+
+        await asyncio.sleep(0.15)
+        second = await queue.dequeue()
+        assert second["task_id"] == "t1"
+        assert second["attempts"] == 2
+        assert second["lease_id"] != first["lease_id"]
+
+        # The first worker's lease is gone; it cannot complete the task
+        assert not await queue.set_result(
+            "t1", "stale", TaskStatus.SUCCESS, lease_id=first["lease_id"]
+        )
+        assert await queue.set_result(
+            "t1", {"ok": True}, TaskStatus.SUCCESS, lease_id=second["lease_id"]
+        )
+
+        status = await queue.get_status("t1")
+        assert status.status == TaskStatus.SUCCESS
+        assert status.result == {"ok": True}
+        assert status.attempts == 2
+        assert status.completed_at is not None
+        assert await queue.get_stats() == {"ready": 0, "delayed": 0, "leased": 0}
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_without_attempts_left_fails(self, queue):
+        """A task is failed once its lease expires on the last attempt."""
+        await queue.enqueue({"n": 1}, task_id="t1", options=TaskOptions(timeout=0.05))
+        await queue.dequeue()
+
+        await asyncio.sleep(0.1)
+        assert await queue.dequeue() is None
+
+        status = await queue.get_status("t1")
+        assert status.status == TaskStatus.FAILED
+        assert status.error == "lease expired"
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_keeps_lease(self, queue):
+        """Extending a lease keeps the task from being redelivered."""
+        options = TaskOptions(max_attempts=3, timeout=0.1)
+        await queue.enqueue({"n": 1}, task_id="t1", options=options)
+        task = await queue.dequeue()
+
+        async with queue.lease_heartbeat(task, interval=0.02):
+            await asyncio.sleep(0.25)
+            assert await queue.dequeue() is None
+
+        assert await queue.extend_lease("t1", task["lease_id"])
+        assert not await queue.extend_lease("t1", "someone-else")
+        expires_at = await queue.redis.zscore("test:leased", "t1")
+        assert expires_at > time.time() + 20
+
+    @pytest.mark.asyncio
+    async def test_release_retries_until_attempts_exhausted(self, queue):
+        """Released tasks are retried, optionally after a delay, then failed."""
+        await queue.enqueue({"n": 1}, task_id="t1", options=TaskOptions(max_attempts=2))
+
+        task = await queue.dequeue()
+        assert await queue.release("t1", task["lease_id"], delay=0.1, error="boom")
+        assert (await queue.get_status("t1")).status == TaskStatus.RETRY
+        assert await queue.dequeue() is None
+
+        task = await queue.dequeue(timeout=2.0)
+        assert task["attempts"] == 2
+        assert await queue.release("t1", task["lease_id"], error="boom again")
+
+        status = await queue.get_status("t1")
+        assert status.status == TaskStatus.FAILED
+        assert status.error == "boom again"
+        assert await queue.get_queue_size() == 0
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_task_and_list(self, queue):
+        """Completing a queued task removes it from the queue."""
+        await queue.enqueue({"n": 1}, task_id="keep")
+        await queue.enqueue({"n": 2}, task_id="drop", options=TaskOptions(delay=60))
+
+        assert await queue.set_result("drop", None, TaskStatus.CANCELLED)
+        assert await queue.get_stats() == {"ready": 1, "delayed": 0, "leased": 0}
+
+        cancelled = await queue.list_tasks(status=TaskStatus.CANCELLED)
+        assert [task.task_id for task in cancelled] == ["drop"]
+        assert len(await queue.list_tasks()) == 2
+
+        assert await queue.clear_queue() == 1
+        with pytest.raises(KeyError):
+            await queue.get_status("keep")
+        assert (await queue.get_status("drop")).status == TaskStatus.CANCELLED
+
+    @pytest.mark.asyncio
+    async def test_clear_queue_removes_ready_and_delayed_tasks(self, queue):
+        """Clearing drops both sorted sets and the hashes of their tasks."""
+        for n in range(3):
+            await queue.enqueue({"n": n}, task_id=f"ready-{n}")
+        await queue.enqueue({"n": 3}, task_id="later", options=TaskOptions(delay=60))
+
+        assert await queue.clear_queue() == 4
+        assert await queue.get_queue_size() == 0
+        assert await queue.redis.keys("test:task:*") == []
+        assert await queue.clear_queue() == 0
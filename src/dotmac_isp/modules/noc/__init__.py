@@ -8,6 +8,7 @@ for ISP network operations.
 from .models.alarms import Alarm, AlarmSeverity, AlarmStatus, AlarmType
 from .models.events import EventSeverity, EventType, NetworkEvent
 from .services.alarm_management_service import AlarmManagementService
+from .services.correlation_engine import EventCorrelationEngine
 from .services.event_correlation_service import EventCorrelationService
 from .services.noc_dashboard_service import NOCDashboardService
 
@@ -15,6 +16,7 @@ __all__ = [
     "NOCDashboardService",
     "AlarmManagementService",
     "EventCorrelationService",
+    "EventCorrelationEngine",
     "Alarm",
     "AlarmSeverity",
     "AlarmStatus",
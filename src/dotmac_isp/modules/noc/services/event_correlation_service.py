@@ -16,7 +16,17 @@ from sqlalchemy.orm import Session
 from dotmac.application import standard_exception_handler
 from dotmac_shared.services.base import BaseManagementService as BaseTenantService
 
-from ..models.events import EventRule, EventSeverity, EventType, NetworkEvent
+from ..models.events import NetworkEvent
+from .correlation_engine import (
+    EventCorrelationEngine,
+    correlate,
+    correlation_strength,
+    find_parent_event_id,
+    find_root_cause_event_id,
+    is_likely_parent_child,
+    load_rule_set,
+    shared_rule_cache,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +34,12 @@ logger = logging.getLogger(__name__)
 class EventCorrelationService(BaseTenantService):
     """Service for correlating network events and identifying patterns."""
 
-    def __init__(self, db: Session, tenant_id: str):
+    def __init__(
+        self,
+        db: Session,
+        tenant_id: str,
+        correlation_engine: Optional[EventCorrelationEngine] = None,
+    ):
         super().__init__(
             db=db,
             model_class=NetworkEvent,
@@ -33,10 +48,19 @@ class EventCorrelationService(BaseTenantService):
             response_schema=None,
             tenant_id=tenant_id,
         )
+        self.correlation_engine = correlation_engine
 
     @standard_exception_handler
     async def process_incoming_event(self, event_data: dict[str, Any]) -> dict[str, Any]:
-        """Process incoming network event with correlation analysis."""
+        """
+        Process incoming network event with correlation analysis.
+
+        When a correlation_engine is configured the event is correlated
+        against its in-memory window and written in the engine's next batch.
+        """
+        if self.correlation_engine is not None:
+            return await self.correlation_engine.process_event(self.tenant_id, event_data)
+
         event_id = event_data.get("event_id") or str(uuid4())
 
         # Create base event
@@ -221,41 +245,7 @@ class EventCorrelationService(BaseTenantService):
 
         # Find related events
         related_events = await self._find_related_events(event, since)
-
-        correlation_results = {
-            "correlation_id": None,
-            "parent_event_id": None,
-            "root_cause_event_id": None,
-            "related_events_count": len(related_events),
-            "correlation_strength": 0.0,
-        }
-
-        if not related_events:
-            return correlation_results
-
-        # Check if any related events already have a correlation ID
-        existing_correlation = None
-        for related_event in related_events:
-            if related_event.correlation_id:
-                existing_correlation = related_event.correlation_id
-                break
-
-        if existing_correlation:
-            correlation_results["correlation_id"] = existing_correlation
-        else:
-            # Create new correlation ID
-            correlation_results["correlation_id"] = f"CORR-{uuid4().hex[:8]}"
-
-        # Determine parent-child relationships
-        correlation_results["parent_event_id"] = await self._determine_parent_event(event, related_events)
-
-        # Identify potential root cause
-        correlation_results["root_cause_event_id"] = await self._identify_root_cause(event, related_events)
-
-        # Calculate correlation strength
-        correlation_results["correlation_strength"] = await self._calculate_correlation_strength(event, related_events)
-
-        return correlation_results
+        return correlate(event, related_events)
 
     async def _find_related_events(self, event: NetworkEvent, since: datetime) -> list[NetworkEvent]:
         """Find events related to the given event."""
@@ -321,162 +311,27 @@ class EventCorrelationService(BaseTenantService):
 
     async def _determine_parent_event(self, event: NetworkEvent, related_events: list[NetworkEvent]) -> Optional[str]:
         """Determine if this event should be a child of another event."""
-        # Look for earlier events that could be parents
-        for related_event in related_events:
-            if related_event.event_timestamp < event.event_timestamp:
-                # Check if it's a likely parent based on event types
-                if await self._is_likely_parent_child(related_event, event):
-                    return related_event.event_id
-        return None
+        return find_parent_event_id(event, related_events)
 
     async def _identify_root_cause(self, event: NetworkEvent, related_events: list[NetworkEvent]) -> Optional[str]:
         """Identify potential root cause event."""
-        # Find the earliest device-down or critical event
-        root_cause_events = [
-            evt
-            for evt in related_events
-            if evt.event_type in [EventType.DEVICE_STATE_CHANGE, EventType.INTERFACE_STATE_CHANGE]
-            and evt.severity in [EventSeverity.CRITICAL, EventSeverity.HIGH]
-        ]
-
-        if root_cause_events:
-            # Return earliest critical event
-            earliest = min(root_cause_events, key=lambda x: x.event_timestamp)
-            return earliest.event_id
-
-        return None
+        return find_root_cause_event_id(related_events)
 
     async def _calculate_correlation_strength(self, event: NetworkEvent, related_events: list[NetworkEvent]) -> float:
         """Calculate correlation strength (0.0 - 1.0)."""
-        if not related_events:
-            return 0.0
-
-        strength = 0.0
-        max_strength = 1.0
-
-        # Same device increases correlation
-        same_device_count = sum(1 for evt in related_events if evt.device_id == event.device_id)
-        if same_device_count > 0:
-            strength += 0.3
-
-        # Same service increases correlation
-        same_service_count = sum(1 for evt in related_events if evt.service_id == event.service_id)
-        if same_service_count > 0:
-            strength += 0.2
-
-        # Same customer increases correlation
-        same_customer_count = sum(1 for evt in related_events if evt.customer_id == event.customer_id)
-        if same_customer_count > 0:
-            strength += 0.2
-
-        # Time proximity increases correlation
-        time_proximity = min(len(related_events) * 0.1, 0.3)
-        strength += time_proximity
-
-        return min(strength, max_strength)
+        return correlation_strength(event, related_events)
 
     async def _is_likely_parent_child(self, potential_parent: NetworkEvent, potential_child: NetworkEvent) -> bool:
         """Determine if two events have a parent-child relationship."""
-        # Device down -> Interface down
-        if (
-            potential_parent.event_type == EventType.DEVICE_STATE_CHANGE
-            and potential_parent.current_state == "down"
-            and potential_child.event_type == EventType.INTERFACE_STATE_CHANGE
-            and potential_child.device_id == potential_parent.device_id
-        ):
-            return True
-
-        # Interface down -> Service down
-        if (
-            potential_parent.event_type == EventType.INTERFACE_STATE_CHANGE
-            and potential_parent.current_state == "down"
-            and potential_child.event_type == EventType.SERVICE_STATE_CHANGE
-        ):
-            return True
-
-        return False
+        return is_likely_parent_child(potential_parent, potential_child)
 
     async def _apply_event_rules(self, event: NetworkEvent) -> list[dict[str, Any]]:
-        """Apply event processing rules."""
-        rules = (
-            self.db.query(EventRule)
-            .filter(
-                and_(
-                    EventRule.tenant_id == self.tenant_id,
-                    EventRule.is_enabled == "true",
-                )
-            )
-            .all()
-        )
-
-        applied_actions = []
-
-        for rule in rules:
-            try:
-                if await self._event_matches_rule(event, rule):
-                    action_result = await self._execute_rule_action(event, rule)
-                    applied_actions.append(action_result)
-            except Exception as e:
-                logger.error(f"Error applying rule {rule.rule_id}: {str(e)}")
-
-        return applied_actions
-
-    async def _event_matches_rule(self, event: NetworkEvent, rule: EventRule) -> bool:
-        """Check if event matches rule criteria."""
-        # Simple pattern matching - can be enhanced
-        if rule.event_type_pattern and rule.event_type_pattern != event.event_type:
-            return False
-
-        if rule.severity_filter and event.severity not in rule.severity_filter:
-            return False
-
-        # Device filter matching
-        if rule.device_filter:
-            device_criteria = rule.device_filter
-            if "device_type" in device_criteria and event.raw_data:
-                event_device_type = event.raw_data.get("device_type")
-                if event_device_type != device_criteria["device_type"]:
-                    return False
-
-        return True
-
-    async def _execute_rule_action(self, event: NetworkEvent, rule: EventRule) -> dict[str, Any]:
-        """Execute rule action."""
-        action_result = {
-            "rule_id": rule.rule_id,
-            "rule_name": rule.name,
-            "action_type": rule.action_type,
-            "executed_at": datetime.now(timezone.utc).isoformat(),
-            "success": True,
-            "details": {},
-        }
-
-        try:
-            if rule.action_type == "suppress":
-                # Suppress similar events
-                action_result["details"]["suppressed_similar_events"] = True
-
-            elif rule.action_type == "escalate":
-                # Escalate event severity
-                original_severity = event.severity
-                event.severity = rule.action_config.get("target_severity", "high")
-                action_result["details"]["escalated_from"] = original_severity
-                action_result["details"]["escalated_to"] = event.severity
-
-            elif rule.action_type == "correlate":
-                # Force correlation with specific pattern
-                action_result["details"]["forced_correlation"] = True
-
-            elif rule.action_type == "notify":
-                # Send notification (placeholder)
-                action_result["details"]["notification_sent"] = True
-                action_result["details"]["notification_type"] = rule.action_config.get("notification_type", "email")
-
-        except Exception as e:
-            action_result["success"] = False
-            action_result["error"] = str(e)
-
-        return action_result
+        """Apply event processing rules, compiling them once per tenant."""
+        rule_set = shared_rule_cache.get(self.tenant_id)
+        if rule_set is None:
+            rule_set = load_rule_set(self.db, self.tenant_id)
+            shared_rule_cache.put(self.tenant_id, rule_set)
+        return rule_set.apply(event)
 
     async def _identify_event_patterns(self, events: list[NetworkEvent]) -> list[dict[str, Any]]:
         """Identify patterns in event data."""
@@ -0,0 +1,271 @@
+"""
+Tests for the streaming NOC event correlation engine.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from dotmac_isp.modules.noc.models.events import Base, EventRule, EventType, NetworkEvent
+from dotmac_isp.modules.noc.services.correlation_engine import (
+    _PENDING_RULE_TENANTS,
+    CompiledRuleSet,
+    EventCorrelationEngine,
+    EventRuleCache,
+    EventWindowIndex,
+    shared_rule_cache,
+)
+
+TENANT = "tenant-1"
+START = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def make_event(event_id, minutes, event_type="system_event", **fields):
+    return NetworkEvent(
+        event_id=event_id,
+        tenant_id=TENANT,
+        event_type=event_type,
+        severity=fields.pop("severity", "low"),
+        title=event_id,
+        event_timestamp=START + timedelta(minutes=minutes),
+        **fields,
+    )
+
+
+def event_data(event_id, minutes, event_type, **fields):
+    return {
+        "event_id": event_id,
+        "event_type": event_type,
+        "severity": fields.pop("severity", "low"),
+        "title": event_id,
+        "event_timestamp": START + timedelta(minutes=minutes),
+        **fields,
+    }
+
+
+class TestEventWindowIndex:
+    """Test the time-bucketed related-event lookup."""
+
+    def test_related_matches_device_service_and_type(self):
+        index = EventWindowIndex(timedelta(minutes=30), bucket_seconds=60)
+        for event in [
+            make_event("old", -31, device_id="d1"),
+            make_event("device", -10, device_id="d1"),
+            make_event("service", -5, service_id="s1"),
+            make_event("both", -2, device_id="d1", service_id="s1"),
+            make_event("other", -1, "custom_event", device_id="d2"),
+        ]:
+            index.add(event)
+        incoming = make_event("new", 0, "custom_event", device_id="d1", service_id="s1")
+
+        related = [evt.event_id for evt in index.related(incoming)]
+
+        assert related == ["device", "both", "service", "other"]
+
+    def test_type_matches_are_limited_and_buckets_expire(self):
+        index = EventWindowIndex(timedelta(minutes=30), bucket_seconds=60)
+        for i in range(15):
+            index.add(make_event(f"e{i}", i, EventType.SYSTEM_EVENT))
+
+        related = index.related(make_event("new", 15))
+        dropped = index.expire(START + timedelta(minutes=40))
+
+        assert [evt.event_id for evt in related] == [f"e{i}" for i in range(10)]
+        assert dropped == 10
+        assert len(index) == 5
+
+
+class TestEventCorrelationEngine:
+    """Test in-memory correlation, cached rules and batched writes."""
+
+    async def test_correlates_storm_and_writes_in_batches(self, session_factory):
+        engine = EventCorrelationEngine(
+            session_factory, flush_size=3, rule_cache=EventRuleCache()
+        )
+        storm = [
+            event_data(
+                "dev-down", 0, "device_state_change",
+                severity="critical", device_id="r1", current_state="down",
+            ),
+            event_data("if-1", 1, "interface_state_change", device_id="r1"),
+            event_data("if-2", 2, "interface_state_change", device_id="r1"),
+            event_data("unrelated", 45, "security_event", device_id="fw1"),
+        ]
+
+        results = [await engine.process_event(TENANT, data) for data in storm[:2]]
+        stats = await engine.replay(storm[2:], TENANT)
+
+        correlation = results[1]["correlation_results"]
+        assert correlation["parent_event_id"] == "dev-down"
+        assert correlation["root_cause_event_id"] == "dev-down"
+        assert stats["events"] == 2
+        assert stats["correlated_events"] == 1
+        assert stats["events_per_second"] > 0
+
+        with session_factory() as db:
+            stored = {e.event_id: e for e in db.query(NetworkEvent).all()}
+        assert set(stored) == {"dev-down", "if-1", "if-2", "unrelated"}
+        assert stored["if-2"].correlation_id == correlation["correlation_id"]
+        assert stored["if-2"].parent_event_id == "dev-down"
+        assert stored["unrelated"].correlation_id is None
+
+    async def test_seeds_index_from_stored_events(self, session_factory):
+        with session_factory() as db:
+            stored = make_event("stored", -5, device_id="r1", correlation_id="CORR-seed")
+            stored.event_timestamp = stored.event_timestamp.replace(tzinfo=None)
+            db.add(stored)
+            db.commit()
+
+        async with EventCorrelationEngine(session_factory, rule_cache=EventRuleCache()) as engine:
+            result = await engine.process_event(
+                TENANT, event_data("new", 0, "custom_event", device_id="r1")
+            )
+
+        assert result["correlation_results"]["correlation_id"] == "CORR-seed"
+        assert engine.pending == 0
+
+    async def test_rule_cache_invalidated_on_commit(self, session_factory):
+        shared_rule_cache.invalidate()
+        engine = EventCorrelationEngine(session_factory)
+        with session_factory() as db:
+            db.add(
+                EventRule(
+                    rule_id="esc", tenant_id=TENANT, name="Escalate", is_enabled="true",
+                    event_type_pattern="interface_state_change", severity_filter=["low"],
+                    action_type="escalate", action_config={"target_severity": "major"},
+                )
+            )
+            db.commit()
+
+        first = await engine.process_event(
+            TENANT, event_data("a", 0, EventType.INTERFACE_STATE_CHANGE)
+        )
+        with session_factory() as db:
+            db.query(EventRule).filter_by(rule_id="esc").one().is_enabled = "false"
+            db.flush()
+            assert shared_rule_cache.get(TENANT) is not None
+            db.commit()
+        assert shared_rule_cache.get(TENANT) is None
+        second = await engine.process_event(
+            TENANT, event_data("b", 1, "interface_state_change")
+        )
+        await engine.close()
+
+        assert first["event_data"]["severity"] == "major"
+        assert first["rule_actions"][0]["details"]["escalated_from"] == "low"
+        assert second["rule_actions"] == []
+
+    async def test_rejected_rows_do_not_block_the_batch(self, session_factory):
+        with session_factory() as db:
+            db.add(make_event("dup", -60))
+            db.commit()
+        engine = EventCorrelationEngine(
+            session_factory, flush_size=100, rule_cache=EventRuleCache()
+        )
+        for i, event_id in enumerate(["a", "b", "dup", "c", "d"]):
+            await engine.process_event(TENANT, event_data(event_id, i, "custom_event"))
+
+        assert await engine.flush() == 4
+        assert engine.pending == 0
+        assert engine.dropped_events == 1
+        with session_factory() as db:
+            stored = {e.event_id: e.title for e in db.query(NetworkEvent).all()}
+        assert stored == {"dup": "dup", "a": "a", "b": "b", "c": "c", "d": "d"}
+
+    async def test_pending_events_capped_while_writes_fail(self, session_factory):
+        database_down = False
+
+        def sessions():
+            if database_down:
+                raise OperationalError("INSERT", {}, Exception("database is down"))
+            return session_factory()
+
+        engine = EventCorrelationEngine(
+            sessions, flush_size=2, max_pending=3, rule_cache=EventRuleCache()
+        )
+        await engine.process_event(TENANT, event_data("e0", 0, "custom_event"))
+        database_down = True
+        for i in range(1, 6):
+            await engine.process_event(TENANT, event_data(f"e{i}", i, "custom_event"))
+
+        assert engine.pending == 3
+        assert engine.dropped_events == 3
+        database_down = False
+        assert await engine.flush() == 3
+        with session_factory() as db:
+            assert sorted(e.event_id for e in db.query(NetworkEvent).all()) == ["e3", "e4", "e5"]
+
+    async def test_future_timestamp_does_not_expire_window(self, session_factory):
+        engine = EventCorrelationEngine(session_factory, rule_cache=EventRuleCache())
+        now = datetime.now(timezone.utc)
+        recent = {"event_type": "custom_event", "severity": "low", "device_id": "r1"}
+
+        await engine.process_event(
+            TENANT, {**recent, "event_id": "a", "title": "a", "event_timestamp": now}
+        )
+        await engine.process_event(
+            TENANT,
+            {
+                **recent,
+                "event_id": "skewed",
+                "title": "skewed",
+                "event_timestamp": (now + timedelta(days=2)).isoformat(),
+            },
+        )
+        result = await engine.process_event(
+            TENANT, {**recent, "event_id": "b", "title": "b"}
+        )
+
+        assert len(engine._indexes[TENANT]) == 3
+        assert result["correlation_results"]["correlation_id"] is not None
+
+    async def test_timestamps_are_parsed_or_rejected(self, session_factory):
+        engine = EventCorrelationEngine(session_factory, rule_cache=EventRuleCache())
+
+        result = await engine.process_event(
+            TENANT,
+            {**event_data("iso", 0, "custom_event"), "event_timestamp": "2024-03-01T12:00:00Z"},
+        )
+        assert result["event_data"]["event_timestamp"] == START.isoformat()
+
+        for bad in ("yesterday", 1709294400):
+            with pytest.raises(ValueError, match="event_timestamp"):
+                await engine.process_event(
+                    TENANT, {**event_data("bad", 0, "custom_event"), "event_timestamp": bad}
+                )
+        assert engine.pending == 1
+
+    async def test_idle_tenant_indexes_are_evicted(self, session_factory):
+        engine = EventCorrelationEngine(session_factory, rule_cache=EventRuleCache())
+        await engine.process_event(TENANT, event_data("a", 0, "custom_event"))
+        await engine.process_event("tenant-2", event_data("b", 0, "custom_event"))
+
+        engine._index_used[TENANT] -= engine.window.total_seconds() + 1
+        engine._evict_idle_indexes()
+
+        assert set(engine._indexes) == {"tenant-2"}
+
+    def test_rollback_discards_uncommitted_rule_changes(self, session_factory):
+        shared_rule_cache.put(TENANT, CompiledRuleSet([]))
+        with session_factory() as db:
+            db.add(EventRule(rule_id="r", tenant_id=TENANT, name="R", action_type="log"))
+            db.flush()
+            assert db.info[_PENDING_RULE_TENANTS] == {TENANT}
+            db.rollback()
+
+            assert _PENDING_RULE_TENANTS not in db.info
+        assert shared_rule_cache.get(TENANT) is not None
+        shared_rule_cache.invalidate()